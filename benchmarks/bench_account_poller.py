@@ -0,0 +1,61 @@
+import asyncio
+import base64
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.connection.account_poller import WhirlpoolPoller
+from src.whirlpool.account_decoder import decode_whirlpool, encode_whirlpool
+from testing.mock_rpc import MockRPCServer
+
+POOL_COUNT = 500
+LATENCY = 0.01  # 10ms simulierte RPC-Latenz
+
+
+async def sequential_poll(session: aiohttp.ClientSession, url: str, addresses):
+    """Bisheriges Muster: ein getAccountInfo pro Pool"""
+    results = {}
+    for i, address in enumerate(addresses):
+        payload = {
+            "jsonrpc": "2.0", "id": i, "method": "getAccountInfo",
+            "params": [address, {"encoding": "base64"}]
+        }
+        async with session.post(url, json=payload) as response:
+            body = await response.json()
+        value = body["result"]["value"]
+        if value:
+            results[address] = decode_whirlpool(base64.b64decode(value["data"][0]))
+    return results
+
+
+async def main():
+    accounts = {
+        f"Pool{i:05d}": encode_whirlpool(sqrt_price=(1 << 64) + i, tick_current_index=i, liquidity=10 ** 9)
+        for i in range(POOL_COUNT)
+    }
+    addresses = list(accounts)
+
+    async with MockRPCServer(accounts, latency=LATENCY) as server:
+        async with aiohttp.ClientSession() as session:
+            start = time.perf_counter()
+            sequential = await sequential_poll(session, server.url, addresses)
+            sequential_time = time.perf_counter() - start
+
+            poller = WhirlpoolPoller(server.url, session=session)
+            start = time.perf_counter()
+            batched = await poller.snapshots(addresses)
+            batched_time = time.perf_counter() - start
+
+    assert len(sequential) == len(batched) == POOL_COUNT
+    print(f"Pools: {POOL_COUNT}, simulierte Latenz: {LATENCY * 1000:.0f}ms")
+    print(f"Sequentiell (getAccountInfo):     {sequential_time * 1000:8.1f}ms")
+    print(f"Gebündelt (getMultipleAccounts):  {batched_time * 1000:8.1f}ms")
+    print(f"Speedup: {sequential_time / batched_time:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.connection.http_transport import HttpTransport
+
+REQUESTS = 500
+CONCURRENCY = 10
+
+
+async def start_stand_in():
+    """Lokaler Ersatz für die Orca API (antwortet sofort mit kleinem JSON)"""
+    connections = set()
+
+    async def price(request):
+        connections.add(request.transport.get_extra_info("peername"))
+        return web.json_response({"price": "101.25"})
+
+    app = web.Application()
+    app.router.add_get("/v1/whirlpool/{address}/price", price)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", connections
+
+
+async def session_per_request(url: str):
+    """Bisheriges Muster: neue ClientSession pro Aufruf"""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url) as response:
+            return await response.json()
+
+
+async def run_pattern(fetch, base_url: str):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await fetch(f"{base_url}/v1/whirlpool/Pool{i % 50}/price")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(REQUESTS)))
+    total = time.perf_counter() - start
+    latencies.sort()
+    return total, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+
+async def main():
+    runner, base_url, connections = await start_stand_in()
+    try:
+        old = await run_pattern(session_per_request, base_url)
+        old_connections = len(connections)
+
+        connections.clear()
+        async with HttpTransport() as transport:
+            new = await run_pattern(transport.get_json, base_url)
+        new_connections = len(connections)
+    finally:
+        await runner.cleanup()
+
+    print(f"Requests: {REQUESTS}, parallel: {CONCURRENCY}")
+    print(f"{'':28}{'gesamt':>10}{'p50':>10}{'p99':>10}{'TCP-Verb.':>11}")
+    for name, (total, p50, p99), conns in (
+        ("Session pro Request", old, old_connections),
+        ("Geteilter Transport", new, new_connections)
+    ):
+        print(f"{name:28}{total * 1000:8.1f}ms{p50 * 1000:8.2f}ms{p99 * 1000:8.2f}ms{conns:>11}")
+    print(f"Speedup: {old[0] / new[0]:.1f}x (ohne TLS; gegen die echte API spart Keep-Alive zusätzlich den Handshake)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
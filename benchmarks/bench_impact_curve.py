@@ -0,0 +1,69 @@
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.whirlpool.account_decoder import decode_tick_array, encode_tick_array
+from src.whirlpool.impact_curve import ImpactCurveBook
+from src.whirlpool.swap_math import sqrt_price_from_tick_index
+from src.whirlpool.swap_simulator import WhirlpoolSwapSimulator
+
+TRADES = 20_000
+TICK_SPACING = 64
+
+
+def make_pool():
+    rng = np.random.default_rng(5)
+    nets = {}
+    for _ in range(200):  # 200 Positionen mit zufälligen Bereichen
+        lower, upper = sorted(rng.integers(-170, 170, 2) * TICK_SPACING)
+        if lower == upper:
+            continue
+        liquidity = int(rng.integers(10 ** 10, 10 ** 12))
+        nets[lower] = nets.get(lower, 0) + liquidity
+        nets[upper] = nets.get(upper, 0) - liquidity
+    starts = range(-11264, 11264, 5632)
+    arrays = [
+        decode_tick_array(encode_tick_array(start, TICK_SPACING, {
+            tick: net for tick, net in nets.items() if start <= tick < start + 5632
+        }), TICK_SPACING)
+        for start in starts
+    ]
+    liquidity = sum(net for tick, net in nets.items() if tick <= 0)
+    pool_data = {'sqrt_price': sqrt_price_from_tick_index(0), 'tick_current_index': 0,
+                 'liquidity': liquidity, 'fee_rate': 3000, 'tick_spacing': TICK_SPACING}
+    return pool_data, arrays
+
+
+def main():
+    pool_data, arrays = make_pool()
+    values = np.random.default_rng(1).uniform(10, 1e5, TRADES)
+
+    sample = 500
+    begin = time.perf_counter()
+    simulator = WhirlpoolSwapSimulator.from_pool(pool_data, arrays)
+    for value in values[:sample]:
+        simulator.quote(int(value * 1e6), a_to_b=False)
+    exact = (time.perf_counter() - begin) / sample * TRADES
+
+    begin = time.perf_counter()
+    book = ImpactCurveBook()
+    book.add_snapshot('P', datetime(2024, 1, 1), pool_data, arrays, 6)
+    build = time.perf_counter() - begin
+    begin = time.perf_counter()
+    book.slippage('P', values, True)
+    lookup = time.perf_counter() - begin
+
+    print(f"{TRADES} Trades, ein Snapshot")
+    print(f"Exaktes Quote pro Trade (hochgerechnet): {exact:8.3f} s")
+    print(f"Kurve bauen (Kauf + Verkauf):            {build:8.3f} s")
+    print(f"Kurven-Lookup vektorisiert:              {lookup:8.3f} s")
+    print(f"Speedup inkl. Aufbau: {exact / (build + lookup):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
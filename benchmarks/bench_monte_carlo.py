@@ -0,0 +1,59 @@
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.backtest.monte_carlo import ScenarioConfig, simulate
+
+TRADES = 500
+PATHS = 10_000
+
+
+def make_trades():
+    rng = np.random.default_rng(11)
+    start = datetime(2024, 1, 1)
+    trades = []
+    for i in range(TRADES):
+        price = 100 * np.exp(rng.normal(0, 0.05))
+        exit_price = price * np.exp(rng.normal(0, 0.01))
+        trades.append({'timestamp': start + timedelta(minutes=2 * i), 'pool_address': f"pool{i % 10}",
+                       'type': 'buy', 'amount': 1.0, 'price': price, 'value': 100.0})
+        trades.append({'timestamp': start + timedelta(minutes=2 * i + 1), 'pool_address': f"pool{i % 10}",
+                       'type': 'sell', 'amount': 1.0, 'price': exit_price})
+    return trades
+
+
+def loop_pattern(trades, paths):
+    """Bisheriges Muster: ein Backtest-Durchlauf pro Pfad, Slippage je Trade per np.random.normal"""
+    begin = time.perf_counter()
+    entry = {}
+    for _ in range(paths):
+        capital = 1000.0
+        for trade in trades:
+            slippage = 0.001 * (1 + 100 / 10000) * np.random.normal(1, 0.1)
+            if trade['type'] == 'buy':
+                entry[trade['pool_address']] = 100 / (trade['price'] * (1 + slippage))
+            else:
+                capital += entry.pop(trade['pool_address']) * trade['price'] * (1 - slippage) * 0.997 - 100.3
+    return time.perf_counter() - begin
+
+
+def main():
+    trades = make_trades()
+    sample = 20
+    old = loop_pattern(trades, sample) / sample * PATHS
+    begin = time.perf_counter()
+    simulate(trades, config=ScenarioConfig(paths=PATHS, seed=1))
+    new = time.perf_counter() - begin
+    print(f"{TRADES} Round-Trips, {PATHS} Pfade")
+    print(f"Schleife pro Pfad (hochgerechnet): {old:8.2f} s")
+    print(f"Vektorisiert:                      {new:8.2f} s")
+    print(f"Speedup: {old / new:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
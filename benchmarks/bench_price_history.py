@@ -0,0 +1,54 @@
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.price_history import PriceHistory
+
+TICKS = 20_000  # 1s-Sampling; bei 24h Historie wächst die alte Liste bis 86.400 Einträge
+WARM = 86_400
+
+
+def list_pattern(prices, start):
+    """Bisheriges Muster: Dict pro Tick, 24h-Liste bei jedem Update neu aufbauen, Metriken per np.array"""
+    cache = [{'price': 1.0, 'timestamp': start + timedelta(seconds=i)} for i in range(WARM)]
+    begin = time.perf_counter()
+    for i, price in enumerate(prices):
+        now = start + timedelta(seconds=WARM + i)
+        cache.append({'price': price, 'timestamp': now})
+        cutoff = now - timedelta(hours=24)
+        cache = [p for p in cache if p['timestamp'] > cutoff]
+        values = np.array([p['price'] for p in cache])
+        np.std(np.diff(np.log(values)))
+    return time.perf_counter() - begin
+
+
+def ring_pattern(prices, start):
+    history = PriceHistory(WARM)
+    for i in range(WARM):
+        history.append_datetime(start + timedelta(seconds=i), 1.0)
+    begin = time.perf_counter()
+    for i, price in enumerate(prices):
+        history.append_datetime(start + timedelta(seconds=WARM + i), price)
+        history.metrics()
+    return time.perf_counter() - begin
+
+
+def main():
+    prices = 1.0 + np.random.default_rng(1).normal(0, 0.001, TICKS).cumsum()
+    start = datetime(2024, 1, 1)
+    ticks = TICKS // 20  # alte Variante ist zu langsam für alle Ticks
+    old = list_pattern(prices[:ticks], start) / ticks
+    new = ring_pattern(prices, start) / TICKS
+    print(f"Updates mit Metriken bei {WARM} Einträgen Historie")
+    print(f"Liste + Comprehension: {old * 1e6:10.1f} µs/Update")
+    print(f"Ringpuffer:            {new * 1e6:10.1f} µs/Update")
+    print(f"Speedup: {old / new:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
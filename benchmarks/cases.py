@@ -0,0 +1,164 @@
+"""Benchmark-Fälle: jeder Fall baut seine Eingaben aus dem synthetischen Markt und liefert die zu messende Funktion"""
+import asyncio
+import contextlib
+import io
+import sys
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import (
+    MarketSpec, generate_frames, generate_prices, generate_swaps, generate_whirlpool_accounts
+)
+
+SRC = Path(__file__).parent.parent / "src"
+
+# setup(spec, workdir) -> Funktion ohne Argumente; ImportError im Setup = Fall übersprungen
+Setup = Callable[[MarketSpec, Path], Callable[[], Any]]
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Setup
+    pools: Sequence[int]  # Poolzahlen im vollen Lauf
+    quick: Sequence[int]  # Poolzahlen mit --quick
+    steps: int  # Zeitschritte pro Pool
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, pools: Sequence[int], quick: Sequence[int] = (), steps: int = 1440):
+    def register(setup: Setup) -> Setup:
+        CASES[name] = Case(name, setup, tuple(pools), tuple(quick) or tuple(pools[:1]), steps)
+        return setup
+    return register
+
+
+def _quiet(coro):
+    # Rich-Fortschrittsbalken und Ergebnistabellen gehen auf sys.stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(coro)
+
+
+# --- Hot Paths ---
+
+@case('decode_whirlpools', pools=(10, 1_000, 10_000), quick=(10, 1_000), steps=1)
+def decode_whirlpools(spec: MarketSpec, workdir: Path):
+    from src.whirlpool.account_decoder import decode_whirlpools
+    accounts = generate_whirlpool_accounts(spec)
+    return lambda: decode_whirlpools(accounts).price
+
+
+@case('indicator_engine', pools=(10, 100, 1_000), quick=(10,), steps=240)
+def indicator_engine(spec: MarketSpec, workdir: Path):
+    from src.data.indicators import IndicatorEngine
+    swaps = generate_swaps(spec)
+    names = spec.pool_names
+    pools, prices = swaps['pool'].tolist(), swaps['price'].tolist()
+
+    def run():
+        engine = IndicatorEngine()
+        for pool, price in zip(pools, prices):
+            engine.update(names[pool], price)
+    return run
+
+
+@case('strategy_indicators', pools=(10, 100), quick=(10,), steps=7 * 1440)
+def strategy_indicators(spec: MarketSpec, workdir: Path):
+    from src.backtest.strategy_manager import BacktestStrategy
+    strategy = BacktestStrategy()
+    frames = list(generate_frames(spec).values())
+    return lambda: [strategy.calculate_indicators(df) for df in frames]
+
+
+@case('strategy_signals', pools=(10, 100), quick=(10,), steps=7 * 1440)
+def strategy_signals(spec: MarketSpec, workdir: Path):
+    from src.backtest.strategy_manager import BacktestStrategy
+    strategy = BacktestStrategy()
+    frames = [strategy.calculate_indicators(df) for df in generate_frames(spec).values()]
+    return lambda: [strategy.generate_signals(df) for df in frames]
+
+
+@case('risk_checks', pools=(10, 1_000), quick=(10,), steps=100)
+def risk_checks(spec: MarketSpec, workdir: Path):
+    from src.models import TradeData
+    from src.risk_manager import RiskManager
+    swaps = generate_swaps(spec)
+    names = spec.pool_names
+    trades = [
+        TradeData(pool_name=names[pool], price=price, amount=amount / price,
+                  side='buy' if is_buy else 'sell', timestamp=pd.Timestamp(ts).floor('us').to_pydatetime())
+        for ts, pool, price, amount, is_buy in swaps.tolist()
+    ]
+
+    def run():
+        manager = RiskManager()
+        manager.max_position_size = Decimal("1e12")
+        for trade in trades:
+            if manager.can_open_position(trade):
+                manager.update_position(trade)
+    return run
+
+
+@case('performance_metrics', pools=(10, 1_000), quick=(10,), steps=7 * 1440)
+def performance_metrics(spec: MarketSpec, workdir: Path):
+    from src.backtest.monte_carlo import PERCENTILES
+    from src.trading import metrics
+    equity = generate_prices(spec)  # ein Pfad pro Pool
+    return lambda: (metrics.max_drawdown(equity), metrics.sharpe_ratio(metrics.returns(equity)),
+                    np.percentile(metrics.calmar_ratio(equity), PERCENTILES))
+
+
+# --- Backtest-Engines ---
+
+@case('event_backtester', pools=(10, 100, 1_000), quick=(10,))
+def event_backtester(spec: MarketSpec, workdir: Path):
+    from src.backtest.event_engine import AlignedMarket, EventBacktester, SignalFrameAdapter
+    from src.backtest.strategy_manager import BacktestStrategy
+    market = AlignedMarket.from_frames(generate_frames(spec))
+    return lambda: asyncio.run(EventBacktester(market, SignalFrameAdapter(BacktestStrategy())).run())
+
+
+@case('orca_backtester', pools=(10, 100), quick=(10,))
+def orca_backtester(spec: MarketSpec, workdir: Path):
+    from src.backtest.orca_backtester import OrcaBacktester
+    from src.data.tick_store import TickStore
+    store = TickStore(workdir / "ticks")
+    for pool, df in generate_frames(spec).items():
+        store.append(pool, df)
+    config = {'tick_store': str(store.directory), 'initial_capital': 1000.0, 'min_volume': 0}
+    start, end = pd.Timestamp(spec.timestamps()[0]), pd.Timestamp(spec.timestamps()[-1])
+    return lambda: _quiet(OrcaBacktester(config).run_backtest(start.to_pydatetime(), end.to_pydatetime()))
+
+
+@case('backtest_engine', pools=(10, 100), quick=(10,))
+def backtest_engine(spec: MarketSpec, workdir: Path):
+    # src/backtest_engine.py importiert seine Nachbarn ohne Paketpräfix
+    if str(SRC) not in sys.path:
+        sys.path.append(str(SRC))
+    from backtest_engine import BacktestEngine
+
+    frames = {pool: df.set_index('timestamp') for pool, df in generate_frames(spec).items()}
+    start, end = frames[spec.pool_names[0]].index[[0, -1]]
+
+    class SyntheticEngine(BacktestEngine):
+        async def _get_historical_data(self, date) -> Dict:
+            day = pd.Timestamp(date).normalize()
+            return {pool: df.loc[day:day + pd.Timedelta(days=1) - pd.Timedelta(1)] for pool, df in frames.items()}
+
+    async def run():
+        engine = SyntheticEngine(start.to_pydatetime(), end.to_pydatetime(), 1000.0, seed=1)
+        await engine.run_backtest()
+        return engine.generate_report()
+    return lambda: asyncio.run(run())
+
+
+def select(patterns: Sequence[str] = ()) -> List[Case]:
+    """Fälle, deren Name einen der Teilstrings enthält (leer = alle)"""
+    return [c for name, c in CASES.items() if not patterns or any(p in name for p in patterns)]
@@ -0,0 +1,172 @@
+"""Führt die Benchmark-Fälle aus, schreibt JSON und vergleicht mit einer gespeicherten Baseline
+
+    python -m benchmarks.run --quick
+    python -m benchmarks.run --save-baseline              # benchmarks/baseline.json neu schreiben
+    python -m benchmarks.run --filter backtest --threshold 0.1
+
+Baselines sind maschinenabhängig und werden pro Rechner (bzw. CI-Runner) erzeugt.
+Exit-Code 1, wenn ein Fall langsamer als Baseline * (1 + Schwelle) ist oder ein in der
+Baseline gemessener Fall jetzt übersprungen wird bzw. fehlschlägt.
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.cases import Case, select
+from benchmarks.synthetic import MarketSpec
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.2  # 20 % langsamer als die Baseline gilt als Regression
+MIN_DELTA = 0.002  # Sekunden; kleinere Abweichungen sind Messrauschen
+
+
+def result_key(name: str, pools: int) -> str:
+    return f"{name}[pools={pools}]"
+
+
+def measure(case: Case, pools: int, repeat: int, seed: int) -> Dict:
+    """Setup einmal, ein Aufwärmlauf, dann repeat gemessene Läufe"""
+    spec = MarketSpec(pools=pools, steps=case.steps, seed=seed)
+    entry = {'case': case.name, 'pools': pools, 'steps': case.steps, 'repeat': repeat}
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            fn = case.setup(spec, Path(workdir))
+        except ImportError as e:
+            return {**entry, 'status': 'skipped', 'reason': str(e)}
+        try:
+            fn()
+            times = []
+            for _ in range(repeat):
+                begin = time.perf_counter()
+                fn()
+                times.append(time.perf_counter() - begin)
+        except Exception as e:
+            traceback.print_exc()
+            return {**entry, 'status': 'error', 'reason': f"{type(e).__name__}: {e}"}
+    return {**entry, 'status': 'ok', 'min': min(times), 'median': statistics.median(times),
+            'mean': statistics.fmean(times)}
+
+
+def run(cases: List[Case], quick: bool = False, repeat: int = 5, seed: int = 7) -> Dict:
+    results = {}
+    for case in cases:
+        for pools in (case.quick if quick else case.pools):
+            key = result_key(case.name, pools)
+            print(f"{key:45s}", end=' ', flush=True)
+            entry = results[key] = measure(case, pools, repeat, seed)
+            print(f"{entry['median']:10.4f} s" if entry['status'] == 'ok' else f"{entry['status']}: {entry['reason']}")
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'quick': quick,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD,
+            min_delta: float = MIN_DELTA) -> List[Dict]:
+    """Median je Fall gegen die Baseline; ein dort gemessener Fall ohne Messung gilt als 'failed'"""
+    rows = []
+    for key, entry in current['results'].items():
+        base = baseline.get('results', {}).get(key)
+        if not base or base.get('status') != 'ok':
+            continue
+        if entry.get('status') != 'ok':
+            rows.append({'key': key, 'baseline': base['median'], 'current': None, 'ratio': None,
+                         'status': 'failed', 'reason': f"{entry.get('status')}: {entry.get('reason')}"})
+            continue
+        ratio = entry['median'] / base['median'] if base['median'] > 0 else float('inf')
+        regression = ratio > 1 + threshold and entry['median'] - base['median'] > min_delta
+        improvement = ratio < 1 / (1 + threshold) and base['median'] - entry['median'] > min_delta
+        rows.append({'key': key, 'baseline': base['median'], 'current': entry['median'], 'ratio': ratio,
+                     'status': 'regression' if regression else 'faster' if improvement else 'ok'})
+    return rows
+
+
+def load(path: Path) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save(data: Dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, sort_keys=True))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Backtest- und Hot-Path-Benchmarks")
+    parser.add_argument('--filter', action='append', default=[], help="Nur Fälle mit diesem Teilstring")
+    parser.add_argument('--quick', action='store_true', help="Nur kleine Poolzahlen")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', type=Path, help="Ergebnis-JSON (Standard: benchmarks/results/<Zeit>.json)")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--save-baseline', action='store_true', help="Ergebnis als neue Baseline speichern")
+    args = parser.parse_args(argv)
+
+    cases = select(args.filter)
+    if not cases:
+        print(f"Keine Fälle für {args.filter}")
+        return 2
+
+    # Abgelehnte Trades u.ä. loggen im Hot Path; die Ausgabe würde die Messung verfälschen
+    logging.disable(logging.WARNING)
+    try:
+        current = run(cases, quick=args.quick, repeat=args.repeat, seed=args.seed)
+    finally:
+        logging.disable(logging.NOTSET)
+    output = args.output or Path(__file__).parent / "results" / f"{datetime.now():%Y%m%d_%H%M%S}.json"
+    save(current, output)
+    print(f"\nErgebnisse: {output}")
+
+    if args.save_baseline:
+        save(current, args.baseline)
+        print(f"Baseline gespeichert: {args.baseline}")
+        return 0
+
+    baseline = load(args.baseline)
+    if baseline is None:
+        print(f"Keine Baseline unter {args.baseline} (mit --save-baseline anlegen)")
+        return 0
+
+    rows = compare(current, baseline, args.threshold)
+    print(f"\nVergleich mit {args.baseline} (Schwelle {args.threshold:.0%}):")
+    for row in rows:
+        if row['status'] == 'failed':
+            print(f"{row['key']:45s} {row['baseline']:10.4f} s -> {'-':>10s}    {'':6s}   failed ({row['reason']})")
+            continue
+        print(f"{row['key']:45s} {row['baseline']:10.4f} s -> {row['current']:10.4f} s  "
+              f"{row['ratio']:6.2f}x  {row['status']}")
+    regressions = [row for row in rows if row['status'] == 'regression']
+    failed = [row for row in rows if row['status'] == 'failed']
+    if regressions or failed:
+        print(f"\n{len(regressions)} Regression(en), {len(failed)} nicht mehr messbar")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Deterministischer synthetischer Markt für Benchmarks: GBM mit Sprüngen, Swaps, Whirlpool-Accounts"""
+import sys
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.whirlpool.account_decoder import encode_whirlpool
+from src.whirlpool.swap_math import sqrt_price_from_tick_index
+
+SWAP_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('pool', '<i4'),
+    ('price', '<f8'),
+    ('amount', '<f8'),  # Gegenwert in Quote-Einheiten
+    ('is_buy', '?'),
+])
+
+
+@dataclass(frozen=True)
+class MarketSpec:
+    pools: int = 10
+    steps: int = 1440  # Zeitschritte pro Pool
+    freq: str = '1min'
+    start: datetime = datetime(2024, 1, 1)
+    drift: float = 0.0  # pro Jahr
+    volatility: float = 0.8  # pro Jahr
+    jump_intensity: float = 5.0  # erwartete Sprünge pro Tag
+    jump_mean: float = 0.0  # mittlere Log-Sprunghöhe
+    jump_std: float = 0.03
+    swaps_per_step: float = 2.0  # Poisson-Rate der Swaps pro Pool und Schritt
+    seed: int = 7
+
+    def scaled(self, **changes) -> 'MarketSpec':
+        return replace(self, **changes)
+
+    @property
+    def pool_names(self) -> List[str]:
+        return [f"pool{i:05d}" for i in range(self.pools)]
+
+    def timestamps(self) -> np.ndarray:
+        return pd.date_range(self.start, periods=self.steps, freq=self.freq).as_unit('ns').asi8
+
+
+def _pool_rng(spec: MarketSpec, pool: int, stream: int) -> np.random.Generator:
+    # Eigener Strom je Pool: Pool i sieht dieselben Daten, egal wie viele Pools erzeugt werden
+    return np.random.default_rng([spec.seed, pool, stream])
+
+
+def generate_prices(spec: MarketSpec) -> np.ndarray:
+    """(pools, steps)-Preise: Merton-Jump-Diffusion, Startpreise log-uniform zwischen 1e-4 und 1e3"""
+    dt = pd.Timedelta(spec.freq).total_seconds() / (365 * 86400)
+    jump_rate = spec.jump_intensity * pd.Timedelta(spec.freq).total_seconds() / 86400
+    prices = np.empty((spec.pools, spec.steps))
+    for pool in range(spec.pools):
+        rng = _pool_rng(spec, pool, 0)
+        start = np.exp(rng.uniform(np.log(1e-4), np.log(1e3)))
+        diffusion = (spec.drift - 0.5 * spec.volatility ** 2) * dt \
+            + spec.volatility * np.sqrt(dt) * rng.standard_normal(spec.steps)
+        jumps = rng.poisson(jump_rate, spec.steps)
+        jump_sizes = jumps * spec.jump_mean + np.sqrt(jumps) * spec.jump_std * rng.standard_normal(spec.steps)
+        log_returns = diffusion + jump_sizes
+        log_returns[0] = 0.0
+        prices[pool] = start * np.exp(np.cumsum(log_returns))
+    return prices
+
+
+def generate_frames(spec: MarketSpec) -> Dict[str, pd.DataFrame]:
+    """Ein DataFrame pro Pool im Parquet-Format (timestamp, price, volume, liquidity)"""
+    timestamps = pd.to_datetime(spec.timestamps())
+    prices = generate_prices(spec)
+    frames = {}
+    for pool, name in enumerate(spec.pool_names):
+        rng = _pool_rng(spec, pool, 1)
+        frames[name] = pd.DataFrame({
+            'timestamp': timestamps,
+            'price': prices[pool],
+            'volume': rng.lognormal(11, 1.5, spec.steps),
+            'liquidity': rng.lognormal(20, 1, 1)[0] * np.exp(0.05 * np.cumsum(rng.standard_normal(spec.steps))),
+        })
+    return frames
+
+
+def generate_swaps(spec: MarketSpec) -> np.ndarray:
+    """Einzelne Swaps aller Pools, nach Zeit sortiert; Preis = Pfadpreis zum Zeitpunkt des Swaps"""
+    timestamps = spec.timestamps()
+    step_ns = int(pd.Timedelta(spec.freq).value)
+    prices = generate_prices(spec)
+    parts = []
+    for pool in range(spec.pools):
+        rng = _pool_rng(spec, pool, 2)
+        counts = rng.poisson(spec.swaps_per_step, spec.steps)
+        steps = np.repeat(np.arange(spec.steps), counts)
+        swaps = np.empty(len(steps), dtype=SWAP_DTYPE)
+        swaps['timestamp'] = timestamps[steps] + rng.integers(0, step_ns, len(steps))
+        swaps['pool'] = pool
+        swaps['price'] = prices[pool, steps]
+        swaps['amount'] = rng.lognormal(5, 2, len(steps))
+        swaps['is_buy'] = rng.random(len(steps)) < 0.5
+        parts.append(swaps)
+    swaps = np.concatenate(parts) if parts else np.empty(0, dtype=SWAP_DTYPE)
+    return swaps[np.argsort(swaps['timestamp'], kind='stable')]
+
+
+def generate_whirlpool_accounts(spec: MarketSpec) -> List[bytes]:
+    """Rohe Whirlpool-Accounts (653 Bytes) zum letzten Preis jedes Pools"""
+    rng = np.random.default_rng([spec.seed, 3])
+    ticks = rng.integers(-40_000, 40_000, spec.pools)
+    liquidity = rng.integers(10 ** 9, 10 ** 15, spec.pools)
+    return [
+        encode_whirlpool(sqrt_price_from_tick_index(int(tick)), int(tick), int(liq))
+        for tick, liq in zip(ticks, liquidity)
+    ]
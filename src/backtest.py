@@ -1,12 +1,20 @@
+import sys
+from pathlib import Path
+
+# Fügen Sie das src Verzeichnis zum Python Path hinzu (Aufruf als python src/backtest.py)
+src_path = str(Path(__file__).parent.parent)
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
 import requests
 import json
 from datetime import datetime, timedelta
-from pathlib import Path
 from colorama import init, Fore, Style
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
-from models import Trade, Pool, Signal
+from typing import Dict, Iterator, List, Optional, Union
+from models import Trade
+from src.data.tick_store import TickStore
 
 init()
 
@@ -19,6 +27,7 @@ class OrcaBacktester:
         # Setup directories
         self.data_dir = Path("backtest_data")
         self.data_dir.mkdir(exist_ok=True)
+        self.tick_store = TickStore(self.data_dir / "ticks")
         
         # Trading parameters
         self.INITIAL_CAPITAL = 1000  # USDC
@@ -70,19 +79,12 @@ class OrcaBacktester:
         
         # Load historical data
         historical_data = self._load_historical_data(start_date, end_date)
-        if historical_data.empty:
+        if len(historical_data) == 0:
             print(f"{Fore.RED}No historical data available{Style.RESET_ALL}")
             return pd.DataFrame()
             
         # Run strategy
-        for idx, row in historical_data.iterrows():
-            market_data = {
-                'timestamp': row['timestamp'],
-                'price': row['price'],
-                'volume': row['volume'],
-                'liquidity': row['liquidity']
-            }
-            
+        for market_data in self._iter_market_data(historical_data):
             signal = strategy.analyze(market_data)
             
             if signal and signal.should_trade:
@@ -94,9 +96,13 @@ class OrcaBacktester:
         # Generate results
         return self._generate_results()
         
-    def _load_historical_data(self, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    def _load_historical_data(self, start_date: datetime, end_date: datetime) -> Union[pd.DataFrame, np.ndarray]:
         """Load historical price data"""
         try:
+            # Tick store first: memory-mapped view, nothing is loaded up front
+            if self.ORCA_WHIRLPOOL in self.tick_store:
+                return self.tick_store.read(self.ORCA_WHIRLPOOL, start_date, end_date)
+                
             # Load from local file if exists
             file_path = self.data_dir / f"historical_{start_date.date()}_{end_date.date()}.csv"
             if file_path.exists():
@@ -111,6 +117,28 @@ class OrcaBacktester:
             print(f"{Fore.RED}Error loading historical data: {e}{Style.RESET_ALL}")
             return pd.DataFrame()
             
+    def _iter_market_data(self, historical_data: Union[pd.DataFrame, np.ndarray],
+                          chunk_rows: int = 65536) -> Iterator[Dict]:
+        """Yield market data dicts from a CSV frame or memory-mapped tick records"""
+        if isinstance(historical_data, pd.DataFrame):
+            for _, row in historical_data.iterrows():
+                yield {
+                    'timestamp': row['timestamp'],
+                    'price': row['price'],
+                    'volume': row['volume'],
+                    'liquidity': row['liquidity']
+                }
+            return
+            
+        # Only one chunk at a time is paged in and converted
+        for i in range(0, len(historical_data), chunk_rows):
+            chunk = historical_data[i:i + chunk_rows]
+            timestamps = pd.to_datetime(chunk['timestamp'], unit='ns')
+            for timestamp, price, volume, liquidity in zip(
+                timestamps, chunk['price'].tolist(), chunk['volume'].tolist(), chunk['liquidity'].tolist()
+            ):
+                yield {'timestamp': timestamp, 'price': price, 'volume': volume, 'liquidity': liquidity}
+            
     def _generate_results(self) -> pd.DataFrame:
         """Generate backtest results"""
         if not self.trades:
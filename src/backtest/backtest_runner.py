@@ -6,7 +6,9 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
 from rich.console import Console
 from src.whirlpool.microscope import WhirlpoolMicroscope
 from src.models import Trade, PoolState, BacktestResult
@@ -15,12 +17,21 @@ from src.wallet_manager import WalletManager
 from src.config.network_config import WHIRLPOOL_CONFIGS
 from orca_whirlpool.context import WhirlpoolContext
 from orca_whirlpool.constants import ORCA_WHIRLPOOL_PROGRAM_ID
+from src.backtest.stage_cache import StageCache
+from src.data.dataset_catalog import DatasetCatalog
+from src.trading.metrics import max_drawdown
 
 console = Console()
 logger = logging.getLogger(__name__)
 
+# Lücken bis zu dieser Länge gelten beim Abdecken eines Fensters durch gesammelte Daten als geschlossen
+COVER_TOLERANCE = 300
+
 class BacktestRunner:
-    def __init__(self):
+    def __init__(self,
+        cache_dir: Optional[Path] = Path("cache/backtest"),
+        data_dir: Optional[Path] = Path("data/historical")
+    ):
         self.wallet = WalletManager()
         self.ctx = WhirlpoolContext(
             ORCA_WHIRLPOOL_PROGRAM_ID, 
@@ -29,6 +40,10 @@ class BacktestRunner:
         )
         self.microscope = WhirlpoolMicroscope()
         self.risk_manager = RiskManager()
+        # Pool-Historie und Fees je Zeitpunkt sind pro Fenster fest, nur die Simulation läuft neu
+        self.stage_cache = StageCache(cache_dir) if cache_dir else None
+        # Historie liegt im Parquet-Bestand; der Katalog-Fingerprint ist Schlüssel der Folgestufen
+        self.catalog = DatasetCatalog(data_dir) if data_dir else None
         
     async def get_historical_fees(self, pool_address: str, timestamp: datetime) -> int:
         """Holt historische Fee-Daten"""
@@ -50,6 +65,58 @@ class BacktestRunner:
             logger.error(f"Fehler beim Abrufen historischer Fees: {e}")
             return None, None
             
+    async def _load_pool_data(self,
+        pool_address: str,
+        start_time: datetime,
+        end_time: datetime
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """Historische Pool-Daten samt Cache-Schlüssel (None ohne Katalog oder Cache)"""
+        if self.catalog is None:
+            return await self.microscope.get_historical_pool_data(pool_address, start_time, end_time), None
+            
+        # Vorrang: früher geladenes Fenster, dann gesammelte Daten, die das Fenster abdecken,
+        # sonst laden und als Fensterdatei im Bestand ablegen
+        self.catalog.refresh(pool_address)
+        path = self.catalog.window_file(pool_address, 'history', start_time, end_time)
+        if path.exists():
+            df = pd.read_parquet(path)
+        elif self.catalog.covers(pool_address, start_time, end_time, tolerance_seconds=COVER_TOLERANCE):
+            df = self.catalog.query(pool_address, start_time, end_time, refresh=False)
+        else:
+            data = await self.microscope.get_historical_pool_data(pool_address, start_time, end_time)
+            if not data:
+                return data, None
+            df = pd.DataFrame(data)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(path, index=False)
+            self.catalog.refresh(pool_address)
+            
+        key = None
+        if self.stage_cache is not None:
+            key = self.stage_cache.key('pool_data', self.catalog.fingerprint(pool_address, start_time, end_time))
+        return df.to_dict('records'), key
+        
+    async def _load_fees(self,
+        pool_address: str,
+        historical_data: List[Dict],
+        data_key: Optional[str]
+    ) -> List[Tuple[Optional[float], Optional[int]]]:
+        """(fee_rate, gas_cost) je Datenpunkt; nur vollständige Ergebnisse werden gecacht"""
+        key = self.stage_cache.key('fees', data_key) if data_key else None
+        cached = self.stage_cache.get(key) if key else None
+        if cached is None:
+            fees = [await self.get_historical_fees(pool_address, data['timestamp']) for data in historical_data]
+            cached = {
+                'fee_rate': np.array([np.nan if f is None else f for f, _ in fees], dtype=np.float64),
+                'gas_cost': np.array([np.nan if g is None else g for _, g in fees], dtype=np.float64),
+            }
+            if key and len(fees) and not np.isnan(cached['fee_rate']).any() and not np.isnan(cached['gas_cost']).any():
+                self.stage_cache.put('fees', key, cached)
+        return [
+            (None if np.isnan(fee) else float(fee), None if np.isnan(gas) else int(gas))
+            for fee, gas in zip(cached['fee_rate'].tolist(), cached['gas_cost'].tolist())
+        ]
+            
     async def run_backtest(self,
         pool_address: str,
         start_time: datetime,
@@ -62,20 +129,16 @@ class BacktestRunner:
         try:
             trades = []
             current_capital = initial_capital
-            max_capital = initial_capital
+            capital_curve = [float(initial_capital)]
             
-            # Hole historische Daten
-            historical_data = await self.microscope.get_historical_pool_data(
+            # Hole historische Daten und Fees (aus dem Cache, wenn das Fenster bekannt ist)
+            historical_data, data_key = await self._load_pool_data(
                 pool_address, start_time, end_time
             )
+            fees = await self._load_fees(pool_address, historical_data, data_key)
             
             # Simuliere Trades
-            for data in historical_data:
-                # Hole historische Fees
-                fee_rate, gas_cost = await self.get_historical_fees(
-                    pool_address, data['timestamp']
-                )
-                
+            for data, (fee_rate, gas_cost) in zip(historical_data, fees):
                 if not fee_rate or not gas_cost:
                     continue
                     
@@ -112,7 +175,7 @@ class BacktestRunner:
                     else:
                         current_capital += (trade.amount_out - trade.fee - trade.gas_cost) / 1e6
                         
-                    max_capital = max(max_capital, current_capital)
+                    capital_curve.append(float(current_capital))
                     
             # Berechne Ergebnis
             return BacktestResult(
@@ -126,10 +189,14 @@ class BacktestRunner:
                 total_gas_cost=sum(t.gas_cost for t in trades),
                 net_profit=current_capital - initial_capital,
                 roi=((current_capital - initial_capital) / initial_capital) * 100,
-                max_drawdown=((max_capital - current_capital) / max_capital) * 100,
+                max_drawdown=max_drawdown(capital_curve) * 100,
                 trades=trades
             )
             
         except Exception as e:
             logger.error(f"Fehler im Backtest: {e}")
-            return None
\ No newline at end of file
+            return None
+            
+        finally:
+            if self.stage_cache is not None:
+                self.stage_cache.close()
\ No newline at end of file
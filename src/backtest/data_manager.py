@@ -20,6 +20,13 @@ from src.models import PoolState, Trade
 from rich.console import Console
 from src.models import TradeData, BacktestResult
 from src.data.orca_pipeline import OrcaPipeline
+from src.whirlpool.account_decoder import decode_whirlpool
+from src.utils.ttl_cache import AsyncTTLCache
+from src.data.collector_sink import ParquetCollectorSink
+from src.data.dataset_catalog import DatasetCatalog
+from src.backtest.stage_cache import StageCache, strategy_params
+from src.trading.metrics import max_drawdown, returns, sharpe_ratio
+from dataclasses import asdict
 
 init()
 logger = logging.getLogger(__name__)
@@ -30,6 +37,8 @@ class OrcaDataManager:
         self.client = AsyncClient("https://api.mainnet-beta.solana.com")
         self.data_dir = Path("data/historical")
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.sink = ParquetCollectorSink(self.data_dir)
+        self.catalog = DatasetCatalog(self.data_dir)
         
         # Wichtige Pool-Adressen
         self.pools = {
@@ -48,17 +57,16 @@ class OrcaDataManager:
             )
             
             if account and account.value:
-                data = account.value.data
                 # Decodiere Whirlpool-Daten
-                sqrt_price = int.from_bytes(data[:8], 'little')
-                price = (sqrt_price / (2 ** 64)) ** 2
-                liquidity = int.from_bytes(data[16:24], 'little')
+                decoded = decode_whirlpool(account.value.data)
+                if decoded is None:
+                    return None
                 
                 return {
                     'timestamp': datetime.now().isoformat(),
-                    'price': price,
-                    'liquidity': liquidity,
-                    'sqrt_price': sqrt_price
+                    'price': decoded['price'],
+                    'liquidity': decoded['liquidity'],
+                    'sqrt_price': decoded['sqrt_price']
                 }
             return None
         except Exception as e:
@@ -71,42 +79,43 @@ class OrcaDataManager:
         interval_seconds: int = 60
     ):
         """Sammelt historische Daten für einen Pool"""
-        data_points = []
+        collected = 0
         start_time = datetime.now()
         
         print(f"{Fore.CYAN}Sammle Daten für Pool {pool_address}{Style.RESET_ALL}")
         print(f"Start: {start_time}")
         
-        while (datetime.now() - start_time).total_seconds() < duration_hours * 3600:
-            pool_data = await self.fetch_pool_data(pool_address)
-            if pool_data:
-                data_points.append(pool_data)
-                if len(data_points) % 10 == 0:  # Status alle 10 Datenpunkte
-                    print(f"Gesammelte Datenpunkte: {len(data_points)}", end='\r')
-                    
-            await asyncio.sleep(interval_seconds)
+        # Punkte gehen laufend als Row-Groups auf die Platte statt 24h im Speicher zu liegen
+        try:
+            while (datetime.now() - start_time).total_seconds() < duration_hours * 3600:
+                pool_data = await self.fetch_pool_data(pool_address)
+                if pool_data:
+                    pool_data.pop('timestamp', None)
+                    self.sink.append(pool_address, datetime.now(), **pool_data)
+                    collected += 1
+                    if collected % 10 == 0:  # Status alle 10 Datenpunkte
+                        print(f"Gesammelte Datenpunkte: {collected}", end='\r')
+                        
+                await asyncio.sleep(interval_seconds)
+        finally:
+            self.sink.close()
             
-        # Speichere Daten
-        df = pd.DataFrame(data_points)
-        filename = f"pool_{pool_address}_{start_time:%Y%m%d_%H%M}.parquet"
-        df.to_parquet(self.data_dir / filename)
-        print(f"\n{Fore.GREEN}Datensammlung abgeschlossen. {len(data_points)} Datenpunkte gespeichert.{Style.RESET_ALL}")
-        return df
+        print(f"\n{Fore.GREEN}Datensammlung abgeschlossen. {collected} Datenpunkte gespeichert.{Style.RESET_ALL}")
+        return self.sink.load(pool_address, start_time)
         
-    def load_historical_data(self, pool_address: str) -> pd.DataFrame:
-        """Lädt historische Daten für einen Pool"""
-        files = list(self.data_dir.glob(f"pool_{pool_address}_*.parquet"))
-        if not files:
+    def load_historical_data(self,
+        pool_address: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Lädt historische Daten für einen Pool, optional nur das Fenster [start_time, end_time]"""
+        # Der Katalog kennt Einzeldateien und Sink-Partitionen samt Min/Max je Row-Group,
+        # gelesen werden nur die Row-Groups, die das Fenster schneiden
+        combined_df = self.catalog.query(pool_address, start_time, end_time)
+        if combined_df.empty:
             raise FileNotFoundError(f"Keine historischen Daten für Pool {pool_address}")
             
-        # Lade und kombiniere alle Dateien
-        dfs = []
-        for file in files:
-            df = pd.read_parquet(file)
-            dfs.append(df)
-            
-        combined_df = pd.concat(dfs).sort_values('timestamp')
-        print(f"{Fore.GREEN}Geladen: {len(combined_df)} Datenpunkte von {len(files)} Dateien{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}Geladen: {len(combined_df)} Datenpunkte{Style.RESET_ALL}")
         return combined_df
 
 class HistoricalDataManager:
@@ -246,10 +255,22 @@ class BacktestDataManager:
                 
         return trades
 
+def _catalog_pool(pool_name: str) -> str:
+    # Katalog-Dateinamen erlauben weder '/' noch '_' im Pool-Teil (z.B. "SOL/USDC" -> "SOL-USDC")
+    return pool_name.replace('/', '-').replace('_', '-')
+
+
 class BacktestManager:
-    def __init__(self):
+    def __init__(self,
+        cache_dir: Optional[Path] = Path("cache/backtest"),
+        data_dir: Optional[Path] = Path("data/trades")
+    ):
         self.pipeline = OrcaPipeline()
-        self.historical_data = {}
+        self.historical_data = AsyncTTLCache(maxsize=100, ttl=None, max_bytes=512 * 1024 * 1024,
+                                        name="backtest_trades")
+        # Geladene Trades als Fensterdateien im Katalog, Signale im Plattencache (None = aus)
+        self.catalog = DatasetCatalog(data_dir) if data_dir else None
+        self.stage_cache = StageCache(cache_dir) if cache_dir else None
         
     async def initialize(self):
         """Initialisiert den Manager"""
@@ -262,18 +283,47 @@ class BacktestManager:
         end_time: datetime = None
     ) -> List[TradeData]:
         """Lädt historische Daten"""
+        # Nur abgeschlossene Fenster (explizites end_time) gehen auf die Platte,
+        # ein Fenster bis "jetzt" wächst noch
+        persist = self.catalog is not None and end_time is not None
         if not end_time:
             end_time = datetime.now()
             
         key = f"{pool_name}_{start_time.timestamp()}_{end_time.timestamp()}"
         
-        if key not in self.historical_data:
+        trades = self.historical_data.get(key)
+        path = self.catalog.window_file(_catalog_pool(pool_name), 'trades', start_time, end_time) if persist else None
+        if trades is None and persist and path.exists():
+            trades = [TradeData(**row) for row in pd.read_parquet(path).to_dict('records')]
+            for trade in trades:
+                trade.timestamp = trade.timestamp.to_pydatetime()
+        if trades is None:
             trades = await self.pipeline.fetch_historical_data(
                 pool_name, start_time, end_time
             )
-            self.historical_data[key] = trades
+            if persist and trades:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                pd.DataFrame([asdict(trade) for trade in trades]).to_parquet(path, index=False)
+        self.historical_data[key] = trades
             
-        return self.historical_data[key]
+        return trades
+        
+    def _data_key(self, pool_name: str, start_time: datetime, end_time: datetime) -> Optional[str]:
+        """Katalog-Fingerprint des Fensters: ändern sich die Dateien, ändert sich der Schlüssel"""
+        pool = _catalog_pool(pool_name)
+        self.catalog.refresh(pool)
+        if not self.catalog.files(pool, start_time, end_time):
+            return None
+        return self.stage_cache.key('trades', self.catalog.fingerprint(pool, start_time, end_time))
+        
+    def _signals(self, strategy, trades: List[TradeData], data_key: Optional[str]) -> List[Optional[str]]:
+        """Signale je Trade; bei gleichen Daten und Strategie-Parametern aus dem Cache"""
+        compute = lambda: pd.DataFrame({'signal': [strategy.generate_signal(trade) for trade in trades]})
+        if self.stage_cache is None or data_key is None:
+            return compute()['signal'].tolist()
+        key = self.stage_cache.key('signals', data_key, strategy_params(strategy))
+        signals = self.stage_cache.cached('signals', key, compute)['signal']
+        return [signal if isinstance(signal, str) else None for signal in signals.tolist()]
         
     async def run_backtest(
         self,
@@ -298,13 +348,16 @@ class BacktestManager:
             # Initialisiere Tracking
             capital = initial_capital
             positions = []
-            max_capital = initial_capital
-            min_capital = initial_capital
+            capital_curve = [float(initial_capital)]
+            
+            # Signale hängen nur von Daten und Strategie-Parametern ab, die Simulation
+            # danach wird immer neu gerechnet
+            data_key = self._data_key(pool_name, start_time, end_time) \
+                if self.stage_cache is not None and self.catalog is not None and end_time is not None else None
+            signals = self._signals(strategy, trades, data_key)
             
             # Simuliere Trading
-            for trade in trades:
-                signal = strategy.generate_signal(trade)
-                
+            for trade, signal in zip(trades, signals):
                 if signal:
                     # Simuliere Trade
                     fee = trade_size * Decimal(str(trade.fee_rate))
@@ -315,13 +368,11 @@ class BacktestManager:
                         capital += trade_size - fee
                         positions.append(trade)
                         
-                    # Update Tracking
-                    max_capital = max(max_capital, capital)
-                    min_capital = min(min_capital, capital)
+                    capital_curve.append(float(capital))
                     
             # Berechne Metriken
             roi = (capital - initial_capital) / initial_capital * 100
-            max_drawdown = (max_capital - min_capital) / max_capital * 100
+            drawdown = Decimal(str(max_drawdown(capital_curve) * 100))
             
             winning_trades = sum(1 for p in positions if p.price > 0)
             
@@ -330,8 +381,8 @@ class BacktestManager:
                 winning_trades=winning_trades,
                 losing_trades=len(positions) - winning_trades,
                 roi=roi,
-                max_drawdown=max_drawdown,
-                sharpe_ratio=self._calculate_sharpe_ratio(positions),
+                max_drawdown=drawdown,
+                sharpe_ratio=self._calculate_sharpe_ratio(capital_curve),
                 trades=positions
             )
             
@@ -339,21 +390,13 @@ class BacktestManager:
             logger.error(f"Fehler beim Backtest: {e}")
             return None
             
-    def _calculate_sharpe_ratio(self, trades: List[TradeData]) -> float:
-        """Berechnet Sharpe Ratio"""
-        if not trades:
-            return 0.0
-            
-        returns = []
-        for i in range(1, len(trades)):
-            ret = (trades[i].price - trades[i-1].price) / trades[i-1].price
-            returns.append(ret)
-            
-        if not returns:
-            return 0.0
+        finally:
+            if self.stage_cache is not None:
+                self.stage_cache.close()
             
-        import numpy as np
-        return float(np.mean(returns) / np.std(returns) * np.sqrt(252))
+    def _calculate_sharpe_ratio(self, capital_curve: List[float]) -> float:
+        """Sharpe Ratio der Kapitalkurve (Rendite je Trade), nicht der Pool-Preise"""
+        return sharpe_ratio(returns(capital_curve))
         
     async def close(self):
         """Schließt den Manager"""
@@ -0,0 +1,494 @@
+import inspect
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.trading import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COLUMNS = ('price', 'volume', 'liquidity')
+
+BUY, SELL = 'buy', 'sell'
+
+
+def _to_ns(value) -> Optional[int]:
+    if value is None:
+        return None
+    return int(pd.Timestamp(value).as_unit('ns').value)
+
+
+def _frame_series(df: pd.DataFrame, columns: Sequence[str]) -> Dict[str, np.ndarray]:
+    """DataFrame (Zeitstempel als Spalte oder Index, 'close' als Preis-Fallback) in sortierte Arrays"""
+    timestamps = df['timestamp'] if 'timestamp' in df else df.index.to_series()
+    series = {'timestamp': pd.to_datetime(timestamps).astype('datetime64[ns]').to_numpy().view(np.int64)}
+    for name in columns:
+        source = name if name in df else ('close' if name == 'price' and 'close' in df else None)
+        series[name] = df[source].to_numpy(dtype=np.float64) if source else np.full(len(df), np.nan)
+
+    if len(series['timestamp']) > 1 and (np.diff(series['timestamp']) < 0).any():
+        order = np.argsort(series['timestamp'], kind='stable')
+        series = {name: values[order] for name, values in series.items()}
+    return series
+
+
+@dataclass
+class EventBatch:
+    """Alle Pool-Zeilen mit demselben Zeitstempel; Werte sind Views in Event-Reihenfolge"""
+    timestamp: int  # ns
+    start: int  # Position im Event-Stream
+    pools: np.ndarray  # Pool-Indizes
+    rows: np.ndarray  # Zeile in der Serie des jeweiligen Pools
+    values: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.pools)
+
+    @property
+    def datetime(self) -> datetime:
+        return pd.Timestamp(self.timestamp).to_pydatetime()
+
+
+class AlignedMarket:
+    """Pool-Serien einmal ausgerichtet und zu einem zeitlich sortierten Event-Stream gemischt"""
+
+    # Jeder Pool bleibt eine sortierte Serie (timestamp + Spalten). Der Event-Stream
+    # (timestamp, pool, row) entsteht durch einen stabilen Sort über die aneinander-
+    # gehängten Serien: Timsort erkennt die vorsortierten Läufe, das ist ein k-Wege-Merge.
+    # Die Spalten werden einmal in Event-Reihenfolge umsortiert, Batches sind danach Slices.
+
+    def __init__(self, series: Mapping[str, Mapping[str, np.ndarray]], columns: Sequence[str] = DEFAULT_COLUMNS):
+        self.pools: List[str] = list(series)
+        self.columns = tuple(columns)
+        self.series: List[Dict[str, np.ndarray]] = []
+        for pool in self.pools:
+            data = series[pool]
+            n = len(data['timestamp'])
+            self.series.append({
+                'timestamp': np.asarray(data['timestamp'], dtype=np.int64),
+                **{name: np.asarray(data[name], dtype=np.float64) if name in data else np.full(n, np.nan)
+                   for name in self.columns}
+            })
+        self._pool_index = {pool: i for i, pool in enumerate(self.pools)}
+        self._merge()
+
+    @classmethod
+    def from_frames(cls, frames: Mapping[str, pd.DataFrame], columns: Sequence[str] = DEFAULT_COLUMNS) -> 'AlignedMarket':
+        return cls({pool: _frame_series(df, columns) for pool, df in frames.items() if len(df)}, columns)
+
+    @classmethod
+    def from_tick_files(cls, tick_files: Mapping[str, Any], start: Optional[datetime] = None,
+                        end: Optional[datetime] = None, columns: Sequence[str] = DEFAULT_COLUMNS) -> 'AlignedMarket':
+        """Aus TickFiles (memmap); nur das Fenster [start, end] wird gelesen"""
+        series = {}
+        for pool, tick_file in tick_files.items():
+            records = tick_file.between(start, end)
+            if len(records):
+                series[pool] = {name: records[name] for name in ('timestamp', *columns)}
+        return cls(series, columns)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Alle Arrays flach (Serien in Pool-Reihenfolge), z.B. für Shared Memory"""
+        arrays = {
+            'offsets': self.offsets,
+            'event_ts': self.event_ts,
+            'event_pool': self.event_pool,
+            'event_row': self.event_row,
+            'starts': self._starts,
+        }
+        for name in ('timestamp', *self.columns):
+            arrays[f'series_{name}'] = (np.concatenate([s[name] for s in self.series]) if self.series
+                                        else np.empty(0, dtype=np.int64 if name == 'timestamp' else np.float64))
+        arrays.update({f'values_{name}': values for name, values in self.values.items()})
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, pools: Sequence[str], columns: Sequence[str], arrays: Mapping[str, np.ndarray]) -> 'AlignedMarket':
+        """Gegenstück zu to_arrays(): baut den Markt ohne Kopie und ohne erneuten Merge"""
+        market = cls.__new__(cls)
+        market.pools = list(pools)
+        market.columns = tuple(columns)
+        market.offsets = arrays['offsets']
+        market.series = [
+            {name: arrays[f'series_{name}'][market.offsets[i]:market.offsets[i + 1]] for name in ('timestamp', *columns)}
+            for i in range(len(market.pools))
+        ]
+        market._pool_index = {pool: i for i, pool in enumerate(market.pools)}
+        market.event_ts = arrays['event_ts']
+        market.event_pool = arrays['event_pool']
+        market.event_row = arrays['event_row']
+        market._starts = arrays['starts']
+        market.values = {name: arrays[f'values_{name}'] for name in columns}
+        return market
+
+    def _merge(self):
+        lengths = np.array([len(s['timestamp']) for s in self.series], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)])
+        if not len(self.series) or not lengths.sum():
+            self.event_ts = np.empty(0, dtype=np.int64)
+            self.event_pool = np.empty(0, dtype=np.int32)
+            self.event_row = np.empty(0, dtype=np.int64)
+            self.values = {name: np.empty(0) for name in self.columns}
+            self._starts = np.empty(0, dtype=np.int64)
+            return
+
+        timestamps = np.concatenate([s['timestamp'] for s in self.series])
+        order = np.argsort(timestamps, kind='stable')
+        self.event_ts = timestamps[order]
+        self.event_pool = np.repeat(np.arange(len(self.series), dtype=np.int32), lengths)[order]
+        self.event_row = order - self.offsets[self.event_pool]
+        self.values = {name: np.concatenate([s[name] for s in self.series])[order] for name in self.columns}
+        # Batch-Grenzen: Positionen, an denen sich der Zeitstempel ändert
+        self._starts = np.concatenate([[0], np.flatnonzero(np.diff(self.event_ts)) + 1])
+
+    def __len__(self) -> int:
+        return len(self.event_ts)
+
+    @property
+    def num_batches(self) -> int:
+        return len(self._starts)
+
+    def pool_index(self, pool: str) -> int:
+        return self._pool_index[pool]
+
+    def frame(self, pool: str) -> pd.DataFrame:
+        """Serie eines Pools als DataFrame (für Strategien, die pandas erwarten)"""
+        data = self.series[self._pool_index[pool]]
+        df = pd.DataFrame({name: data[name] for name in self.columns})
+        df.insert(0, 'timestamp', data['timestamp'].view('datetime64[ns]'))
+        return df
+
+    def history(self, pool: int, row: int, column: str = 'price', length: int = 20) -> np.ndarray:
+        """Die letzten `length` Werte eines Pools bis einschließlich `row` (View)"""
+        return self.series[pool][column][max(row + 1 - length, 0):row + 1]
+
+    def events(self) -> Iterator[Tuple[int, int, int]]:
+        """Event-Stream (timestamp, pool, row) in Zeitreihenfolge"""
+        return zip(self.event_ts.tolist(), self.event_pool.tolist(), self.event_row.tolist())
+
+    def batches(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[EventBatch]:
+        first, last = 0, self.num_batches
+        if start is not None:
+            first = int(np.searchsorted(self.event_ts[self._starts], _to_ns(start), side='left'))
+        if end is not None:
+            last = int(np.searchsorted(self.event_ts[self._starts], _to_ns(end), side='right'))
+        stops = np.append(self._starts[1:], len(self.event_ts))
+        for b in range(first, last):
+            lo, hi = int(self._starts[b]), int(stops[b])
+            yield EventBatch(
+                timestamp=int(self.event_ts[lo]),
+                start=lo,
+                pools=self.event_pool[lo:hi],
+                rows=self.event_row[lo:hi],
+                values={name: values[lo:hi] for name, values in self.values.items()}
+            )
+
+
+@dataclass
+class Order:
+    pool: str
+    side: str  # 'buy' oder 'sell'
+    value: Optional[float] = None  # Kaufbetrag in Quote-Währung; None = position_size * Cash
+    reason: str = ''
+    stop_loss: Optional[float] = None  # Preis; die Engine verkauft bei price <= stop_loss
+    take_profit: Optional[float] = None  # Preis; die Engine verkauft bei price >= take_profit
+
+
+class EventStrategy:
+    """Schnittstelle des Event-Kerns: prepare() einmal, on_batch() pro Zeitstempel"""
+
+    def prepare(self, market: AlignedMarket):
+        pass
+
+    def on_batch(self, batch: EventBatch, engine: 'EventBacktester') -> Optional[List[Order]]:
+        """Liefert Orders (oder ein Awaitable darauf)"""
+        raise NotImplementedError
+
+
+@dataclass
+class EventBacktestResult:
+    initial_capital: float
+    final_capital: float
+    timestamps: np.ndarray  # ns, ein Eintrag pro Batch
+    equity: np.ndarray
+    trades: List[Dict] = field(default_factory=list)
+    in_market: Optional[np.ndarray] = None  # bool je Batch: mindestens eine offene Position
+
+    @property
+    def total_return(self) -> float:
+        return self.final_capital / self.initial_capital - 1
+
+    @property
+    def max_drawdown(self) -> float:
+        return metrics.max_drawdown(self.equity, initial=self.initial_capital)
+
+    def equity_curve(self) -> pd.Series:
+        return pd.Series(self.equity, index=pd.to_datetime(self.timestamps, unit='ns'), name='equity')
+
+    def metrics(self, periods_per_year: Optional[float] = None) -> Dict[str, float]:
+        """Kennzahlen aus src.trading.metrics; annualisiert über den Batch-Abstand, wenn nicht angegeben"""
+        if periods_per_year is None:
+            periods_per_year = metrics.periods_per_year(self.timestamps)
+        pnls = [t['pnl'] for t in self.trades if t['pnl'] is not None]
+        positions = None
+        if self.in_market is not None:
+            positions = np.concatenate([[False], self.in_market])
+        return metrics.summary(self.equity, pnls, positions, periods_per_year,
+                               self.timestamps, initial=self.initial_capital)
+
+    def monte_carlo(self, market: Optional['AlignedMarket'] = None, config=None, **kwargs):
+        """Kosten-Szenarien über die Trades dieses Laufs (siehe src.backtest.monte_carlo.simulate)"""
+        from src.backtest.monte_carlo import simulate
+        return simulate(self.trades, market, config, initial_capital=self.initial_capital, **kwargs)
+
+
+class EventBacktester:
+    """Event-getriebener Backtest-Kern: ein Durchlauf über den gemischten Event-Stream"""
+
+    def __init__(self,
+        market: AlignedMarket,
+        strategy: EventStrategy,
+        initial_capital: float = 1000.0,
+        position_size: float = 0.1,
+        fee_rate: float = 0.003,
+        slippage: float = 0.001,
+        cost_model=None
+    ):
+        self.market = market
+        self.strategy = strategy
+        self.initial_capital = initial_capital
+        self.position_size = position_size
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.cost_model = cost_model  # ExecutionCostModel; ersetzt die feste Slippage
+
+        self.cash = initial_capital
+        self.positions: Dict[int, Dict[str, float]] = {}  # Pool-Index -> amount, entry_price, cost
+        self.exits: Dict[int, Tuple[float, float]] = {}  # Pool-Index -> (stop_loss, take_profit) offener Positionen
+        self.last_price = np.full(len(market.pools), np.nan)
+        self.trades: List[Dict] = []
+
+    def position(self, pool: str) -> Optional[Dict[str, float]]:
+        return self.positions.get(self.market.pool_index(pool))
+
+    def equity(self) -> float:
+        return self.cash + sum(p['amount'] * self.last_price[i] for i, p in self.positions.items())
+
+    async def run(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> EventBacktestResult:
+        self.strategy.prepare(self.market)
+        timestamps = np.empty(self.market.num_batches, dtype=np.int64)
+        equity = np.empty(self.market.num_batches, dtype=np.float64)
+        in_market = np.empty(self.market.num_batches, dtype=bool)
+
+        n = 0
+        for batch in self.market.batches(start, end):
+            self.last_price[batch.pools] = batch.values['price']
+            if self.exits:
+                self._check_exits(batch)
+            orders = self.strategy.on_batch(batch, self)
+            if inspect.isawaitable(orders):
+                orders = await orders
+            for order in orders or ():
+                self._fill(order, batch.timestamp)
+            timestamps[n], equity[n], in_market[n] = batch.timestamp, self.equity(), bool(self.positions)
+            n += 1
+
+        return EventBacktestResult(
+            initial_capital=self.initial_capital,
+            final_capital=float(equity[n - 1]) if n else self.initial_capital,
+            timestamps=timestamps[:n],
+            equity=equity[:n],
+            trades=self.trades,
+            in_market=in_market[:n]
+        )
+
+    def _check_exits(self, batch: EventBatch):
+        """Stop-Loss/Take-Profit der Kauf-Orders zum Preis dieses Zeitpunkts auslösen"""
+        for pool, price in zip(batch.pools.tolist(), batch.values['price'].tolist()):
+            levels = self.exits.get(pool)
+            if levels is None:
+                continue
+            stop_loss, take_profit = levels
+            if price <= stop_loss:
+                self._fill(Order(self.market.pools[pool], SELL, reason='stop_loss'), batch.timestamp)
+            elif price >= take_profit:
+                self._fill(Order(self.market.pools[pool], SELL, reason='take_profit'), batch.timestamp)
+
+    def _slippage(self, pool: str, value: float, is_buy: bool, timestamp: int) -> float:
+        if self.cost_model is None:
+            return self.slippage
+        return self.cost_model.slippage(pool, value, is_buy, timestamp)
+
+    def _fill(self, order: Order, timestamp: int):
+        pool = self.market.pool_index(order.pool)
+        price = self.last_price[pool]
+        if not price > 0:
+            return
+
+        if order.side == BUY and pool not in self.positions:
+            value = min(order.value if order.value is not None else self.cash * self.position_size, self.cash)
+            fill_price = price * (1 + self._slippage(order.pool, value, True, timestamp))
+            fees = value * self.fee_rate
+            if value <= 0 or value + fees > self.cash:
+                return
+            amount = value / fill_price
+            self.cash -= value + fees
+            self.positions[pool] = {'amount': amount, 'entry_price': fill_price, 'cost': value + fees}
+            if order.stop_loss is not None or order.take_profit is not None:
+                self.exits[pool] = (order.stop_loss if order.stop_loss is not None else -np.inf,
+                                    order.take_profit if order.take_profit is not None else np.inf)
+            pnl = None
+        elif order.side == SELL and pool in self.positions:
+            position = self.positions.pop(pool)
+            self.exits.pop(pool, None)
+            amount = position['amount']
+            fill_price = price * (1 - self._slippage(order.pool, amount * price, False, timestamp))
+            value = amount * fill_price
+            fees = value * self.fee_rate
+            self.cash += value - fees
+            pnl = value - fees - position['cost']
+        else:
+            return
+
+        self.trades.append({
+            'timestamp': pd.Timestamp(timestamp).to_pydatetime(),
+            'pool_address': order.pool,
+            'type': order.side,
+            'amount': amount,
+            'price': fill_price,
+            'market_price': float(price),
+            'value': value,
+            'fees': fees,
+            'pnl': pnl,
+            'reason': order.reason,
+        })
+
+
+# --- Adapter für bestehende Strategien ---
+
+class SignalFrameAdapter(EventStrategy):
+    """Für DataFrame-Strategien (calculate_indicators/generate_signals wie BacktestStrategy)"""
+
+    # Indikatoren und Signale werden pro Pool einmal über die ganze Serie berechnet und
+    # in Event-Reihenfolge abgelegt; on_batch liest nur noch einen Slice.
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.signals = np.empty(0, dtype=np.int8)
+
+    def prepare(self, market: AlignedMarket):
+        self.market = market
+        per_pool = []
+        for pool in market.pools:
+            df = self.strategy.calculate_indicators(market.frame(pool))
+            signals = self.strategy.generate_signals(df).astype(str).str.upper().to_numpy()
+            per_pool.append(np.select([signals == 'BUY', signals == 'SELL'], [1, -1], 0).astype(np.int8))
+        flat = np.concatenate(per_pool) if per_pool else np.empty(0, dtype=np.int8)
+        self.signals = flat[market.offsets[market.event_pool] + market.event_row]
+
+    def on_batch(self, batch: EventBatch, engine: EventBacktester) -> List[Order]:
+        signals = self.signals[batch.start:batch.start + len(batch)]
+        pools = self.market.pools
+        return [
+            Order(pools[batch.pools[i]], BUY if signals[i] > 0 else SELL)
+            for i in np.flatnonzero(signals)
+        ]
+
+
+class RowStrategyAdapter(EventStrategy):
+    """Für zeilenweise Strategien: analyze_candle(candle), analyze(market_data) oder analyze_token(data)"""
+
+    # Ergebnisse werden normalisiert: 'buy'/'sell'-Strings, Objekte mit should_trade und
+    # trade_type (StrategyResult) oder is_buy (TradingSignal). Coroutines werden awaited.
+    # stop_loss/take_profit eines Kauf-Ergebnisses gehen an die Order und werden von der Engine ausgelöst.
+    #
+    # Neben den Spalten des Markts bekommt jede Zeile Kennzahlen über nachlaufende Zeitfenster
+    # (window, Standard 24h) wie sie Live-Strategien aus der API kennen: price_change_24h und
+    # volume_change_24h in Prozent, volume_24h als Summe. Holder-Daten enthält der Markt nicht,
+    # holder_change_24h ist 0, sofern keine gleichnamige Spalte existiert.
+
+    METHODS = ('analyze_candle', 'analyze', 'analyze_token')
+
+    def __init__(self, strategy, method: Optional[str] = None, history_length: int = 20,
+                 window: str = '24h'):
+        self.strategy = strategy
+        name = method or next((m for m in self.METHODS if hasattr(strategy, m)), None)
+        if name is None:
+            raise TypeError(f"{type(strategy).__name__} hat keine der Methoden {self.METHODS}")
+        self._analyze = getattr(strategy, name)
+        self.history_length = history_length
+        self.window = int(pd.Timedelta(window).value)
+
+    def prepare(self, market: AlignedMarket):
+        self.market = market
+        # Kumulierte Volumen je Pool: Fenstersummen in O(1) pro Zeile
+        self._cum_volume = [
+            np.concatenate([[0.0], np.cumsum(np.nan_to_num(series['volume']))]) if 'volume' in series else None
+            for series in market.series
+        ]
+
+    def _window_stats(self, pool: int, row: int) -> Dict[str, float]:
+        series = self.market.series[pool]
+        timestamps = series['timestamp']
+        now = timestamps[row]
+        # Fenster (now - window, now] und das Fenster davor
+        lo = int(np.searchsorted(timestamps, now - self.window, side='right'))
+        prev_lo = int(np.searchsorted(timestamps, now - 2 * self.window, side='right'))
+        prices = series['price']
+        reference = prices[lo - 1] if lo > 0 else prices[0]
+        stats = {'price_change_24h': (float(prices[row]) / reference - 1) * 100 if reference > 0 else 0.0}
+
+        cum = self._cum_volume[pool]
+        if cum is not None:
+            volume = float(cum[row + 1] - cum[lo])
+            previous = float(cum[lo] - cum[prev_lo])
+            stats['volume_24h'] = volume
+            stats['volume_change_24h'] = (volume / previous - 1) * 100 if previous > 0 else 0.0
+        return stats
+
+    def _row(self, batch: EventBatch, i: int) -> Dict:
+        pool, row = int(batch.pools[i]), int(batch.rows[i])
+        data = {name: float(values[i]) for name, values in batch.values.items()}
+        history = self.market.history(pool, row, 'price', self.history_length)
+        for name, value in self._window_stats(pool, row).items():
+            data.setdefault(name, value)
+        data.setdefault('holder_change_24h', 0.0)
+        data.update({
+            'timestamp': batch.datetime,
+            'pool_address': self.market.pools[pool],
+            'close': data['price'],
+            'open': float(history[-2]) if len(history) > 1 else data['price'],
+            'price_history': history,
+        })
+        return data
+
+    @staticmethod
+    def _side(result) -> Optional[str]:
+        if result is None:
+            return None
+        if isinstance(result, str):
+            side = result.lower()
+        elif getattr(result, 'should_trade', False):
+            side = getattr(result, 'trade_type', None) or (BUY if getattr(result, 'is_buy', False) else SELL)
+            side = side.lower()
+        else:
+            return None
+        return side if side in (BUY, SELL) else None
+
+    async def on_batch(self, batch: EventBatch, engine: EventBacktester) -> List[Order]:
+        orders = []
+        for i in range(len(batch)):
+            row = self._row(batch, i)
+            result = self._analyze(row)
+            if inspect.isawaitable(result):
+                result = await result
+            side = self._side(result)
+            if side:
+                orders.append(Order(row['pool_address'], side, reason=getattr(result, 'reason', '') or '',
+                                    stop_loss=getattr(result, 'stop_loss', None),
+                                    take_profit=getattr(result, 'take_profit', None)))
+        return orders
@@ -5,6 +5,7 @@ import pandas as pd
 from pathlib import Path
 from typing import Dict, List
 from src.data.orca_pipeline import OrcaWhirlpoolPipeline
+from src.data.dataset_catalog import DatasetCatalog
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +14,7 @@ class HistoricalDataManager:
         self.pipeline = OrcaWhirlpoolPipeline()
         self.data_dir = Path("data/historical")
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.catalog = DatasetCatalog(self.data_dir)
         self.timeframes = {
             '1m': 60,
             '5m': 300,
@@ -22,9 +24,10 @@ class HistoricalDataManager:
             '1d': 86400
         }
         
-    def _get_historical_file_path(self, pool_address: str, timeframe: str, date: datetime) -> Path:
+    def _get_historical_file_path(self, pool_address: str, timeframe: str,
+                                  start_time: datetime, end_time: datetime) -> Path:
         """Generiert den Dateipfad für historische Daten"""
-        return self.data_dir / f"pool_{pool_address}_{timeframe}_{date:%Y%m%d}.parquet"
+        return self.data_dir / f"pool_{pool_address}_{timeframe}_{start_time:%Y%m%d%H%M%S}_{end_time:%Y%m%d%H%M%S}.parquet"
         
     async def fast_forward_historical_data(self, 
         pool_address: str,
@@ -42,7 +45,7 @@ class HistoricalDataManager:
             pool_data = await self.pipeline.get_pool_data(pool_address)
             if pool_data:
                 data_point = {
-                    'timestamp': current_time.isoformat(),
+                    'timestamp': current_time,
                     'price': pool_data['price'],
                     'liquidity': pool_data['liquidity'],
                     'volume_24h': pool_data['volume_24h']
@@ -55,8 +58,9 @@ class HistoricalDataManager:
         df = pd.DataFrame(data_points)
         
         # Speichere die Daten
-        file_path = self._get_historical_file_path(pool_address, timeframe, start_time)
-        df.to_parquet(file_path)
+        file_path = self._get_historical_file_path(pool_address, timeframe, start_time, end_time)
+        if not df.empty:
+            df.to_parquet(file_path, index=False)
         
         return df
         
@@ -67,11 +71,12 @@ class HistoricalDataManager:
         timeframe: str = '1m'
     ) -> pd.DataFrame:
         """Holt historische Daten, entweder aus Cache oder durch Fast-Forward"""
-        file_path = self._get_historical_file_path(pool_address, timeframe, start_time)
-        
-        if file_path.exists():
-            # Lade aus Cache
-            return pd.read_parquet(file_path)
+        # Treffer nur, wenn die vorhandenen Dateien das ganze Fenster abdecken
+        # (früher reichte eine Datei mit gleichem Startdatum, egal welches Ende)
+        self.catalog.refresh(pool_address)
+        interval_seconds = self.timeframes[timeframe]
+        if self.catalog.covers(pool_address, start_time, end_time, timeframe, tolerance_seconds=interval_seconds):
+            return self.catalog.query(pool_address, start_time, end_time, timeframe, refresh=False)
         else:
             # Generiere neue Daten
             return await self.fast_forward_historical_data(
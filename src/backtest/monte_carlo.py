@@ -0,0 +1,208 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.trading.metrics import max_drawdown, win_rate
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@dataclass
+class ScenarioConfig:
+    """Verteilung der Ausführungskosten; jeder Pfad zieht pro Trade neue Werte"""
+    paths: int = 10_000
+    slippage: float = 0.001  # Basis-Slippage pro Seite
+    slippage_noise: float = 0.1  # relative Streuung, wie N(1, 0.1) in BacktestEngine._apply_slippage
+    size_impact: float = 1 / 10_000  # Slippage-Aufschlag pro Quote-Einheit Ordergröße
+    fee_rate: float = 0.003
+    fee_spread: float = 0.0  # Fee je Pfad gleichverteilt in fee_rate ± fee_spread
+    latency_mean: float = 0.0  # Sekunden, exponentialverteilt; verschiebt den Ausführungszeitpunkt
+    seed: Optional[int] = None
+
+
+@dataclass
+class RoundTrips:
+    """Geschlossene Positionen als Arrays, nach Exit-Zeitpunkt sortiert"""
+    pools: List[str]
+    pool_idx: np.ndarray
+    entry_ts: np.ndarray  # ns
+    exit_ts: np.ndarray
+    entry_price: np.ndarray  # Marktpreis ohne Slippage
+    exit_price: np.ndarray
+    value: np.ndarray  # eingesetzter Betrag in Quote-Währung
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+
+def round_trips(trades: Sequence[Dict]) -> RoundTrips:
+    """Paart Käufe und Verkäufe je Pool (Trade-Format des EventBacktester); offene Positionen entfallen"""
+    open_positions: Dict[str, Dict] = {}
+    pools: List[str] = []
+    rows = []
+    for trade in trades:
+        pool = trade['pool_address']
+        if trade['type'] == 'buy':
+            open_positions[pool] = trade
+        elif trade['type'] == 'sell' and pool in open_positions:
+            entry = open_positions.pop(pool)
+            if pool not in pools:
+                pools.append(pool)
+            rows.append((
+                pools.index(pool),
+                np.datetime64(entry['timestamp'], 'ns').astype(np.int64),
+                np.datetime64(trade['timestamp'], 'ns').astype(np.int64),
+                entry.get('market_price', entry['price']),
+                trade.get('market_price', trade['price']),
+                entry.get('value', entry['amount'] * entry['price']),
+            ))
+    if open_positions:
+        logger.info(f"Monte Carlo: {len(open_positions)} offene Positionen nicht berücksichtigt")
+
+    columns = list(zip(*rows)) if rows else [()] * 6
+    trips = RoundTrips(
+        pools=pools,
+        pool_idx=np.array(columns[0], dtype=np.int64),
+        entry_ts=np.array(columns[1], dtype=np.int64),
+        exit_ts=np.array(columns[2], dtype=np.int64),
+        entry_price=np.array(columns[3], dtype=np.float64),
+        exit_price=np.array(columns[4], dtype=np.float64),
+        value=np.array(columns[5], dtype=np.float64),
+    )
+    order = np.argsort(trips.exit_ts, kind='stable')
+    for name in ('pool_idx', 'entry_ts', 'exit_ts', 'entry_price', 'exit_price', 'value'):
+        setattr(trips, name, getattr(trips, name)[order])
+    return trips
+
+
+def _price_at(series: List[Tuple[np.ndarray, np.ndarray]], pool_idx: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Letzter bekannter Preis je (Pfad, Trade) zum Zeitpunkt query; ein searchsorted pro Pool"""
+    prices = np.empty(query.shape, dtype=np.float64)
+    for k in np.unique(pool_idx):
+        timestamps, values = series[k]
+        cols = pool_idx == k
+        idx = np.searchsorted(timestamps, query[:, cols].ravel(), side='right') - 1
+        prices[:, cols] = values[np.clip(idx, 0, len(values) - 1)].reshape(query.shape[0], -1)
+    return prices
+
+
+def _simulate_chunk(trips: RoundTrips, series: Optional[List[Tuple[np.ndarray, np.ndarray]]],
+                    config: ScenarioConfig, initial_capital: float, paths: int,
+                    seed: np.random.SeedSequence, keep_equity: bool) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    n = len(trips)
+
+    base = config.slippage * (1 + trips.value * config.size_impact)
+    slip_in = base * rng.normal(1, config.slippage_noise, (paths, n))
+    slip_out = base * rng.normal(1, config.slippage_noise, (paths, n))
+    fee = config.fee_rate
+    if config.fee_spread:
+        fee = config.fee_rate + rng.uniform(-config.fee_spread, config.fee_spread, (paths, 1))
+
+    if config.latency_mean > 0 and series is not None:
+        delay_in = (rng.exponential(config.latency_mean, (paths, n)) * 1e9).astype(np.int64)
+        delay_out = (rng.exponential(config.latency_mean, (paths, n)) * 1e9).astype(np.int64)
+        entry = _price_at(series, trips.pool_idx, trips.entry_ts + delay_in)
+        exit_ = _price_at(series, trips.pool_idx, trips.exit_ts + delay_out)
+    else:
+        entry, exit_ = trips.entry_price, trips.exit_price
+
+    amount = trips.value / (entry * (1 + slip_in))
+    pnl = amount * exit_ * (1 - slip_out) * (1 - fee) - trips.value * (1 + fee)
+
+    equity = initial_capital + np.cumsum(pnl, axis=1)
+    result = {
+        'pnl': pnl.sum(axis=1),
+        'max_drawdown': max_drawdown(equity, initial=initial_capital),
+        'win_rate': win_rate(pnl),
+    }
+    if keep_equity:
+        result['equity'] = equity.astype(np.float32)
+    return result
+
+
+@dataclass
+class MonteCarloResult:
+    paths: int
+    trips: int
+    initial_capital: float
+    percentiles: Tuple[int, ...]
+    pnl: np.ndarray  # je Pfad
+    max_drawdown: np.ndarray
+    win_rate: np.ndarray
+    equity_bands: Optional[np.ndarray] = None  # (len(percentiles), trips)
+    config: ScenarioConfig = field(default_factory=ScenarioConfig)
+
+    @property
+    def total_return(self) -> np.ndarray:
+        return self.pnl / self.initial_capital
+
+    def bands(self, metric: str) -> Dict[int, float]:
+        values = np.percentile(getattr(self, metric), self.percentiles)
+        return {p: float(v) for p, v in zip(self.percentiles, values)}
+
+    def summary(self) -> Dict[str, Dict]:
+        return {
+            metric: {**{f"p{p}": v for p, v in self.bands(metric).items()},
+                     'mean': float(np.mean(getattr(self, metric)))}
+            for metric in ('pnl', 'total_return', 'max_drawdown', 'win_rate')
+        }
+
+
+def simulate(
+    trades: Sequence[Dict],
+    market=None,
+    config: Optional[ScenarioConfig] = None,
+    initial_capital: float = 1000.0,
+    workers: int = 0,
+    chunk_paths: int = 2_000,
+    percentiles: Sequence[int] = PERCENTILES,
+    max_equity_cells: int = 20_000_000
+) -> MonteCarloResult:
+    """Spielt die Trades über config.paths Kosten-Szenarien ab, vektorisiert über Pfade und Trades"""
+    # Pfade werden in Blöcke zu chunk_paths geteilt; jeder Block hat einen eigenen Seed aus
+    # SeedSequence.spawn, das Ergebnis ist also unabhängig von der Zahl der Worker. Latenz
+    # braucht den Markt (AlignedMarket) für die Preise zum verschobenen Zeitpunkt.
+    config = config or ScenarioConfig()
+    trips = round_trips(trades)
+    series = None
+    if market is not None and config.latency_mean > 0:
+        series = []
+        for pool in trips.pools:
+            data = market.series[market.pool_index(pool)]
+            series.append((data['timestamp'], data['price']))
+
+    sizes = [min(chunk_paths, config.paths - i) for i in range(0, config.paths, chunk_paths)]
+    seeds = np.random.SeedSequence(config.seed).spawn(len(sizes))
+    keep_equity = config.paths * len(trips) <= max_equity_cells
+    if not keep_equity:
+        logger.info(f"Monte Carlo: {config.paths}x{len(trips)} Equity-Werte, Bänder werden nicht berechnet")
+
+    args = [(trips, series, config, initial_capital, size, seed, keep_equity) for size, seed in zip(sizes, seeds)]
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, *zip(*args)))
+    else:
+        chunks = [_simulate_chunk(*a) for a in args]
+
+    equity_bands = None
+    if keep_equity and len(trips):
+        equity = np.concatenate([chunk['equity'] for chunk in chunks])
+        equity_bands = np.percentile(equity, percentiles, axis=0)
+
+    return MonteCarloResult(
+        paths=config.paths,
+        trips=len(trips),
+        initial_capital=initial_capital,
+        percentiles=tuple(percentiles),
+        pnl=np.concatenate([chunk['pnl'] for chunk in chunks]),
+        max_drawdown=np.concatenate([chunk['max_drawdown'] for chunk in chunks]),
+        win_rate=np.concatenate([chunk['win_rate'] for chunk in chunks]),
+        equity_bands=equity_bands,
+        config=config,
+    )
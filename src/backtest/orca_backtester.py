@@ -3,11 +3,17 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from dataclasses import dataclass
+from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 from rich.progress import track
 import pandas as pd
 import numpy as np
+from src.data.tick_store import TickStore
+from src.backtest.event_engine import AlignedMarket, EventBatch
+from src.backtest.stage_cache import StageCache, fingerprint
+from src.trading.execution_cost import FixedSlippage, cost_model_from_config
+from src.trading.metrics import max_drawdown, profit_factor, win_rate
 
 console = Console()
 logger = logging.getLogger(__name__)
@@ -33,10 +39,16 @@ class OrcaBacktester:
         self.positions = {}
         self.metrics = {
             'max_drawdown': 0,
+            'win_rate': 0,
+            'profit_factor': 0,
             'best_trade': 0,
             'worst_trade': 0,
             'avg_trade_duration': timedelta(0)
         }
+        # Plattencache für Historie und ausgerichteten Markt ('cache_dir' in der Config)
+        self.cache = StageCache(Path(config['cache_dir'])) if config.get('cache_dir') else None
+        # Slippage aus Impact-Kurven ('impact_curves' = NPZ aus record_impact_curves.py), sonst fest
+        self.cost_model = cost_model_from_config(config) or FixedSlippage(config.get('slippage', 0.001))
         
     async def run_backtest(self, start_date: datetime, end_date: datetime):
         """Führt Backtest für Zeitraum aus"""
@@ -48,10 +60,11 @@ class OrcaBacktester:
             if not historical_data:
                 raise Exception("No historical data available")
                 
-            # 2. Für jeden Zeitpunkt simulieren
-            for timestamp in track(pd.date_range(start_date, end_date, freq='1min'),
+            # 2. Serien einmal ausrichten, dann den gemischten Event-Stream abarbeiten
+            market = self._build_market(historical_data, start_date, end_date)
+            for batch in track(market.batches(start_date, end_date), total=market.num_batches,
                                 description="Running backtest..."):
-                await self._process_timepoint(timestamp, historical_data)
+                await self._process_batch(batch, market)
                 
             # 3. Metriken berechnen
             self._calculate_metrics()
@@ -62,9 +75,16 @@ class OrcaBacktester:
         except Exception as e:
             logger.error(f"Backtest failed: {e}")
             
+        finally:
+            if self.cache is not None:
+                self.cache.close()
+            
     async def _load_historical_data(self, start_date: datetime, end_date: datetime) -> Dict:
         """Lädt historische Daten von Orca"""
         try:
+            if self.config.get('tick_store'):
+                return self._load_tick_store(start_date, end_date)
+                
             from src.data.orca_provider import OrcaDataProvider
             provider = OrcaDataProvider(self.config)
             
@@ -73,15 +93,18 @@ class OrcaBacktester:
             data = {}
             
             for pool in pools[:10]:  # Top 10 Pools
-                history = await provider.get_pool_price_history(
-                    pool['address'],
-                    start_date,
-                    end_date
-                )
+                fetch = lambda: provider.get_pool_price_history(pool['address'], start_date, end_date)
+                cache_key = None
+                if self.cache is not None:
+                    cache_key = self.cache.key('history', pool['address'], start_date, end_date)
+                    history = await self.cache.cached_async('history', cache_key, fetch)
+                else:
+                    history = await fetch()
                 if not history.empty:
                     data[pool['address']] = {
                         'history': history,
-                        'token': pool['tokenA']['symbol']
+                        'token': pool['tokenA']['symbol'],
+                        'cache_key': cache_key
                     }
                     
             return data
@@ -90,29 +113,52 @@ class OrcaBacktester:
             logger.error(f"Failed to load historical data: {e}")
             return {}
             
-    async def _process_timepoint(self, timestamp: datetime, data: Dict):
-        """Verarbeitet einen Zeitpunkt"""
-        for pool_address, pool_data in data.items():
+    def _load_tick_store(self, start_date: datetime, end_date: datetime) -> Dict:
+        """Öffnet die Tick-Dateien aller Pools mit Daten im Zeitraum (memmap, kein Vorladen)"""
+        store = TickStore(Path(self.config['tick_store']))
+        data = {}
+        for pool_address in store.pools():
+            ticks = store.open(pool_address)
+            if len(ticks.between(start_date, end_date)):
+                # Append-only: Pfad und Länge bestimmen den Inhalt
+                data[pool_address] = {'ticks': ticks, 'token': pool_address,
+                                      'cache_key': fingerprint(str(ticks.path), len(ticks))}
+        return data
+        
+    def _build_market(self, data: Dict, start_date: datetime, end_date: datetime) -> AlignedMarket:
+        """Richtet alle Pool-Serien einmal aus (Tick-Dateien als memmap, sonst DataFrames)"""
+        sources = sorted((pool, pool_data.get('cache_key')) for pool, pool_data in data.items())
+        if self.cache is None or any(key is None for _, key in sources):
+            return self._align(data, start_date, end_date)
+        
+        def align() -> Dict[str, np.ndarray]:
+            market = self._align(data, start_date, end_date)
+            return {**market.to_arrays(), 'pools': np.array(market.pools), 'columns': np.array(market.columns)}
+            
+        arrays = self.cache.cached('market', self.cache.key('market', sources, start_date, end_date), align)
+        return AlignedMarket.from_arrays(arrays['pools'].tolist(), arrays['columns'].tolist(), arrays)
+        
+    def _align(self, data: Dict, start_date: datetime, end_date: datetime) -> AlignedMarket:
+        ticks = {pool: pool_data['ticks'] for pool, pool_data in data.items() if 'ticks' in pool_data}
+        if ticks:
+            return AlignedMarket.from_tick_files(ticks, start_date, end_date)
+        return AlignedMarket.from_frames({pool: pool_data['history'] for pool, pool_data in data.items()})
+        
+    async def _process_batch(self, batch: EventBatch, market: AlignedMarket):
+        """Verarbeitet alle Pool-Zeilen eines Zeitpunkts"""
+        volumes = np.nan_to_num(batch.values['volume'])
+        for pool, price, volume in zip(batch.pools.tolist(), batch.values['price'].tolist(), volumes.tolist()):
+            pool_address = market.pools[pool]
             try:
-                # Daten für den Zeitpunkt
-                point_data = pool_data['history'][
-                    pool_data['history'].index == timestamp
-                ]
-                if point_data.empty:
-                    continue
-                    
-                price = point_data['close'].iloc[0]
-                volume = point_data['volume'].iloc[0]
-                
                 # Trading Signale prüfen
                 if self._should_enter(pool_address, price, volume):
-                    await self._execute_trade(pool_address, price, True)
+                    await self._execute_trade(pool_address, price, True, batch.timestamp)
                     
                 elif self._should_exit(pool_address, price):
-                    await self._execute_trade(pool_address, price, False)
+                    await self._execute_trade(pool_address, price, False, batch.timestamp)
                     
             except Exception as e:
-                logger.error(f"Error processing {timestamp}: {e}")
+                logger.error(f"Error processing {batch.datetime}: {e}")
                 
     def _should_enter(self, pool_address: str, price: float, volume: float) -> bool:
         """Entry Signal"""
@@ -149,13 +195,13 @@ class OrcaBacktester:
             
         return False
         
-    async def _execute_trade(self, pool_address: str, price: float, is_entry: bool):
-        """Führt simulierten Trade aus"""
+    async def _execute_trade(self, pool_address: str, price: float, is_entry: bool, timestamp=None):
+        """Führt simulierten Trade aus; timestamp (Backtest-Zeit) wählt den Impact-Snapshot"""
         try:
             if is_entry:
                 # Entry Trade
                 amount = self.current_capital * self.config.get('position_size', 0.1)
-                slippage = self._calculate_slippage(amount, price)
+                slippage = self._calculate_slippage(amount, price, pool_address, True, timestamp)
                 fees = amount * self.config.get('fee_rate', 0.003)
                 
                 actual_price = price * (1 + slippage)
@@ -176,7 +222,7 @@ class OrcaBacktester:
                 # Exit Trade
                 position = self.positions[pool_address]
                 amount = position['amount']
-                slippage = self._calculate_slippage(amount, price)
+                slippage = self._calculate_slippage(amount, price, pool_address, False, timestamp)
                 fees = amount * self.config.get('fee_rate', 0.003)
                 
                 actual_price = price * (1 - slippage)
@@ -203,34 +249,27 @@ class OrcaBacktester:
         except Exception as e:
             logger.error(f"Trade execution failed: {e}")
             
+    def _calculate_slippage(self, amount: float, price: float, pool_address: str, is_buy: bool,
+                            timestamp=None) -> float:
+        """Slippage für eine Order über amount Einheiten zum Preis price (Snapshot vor timestamp)"""
+        return self.cost_model.slippage(pool_address, amount * price, is_buy, timestamp)
+            
     def _calculate_metrics(self):
         """Berechnet Performance-Metriken"""
         if not self.trades:
             return
             
-        # PnL Analyse
+        # PnL Analyse (nur geschlossene Trades)
         pnls = [t.pnl for t in self.trades if t.pnl is not None]
         if pnls:
             self.metrics['best_trade'] = max(pnls)
             self.metrics['worst_trade'] = min(pnls)
+            self.metrics['win_rate'] = win_rate(pnls)
+            self.metrics['profit_factor'] = profit_factor(pnls)
             
-        # Drawdown
-        capital_history = []
-        current = self.initial_capital
-        for trade in self.trades:
-            if trade.pnl:
-                current += trade.pnl
-                capital_history.append(current)
-                
-        if capital_history:
-            peak = self.initial_capital
-            for capital in capital_history:
-                drawdown = (peak - capital) / peak
-                self.metrics['max_drawdown'] = max(
-                    self.metrics['max_drawdown'],
-                    drawdown
-                )
-                peak = max(peak, capital)
+            # Drawdown über die Kapitalkurve nach jedem geschlossenen Trade
+            capital_history = self.initial_capital + np.cumsum(pnls)
+            self.metrics['max_drawdown'] = max_drawdown(capital_history, initial=self.initial_capital)
                 
     def _print_results(self):
         """Zeigt Backtest-Ergebnisse"""
@@ -252,12 +291,9 @@ class OrcaBacktester:
         table.add_row("Total P/L", f"{pnl:+.4f} SOL ({pnl_pct:+.2f}%)")
         
         # Trading Metriken
-        total_trades = len(self.trades)
-        profitable = len([t for t in self.trades if t.pnl and t.pnl > 0])
-        win_rate = (profitable / total_trades * 100) if total_trades > 0 else 0
-        
-        table.add_row("Total Trades", str(total_trades))
-        table.add_row("Win Rate", f"{win_rate:.1f}%")
+        table.add_row("Total Trades", str(len(self.trades)))
+        table.add_row("Win Rate", f"{self.metrics['win_rate']*100:.1f}%")
+        table.add_row("Profit Factor", f"{self.metrics['profit_factor']:.2f}")
         table.add_row("Max Drawdown", f"{self.metrics['max_drawdown']*100:.1f}%")
         table.add_row("Best Trade", f"{self.metrics['best_trade']:+.4f} SOL")
         table.add_row("Worst Trade", f"{self.metrics['worst_trade']:+.4f} SOL")
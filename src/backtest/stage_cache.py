@@ -0,0 +1,229 @@
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+Stored = Union[pd.DataFrame, Dict[str, np.ndarray]]
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stabiler Hash beliebiger JSON-fähiger Eingaben (datetime & Co. über str)"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+@functools.lru_cache(maxsize=None)
+def code_hash(cls: type) -> str:
+    """Hash über den Quelltext der Module aller Klassen in der MRO (Helfer im selben Modul inklusive)"""
+    digest = hashlib.sha256()
+    for klass in cls.__mro__:
+        module = inspect.getmodule(klass)
+        if module is None or klass is object:
+            continue
+        try:
+            digest.update(inspect.getsource(module).encode())
+        except (OSError, TypeError):
+            # Ohne Quelltext (z.B. eingebaute Module): nur der Name, Änderungen bleiben unerkannt
+            digest.update(klass.__qualname__.encode())
+    return digest.hexdigest()[:16]
+
+
+def strategy_params(strategy: Any) -> Dict[str, Any]:
+    """Parameter einer Strategie für den Cache-Schlüssel: config-Dict oder skalare Attribute plus Code-Hash"""
+    config = getattr(strategy, 'config', None)
+    params = dict(config) if isinstance(config, dict) else {
+        name: value for name, value in vars(strategy).items()
+        if not name.startswith('_') and isinstance(value, (int, float, str, bool, type(None), tuple))
+    }
+    return {'class': f"{type(strategy).__module__}.{type(strategy).__qualname__}", 'code': code_hash(type(strategy)),
+            **params}
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    stage: str
+    path: str  # relativ zum Cache-Verzeichnis
+    size: int
+    created: float
+    last_access: float
+
+
+class StageCache:
+    """Content-adressierter Plattencache für Zwischenergebnisse von Backtest-Stufen"""
+
+    # Jede Stufe (Daten, Gebühren, Signale, ausgerichteter Markt ...) legt ihr Ergebnis unter
+    # fingerprint(stage, eingaben) ab; hängt eine Stufe vom Ergebnis der vorigen ab, geht deren
+    # Schlüssel in die Eingaben ein. Ändert sich nur eine späte Stufe, werden die früheren von
+    # der Platte geladen. DataFrames als Parquet, Array-Dicts als NPZ. Überschreitet der
+    # Bestand max_bytes, fliegen die am längsten nicht gelesenen Einträge (LRU). Lesezugriffe
+    # aktualisieren die LRU-Zeiten nur im Speicher; der Index wird bei put(), purge() und
+    # close() geschrieben.
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.index_path = self.directory / 'index.json'
+        self.max_bytes = max_bytes
+        self.entries: Dict[str, CacheEntry] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._load_index()
+
+    def _load_index(self):
+        if not self.index_path.exists():
+            return
+        try:
+            index = json.loads(self.index_path.read_text())
+            if index.get('version') != CACHE_VERSION:
+                logger.info(f"Cache-Version {index.get('version')} veraltet, Einträge werden ignoriert")
+                return
+            self.entries = {item['key']: CacheEntry(**item) for item in index['entries']}
+        except Exception as e:
+            logger.warning(f"Cache-Index {self.index_path} unlesbar, beginne leer: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Schreibt den Index atomar (tmp + rename)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix('.tmp')
+        index = {'version': CACHE_VERSION, 'entries': [asdict(entry) for entry in self.entries.values()]}
+        tmp.write_text(json.dumps(index))
+        os.replace(tmp, self.index_path)
+        self._dirty = False
+
+    def close(self):
+        """Schreibt ausstehende LRU-Zeiten und verworfene Einträge"""
+        if self._dirty:
+            self.save()
+
+    # --- Lesen / Schreiben ---
+
+    def key(self, stage: str, *inputs: Any) -> str:
+        return fingerprint(CACHE_VERSION, stage, *inputs)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def get(self, key: str) -> Optional[Stored]:
+        """Gespeichertes Ergebnis oder None (fehlt, gelöscht oder unlesbar)"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        path = self.directory / entry.path
+        try:
+            if path.suffix == '.parquet':
+                value = pd.read_parquet(path)
+            else:
+                with np.load(path, allow_pickle=False) as data:
+                    value = {name: data[name] for name in data.files}
+        except Exception as e:
+            logger.warning(f"Cache-Eintrag {entry.stage}/{key} unlesbar, wird verworfen: {e}")
+            self._remove(key)
+            self._dirty = True
+            self.misses += 1
+            return None
+        entry.last_access = time.time()
+        self._dirty = True
+        self.hits += 1
+        return value
+
+    def put(self, stage: str, key: str, value: Stored) -> Stored:
+        """Speichert ein Stufenergebnis (DataFrame oder Dict von Arrays) und liefert es zurück"""
+        stage_dir = self.directory / stage
+        stage_dir.mkdir(parents=True, exist_ok=True)
+        suffix = '.parquet' if isinstance(value, pd.DataFrame) else '.npz'
+        path = stage_dir / f"{key}{suffix}"
+        tmp = path.with_name(f"{key}.tmp{suffix}")
+        try:
+            if suffix == '.parquet':
+                value.to_parquet(tmp)  # ein Zeitstempel-Index bleibt erhalten
+            else:
+                np.savez(tmp, **value)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.error(f"Cache-Eintrag {stage}/{key} nicht gespeichert: {e}")
+            tmp.unlink(missing_ok=True)
+            return value
+
+        now = time.time()
+        self.entries[key] = CacheEntry(
+            key=key, stage=stage, path=path.relative_to(self.directory).as_posix(),
+            size=path.stat().st_size, created=now, last_access=now
+        )
+        self._evict()
+        self.save()
+        return value
+
+    def cached(self, stage: str, key: str, compute: Callable[[], Stored]) -> Stored:
+        """Aus dem Cache oder berechnet; leere Ergebnisse (z.B. nach Fetch-Fehlern) werden nicht gespeichert"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if len(value):
+                self.put(stage, key, value)
+        return value
+
+    async def cached_async(self, stage: str, key: str, compute: Callable[[], Awaitable[Stored]]) -> Stored:
+        value = self.get(key)
+        if value is None:
+            value = await compute()
+            if len(value):
+                self.put(stage, key, value)
+        return value
+
+    # --- Verwaltung ---
+
+    def _remove(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            (self.directory / entry.path).unlink(missing_ok=True)
+
+    def _evict(self):
+        total = sum(entry.size for entry in self.entries.values())
+        for entry in sorted(self.entries.values(), key=lambda e: e.last_access):
+            if total <= self.max_bytes:
+                break
+            logger.debug(f"Cache voll, verdränge {entry.stage}/{entry.key}")
+            total -= entry.size
+            self._remove(entry.key)
+
+    def list(self, stage: Optional[str] = None) -> List[CacheEntry]:
+        return sorted((e for e in self.entries.values() if stage is None or e.stage == stage),
+                      key=lambda e: e.last_access, reverse=True)
+
+    def purge(self, stage: Optional[str] = None, older_than: Optional[float] = None) -> int:
+        """Löscht Einträge (optional nur einer Stufe / seit older_than Sekunden ungelesen)"""
+        cutoff = time.time() - older_than if older_than is not None else None
+        removed = [
+            entry.key for entry in self.list(stage)
+            if cutoff is None or entry.last_access < cutoff
+        ]
+        for key in removed:
+            self._remove(key)
+        if removed:
+            self.save()
+        return len(removed)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        stages: Dict[str, Dict[str, int]] = {}
+        for entry in self.entries.values():
+            stage = stages.setdefault(entry.stage, {'entries': 0, 'bytes': 0})
+            stage['entries'] += 1
+            stage['bytes'] += entry.size
+        return stages
@@ -14,8 +14,22 @@ class Trade:
     fees: float = 0.0
 
 class BacktestStrategy:
-    def __init__(self, initial_balance: float = 1000):
+    def __init__(self,
+        initial_balance: float = 1000,
+        fast_window: int = 5,
+        slow_window: int = 20,
+        rsi_period: int = 14,
+        rsi_buy: float = 30,
+        rsi_sell: float = 70,
+        max_volatility: float = 0.02
+    ):
         self.initial_balance = initial_balance
+        self.fast_window = fast_window
+        self.slow_window = slow_window
+        self.rsi_period = rsi_period
+        self.rsi_buy = rsi_buy
+        self.rsi_sell = rsi_sell
+        self.max_volatility = max_volatility
         self.current_balance = initial_balance
         self.position = None
         self.trades: List[Trade] = []
@@ -24,17 +38,17 @@ class BacktestStrategy:
         """Berechnet technische Indikatoren"""
         df = df.copy()
         
-        # Moving Averages
-        df['MA5'] = df['price'].rolling(window=5).mean()
-        df['MA20'] = df['price'].rolling(window=20).mean()
+        # Moving Averages (Standard: MA5 / MA20)
+        df[f'MA{self.fast_window}'] = df['price'].rolling(window=self.fast_window).mean()
+        df[f'MA{self.slow_window}'] = df['price'].rolling(window=self.slow_window).mean()
         
         # Volatilität
-        df['volatility'] = df['price'].rolling(window=20).std()
+        df['volatility'] = df['price'].rolling(window=self.slow_window).std()
         
         # RSI
         delta = df['price'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_period).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_period).mean()
         rs = gain / loss
         df['RSI'] = 100 - (100 / (1 + rs))
         
@@ -45,14 +59,15 @@ class BacktestStrategy:
         signals = pd.Series(index=df.index, data='HOLD')
         
         # Beispiel-Strategie: MA Crossover + RSI
+        fast, slow = df[f'MA{self.fast_window}'], df[f'MA{self.slow_window}']
         buy_condition = (
-            (df['MA5'] > df['MA20']) & 
-            (df['RSI'] < 30) &
-            (df['volatility'] < df['price'] * 0.02)  # Volatilität < 2%
+            (fast > slow) & 
+            (df['RSI'] < self.rsi_buy) &
+            (df['volatility'] < df['price'] * self.max_volatility)  # Volatilität unter max_volatility (relativ zum Preis)
         )
         sell_condition = (
-            (df['MA5'] < df['MA20']) | 
-            (df['RSI'] > 70)
+            (fast < slow) | 
+            (df['RSI'] > self.rsi_sell)
         )
         
         signals[buy_condition] = 'BUY'
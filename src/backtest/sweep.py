@@ -0,0 +1,327 @@
+import asyncio
+import functools
+import hashlib
+import itertools
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.event_engine import AlignedMarket, EventBacktester, EventStrategy, RowStrategyAdapter, SignalFrameAdapter
+from src.data.dataset_catalog import DatasetCatalog
+from src.data.tick_store import TickStore
+from src.trading.execution_cost import cost_model_from_config
+
+logger = logging.getLogger(__name__)
+
+# Parameter mit diesen Namen gehen an den EventBacktester, alle anderen an die Strategie
+ENGINE_PARAMS = ('initial_capital', 'position_size', 'fee_rate', 'slippage')
+# Engine-Basiswert mit Pfad zu Impact-Kurven (NPZ); wird pro Prozess einmal geladen
+IMPACT_CURVES = 'impact_curves'
+
+
+# --- Parameterräume ---
+
+def grid_search(space: Mapping[str, Sequence]) -> Iterator[Dict[str, Any]]:
+    """Alle Kombinationen der Werte-Listen"""
+    names = list(space)
+    for values in itertools.product(*(space[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def random_search(space: Mapping[str, Any], samples: int, seed: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Zufallsstichprobe: Listen = Auswahl, (low, high)-Tupel = gleichverteilt (int, wenn beide Grenzen int)"""
+    rng = np.random.default_rng(seed)
+    for _ in range(samples):
+        params = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    params[name] = int(rng.integers(low, high + 1))
+                else:
+                    params[name] = float(rng.uniform(low, high))
+            else:
+                params[name] = values[int(rng.integers(len(values)))]
+        yield params
+
+
+def param_key(params: Mapping[str, Any], context: Optional[Mapping[str, Any]] = None) -> str:
+    """Stabiler Schlüssel einer Parameter-Kombination (für Resume und Deduplizierung)
+
+    context enthält alles außer den Parametern, was das Ergebnis bestimmt (Strategie, Markt,
+    Zeitfenster, Engine-Basiswerte); gleiche Parameter in einem anderen Kontext werden neu gerechnet.
+    """
+    payload = json.dumps([context or {}, params], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def market_fingerprint(market: AlignedMarket) -> str:
+    """Hash über Pools, Spalten und alle Serien des Markts"""
+    digest = hashlib.sha1(json.dumps([market.pools, market.columns]).encode())
+    for series in market.series:
+        for name in ('timestamp', *market.columns):
+            digest.update(np.ascontiguousarray(series[name]).tobytes())
+    return digest.hexdigest()[:16]
+
+
+# --- Strategien ---
+
+def backtest_strategy(params: Dict[str, Any]) -> EventStrategy:
+    from src.backtest.strategy_manager import BacktestStrategy
+    return SignalFrameAdapter(BacktestStrategy(**params))
+
+
+def meme_sniper(params: Dict[str, Any]) -> EventStrategy:
+    from src.strategies.meme_sniper import MemeSniper
+    config = MemeSniper().config
+    config.update(params)
+    return RowStrategyAdapter(MemeSniper(config))
+
+
+STRATEGIES: Dict[str, Callable[[Dict[str, Any]], EventStrategy]] = {
+    'backtest_strategy': backtest_strategy,
+    'meme_sniper': meme_sniper,
+}
+
+
+# --- Shared Memory ---
+
+class SharedMarket:
+    """Legt die Arrays eines AlignedMarket einmal in Shared Memory; Worker hängen sich ohne Kopie an"""
+
+    def __init__(self, market: AlignedMarket):
+        arrays = market.to_arrays()
+        layout, offset = {}, 0
+        for name, array in arrays.items():
+            layout[name] = (offset, array.dtype.str, array.shape)
+            offset += -(-array.nbytes // 64) * 64  # 64-Byte-Ausrichtung je Array
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for name, array in arrays.items():
+            start, dtype, shape = layout[name]
+            np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=start)[...] = array
+
+        self.spec = {
+            'name': self._shm.name,
+            'layout': layout,
+            'pools': market.pools,
+            'columns': market.columns,
+        }
+
+    @staticmethod
+    def attach(spec: Dict) -> Tuple[AlignedMarket, shared_memory.SharedMemory]:
+        shm = shared_memory.SharedMemory(name=spec['name'])
+        arrays = {
+            name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)
+            for name, (start, dtype, shape) in spec['layout'].items()
+        }
+        return AlignedMarket.from_arrays(spec['pools'], spec['columns'], arrays), shm
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+
+# --- Ergebnisse ---
+
+class SweepStore:
+    """Append-only JSONL-Datei mit einem Ergebnis pro Parameter-Kombination; Grundlage für Resume"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.results: Dict[str, Dict] = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        result = json.loads(line)
+                        self.results[result['key']] = result
+                    except (json.JSONDecodeError, KeyError):
+                        logger.warning(f"{self.path}: unvollständige Zeile übersprungen")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.results
+
+    def add(self, result: Dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(result, default=str) + '\n')
+            f.flush()
+        self.results[result['key']] = result
+
+
+def rank_results(results: Iterable[Dict], metric: str = 'total_return') -> List[Dict]:
+    """Sortiert absteigend nach Metrik; fehlgeschlagene Läufe ans Ende"""
+    def score(result):
+        value = result.get('metrics', {}).get(metric)
+        return -np.inf if value is None or value != value else value
+    ranked = sorted(results, key=score, reverse=True)
+    for rank, result in enumerate(ranked, 1):
+        result['rank'] = rank
+    return ranked
+
+
+def write_results(ranked: List[Dict], path: Path):
+    """Schreibt die Rangliste als JSON oder (bei .parquet) als flache Tabelle"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == '.parquet':
+        rows = [
+            {'rank': r['rank'], 'key': r['key'], 'error': r.get('error'),
+             **{f"param_{k}": v for k, v in r['params'].items()},
+             **r.get('metrics', {})}
+            for r in ranked
+        ]
+        pd.DataFrame(rows).to_parquet(path, index=False)
+    else:
+        path.write_text(json.dumps(ranked, indent=2, default=str))
+
+
+# --- Ausführung ---
+
+def load_market(data_dir: Optional[Path] = None, tick_dir: Optional[Path] = None,
+                pools: Sequence[str] = (), start=None, end=None) -> AlignedMarket:
+    """Marktdaten einmal laden: aus dem TickStore (memmap) oder über den Parquet-Katalog"""
+    if tick_dir is not None:
+        store = TickStore(Path(tick_dir))
+        return AlignedMarket.from_tick_files({pool: store.open(pool) for pool in pools or store.pools()}, start, end)
+    catalog = DatasetCatalog(Path(data_dir))
+    catalog.refresh()
+    pools = pools or sorted({entry.pool for entry in catalog.entries.values()})
+    return AlignedMarket.from_frames({pool: catalog.query(pool, start, end, refresh=False) for pool in pools})
+
+
+def summarize(result) -> Dict[str, float]:
+    metrics = result.metrics()
+    return {
+        'total_return': result.total_return,
+        'max_drawdown': metrics['max_drawdown'],
+        'final_capital': result.final_capital,
+        'trades': len(result.trades),
+        'win_rate': metrics['win_rate'],
+        'sharpe_ratio': metrics['sharpe_ratio'],
+        'sortino_ratio': metrics['sortino_ratio'],
+        'calmar_ratio': metrics['calmar_ratio'],
+        'profit_factor': metrics['profit_factor'],
+        'exposure': metrics['exposure'],
+    }
+
+
+@functools.lru_cache(maxsize=4)
+def _curve_model(path: str, fixed_slippage: float):
+    return cost_model_from_config({'impact_curves': path, 'fixed_slippage': fixed_slippage})
+
+
+def run_single(market: AlignedMarket, strategy: str, params: Dict[str, Any],
+               engine_defaults: Optional[Dict[str, Any]] = None, key: Optional[str] = None,
+               start=None, end=None) -> Dict:
+    """Ein Backtest-Lauf über das Fenster [start, end] des Markts (None = ganzer Markt)"""
+    engine_kwargs = dict(engine_defaults or {})
+    strategy_params = {}
+    for name, value in params.items():
+        (engine_kwargs if name in ENGINE_PARAMS else strategy_params)[name] = value
+    curves = engine_kwargs.pop(IMPACT_CURVES, None)
+
+    result = {'key': key or param_key(params), 'params': params}
+    try:
+        if curves:
+            engine_kwargs['cost_model'] = _curve_model(str(curves), engine_kwargs.get('slippage', 0.001))
+        engine = EventBacktester(market, STRATEGIES[strategy](strategy_params), **engine_kwargs)
+        result['metrics'] = summarize(asyncio.run(engine.run(start, end)))
+    except Exception as e:
+        logger.error(f"Sweep-Lauf {params} fehlgeschlagen: {e}")
+        result['error'] = str(e)
+    return result
+
+
+_worker_market: Optional[AlignedMarket] = None
+_worker_shm = None
+
+
+def _init_worker(spec: Dict):
+    global _worker_market, _worker_shm
+    _worker_market, _worker_shm = SharedMarket.attach(spec)
+
+
+def _run_in_worker(strategy: str, params: Dict[str, Any], engine_defaults: Dict[str, Any], key: str,
+                   start=None, end=None) -> Dict:
+    return run_single(_worker_market, strategy, params, engine_defaults, key, start, end)
+
+
+def run_sweep(
+    market: AlignedMarket,
+    strategy: str,
+    param_sets: Iterable[Dict[str, Any]],
+    store: Optional[SweepStore] = None,
+    workers: Optional[int] = None,
+    engine_defaults: Optional[Dict[str, Any]] = None,
+    progress: Optional[Callable[[Dict], None]] = None,
+    market_id: Optional[str] = None,
+    start=None,
+    end=None
+) -> List[Dict]:
+    """Führt alle noch fehlenden Kombinationen aus; workers=0 rechnet im aktuellen Prozess
+
+    Jeder Lauf backtestet nur das Zeitfenster [start, end] des Markts. Gespeicherte Ergebnisse
+    gelten nur für denselben Kontext: Strategie, Markt (market_id, Standard: Hash der
+    Marktdaten), Zeitfenster und Engine-Basiswerte.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unbekannte Strategie {strategy}, verfügbar: {', '.join(STRATEGIES)}")
+
+    context = {
+        'strategy': strategy,
+        'market': market_id or market_fingerprint(market),
+        'start': start,
+        'end': end,
+        'engine': engine_defaults or {},
+    }
+    curves = (engine_defaults or {}).get(IMPACT_CURVES)
+    if curves:
+        # Neu aufgezeichnete Kurven unter gleichem Pfad gelten als anderer Kontext
+        stat = Path(curves).stat()
+        context['curves'] = [stat.st_size, stat.st_mtime_ns]
+    requested, pending, seen = [], [], set()
+    for params in param_sets:
+        key = param_key(params, context)
+        if key in seen:
+            continue
+        seen.add(key)
+        requested.append(key)
+        if store is None or key not in store:
+            pending.append((key, params))
+    logger.info(f"Sweep: {len(pending)} Läufe offen, {len(store.results) if store else 0} bereits gespeichert")
+
+    results: Dict[str, Dict] = {}
+
+    def collect(result: Dict):
+        if store is not None:
+            store.add(result)
+        results[result['key']] = result
+        if progress:
+            progress(result)
+
+    workers = os.cpu_count() if workers is None else workers
+    if workers <= 1 or len(pending) <= 1:
+        for key, params in pending:
+            collect(run_single(market, strategy, params, engine_defaults, key, start, end))
+    else:
+        shared = SharedMarket(market)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared.spec,)) as pool:
+                futures = [pool.submit(_run_in_worker, strategy, params, engine_defaults or {}, key, start, end)
+                           for key, params in pending]
+                for future in as_completed(futures):
+                    collect(future.result())
+        finally:
+            shared.close()
+
+    # Nur die angefragten Kombinationen, ob neu gerechnet oder aus dem Store
+    return [results[key] if key in results else store.results[key] for key in requested]
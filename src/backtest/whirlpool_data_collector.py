@@ -3,30 +3,33 @@ from pathlib import Path
 from datetime import datetime
 import pandas as pd
 from typing import Dict
+from src.data.collector_sink import WHIRLPOOL_COLUMNS, ParquetCollectorSink
+from src.whirlpool_fetcher import WhirlpoolFetcher
+
+# Mints und Vaults sind pro Pool konstant und stecken in der Pool-Adresse der Partition
+STATIC_FIELDS = {'token_mint_a', 'token_mint_b', 'token_vault_a', 'token_vault_b'}
 
 class WhirlpoolDataCollector:
     def __init__(self, fetcher: WhirlpoolFetcher):
         self.fetcher = fetcher
         self.data_dir = Path("data/historical")
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.sink = ParquetCollectorSink(self.data_dir, columns=WHIRLPOOL_COLUMNS)
         
     async def collect_pool_data(self, pool_address: str, duration_hours: int = 24):
         """Sammelt Pooldaten für Backtesting"""
-        data_points = []
         interval = 60  # 1 Minute
         
-        for _ in range(duration_hours * 60):
-            pool_data = await self.fetcher.get_whirlpool_data(pool_address)
-            if pool_data:
-                data_points.append({
-                    'timestamp': datetime.now().isoformat(),
-                    **pool_data
-                })
-            await asyncio.sleep(interval)
-            
-        # Speichere Daten
-        df = pd.DataFrame(data_points)
-        df.to_parquet(self.data_dir / f"pool_{pool_address}_{datetime.now():%Y%m%d}.parquet") 
+        # Streamt in Row-Groups pro Pool und Tag, ein Abbruch verliert höchstens den Puffer
+        try:
+            for _ in range(duration_hours * 60):
+                pool_data = await self.fetcher.get_whirlpool_data(pool_address)
+                if pool_data:
+                    values = {k: v for k, v in pool_data.items() if k not in STATIC_FIELDS}
+                    self.sink.append(pool_address, datetime.now(), **values)
+                await asyncio.sleep(interval)
+        finally:
+            self.sink.close()
         
     async def collect_tick_data(self, pool_address: str):
         """Sammelt Tick-Daten für Backtesting"""
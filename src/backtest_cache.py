@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+# Fügen Sie das src Verzeichnis zum Python Path hinzu
+src_path = str(Path(__file__).parent.parent)
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from datetime import datetime
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from src.backtest.stage_cache import StageCache
+
+console = Console()
+
+
+def _size(size: int) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+@click.group()
+@click.option('--cache-dir', default='cache/backtest', help='Verzeichnis des Backtest-Stufencaches')
+@click.pass_context
+def cli(ctx, cache_dir):
+    """Backtest-Stufencache ansehen und aufräumen"""
+    ctx.obj = StageCache(Path(cache_dir))
+
+
+@cli.command()
+@click.pass_obj
+def stats(cache: StageCache):
+    """Einträge und Größe je Stufe"""
+    table = Table(title=f"Stufencache {cache.directory}")
+    table.add_column("Stufe", style="cyan")
+    table.add_column("Einträge", justify="right")
+    table.add_column("Größe", justify="right")
+    total = 0
+    for stage, info in sorted(cache.stats().items()):
+        table.add_row(stage, str(info['entries']), _size(info['bytes']))
+        total += info['bytes']
+    console.print(table)
+    console.print(f"Gesamt: {_size(total)} von {_size(cache.max_bytes)}")
+
+
+@cli.command(name='list')
+@click.option('--stage', '-s', default=None, help='Nur Einträge dieser Stufe')
+@click.pass_obj
+def list_entries(cache: StageCache, stage):
+    """Einträge, zuletzt gelesene zuerst"""
+    table = Table()
+    table.add_column("Stufe", style="cyan")
+    table.add_column("Schlüssel")
+    table.add_column("Größe", justify="right")
+    table.add_column("Zuletzt gelesen")
+    for entry in cache.list(stage):
+        table.add_row(entry.stage, entry.key, _size(entry.size),
+                      datetime.fromtimestamp(entry.last_access).strftime('%Y-%m-%d %H:%M'))
+    console.print(table)
+
+
+@cli.command()
+@click.option('--stage', '-s', default=None, help='Nur Einträge dieser Stufe')
+@click.option('--older-than', type=float, default=None, help='Nur Einträge, die seit N Tagen nicht gelesen wurden')
+@click.confirmation_option(prompt='Cache-Einträge wirklich löschen?')
+@click.pass_obj
+def purge(cache: StageCache, stage, older_than):
+    """Löscht Einträge (alle, eine Stufe oder veraltete)"""
+    removed = cache.purge(stage, older_than * 86400 if older_than is not None else None)
+    console.print(f"[green]{removed} Einträge gelöscht[/green]")
+
+
+if __name__ == "__main__":
+    cli()
@@ -3,32 +3,49 @@ import numpy as np
 import pandas as pd
 import logging
 from typing import Dict, List
-from data_collector import DataCollector
 from risk_manager import RiskManager
-from trading_manager import TradingManager
-from models import Signal, Pool, Trade
+from backtest.event_engine import AlignedMarket
+from trading.metrics import max_drawdown, sharpe_ratio, win_rate
 import asyncio
 
 logger = logging.getLogger(__name__)
 
 class BacktestEngine:
-    def __init__(self, start_date, end_date, initial_capital):
+    def __init__(self, start_date, end_date, initial_capital, seed=None, cost_model=None,
+                 data_collector=None, trading_manager=None):
         self.start_date = start_date
         self.end_date = end_date
         self.capital = initial_capital
         self.positions = {}
         self.trades = []
         self.performance_metrics = {}
+        self.rng = np.random.default_rng(seed)  # seedable, so slippage draws are reproducible
+        self.cost_model = cost_model  # ExecutionCostModel; None keeps the size-based heuristic
         
-        # Initialize components
-        self.data_collector = DataCollector()
+        # Initialize components; collector and trading manager are only needed to fetch
+        # candles and are created on first use (they pull in the HTTP/wallet stack)
+        self._data_collector = data_collector
+        self._trading_manager = trading_manager
         self.risk_manager = RiskManager()
-        self.trading_manager = TradingManager()
         
         # Performance tracking
         self.daily_returns = []
         self.equity_curve = [initial_capital]
 
+    @property
+    def data_collector(self):
+        if self._data_collector is None:
+            from data_collector import DataCollector
+            self._data_collector = DataCollector()
+        return self._data_collector
+
+    @property
+    def trading_manager(self):
+        if self._trading_manager is None:
+            from trading_manager import TradingManager
+            self._trading_manager = TradingManager()
+        return self._trading_manager
+
     async def _get_historical_data(self, date: datetime) -> Dict:
         """Fetch historical market data for given date"""
         try:
@@ -38,8 +55,8 @@ class BacktestEngine:
             logger.error(f"Error fetching historical data: {e}")
             return {}
 
-    def _generate_signals(self, market_data: Dict) -> List:
-        """Generate trading signals from market data"""
+    def _generate_signals(self, market_data: Dict, timestamp=None) -> List:
+        """Generate trading signals from market data at the given backtest time"""
         signals = []
         for pool_id, data in market_data.items():
             try:
@@ -48,7 +65,8 @@ class BacktestEngine:
                         'pool_id': pool_id,
                         'type': 'entry',
                         'price': data['price'],
-                        'size': self._calculate_position_size(data)
+                        'size': self._calculate_position_size(data),
+                        'timestamp': timestamp
                     })
             except Exception as e:
                 logger.error(f"Error generating signals: {e}")
@@ -90,16 +108,43 @@ class BacktestEngine:
             logger.error(f"Error calculating volatility: {e}")
             return float('inf')
 
-    async def run_backtest(self):
-        """Run the backtest simulation"""
+    async def _load_market(self) -> AlignedMarket:
+        """Fetch candles once per day and align all pools into one event stream"""
+        frames: Dict[str, List[pd.DataFrame]] = {}
         current_date = self.start_date
         while current_date <= self.end_date:
+            for pool_id, df in (await self._get_historical_data(current_date)).items():
+                frames.setdefault(pool_id, []).append(df)
+            current_date += timedelta(days=1)
+            
+        combined = {}
+        for pool_id, dfs in frames.items():
+            df = pd.concat(dfs)
+            combined[pool_id] = df[~df.index.duplicated(keep='last')]
+        return AlignedMarket.from_frames(combined)
+
+    async def run_backtest(self):
+        """Run the backtest simulation"""
+        market = await self._load_market()
+        
+        # One batch per timestamp with data instead of one awaited fetch per minute
+        for batch in market.batches(self.start_date, self.end_date):
             try:
-                # Get market data
-                market_data = await self._get_historical_data(current_date)
+                market_data = {
+                    market.pools[pool]: {
+                        'price': price,
+                        'volume': volume,
+                        'prices': market.history(pool, row, 'price', 20)
+                    }
+                    for pool, row, price, volume in zip(
+                        batch.pools.tolist(), batch.rows.tolist(),
+                        batch.values['price'].tolist(), np.nan_to_num(batch.values['volume']).tolist()
+                    )
+                }
                 
                 # Generate and process signals
-                signals = self._generate_signals(market_data)
+                # The batch time picks the impact snapshot; without it the newest one would leak in
+                signals = self._generate_signals(market_data, batch.timestamp)
                 for signal in signals:
                     if self.risk_manager.check_trade(signal, market_data[signal['pool_id']]['price']):
                         trade_result = await self._execute_backtest_trade(signal)
@@ -108,14 +153,10 @@ class BacktestEngine:
                 
                 # Update positions and metrics
                 self._update_positions(market_data)
-                self._calculate_daily_metrics(current_date)
-                
-                current_date += timedelta(minutes=1)  # 1-minute intervals
+                self._calculate_daily_metrics(batch.datetime)
                 
             except Exception as e:
                 logger.error(f"Error in backtest loop: {e}")
-                
-            await asyncio.sleep(0)  # Allow other tasks to run
 
     def generate_report(self) -> Dict:
         """Generate backtest report"""
@@ -139,32 +180,15 @@ class BacktestEngine:
 
     def _calculate_sharpe_ratio(self) -> float:
         """Calculate Sharpe ratio"""
-        if not self.daily_returns:
-            return 0
-        returns = np.array(self.daily_returns)
-        if returns.std() == 0:
-            return 0
-        return (returns.mean() / returns.std()) * np.sqrt(252)
+        return sharpe_ratio(self.daily_returns)
 
     def _calculate_max_drawdown(self) -> float:
         """Calculate maximum drawdown percentage"""
-        if not self.equity_curve:
-            return 0
-        peak = self.equity_curve[0]
-        max_dd = 0
-        for value in self.equity_curve:
-            if value > peak:
-                peak = value
-            dd = (peak - value) / peak * 100
-            max_dd = max(max_dd, dd)
-        return max_dd
+        return max_drawdown(self.equity_curve) * 100
 
     def _calculate_win_rate(self) -> float:
         """Calculate win rate percentage"""
-        if not self.trades:
-            return 0
-        winning_trades = sum(1 for trade in self.trades if trade.get('profit', 0) > 0)
-        return (winning_trades / len(self.trades)) * 100
+        return win_rate([trade.get('profit', 0) for trade in self.trades]) * 100
 
     async def _execute_backtest_trade(self, signal: Dict) -> Dict:
         """Execute trade in backtest environment"""
@@ -174,7 +198,9 @@ class BacktestEngine:
             pool_id = signal['pool_id']
             
             # Simulate execution with slippage
-            executed_price = self._apply_slippage(price, size)
+            executed_price = self._apply_slippage(
+                price, size, pool_id, signal['type'] in ('entry', 'buy'), signal.get('timestamp')
+            )
             
             trade_result = {
                 'timestamp': datetime.now(),
@@ -197,19 +223,24 @@ class BacktestEngine:
             logger.error(f"Error executing backtest trade: {e}")
             return None
 
-    def _apply_slippage(self, price: float, size: float) -> float:
+    def _apply_slippage(self, price: float, size: float, pool_id: str = None,
+                        is_buy: bool = True, timestamp=None) -> float:
         """Simulate price slippage based on order size"""
         try:
+            if self.cost_model is not None:
+                # Liquidity-aware: impact curves from recorded tick arrays (value in quote units)
+                return self.cost_model.fill_price(pool_id, price, size * price, is_buy, timestamp)
+            
             # Basic slippage model: larger orders = more slippage
             base_slippage = 0.001  # 0.1% base slippage
             size_factor = size / 10000  # Adjust based on your typical order size
             total_slippage = base_slippage * (1 + size_factor)
             
             # Random component to simulate market conditions
-            random_factor = np.random.normal(1, 0.1)  # Mean=1, STD=0.1
+            random_factor = self.rng.normal(1, 0.1)  # Mean=1, STD=0.1
             total_slippage *= random_factor
             
-            return price * (1 + total_slippage)
+            return price * (1 + total_slippage) if is_buy else price * (1 - total_slippage)
             
         except Exception as e:
             logger.error(f"Error applying slippage: {e}")
@@ -19,6 +19,8 @@ class RPCEndpoint:
     weight: int
     ws_url: str = None
     api_key: str = None
+    healthy: bool = True
+    response_time: float = 0.0
 
 ORCA_ENDPOINTS = {
     "api": "https://api.mainnet.orca.so",
@@ -63,12 +65,20 @@ SOLANA_RPC_ENDPOINTS = {
     ]
 }
 
+def primary_rpc_url(network: str = 'mainnet') -> str:
+    """URL des bevorzugten Endpoints (gesund, niedrigstes Gewicht) aus SOLANA_RPC_ENDPOINTS"""
+    configured = [ep for ep in SOLANA_RPC_ENDPOINTS[network] if ep.url]
+    if not configured:
+        raise ValueError(f"Keine RPC-Endpoints für {network} konfiguriert")
+    return min(configured, key=lambda ep: (not ep.healthy, ep.weight)).url
+
 class RPCManager:
     def __init__(self, network: str = 'mainnet'):
         self.endpoints = SOLANA_RPC_ENDPOINTS[network]
         self.current_endpoint_index = 0
         self.health_check_interval = 30  # Sekunden
         self.session = None
+        self.hedged = None
         
     async def initialize(self):
         """Initialize RPC connection"""
@@ -76,6 +86,13 @@ class RPCManager:
         await self.check_endpoints_health()
         asyncio.create_task(self._periodic_health_check())
         
+    async def request(self, method: str, params: List = None, min_slot: int = None):
+        """Read-Requests laufen gehedged über die gewichteten Endpoints (Health aus dem Check)"""
+        if self.hedged is None:
+            from src.connection.hedged_rpc import HedgedRPCClient
+            self.hedged = HedgedRPCClient(self.endpoints)
+        return await self.hedged.request(method, params, min_slot)
+        
     async def get_healthy_endpoint(self) -> RPCEndpoint:
         """Get the best available RPC endpoint"""
         healthy_endpoints = [ep for ep in self.endpoints if ep.healthy]
@@ -169,6 +186,7 @@ RATE_LIMITS = {
 RPC_PROVIDERS = {
     QUICKNODE_RPC_URL: 'quicknode',
     'api.mainnet.orca.so': 'orca',
+    'api.orca.so': 'orca',
     'rpc.ankr.com': 'ankr',
     'api.mainnet-beta.solana.com': 'public',
     'solana-mainnet.rpc.extrnode.com': 'public'
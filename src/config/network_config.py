@@ -4,6 +4,7 @@ import aiohttp
 import logging
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Confirmed
+from src.data.whirlpool_registry import get_whirlpool_registry
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -14,6 +15,8 @@ if not QUICKNODE_RPC_URL:
     logger.warning("Kein QuickNode RPC URL gefunden, nutze Fallback")
     QUICKNODE_RPC_URL = "https://api.mainnet-beta.solana.com"
 
+QUICKNODE_WS_URL = os.getenv("QUICKNODE_WS_URL") or QUICKNODE_RPC_URL.replace("https://", "wss://", 1)
+
 async def get_rpc_client() -> AsyncClient:
     """Erstellt einen RPC Client mit optimalen Einstellungen"""
     return AsyncClient(
@@ -46,25 +49,25 @@ DEFAULT_WHIRLPOOLS = {
 async def fetch_whirlpool_configs():
     """Holt aktuelle Whirlpool Konfigurationen"""
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://api.mainnet.orca.so/v1/whirlpool/list") as resp:
-                data = await resp.json()
-                
-                configs = {}
-                for pool in data["whirlpools"]:
-                    if pool["whitelisted"]:  # Nur verifizierte Pools
-                        symbol = f"{pool['tokenA']['symbol']}/{pool['tokenB']['symbol']}"
-                        configs[symbol] = {
-                            "address": pool["address"],
-                            "token_a": pool["tokenA"]["mint"],
-                            "token_b": pool["tokenB"]["mint"],
-                            "decimals_a": pool["tokenA"]["decimals"],
-                            "decimals_b": pool["tokenB"]["decimals"],
-                            "fee_rate": pool["lpFeeRate"]
-                        }
-                        
-                return configs
+        pools = await get_whirlpool_registry().get_pools()
+        if not pools:
+            return DEFAULT_WHIRLPOOLS
+            
+        configs = {}
+        for pool in pools:
+            if pool.get("whitelisted"):  # Nur verifizierte Pools
+                symbol = f"{pool['tokenA']['symbol']}/{pool['tokenB']['symbol']}"
+                configs[symbol] = {
+                    "address": pool["address"],
+                    "token_a": pool["tokenA"]["mint"],
+                    "token_b": pool["tokenB"]["mint"],
+                    "decimals_a": pool["tokenA"]["decimals"],
+                    "decimals_b": pool["tokenB"]["decimals"],
+                    "fee_rate": pool["lpFeeRate"]
+                }
                 
+        return configs
+        
     except Exception as e:
         logger.error(f"Fehler beim Laden der Whirlpool Konfigurationen: {e}")
         return DEFAULT_WHIRLPOOLS
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+import aiohttp
+
+from src.connection.http_transport import HttpTransport, get_http_transport
+from src.connection.rate_limiter import Priority, get_rate_limiter
+from src.whirlpool.account_decoder import WhirlpoolBatch, decode_whirlpools
+
+logger = logging.getLogger(__name__)
+
+# Solana-Limit für getMultipleAccounts
+MAX_MULTIPLE_ACCOUNTS = 100
+
+
+@dataclass
+class PollChunk:
+    """Dekodierte Accounts eines getMultipleAccounts-Aufrufs"""
+    slot: int
+    batch: WhirlpoolBatch
+
+
+@dataclass
+class PoolSnapshot:
+    address: str
+    slot: int
+    data: Dict
+
+
+class WhirlpoolPoller:
+    """Pollt viele Whirlpools über gebündelte getMultipleAccounts-Aufrufe"""
+
+    def __init__(self,
+        rpc_url: str,
+        session: Optional[aiohttp.ClientSession] = None,
+        transport: Optional[HttpTransport] = None,
+        chunk_size: int = MAX_MULTIPLE_ACCOUNTS,
+        max_concurrency: int = 4,
+        commitment: str = "confirmed",
+        timeout: float = 10.0,
+        priority: Priority = Priority.NORMAL
+    ):
+        self.rpc_url = rpc_url
+        self.chunk_size = max(1, min(chunk_size, MAX_MULTIPLE_ACCOUNTS))
+        self.commitment = commitment
+        self.priority = priority
+        self.rate_limiter = get_rate_limiter()
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Eine übergebene Session gehört dem Aufrufer, sonst der geteilte HttpTransport
+        self._session = session
+        self.transport = transport or get_http_transport()
+        self._request_id = 0
+        self.is_running = False
+
+    @classmethod
+    def from_config(cls, network: str = 'mainnet', **kwargs) -> "WhirlpoolPoller":
+        """Erstellt einen Poller für den bevorzugten RPC-Endpoint aus SOLANA_RPC_ENDPOINTS"""
+        from src.config.connections import primary_rpc_url
+        return cls(primary_rpc_url(network), **kwargs)
+
+    def _post(self, payload: Dict):
+        if self._session is not None:
+            return self._session.post(self.rpc_url, json=payload, timeout=self.timeout)
+        return self.transport.post(self.rpc_url, json=payload, timeout=self.timeout)
+
+    def _chunks(self, addresses: Sequence[str]) -> List[Sequence[str]]:
+        return [
+            addresses[i:i + self.chunk_size]
+            for i in range(0, len(addresses), self.chunk_size)
+        ]
+
+    async def fetch_chunk(self, addresses: Sequence[str]) -> PollChunk:
+        """Holt und dekodiert bis zu 100 Accounts in einem Aufruf"""
+        self._request_id += 1
+        payload = {
+            "jsonrpc": "2.0",
+            "id": self._request_id,
+            "method": "getMultipleAccounts",
+            "params": [
+                list(addresses),
+                {"encoding": "base64", "commitment": self.commitment}
+            ]
+        }
+
+        async with self._semaphore:
+            async with self.rate_limiter.limit(
+                self.rpc_url, "getMultipleAccounts", self.priority, subsystem="poller"
+            ):
+                async with self._post(payload) as response:
+                    if response.status == 429:
+                        self.rate_limiter.penalize(self.rpc_url, float(response.headers.get('Retry-After', 1)))
+                    response.raise_for_status()
+                    body = await response.json()
+
+        if "error" in body:
+            raise RuntimeError(f"getMultipleAccounts Fehler: {body['error']}")
+
+        result = body["result"]
+        raw_accounts = [value["data"] if value else None for value in result["value"]]
+        return PollChunk(
+            slot=result["context"]["slot"],
+            batch=decode_whirlpools(raw_accounts, addresses)
+        )
+
+    async def poll(self, addresses: Sequence[str]) -> List[PollChunk]:
+        """Pollt alle Adressen, Chunks laufen parallel (begrenzt)"""
+        if not addresses:
+            return []
+
+        results = await asyncio.gather(
+            *(self.fetch_chunk(chunk) for chunk in self._chunks(list(addresses))),
+            return_exceptions=True
+        )
+
+        chunks = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Fehler beim Pollen eines Chunks: {result}")
+                continue
+            chunks.append(result)
+        return chunks
+
+    async def snapshots(self, addresses: Sequence[str]) -> Dict[str, PoolSnapshot]:
+        """Pollt alle Adressen und liefert gültige Pools als Snapshots"""
+        snapshots = {}
+        for chunk in await self.poll(addresses):
+            for i, address in enumerate(chunk.batch.addresses):
+                if chunk.batch.valid[i]:
+                    snapshots[address] = PoolSnapshot(
+                        address=address,
+                        slot=chunk.slot,
+                        data=chunk.batch.to_dict(i)
+                    )
+        return snapshots
+
+    async def run(self,
+        addresses: Sequence[str],
+        callback: Callable[[List[PollChunk]], Awaitable[None]],
+        interval: float = 1.0
+    ):
+        """Pollt kontinuierlich und übergibt die Chunks an den Callback"""
+        self.is_running = True
+        while self.is_running:
+            try:
+                chunks = await self.poll(addresses)
+                if chunks:
+                    await callback(chunks)
+            except Exception as e:
+                logger.error(f"Fehler im Poll-Loop: {e}")
+            await asyncio.sleep(interval)
+
+    def stop(self):
+        """Stoppt den Poll-Loop"""
+        self.is_running = False
+
+    async def close(self):
+        """Stoppt den Poll-Loop; Session bzw. Transport schließt ihr Besitzer"""
+        self.stop()
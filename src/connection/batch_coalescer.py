@@ -0,0 +1,185 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from src.connection.http_transport import HttpTransport, get_http_transport
+from src.connection.rate_limiter import Priority, get_rate_limiter
+from src.utils.single_flight import SingleFlight, request_key
+
+logger = logging.getLogger(__name__)
+
+# Leichte Reads, die sich gefahrlos in ein Batch-Array legen lassen
+COALESCABLE_METHODS = {
+    'getAccountInfo',
+    'getBalance',
+    'getTokenAccountBalance',
+}
+
+
+def with_commitment(params: Optional[List], commitment: Optional[str]) -> List:
+    """Ergänzt die Commitment im Config-Objekt am Ende der Parameter"""
+    params = list(params or [])
+    if commitment is None:
+        return params
+    if params and isinstance(params[-1], dict):
+        params[-1] = {"commitment": commitment, **params[-1]}
+    else:
+        params.append({"commitment": commitment})
+    return params
+
+
+class RPCBatchError(Exception):
+    """Fehlerantwort für einen einzelnen Eintrag eines Batches"""
+
+
+@dataclass
+class _PendingCall:
+    method: str
+    params: List
+    future: asyncio.Future
+
+
+class RPCBatchCoalescer:
+    """Sammelt gleichzeitige RPC-Reads und sendet sie als ein JSON-RPC-Batch"""
+
+    def __init__(self,
+        rpc_url: str,
+        transport: Optional[HttpTransport] = None,
+        flush_interval: float = 0.01,
+        max_batch_size: int = 100,
+        timeout: float = 10.0,
+        priority: Priority = Priority.NORMAL
+    ):
+        self.rpc_url = rpc_url
+        self.transport = transport or get_http_transport()
+        self.rate_limiter = get_rate_limiter()
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.priority = priority
+        self.flight = SingleFlight()
+
+        self.batches = 0
+        self.requests = 0
+        self.largest_batch = 0
+
+        self._pending: List[_PendingCall] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: set = set()
+        self._request_id = 0
+
+    async def call(self, method: str, params: Optional[List] = None,
+                   commitment: Optional[str] = None) -> Any:
+        """Reiht einen Aufruf ins nächste Batch ein und wartet auf sein Ergebnis"""
+        params = with_commitment(params, commitment)
+        # Identische Aufrufe im selben Fenster belegen nur einen Batch-Eintrag
+        return await self.flight.do(request_key(method, params), lambda: self._enqueue(method, params))
+
+    async def _enqueue(self, method: str, params: Optional[List]) -> Any:
+        loop = asyncio.get_running_loop()
+        pending = _PendingCall(method, params or [], loop.create_future())
+        self._pending.append(pending)
+        self.requests += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush_pending()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, self._flush_pending)
+        return await pending.future
+
+    def _flush_pending(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+        # Rest (über der Obergrenze) im nächsten Fenster
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._flush_pending)
+
+    async def _send(self, batch: List[_PendingCall]):
+        by_id: Dict[int, _PendingCall] = {}
+        payload = []
+        for pending in batch:
+            if pending.future.done():
+                continue
+            self._request_id += 1
+            by_id[self._request_id] = pending
+            payload.append({
+                "jsonrpc": "2.0", "id": self._request_id,
+                "method": pending.method, "params": pending.params
+            })
+        if not payload:
+            return
+
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(payload))
+        try:
+            async with self.rate_limiter.limit(self.rpc_url, priority=self.priority, subsystem="rpc_batch"):
+                async with self.transport.post(self.rpc_url, json=payload, timeout=self.timeout) as response:
+                    if response.status == 429:
+                        self.rate_limiter.penalize(self.rpc_url, float(response.headers.get('Retry-After', 1)))
+                    response.raise_for_status()
+                    body = await response.json(content_type=None)
+
+            # Einzelne Antworten gehören zum Batch, auch wenn der Server sie umsortiert
+            responses = body if isinstance(body, list) else [body]
+            for item in responses:
+                pending = by_id.pop(item.get("id"), None)
+                if pending is None or pending.future.done():
+                    continue
+                if "error" in item:
+                    pending.future.set_exception(RPCBatchError(f"{pending.method}: {item['error']}"))
+                else:
+                    pending.future.set_result(item.get("result"))
+
+            for pending in by_id.values():
+                if not pending.future.done():
+                    pending.future.set_exception(RPCBatchError(f"{pending.method}: keine Antwort im Batch"))
+
+        except Exception as e:
+            logger.error(f"RPC-Batch mit {len(payload)} Aufrufen fehlgeschlagen: {e}")
+            for pending in by_id.values():
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+
+    async def flush(self):
+        """Sendet alle wartenden Aufrufe sofort"""
+        while self._pending:
+            self._flush_pending()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'largest_batch': self.largest_batch,
+            'avg_batch_size': self.requests / self.batches if self.batches else 0.0,
+        }
+
+
+_coalescers: Dict[Tuple, RPCBatchCoalescer] = {}
+
+
+def get_batch_coalescer(rpc_url: str, **kwargs) -> RPCBatchCoalescer:
+    """Ein geteilter Coalescer pro RPC-Endpoint und Einstellungen
+
+    Komponenten mit gleichen Einstellungen schreiben in dieselben Batches,
+    abweichende Einstellungen bekommen eine eigene Instanz statt die geteilte umzustellen.
+    """
+    key = (rpc_url, tuple(sorted(kwargs.items())))
+    coalescer = _coalescers.get(key)
+    if coalescer is None:
+        coalescer = _coalescers[key] = RPCBatchCoalescer(rpc_url, **kwargs)
+    return coalescer
@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+import aiohttp
+
+from src.connection.http_transport import HttpTransport, get_http_transport
+from src.connection.rate_limiter import Priority, get_rate_limiter
+from src.utils.single_flight import SingleFlight, request_key
+
+logger = logging.getLogger(__name__)
+
+# Nur lesende Methoden dürfen parallel an mehrere Endpoints gehen
+READ_ONLY_METHODS = {
+    'getAccountInfo',
+    'getMultipleAccounts',
+    'getProgramAccounts',
+    'getBalance',
+    'getTokenAccountBalance',
+    'getTokenAccountsByOwner',
+    'getTokenSupply',
+    'getSlot',
+    'getBlockHeight',
+    'getLatestBlockhash',
+    'getRecentPrioritizationFees',
+    'getSignaturesForAddress',
+    'getSignatureStatuses',
+    'getTransaction',
+    'getHealth',
+}
+
+MIN_SAMPLES = 20
+DEFAULT_COMMITMENT = 'finalized'
+
+
+def slot_scope(method: str, params: Optional[List]) -> Tuple[str, str]:
+    """(Methode, Commitment) eines Aufrufs; finalized läuft ~32 Slots hinter confirmed"""
+    for param in reversed(params or []):
+        if isinstance(param, dict) and 'commitment' in param:
+            return method, param['commitment']
+    return method, DEFAULT_COMMITMENT
+
+
+class RPCError(Exception):
+    """Fehlerantwort oder ungültige Antwort eines Endpoints"""
+
+
+@dataclass
+class EndpointStats:
+    url: str
+    weight: int = 1
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+    requests: int = 0
+    errors: int = 0
+    wins: int = 0
+    highest_slot: int = 0
+    source: Any = None  # RPCEndpoint aus der Config (Health-Status)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+
+class HedgedRPCClient:
+    """JSON-RPC Client, der langsame Reads nach einer p95-Verzögerung an den nächsten Endpoint absichert"""
+
+    def __init__(self,
+        endpoints: Sequence[Union[str, Any]],
+        transport: Optional[HttpTransport] = None,
+        initial_hedge_delay: float = 0.25,
+        min_hedge_delay: float = 0.02,
+        max_hedge_delay: float = 2.0,
+        max_hedges: int = 1,
+        max_slot_lag: int = 2,
+        timeout: float = 10.0,
+        priority: Priority = Priority.NORMAL
+    ):
+        # Akzeptiert URLs oder RPCEndpoint-Objekte (url, weight, healthy), z.B. SOLANA_RPC_ENDPOINTS
+        self.endpoints: List[EndpointStats] = [
+            EndpointStats(url=endpoint, weight=i + 1) if isinstance(endpoint, str)
+            else EndpointStats(url=endpoint.url, weight=endpoint.weight, source=endpoint)
+            for i, endpoint in enumerate(endpoints)
+            if (endpoint if isinstance(endpoint, str) else endpoint.url)
+        ]
+        if not self.endpoints:
+            raise ValueError("Keine RPC-Endpoints konfiguriert")
+
+        self.transport = transport or get_http_transport()
+        self.rate_limiter = get_rate_limiter()
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.max_hedges = max_hedges
+        self.max_slot_lag = max_slot_lag
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.priority = priority
+        self.flight = SingleFlight()
+
+        self.highest_slot = 0
+        self.highest_slots: Dict[Tuple[str, str], int] = {}  # (Methode, Commitment) -> Slot
+        self.hedges = 0
+        self.stale_responses = 0
+        self._request_id = 0
+
+    def ranked_endpoints(self) -> List[EndpointStats]:
+        """Endpoints nach Health, Fehlerquote, Gewicht und Median-Latenz"""
+        return sorted(self.endpoints, key=lambda ep: (
+            not getattr(ep.source, 'healthy', True),
+            ep.error_rate > 0.5,
+            ep.weight,
+            ep.percentile(0.5) or 0.0
+        ))
+
+    def hedge_delay(self, endpoint: EndpointStats) -> float:
+        """Adaptive Verzögerung: p95 des Endpoints, begrenzt auf [min, max]"""
+        p95 = endpoint.percentile(0.95)
+        if p95 is None:
+            return self.initial_hedge_delay
+        return min(self.max_hedge_delay, max(self.min_hedge_delay, p95))
+
+    async def request(self, method: str, params: Optional[List] = None,
+                      min_slot: Optional[int] = None) -> Any:
+        """Führt einen RPC-Aufruf aus, Reads werden ggf. gehedged"""
+        if method not in READ_ONLY_METHODS:
+            return await self._call(self.ranked_endpoints()[0], method, params, min_slot)
+
+        # Identische Reads, die gerade laufen, teilen sich Ergebnis und Hedge
+        return await self.flight.do(
+            request_key(method, params, min_slot),
+            lambda: self._hedged_request(method, params, min_slot)
+        )
+
+    async def _hedged_request(self, method: str, params: Optional[List],
+                              min_slot: Optional[int]) -> Any:
+        ranked = self.ranked_endpoints()
+        candidates = ranked[:1 + self.max_hedges]
+        pending: Dict[asyncio.Task, EndpointStats] = {}
+        last_error: Optional[Exception] = None
+        launched = 0
+
+        try:
+            while True:
+                if not pending and launched < len(candidates):
+                    endpoint = candidates[launched]
+                    pending[asyncio.create_task(self._call(endpoint, method, params, min_slot))] = endpoint
+                    launched += 1
+
+                if not pending:
+                    raise last_error or RPCError(f"{method}: kein Endpoint erreichbar")
+
+                # Solange noch Hedges möglich sind, nur bis zur p95-Verzögerung warten
+                timeout = self.hedge_delay(candidates[launched - 1]) if launched < len(candidates) else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    endpoint = candidates[launched]
+                    self.hedges += 1
+                    logger.debug(f"{method}: Hedge an {endpoint.url}")
+                    pending[asyncio.create_task(self._call(endpoint, method, params, min_slot))] = endpoint
+                    launched += 1
+                    continue
+
+                for task in done:
+                    endpoint = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    endpoint.wins += 1
+                    return result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _call(self, endpoint: EndpointStats, method: str,
+                    params: Optional[List], min_slot: Optional[int]) -> Any:
+        self._request_id += 1
+        payload = {"jsonrpc": "2.0", "id": self._request_id, "method": method, "params": params or []}
+        endpoint.requests += 1
+        start = time.perf_counter()
+        try:
+            async with self.rate_limiter.limit(endpoint.url, method, self.priority, subsystem="hedged_rpc"):
+                async with self.transport.post(endpoint.url, json=payload, timeout=self.timeout) as response:
+                    if response.status == 429:
+                        self.rate_limiter.penalize(endpoint.url, float(response.headers.get('Retry-After', 1)))
+                    if response.status != 200:
+                        raise RPCError(f"{endpoint.url}: HTTP {response.status}")
+                    body = await response.json(content_type=None)
+
+            if "error" in body:
+                raise RPCError(f"{endpoint.url}: {body['error']}")
+            result = body.get("result")
+            self._check_slot(endpoint, slot_scope(method, params), result, min_slot)
+            endpoint.latencies.append(time.perf_counter() - start)
+            return result
+
+        except asyncio.CancelledError:
+            # Abgebrochene Requests zählen als Untergrenze, sonst wäre p95 zu optimistisch
+            endpoint.latencies.append(time.perf_counter() - start)
+            raise
+        except Exception:
+            endpoint.errors += 1
+            raise
+
+    def _check_slot(self, endpoint: EndpointStats, scope: Tuple[str, str], result: Any,
+                    min_slot: Optional[int]):
+        """Verwirft Antworten, deren Slot hinter dem für (Methode, Commitment) gesehenen Stand liegt"""
+        if not isinstance(result, dict) or "context" not in result:
+            return
+        slot = result["context"].get("slot", 0)
+        highest = self.highest_slots.get(scope, 0)
+        floor = max(min_slot or 0, highest - self.max_slot_lag)
+        if slot < floor:
+            self.stale_responses += 1
+            raise RPCError(f"{endpoint.url}: Slot {slot} hinter {floor} ({scope[0]}, {scope[1]})")
+        endpoint.highest_slot = max(endpoint.highest_slot, slot)
+        self.highest_slots[scope] = max(highest, slot)
+        self.highest_slot = max(self.highest_slot, slot)
+
+    def metrics(self) -> Dict:
+        return {
+            'hedges': self.hedges,
+            'stale_responses': self.stale_responses,
+            'highest_slot': self.highest_slot,
+            'endpoints': {
+                ep.url: {
+                    'requests': ep.requests,
+                    'errors': ep.errors,
+                    'wins': ep.wins,
+                    'p50': ep.percentile(0.5),
+                    'p95': ep.percentile(0.95),
+                    'hedge_delay': self.hedge_delay(ep),
+                }
+                for ep in self.endpoints
+            }
+        }
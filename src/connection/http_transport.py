@@ -0,0 +1,132 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Standard-Limits für gleichzeitige Verbindungen pro Host
+DEFAULT_HOST_LIMITS = {
+    "api.orca.so": 10,
+    "api.mainnet.orca.so": 10,
+}
+
+
+class HttpTransport:
+    """Gemeinsame, langlebige HTTP-Session mit Keep-Alive, DNS-Cache und Host-Limits"""
+
+    def __init__(self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        host_limits: Optional[Dict[str, int]] = None,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        timeout: float = 10.0
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.host_limits = {**DEFAULT_HOST_LIMITS, **(host_limits or {})}
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.requests = 0
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Die geteilte Session, wird beim ersten Zugriff angelegt"""
+        loop = asyncio.get_running_loop()
+        # Neue Session auch, wenn die alte an einen beendeten Event-Loop gebunden ist
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._loop = loop
+            self._host_semaphores.clear()
+        return self._session
+
+    def _host_semaphore(self, url: str) -> Optional[asyncio.Semaphore]:
+        host = urlsplit(url).hostname
+        limit = self.host_limits.get(host)
+        if limit is None:
+            return None
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(limit)
+        return semaphore
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs):
+        """Request über die geteilte Session (beachtet Host-Limits)"""
+        session = self.session
+        semaphore = self._host_semaphore(url)
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            self.requests += 1
+            async with session.request(method, url, **kwargs) as response:
+                yield response
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    async def get_json(self, url: str, params: Optional[Dict] = None, **kwargs) -> Optional[Any]:
+        """GET mit JSON-Antwort, None bei HTTP-Fehlern"""
+        async with self.get(url, params=params, **kwargs) as response:
+            if response.status != 200:
+                logger.warning(f"HTTP {response.status}: {url}")
+                return None
+            return await response.json(content_type=None)
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+_transport: Optional[HttpTransport] = None
+
+
+def get_http_transport() -> HttpTransport:
+    """Prozessweite Transport-Instanz"""
+    global _transport
+    if _transport is None:
+        _transport = HttpTransport()
+    return _transport
+
+
+@asynccontextmanager
+async def http_transport(**kwargs):
+    """Bindet den geteilten Transport an die Laufzeit des Bots"""
+    global _transport
+    if kwargs or _transport is None:
+        if _transport is not None:
+            await _transport.close()
+        _transport = HttpTransport(**kwargs)
+    try:
+        yield _transport
+    finally:
+        await _transport.close()
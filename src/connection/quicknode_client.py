@@ -6,6 +6,9 @@ from solana.rpc.async_api import AsyncClient
 from solana.publickey import PublicKey
 from dotenv import load_dotenv
 import os
+from src.whirlpool.account_decoder import decode_whirlpool
+from src.connection.ws_feed import SolanaWebsocketFeed
+from src.connection.batch_coalescer import get_batch_coalescer
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +19,11 @@ class QuickNodeClient:
         if not self.rpc_url:
             raise ValueError("QUICKNODE_RPC_URL nicht in .env gefunden")
             
+        self.ws_url = os.getenv("QUICKNODE_WS_URL") or self.rpc_url.replace("https://", "wss://", 1)
+            
         self.client: Optional[AsyncClient] = None
+        self.ws: Optional[SolanaWebsocketFeed] = None
+        self.batcher = get_batch_coalescer(self.rpc_url)
         self.whirlpool_program_id = PublicKey("whirLbMiicVdio4qvUfM5KAg6Ct8VwpYzGff3uctyCc")
         self.subscriptions = {}
         
@@ -35,11 +42,11 @@ class QuickNodeClient:
     async def get_pool_data(self, pool_address: str) -> Dict:
         """Hole Daten eines spezifischen Whirlpools"""
         try:
-            pool_pubkey = PublicKey(pool_address)
-            response = await self.client.get_account_info(pool_pubkey)
+            # Gleichzeitige Abfragen landen im selben JSON-RPC-Batch
+            result = await self.batcher.call("getAccountInfo", [pool_address, {"encoding": "base64"}])
             
-            if response['result']['value']:
-                return self._decode_pool_data(response['result']['value']['data'])
+            if result and result['value']:
+                return self._decode_pool_data(result['value']['data'])
             return None
         except Exception as e:
             logger.error(f"Fehler beim Abrufen von Pool {pool_address}: {e}")
@@ -48,52 +55,52 @@ class QuickNodeClient:
     async def subscribe_to_pool(self, pool_address: str, callback: Callable):
         """Subscribe zu Updates eines Pools"""
         try:
-            pool_pubkey = PublicKey(pool_address)
-            sub_id = await self.client.account_subscribe(
-                pool_pubkey,
-                commitment="confirmed",
-                encoding="jsonParsed"
-            )
+            if self.ws is None:
+                self.ws = SolanaWebsocketFeed(self.ws_url)
+                await self.ws.start()
+                
+            async def on_update(slot: int, value: Dict):
+                if not value:
+                    return
+                pool_data = self._decode_pool_data(value['data'])
+                if pool_data:
+                    pool_data['slot'] = slot
+                    result = callback(pool_data)
+                    if asyncio.iscoroutine(result):
+                        await result
+                        
+            sub_id = await self.ws.account_subscribe(pool_address, on_update)
             
             self.subscriptions[pool_address] = {
-                'sub_id': sub_id['result'],
+                'sub_id': sub_id,
                 'callback': callback
             }
             
             logger.info(f"Subscribed zu Pool {pool_address}")
-            return sub_id['result']
+            return sub_id
         except Exception as e:
             logger.error(f"Subscribe-Fehler für Pool {pool_address}: {e}")
             return None
             
     def _decode_pool_data(self, raw_data: bytes) -> Dict:
         """Decodiert die Whirlpool-Daten"""
-        try:
-            # Whirlpool-Layout-Dekodierung
-            data = {
-                'sqrtPrice': int.from_bytes(raw_data[0:8], 'little'),
-                'tickCurrentIndex': int.from_bytes(raw_data[8:16], 'little'),
-                'liquidity': int.from_bytes(raw_data[16:24], 'little'),
-                'feeGrowthGlobalA': int.from_bytes(raw_data[24:32], 'little'),
-                'feeGrowthGlobalB': int.from_bytes(raw_data[32:40], 'little')
-            }
-            
-            # Berechne den aktuellen Preis
-            price = (data['sqrtPrice'] / (2 ** 64)) ** 2
-            
-            return {
-                'price': price,
-                'liquidity': data['liquidity'] / (2 ** 64),
-                'tick_current': data['tickCurrentIndex'],
-                'fee_growth_a': data['feeGrowthGlobalA'],
-                'fee_growth_b': data['feeGrowthGlobalB']
-            }
-        except Exception as e:
-            logger.error(f"Fehler bei der Pool-Daten-Dekodierung: {e}")
+        data = decode_whirlpool(raw_data)
+        if data is None:
+            logger.error("Fehler bei der Pool-Daten-Dekodierung: ungültiger Account")
             return {}
             
+        return {
+            'price': data['price'],
+            'liquidity': data['liquidity'],
+            'tick_current': data['tick_current_index'],
+            'fee_growth_a': data['fee_growth_global_a'],
+            'fee_growth_b': data['fee_growth_global_b']
+        }
+            
     async def close(self):
         """Verbindung schließen"""
+        if self.ws:
+            await self.ws.close()
         if self.client:
             await self.client.close()
             
@@ -0,0 +1,301 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Deque, Dict, List, Optional
+
+from src.config.connections import RATE_LIMITS, RPC_PROVIDERS
+
+logger = logging.getLogger(__name__)
+
+# Teure RPC-Methoden bekommen ein eigenes, kleineres Budget innerhalb des Providers
+METHOD_CLASSES = {
+    'getProgramAccounts': 'heavy',
+    'getSignaturesForAddress': 'heavy',
+    'getTransaction': 'heavy',
+    'getMultipleAccounts': 'batch',
+    'sendTransaction': 'send',
+    'simulateTransaction': 'send',
+}
+
+# Anteil am requests_per_second des Providers
+METHOD_CLASS_SHARES = {
+    'heavy': 0.2,
+    'batch': 0.5,
+}
+
+
+class Priority(IntEnum):
+    """Kleinere Werte werden zuerst bedient"""
+    TRADE = 0
+    NORMAL = 1
+    SCANNER = 2
+
+
+class TokenBucket:
+    """Klassischer Token-Bucket mit kontinuierlichem Nachfüllen"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float, tokens: float = 1.0) -> float:
+        """Sekunden bis genug Tokens vorhanden sind"""
+        self._refill(now)
+        if self.tokens >= tokens:
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+    def consume(self, tokens: float = 1.0):
+        self.tokens -= tokens
+
+    def drain(self, now: float):
+        self._refill(now)
+        self.tokens = 0.0
+
+
+@dataclass
+class WaitStats:
+    """Wartezeiten in der Queue pro Priorität"""
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    def add(self, wait: float):
+        self.count += 1
+        self.total += wait
+        self.max = max(self.max, wait)
+        self.recent.append(wait)
+
+    def to_dict(self) -> Dict:
+        recent = sorted(self.recent)
+        return {
+            'count': self.count,
+            'avg_wait': self.total / self.count if self.count else 0.0,
+            'p95_wait': recent[int(len(recent) * 0.95)] if recent else 0.0,
+            'max_wait': self.max,
+        }
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    virtual_time: float
+    seq: int
+    method_class: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued: float = field(compare=False)
+
+
+class ProviderLimiter:
+    """Limits eines Providers: Token-Buckets, Concurrency, Priorität und faire Queue"""
+
+    def __init__(self,
+        name: str,
+        requests_per_second: float,
+        requests_per_minute: float,
+        concurrent_requests: int,
+        reserved_for_trade: Optional[int] = None
+    ):
+        self.name = name
+        self.requests_per_second = requests_per_second
+        self.second = TokenBucket(requests_per_second, requests_per_second)
+        self.minute = TokenBucket(requests_per_minute / 60.0, requests_per_minute)
+        self.class_buckets = {
+            method_class: TokenBucket(requests_per_second * share, max(1.0, requests_per_second * share))
+            for method_class, share in METHOD_CLASS_SHARES.items()
+        }
+        self.concurrent_requests = concurrent_requests
+        # Slots, die nur der Trade-Pfad belegen darf
+        self.reserved_for_trade = reserved_for_trade if reserved_for_trade is not None \
+            else max(1, concurrent_requests // 5)
+        self.active = 0
+        self.blocked_until = 0.0
+        self.wait_stats: Dict[Priority, WaitStats] = {priority: WaitStats() for priority in Priority}
+
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._virtual_time: Dict[str, float] = {}
+        self._clock = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _buckets(self, method_class: str) -> List[TokenBucket]:
+        buckets = [self.second, self.minute]
+        if method_class in self.class_buckets:
+            buckets.append(self.class_buckets[method_class])
+        return buckets
+
+    def _slot_available(self, priority: int) -> bool:
+        if priority == Priority.TRADE:
+            return self.active < self.concurrent_requests
+        return self.active < self.concurrent_requests - self.reserved_for_trade
+
+    def _next_virtual_time(self, subsystem: str) -> float:
+        """Faire Queue: jedes Subsystem bekommt reihum einen Slot pro Priorität"""
+        virtual_time = max(self._virtual_time.get(subsystem, 0.0), self._clock)
+        self._virtual_time[subsystem] = virtual_time + 1.0
+        return virtual_time
+
+    async def acquire(self, method_class: str, priority: Priority, subsystem: str) -> float:
+        """Wartet auf einen freien Slot, liefert die Wartezeit"""
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            priority=int(priority),
+            virtual_time=self._next_virtual_time(subsystem),
+            seq=next(self._seq),
+            method_class=method_class,
+            future=loop.create_future(),
+            enqueued=time.monotonic()
+        )
+        heapq.heappush(self._queue, waiter)
+        self._wake()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            # Slot wurde schon vergeben, der Aufrufer braucht ihn aber nicht mehr
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release()
+            raise
+
+        wait = time.monotonic() - waiter.enqueued
+        self.wait_stats[Priority(priority)].add(wait)
+        return wait
+
+    def release(self):
+        self.active -= 1
+        self._wake()
+
+    def penalize(self, retry_after: float):
+        """Nach einem 429: Buckets leeren und bis Retry-After pausieren"""
+        now = time.monotonic()
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        self.second.drain(now)
+        logger.warning(f"Rate Limit bei {self.name}, pausiere {retry_after:.1f}s")
+
+    def _wake(self):
+        loop = asyncio.get_running_loop()
+        if self._wakeup is None or self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._dispatcher = None
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def _dispatch(self):
+        while self._queue:
+            # Abgebrochene Anfragen verwerfen
+            while self._queue and self._queue[0].future.done():
+                heapq.heappop(self._queue)
+            if not self._queue:
+                break
+
+            waiter = self._queue[0]
+            now = time.monotonic()
+            delay = self.blocked_until - now
+            if delay <= 0:
+                delay = max(bucket.wait_time(now) for bucket in self._buckets(waiter.method_class))
+
+            if delay <= 0 and self._slot_available(waiter.priority):
+                heapq.heappop(self._queue)
+                for bucket in self._buckets(waiter.method_class):
+                    bucket.consume()
+                self.active += 1
+                self._clock = waiter.virtual_time
+                waiter.future.set_result(None)
+                continue
+
+            # Warten auf Tokens, freien Slot oder eine neue (ggf. wichtigere) Anfrage
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay if delay > 0 else None)
+            except asyncio.TimeoutError:
+                pass
+
+    def metrics(self) -> Dict:
+        return {
+            'active': self.active,
+            'queued': len(self._queue),
+            'wait': {priority.name.lower(): stats.to_dict() for priority, stats in self.wait_stats.items()},
+        }
+
+
+class RateLimiter:
+    """Zentraler Limiter für alle Provider aus RATE_LIMITS"""
+
+    def __init__(self,
+        limits: Dict[str, Dict] = RATE_LIMITS,
+        providers: Dict[Optional[str], str] = RPC_PROVIDERS
+    ):
+        self.limits = limits
+        self.providers = {host: name for host, name in providers.items() if host}
+        self._limiters: Dict[str, ProviderLimiter] = {}
+
+    def provider_for(self, url_or_name: str) -> Optional[str]:
+        """Ordnet eine URL (oder einen Providernamen) einem Provider zu"""
+        if url_or_name in self.limits:
+            return url_or_name
+        for host, name in self.providers.items():
+            if host in url_or_name:
+                return name
+        return None
+
+    def get_limiter(self, provider: str) -> ProviderLimiter:
+        limiter = self._limiters.get(provider)
+        if limiter is None:
+            limiter = self._limiters[provider] = ProviderLimiter(provider, **self.limits[provider])
+        return limiter
+
+    @asynccontextmanager
+    async def limit(self,
+        url_or_provider: str,
+        method: str = '',
+        priority: Priority = Priority.NORMAL,
+        subsystem: str = 'default'
+    ):
+        """Hält einen Slot für die Dauer des Requests; unbekannte Hosts laufen ungebremst"""
+        provider = self.provider_for(url_or_provider)
+        if provider is None:
+            yield 0.0
+            return
+
+        limiter = self.get_limiter(provider)
+        wait = await limiter.acquire(METHOD_CLASSES.get(method, 'default'), priority, subsystem)
+        try:
+            yield wait
+        finally:
+            limiter.release()
+
+    def penalize(self, url_or_provider: str, retry_after: float):
+        """Meldet eine 429-Antwort an den zuständigen Provider"""
+        provider = self.provider_for(url_or_provider)
+        if provider is not None:
+            self.get_limiter(provider).penalize(retry_after)
+
+    def metrics(self) -> Dict[str, Dict]:
+        return {name: limiter.metrics() for name, limiter in self._limiters.items()}
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Prozessweite Limiter-Instanz"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
@@ -9,6 +9,7 @@ import asyncio
 from typing import Optional, Dict
 import json
 from pathlib import Path
+from src.connection.batch_coalescer import get_batch_coalescer
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +17,7 @@ class SolanaClient:
     def __init__(self, rpc_manager):
         self.rpc_manager = rpc_manager
         self.client = None
+        self.batcher = None
         self.cache = TTLCache(maxsize=100, ttl=5)
         
     async def initialize(self):
@@ -26,6 +28,7 @@ class SolanaClient:
                 endpoint=endpoint.url,
                 commitment=Confirmed
             )
+            self.batcher = get_batch_coalescer(endpoint.url)
             logger.info("Solana client initialized")
             return True
         except Exception as e:
@@ -35,9 +38,9 @@ class SolanaClient:
     async def get_token_balance(self, token_account: str) -> Optional[float]:
         """Get token account balance"""
         try:
-            response = await self.client.get_token_account_balance(token_account)
-            if response.value:
-                return float(response.value.amount) / (10 ** response.value.decimals)
+            result = await self.batcher.call("getTokenAccountBalance", [str(token_account)], commitment=Confirmed)
+            if result and result['value']:
+                return float(result['value']['amount']) / (10 ** result['value']['decimals'])
         except Exception as e:
             logger.error(f"Failed to get token balance: {e}")
         return None
@@ -45,9 +48,9 @@ class SolanaClient:
     async def get_sol_balance(self, address: str) -> Optional[float]:
         """Get SOL balance"""
         try:
-            response = await self.client.get_balance(address)
-            if response.value is not None:
-                return float(response.value) / 1e9  # Convert lamports to SOL
+            result = await self.batcher.call("getBalance", [str(address)], commitment=Confirmed)
+            if result and result['value'] is not None:
+                return float(result['value']) / 1e9  # Convert lamports to SOL
         except Exception as e:
             logger.error(f"Failed to get SOL balance: {e}")
         return None
@@ -0,0 +1,365 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+import aiohttp
+
+from src.connection.account_poller import PoolSnapshot, WhirlpoolPoller
+from src.whirlpool.account_decoder import decode_whirlpool
+
+logger = logging.getLogger(__name__)
+
+WHIRLPOOL_PROGRAM_ID = "whirLbMiicVdio4qvUfM5KAg6Ct8VwpYzGff3uctyCc"
+
+NOTIFICATION_METHODS = ("accountNotification", "programNotification")
+UNSUBSCRIBE_METHODS = {
+    "accountSubscribe": "accountUnsubscribe",
+    "programSubscribe": "programUnsubscribe"
+}
+
+NotificationCallback = Callable[[int, Dict], Awaitable[None]]
+
+
+@dataclass
+class Subscription:
+    key: int
+    method: str
+    params: List
+    callback: NotificationCallback
+    server_id: Optional[int] = None
+
+
+class SolanaWebsocketFeed:
+    """Multiplexte account-/programSubscribe über eine WebSocket-Verbindung"""
+
+    def __init__(self,
+        ws_url: str,
+        session: Optional[aiohttp.ClientSession] = None,
+        commitment: str = "confirmed",
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        request_timeout: float = 10.0,
+        heartbeat: float = 30.0
+    ):
+        self.ws_url = ws_url
+        self.commitment = commitment
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.request_timeout = request_timeout
+        self.heartbeat = heartbeat
+        self.reconnects = 0
+
+        self._session = session
+        self._owns_session = session is None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._task: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+        self._closing = False
+        self._next_id = 0
+        self._subscriptions: Dict[int, Subscription] = {}
+        self._by_server_id: Dict[int, Subscription] = {}
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._subscribing: Set[int] = set()
+        self._notifications: asyncio.Queue = asyncio.Queue()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set() and self._ws is not None and not self._ws.closed
+
+    async def start(self):
+        """Startet den Verbindungs-Loop im Hintergrund"""
+        self._closing = False
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    async def connect(self, timeout: Optional[float] = None) -> bool:
+        """Startet den Feed und wartet auf die erste Verbindung"""
+        await self.start()
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout or self.request_timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"WebSocket {self.ws_url} nicht erreichbar")
+            return False
+
+    async def reconnect(self):
+        """Erzwingt einen Reconnect, Subscriptions werden erneuert"""
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+        await self.start()
+
+    async def close(self):
+        """Beendet Feed und Verbindung"""
+        self._closing = True
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+        for task in (self._task, self._dispatcher):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._dispatcher = None
+        if self._owns_session and self._session and not self._session.closed:
+            await self._session.close()
+
+    async def account_subscribe(self, address: str, callback: NotificationCallback,
+                                encoding: str = "base64") -> int:
+        """Abonniert Änderungen eines Accounts"""
+        return await self._add(
+            "accountSubscribe",
+            [address, {"encoding": encoding, "commitment": self.commitment}],
+            callback
+        )
+
+    async def program_subscribe(self, program_id: str, callback: NotificationCallback,
+                                filters: Optional[List[Dict]] = None,
+                                encoding: str = "base64") -> int:
+        """Abonniert alle Account-Änderungen eines Programms"""
+        config = {"encoding": encoding, "commitment": self.commitment}
+        if filters:
+            config["filters"] = filters
+        return await self._add("programSubscribe", [program_id, config], callback)
+
+    async def unsubscribe(self, key: int):
+        """Beendet eine Subscription"""
+        subscription = self._subscriptions.pop(key, None)
+        if subscription is None or subscription.server_id is None:
+            return
+        self._by_server_id.pop(subscription.server_id, None)
+        if self.connected:
+            try:
+                await self._request(UNSUBSCRIBE_METHODS[subscription.method], [subscription.server_id])
+            except Exception as e:
+                logger.warning(f"Unsubscribe fehlgeschlagen: {e}")
+
+    async def _add(self, method: str, params: List, callback: NotificationCallback) -> int:
+        self._next_id += 1
+        subscription = Subscription(self._next_id, method, params, callback)
+        self._subscriptions[subscription.key] = subscription
+
+        # Ohne Verbindung wird beim nächsten Connect abonniert
+        if self.connected:
+            try:
+                await self._send_subscribe(subscription)
+            except Exception as e:
+                logger.warning(f"{method} fehlgeschlagen, erneuter Versuch nach Reconnect: {e}")
+        return subscription.key
+
+    async def _send_subscribe(self, subscription: Subscription):
+        # Laufende oder bestätigte Subscriptions nicht doppelt senden
+        if subscription.server_id is not None or subscription.key in self._subscribing:
+            return
+        self._subscribing.add(subscription.key)
+        try:
+            server_id = await self._request(subscription.method, subscription.params)
+        finally:
+            self._subscribing.discard(subscription.key)
+        subscription.server_id = server_id
+        self._by_server_id[server_id] = subscription
+
+    async def _subscribe_pending(self):
+        await asyncio.gather(*(
+            self._send_subscribe(subscription)
+            for subscription in list(self._subscriptions.values())
+            if subscription.server_id is None
+        ))
+
+    async def _request(self, method: str, params: List):
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._ws.send_json({
+                "jsonrpc": "2.0", "id": request_id, "method": method, "params": params
+            })
+            return await asyncio.wait_for(future, self.request_timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while not self._closing:
+            try:
+                if self._session is None or self._session.closed:
+                    self._session = aiohttp.ClientSession()
+                    self._owns_session = True
+
+                async with self._session.ws_connect(self.ws_url, heartbeat=self.heartbeat) as ws:
+                    self._ws = ws
+                    reader = asyncio.create_task(self._read_loop(ws))
+                    try:
+                        await self._subscribe_pending()
+                        self._connected.set()
+                        # Während des Resubscribe hinzugekommene Subscriptions nachreichen
+                        await self._subscribe_pending()
+                        delay = self.reconnect_delay
+                        logger.info(f"WebSocket verbunden: {len(self._subscriptions)} Subscriptions aktiv")
+                        await reader
+                    finally:
+                        reader.cancel()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"WebSocket-Fehler: {e}")
+            finally:
+                self._on_disconnect()
+
+            if self._closing:
+                break
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _on_disconnect(self):
+        self._connected.clear()
+        self._ws = None
+        self._by_server_id.clear()
+        self._subscribing.clear()
+        for subscription in self._subscriptions.values():
+            subscription.server_id = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("WebSocket getrennt"))
+
+    async def _read_loop(self, ws: aiohttp.ClientWebSocketResponse):
+        async for msg in ws:
+            if msg.type == aiohttp.WSMsgType.TEXT:
+                await self._dispatch(json.loads(msg.data))
+            elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                break
+
+    async def _dispatch(self, message: Dict):
+        request_id = message.get("id")
+        if request_id is not None:
+            future = self._pending.get(request_id)
+            if future and not future.done():
+                if "error" in message:
+                    future.set_exception(RuntimeError(message["error"]))
+                else:
+                    future.set_result(message.get("result"))
+            return
+
+        if message.get("method") not in NOTIFICATION_METHODS:
+            return
+
+        params = message["params"]
+        subscription = self._by_server_id.get(params["subscription"])
+        if subscription is None:
+            return
+
+        # Callbacks laufen nicht im Reader: ein Callback, der selbst einen Request
+        # auf dieser Verbindung absetzt, würde sonst auf seine eigene Antwort warten
+        result = params["result"]
+        self._notifications.put_nowait((subscription, result["context"]["slot"], result["value"]))
+
+    async def _dispatch_loop(self):
+        """Arbeitet Notifications in Empfangsreihenfolge ab"""
+        while True:
+            subscription, slot, value = await self._notifications.get()
+            if subscription.key not in self._subscriptions:
+                continue
+            try:
+                await subscription.callback(slot, value)
+            except Exception as e:
+                logger.error(f"Fehler im Subscription-Callback: {e}")
+
+
+class WhirlpoolFeed:
+    """Push-Feed für Whirlpools mit Polling als Fallback"""
+
+    def __init__(self,
+        ws_url: str,
+        rpc_url: str,
+        handler: Callable[[PoolSnapshot], Awaitable[None]],
+        session: Optional[aiohttp.ClientSession] = None,
+        poll_interval: float = 5.0,
+        stale_after: float = 10.0
+    ):
+        self.ws = SolanaWebsocketFeed(ws_url, session=session)
+        self.poller = WhirlpoolPoller(rpc_url, session=session)
+        self.handler = handler
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.addresses: List[str] = []
+        self.last_slots: Dict[str, int] = {}
+        self.last_updates: Dict[str, float] = {}
+        self._fallback_task: Optional[asyncio.Task] = None
+
+    async def start(self, addresses: List[str]):
+        """Abonniert die Pools und startet den Polling-Fallback"""
+        for address in addresses:
+            await self.add_pool(address)
+        await self.ws.start()
+        if self._fallback_task is None or self._fallback_task.done():
+            self._fallback_task = asyncio.create_task(self._fallback_loop())
+
+    async def add_pool(self, address: str):
+        """Fügt einen Pool zum Feed hinzu"""
+        if address in self.addresses:
+            return
+        self.addresses.append(address)
+        await self.ws.account_subscribe(address, partial(self._on_account, address))
+
+    async def subscribe_program(self, program_id: str = WHIRLPOOL_PROGRAM_ID,
+                                filters: Optional[List[Dict]] = None) -> int:
+        """Abonniert alle Whirlpool-Accounts eines Programms auf derselben Verbindung"""
+        return await self.ws.program_subscribe(program_id, self._on_program, filters)
+
+    async def _on_account(self, address: str, slot: int, value: Optional[Dict]):
+        if value:
+            await self._deliver(address, slot, decode_whirlpool(value["data"]))
+
+    async def _on_program(self, slot: int, value: Dict):
+        await self._deliver(value["pubkey"], slot, decode_whirlpool(value["account"]["data"]))
+
+    async def _deliver(self, address: str, slot: int, data: Optional[Dict]):
+        """Liefert nur Updates mit neuerem Slot aus (WebSocket und Polling gemischt)"""
+        if data is None or slot <= self.last_slots.get(address, -1):
+            return
+        self.last_slots[address] = slot
+        self.last_updates[address] = time.time()
+        await self.handler(PoolSnapshot(address=address, slot=slot, data=data))
+
+    async def _fallback_loop(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if self.ws.connected:
+                    now = time.time()
+                    addresses = [
+                        address for address in self.addresses
+                        if now - self.last_updates.get(address, 0) > self.stale_after
+                    ]
+                else:
+                    addresses = self.addresses
+
+                for chunk in await self.poller.poll(addresses):
+                    for i, address in enumerate(chunk.batch.addresses):
+                        if chunk.batch.valid[i]:
+                            await self._deliver(address, chunk.slot, chunk.batch.to_dict(i))
+            except Exception as e:
+                logger.error(f"Fehler im Polling-Fallback: {e}")
+
+    async def close(self):
+        """Stoppt Feed und Fallback"""
+        if self._fallback_task:
+            self._fallback_task.cancel()
+            try:
+                await self._fallback_task
+            except asyncio.CancelledError:
+                pass
+            self._fallback_task = None
+        await self.ws.close()
+        await self.poller.close()
@@ -4,6 +4,9 @@ import requests
 import time
 import asyncio
 import aiohttp
+from src.connection.batch_coalescer import COALESCABLE_METHODS, get_batch_coalescer
+from src.connection.hedged_rpc import HedgedRPCClient
+from src.connection.http_transport import get_http_transport
 
 init()
 
@@ -19,6 +22,8 @@ class ConnectionManager:
             "https://api.mainnet-beta.solana.com",
             "https://solana-api.projectserum.com"
         ]
+        self.batcher = None
+        self.hedged = None
 
     def get_best_rpc(self):
         """Find fastest RPC endpoint"""
@@ -79,26 +84,27 @@ class ConnectionManager:
             
             await asyncio.sleep(60)
 
-    async def optimize_batch_requests(self):
-        # Request Batching
-        self.request_queue = asyncio.Queue()
-        self.batch_size = 20
-        self.batch_timeout = 0.1  # 100ms
-        
-        while True:
-            batch = []
-            try:
-                while len(batch) < self.batch_size:
-                    request = await asyncio.wait_for(
-                        self.request_queue.get(),
-                        timeout=self.batch_timeout
-                    )
-                    batch.append(request)
-            except asyncio.TimeoutError:
-                pass
-                
-            if batch:
-                await self._execute_batch(batch)
+    async def optimize_batch_requests(self, flush_interval: float = 0.1, max_batch_size: int = 20):
+        """Bündelt gleichzeitige RPC-Reads in JSON-RPC-Batches"""
+        rpc_url = getattr(self.active_rpc, 'url', self.active_rpc) or self.rpc_endpoints[0]
+        self.batcher = get_batch_coalescer(
+            rpc_url,
+            flush_interval=flush_interval,
+            max_batch_size=max_batch_size
+        )
+        return self.batcher
+
+    async def rpc_request(self, method, params=None):
+        """RPC-Aufruf, leichte Reads laufen über den Batch-Coalescer, der Rest über den Hedged-Client"""
+        if self.batcher is None:
+            await self.optimize_batch_requests()
+        if method in COALESCABLE_METHODS:
+            return await self.batcher.call(method, params)
+
+        if self.hedged is None:
+            # Reihenfolge und Gewichte der Hedges aus der Config (RPCEndpoint.weight/healthy)
+            self.hedged = HedgedRPCClient(self.rpcs, transport=get_http_transport())
+        return await self.hedged.request(method, params)
 
     async def _measure_latency(self, endpoint):
         start = time.time()
@@ -113,8 +119,3 @@ class ConnectionManager:
     def _calculate_weights(self, latencies):
         total = sum(1/l for l in latencies.values())
         return {ep: (1/lat)/total for ep, lat in latencies.items()}
-
-    async def _execute_batch(self, batch):
-        async with aiohttp.ClientSession() as session:
-            tasks = [self._execute_request(session, req) for req in batch]
-            return await asyncio.gather(*tasks)
\ No newline at end of file
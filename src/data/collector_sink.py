@@ -0,0 +1,249 @@
+import logging
+import os
+import re
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COLUMNS = {
+    'price': 'float64',
+    'liquidity': 'float64',
+    'sqrt_price': 'float64',
+}
+
+# Numerische Felder aus account_decoder.decode_whirlpool; float64, damit fehlende Werte NaN sein können
+WHIRLPOOL_COLUMNS = {
+    **DEFAULT_COLUMNS,
+    'tick_current_index': 'float64',
+    'tick_spacing': 'float64',
+    'fee_rate': 'float64',
+    'protocol_fee_rate': 'float64',
+    'fee_growth_global_a': 'float64',
+    'fee_growth_global_b': 'float64',
+}
+
+_PART = re.compile(r'part-(\d+)\.parquet$')
+_COMPACT = re.compile(r'compact-(\d+)\.parquet$')
+
+
+def partition_files(directory: Path) -> List[Path]:
+    """Gültige Dateien einer Partition ohne aufzuräumen (für Leser wie den Katalog)"""
+    parts, compacted = ParquetCollectorSink._scan(directory)
+    files = [compacted[1]] if compacted else []
+    files.extend(path for seq, path in parts if not compacted or seq > compacted[0])
+    return files
+
+
+class _PoolBuffer:
+    """Typisierte Spaltenpuffer fester Größe für einen Pool"""
+
+    def __init__(self, columns: Dict[str, str], capacity: int):
+        self.timestamps = np.empty(capacity, dtype='datetime64[ns]')
+        self.columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in columns.items()}
+        self.size = 0
+        self.day: Optional[date] = None
+        self.first_append = 0.0
+
+
+class ParquetCollectorSink:
+    """Streamt Sammeldaten als Parquet-Row-Groups, partitioniert nach Pool und Tag"""
+
+    # Layout: <base_dir>/pool=<adresse>/day=<YYYY-MM-DD>/part-<seq>.parquet
+    # Jeder Flush schreibt einen Part atomar (tmp + rename), ein Absturz kostet also
+    # höchstens den aktuellen Puffer. compact() fasst die Parts eines Tages zu einer
+    # Datei mit mehreren Row-Groups zusammen; Parts bis zur Sequenz im Dateinamen
+    # der Compact-Datei sind darin enthalten und werden beim Öffnen aufgeräumt.
+
+    def __init__(self,
+        base_dir: Path,
+        columns: Dict[str, str] = DEFAULT_COLUMNS,
+        flush_rows: int = 1000,
+        flush_seconds: float = 300.0,
+        compression: str = 'snappy'
+    ):
+        self.base_dir = Path(base_dir)
+        self.columns = dict(columns)
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.compression = compression
+        self.rows_written = 0
+        self.parts_written = 0
+
+        self._buffers: Dict[str, _PoolBuffer] = {}
+        self._next_seq: Dict[Path, int] = {}
+        self._touched: set = set()
+        self._ignored: set = set()
+        self._schema = pa.schema(
+            [pa.field('timestamp', pa.timestamp('ns'))]
+            + [pa.field(name, pa.from_numpy_dtype(np.dtype(dtype))) for name, dtype in self.columns.items()]
+        )
+
+    def partition_dir(self, pool: str, day: date) -> Path:
+        return self.base_dir / f"pool={pool}" / f"day={day:%Y-%m-%d}"
+
+    # --- Schreiben ---
+
+    def append(self, pool: str, timestamp: datetime, **values):
+        """Puffert einen Datenpunkt; unbekannte Felder werden verworfen (einmal geloggt), fehlende als NaN gespeichert"""
+        unknown = values.keys() - self.columns.keys() - self._ignored
+        if unknown:
+            self._ignored |= unknown
+            logger.warning(f"Felder ohne Spalte im Sink werden verworfen: {sorted(unknown)}")
+
+        buffer = self._buffers.get(pool)
+        if buffer is None:
+            buffer = self._buffers[pool] = _PoolBuffer(self.columns, self.flush_rows)
+
+        day = timestamp.date()
+        if buffer.day is not None and day != buffer.day:
+            # Tageswechsel: Vortag abschließen, Puffer gehört immer zu genau einer Partition
+            finished = buffer.day
+            self._flush_buffer(pool, buffer)
+            self.compact(pool, finished)
+
+        if buffer.size == 0:
+            buffer.day = day
+            buffer.first_append = time.monotonic()
+
+        i = buffer.size
+        buffer.timestamps[i] = np.datetime64(timestamp, 'ns')
+        for name, column in buffer.columns.items():
+            value = values.get(name)
+            column[i] = np.nan if value is None else value
+        buffer.size += 1
+
+        if buffer.size >= self.flush_rows or time.monotonic() - buffer.first_append >= self.flush_seconds:
+            self._flush_buffer(pool, buffer)
+
+    def flush(self):
+        """Schreibt alle gepufferten Punkte als neue Parts"""
+        for pool, buffer in self._buffers.items():
+            self._flush_buffer(pool, buffer)
+
+    def _flush_buffer(self, pool: str, buffer: _PoolBuffer):
+        if buffer.size == 0:
+            return
+        n = buffer.size
+        table = pa.Table.from_arrays(
+            [pa.array(buffer.timestamps[:n])] + [pa.array(buffer.columns[name][:n]) for name in self.columns],
+            schema=self._schema
+        )
+
+        directory = self.partition_dir(pool, buffer.day)
+        seq = self._allocate_seq(directory)
+        path = directory / f"part-{seq:06d}.parquet"
+        tmp = path.with_suffix('.tmp')
+        pq.write_table(table, tmp, compression=self.compression)
+        os.replace(tmp, path)
+
+        self._touched.add((pool, buffer.day))
+        self.rows_written += n
+        self.parts_written += 1
+        buffer.size = 0
+
+    def _allocate_seq(self, directory: Path) -> int:
+        """Nächste Part-Nummer; beim ersten Zugriff wird der Stand auf der Platte übernommen (Resume)"""
+        seq = self._next_seq.get(directory)
+        if seq is None:
+            directory.mkdir(parents=True, exist_ok=True)
+            for tmp in directory.glob('*.tmp'):
+                tmp.unlink()  # Reste eines abgebrochenen Flushs
+            parts, compacted = self._scan(directory)
+            seq = max([s for s, _ in parts] + [compacted[0] if compacted else 0]) + 1
+        self._next_seq[directory] = seq + 1
+        return seq
+
+    # --- Compaction ---
+
+    @staticmethod
+    def _scan(directory: Path) -> Tuple[List[Tuple[int, Path]], Optional[Tuple[int, Path]]]:
+        parts, compacted = [], None
+        for path in directory.glob('*.parquet'):
+            match = _PART.match(path.name)
+            if match:
+                parts.append((int(match.group(1)), path))
+                continue
+            match = _COMPACT.match(path.name)
+            if match and (compacted is None or int(match.group(1)) > compacted[0]):
+                compacted = (int(match.group(1)), path)
+        parts.sort()
+        return parts, compacted
+
+    def _live_files(self, directory: Path) -> List[Path]:
+        """Gültige Dateien einer Partition; bereits kompaktierte Parts werden entfernt"""
+        parts, compacted = self._scan(directory)
+        files = []
+        if compacted:
+            files.append(compacted[1])
+            for path in directory.glob('compact-*.parquet'):
+                if path != compacted[1]:
+                    path.unlink()
+        for seq, path in parts:
+            if compacted and seq <= compacted[0]:
+                path.unlink()
+            else:
+                files.append(path)
+        return files
+
+    def compact(self, pool: str, day: date) -> Optional[Path]:
+        """Fasst alle Parts eines Tages zu einer Datei zusammen (Row-Group für Row-Group)"""
+        directory = self.partition_dir(pool, day)
+        if not directory.exists():
+            return None
+        files = self._live_files(directory)
+        parts, _ = self._scan(directory)
+        if not parts:
+            return files[0] if files else None
+
+        max_seq = parts[-1][0]
+        target = directory / f"compact-{max_seq:06d}.parquet"
+        tmp = target.with_suffix('.tmp')
+        with pq.ParquetWriter(tmp, self._schema, compression=self.compression) as writer:
+            for path in files:
+                source = pq.ParquetFile(path)
+                for i in range(source.num_row_groups):
+                    writer.write_table(source.read_row_group(i).cast(self._schema))
+        os.replace(tmp, target)
+        self._live_files(directory)
+        self._touched.discard((pool, day))
+        return target
+
+    def close(self):
+        """Puffer schreiben und alle angefassten Tage kompaktieren"""
+        self.flush()
+        for pool, day in sorted(self._touched):
+            try:
+                self.compact(pool, day)
+            except Exception as e:
+                logger.error(f"Compaction für {pool} am {day} fehlgeschlagen: {e}")
+
+    # --- Lesen ---
+
+    def load(self, pool: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
+        """Lädt die gespeicherten Punkte eines Pools, optional auf [start, end] begrenzt"""
+        pool_dir = self.base_dir / f"pool={pool}"
+        frames = []
+        filters = [('timestamp', op, pd.Timestamp(bound)) for op, bound in (('>=', start), ('<=', end)) if bound] or None
+        for directory in sorted(pool_dir.glob('day=*')) if pool_dir.exists() else []:
+            day = datetime.strptime(directory.name[4:], '%Y-%m-%d').date()
+            if (start and day < start.date()) or (end and day > end.date()):
+                continue
+            # Zeitfilter geht als Prädikat an Parquet, Row-Groups außerhalb werden übersprungen
+            frames.extend(pq.read_table(path, filters=filters).to_pandas() for path in self._live_files(directory))
+
+        if not frames:
+            return pd.DataFrame(columns=['timestamp', *self.columns])
+        df = pd.concat(frames, ignore_index=True).sort_values('timestamp', kind='stable')
+        if start:
+            df = df[df['timestamp'] >= pd.Timestamp(start)]
+        if end:
+            df = df[df['timestamp'] <= pd.Timestamp(end)]
+        return df.reset_index(drop=True)
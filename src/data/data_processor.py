@@ -1,12 +1,15 @@
 from typing import Dict, List, Optional
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import asyncio
-import aioredis
+import redis.asyncio as redis
 import logging
 from dataclasses import dataclass
-import json
+from src.data.indicators import IndicatorEngine
+from src.data.record_codec import (
+    RECORD_DTYPE, decode_block, decode_record, decode_records, encode_block, encode_record
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,24 +28,52 @@ class DataProcessor:
     def __init__(self, config: Dict):
         self.config = config
         self.cache = {}
+        self.indicators = IndicatorEngine()
         self.redis = None
         self.processing_queue = asyncio.Queue()
         self.pipeline_running = False
         
-    async def initialize(self):
+        # Redis-Writes werden pro Fenster über alle Pools gesammelt und gepipelined
+        self.write_interval = config.get('redis_write_interval', 0.05)
+        self.max_pending_writes = config.get('redis_max_pending', 500)
+        self.retention = timedelta(days=config.get('history_retention_days', 7))
+        self.retention_interval = config.get('retention_interval', 60)
+        self.history_limit = config.get('history_limit', 10_000)
+        self.hot_history = timedelta(hours=config.get('hot_history_hours', 24))
+        self._pending_latest: Dict[str, bytes] = {}
+        self._pending_history: Dict[str, Dict[bytes, int]] = {}
+        self._pending_count = 0
+        self._known_pools = set()
+        self._flush_event = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        
+    async def initialize(self, client: Optional[redis.Redis] = None):
         """Initialisiert Redis-Verbindung"""
         try:
-            self.redis = await aioredis.create_redis_pool(
-                self.config['redis_url'],
-                encoding='utf-8'
-            )
+            # Binäre Records: Antworten nicht als UTF-8 dekodieren
+            self.redis = client or redis.from_url(self.config['redis_url'])
+            await self.redis.ping()
             # Start Background Tasks
-            asyncio.create_task(self._process_queue())
+            self._tasks = [
+                asyncio.create_task(self._process_queue()),
+                asyncio.create_task(self._write_loop()),
+                asyncio.create_task(self._retention_loop())
+            ]
             return True
         except Exception as e:
             logger.error(f"Redis connection failed: {e}")
             return False
             
+    async def close(self):
+        """Schreibt offene Daten und schließt die Redis-Verbindung"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.flush_writes()
+        if self.redis:
+            await self.redis.aclose()
+            
     async def process_market_data(self, raw_data: Dict) -> MarketData:
         """Verarbeitet Rohdaten"""
         try:
@@ -80,29 +111,18 @@ class DataProcessor:
                 
             except Exception as e:
                 logger.error(f"Queue processing error: {e}")
-            await asyncio.sleep(0.1)
+                await asyncio.sleep(0.1)
             
     async def _calculate_indicators(self, data: Dict) -> Dict:
         """Berechnet technische Indikatoren"""
         try:
-            # Historie laden
-            history = await self._get_price_history(data['address'])
-            df = pd.DataFrame(history)
-            
-            if len(df) > 0:
-                # Indikatoren berechnen
-                df['sma_20'] = df['price'].rolling(window=20).mean()
-                df['ema_50'] = df['price'].ewm(span=50).mean()
-                df['rsi'] = self._calculate_rsi(df['price'])
-                df['volatility'] = df['price'].rolling(window=20).std()
+            address = data['address']
+            # Historie nur beim ersten Tick eines Pools laden, danach O(1)-Updates
+            if not self.indicators.has_pool(address):
+                history = await self._get_price_history(address)
+                self.indicators.seed(address, history['price'])
                 
-                return {
-                    'sma_20': df['sma_20'].iloc[-1],
-                    'ema_50': df['ema_50'].iloc[-1],
-                    'rsi': df['rsi'].iloc[-1],
-                    'volatility': df['volatility'].iloc[-1]
-                }
-            return {}
+            return self.indicators.update(address, float(data['price']))
             
         except Exception as e:
             logger.error(f"Indicator calculation error: {e}")
@@ -114,32 +134,110 @@ class DataProcessor:
             # Memory Cache
             self.cache[pool_address] = data
             
-            # Redis Cache
+            # Redis Cache: nur vormerken, geschrieben wird gebündelt im nächsten Fenster
             if self.redis:
-                # Compress & Store
-                await self.redis.hset(
-                    f"pool:{pool_address}",
-                    "latest",
-                    self._compress_data(data)
-                )
+                timestamp = int(datetime.now().timestamp())
+                compressed = self._compress_data(data, timestamp)
+                self._pending_latest[pool_address] = compressed
+                self._pending_history.setdefault(pool_address, {})[compressed] = timestamp
+                self._known_pools.add(pool_address)
+                self._pending_count += 1
+                if self._pending_count >= self.max_pending_writes:
+                    self._flush_event.set()
                 
-                # Historie aktualisieren
-                await self.redis.zadd(
-                    f"history:{pool_address}",
-                    int(datetime.now().timestamp()),
-                    self._compress_data(data)
-                )
+        except Exception as e:
+            logger.error(f"Cache update error: {e}")
+            
+    async def _write_loop(self):
+        """Schreibt gesammelte Updates einmal pro Fenster (oder bei voller Queue)"""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), self.write_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            await self.flush_writes()
+            
+    async def flush_writes(self) -> int:
+        """Schreibt alle vorgemerkten Updates in einem Pipeline-Roundtrip"""
+        if not self.redis or not self._pending_latest:
+            return 0
+            
+        latest, history = self._pending_latest, self._pending_history
+        self._pending_latest, self._pending_history = {}, {}
+        count, self._pending_count = self._pending_count, 0
+        
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for pool_address, compressed in latest.items():
+                    pipe.hset(f"pool:{pool_address}", "latest", compressed)
+                    pipe.zadd(f"history:{pool_address}", history[pool_address])
+                await pipe.execute()
+            return count
+            
+        except Exception as e:
+            # Zurück in den Puffer; neuere Updates aus der Zwischenzeit haben Vorrang
+            for pool_address, compressed in latest.items():
+                self._pending_latest.setdefault(pool_address, compressed)
+                self._pending_history[pool_address] = {**history[pool_address], **self._pending_history.get(pool_address, {})}
+            self._pending_count += count
+            logger.error(f"Redis write error ({count} Updates für den nächsten Flush vorgemerkt): {e}")
+            return 0
+            
+    async def _retention_loop(self):
+        """Entfernt alte Historie periodisch statt bei jedem Write"""
+        while True:
+            await asyncio.sleep(self.retention_interval)
+            await self.archive_cold_history()
+            await self.trim_history()
+            
+    async def archive_cold_history(self):
+        """Verschiebt Einträge außerhalb des heißen Fensters als komprimierte Tagesblöcke ins Archiv"""
+        if not self.redis or not self._known_pools:
+            return
+        try:
+            cutoff = int((datetime.now() - self.hot_history).timestamp())
+            pools = list(self._known_pools)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for pool_address in pools:
+                    pipe.zrange(f"history:{pool_address}", 0, cutoff, byscore=True)
+                cold = await pipe.execute()
                 
-                # Alte Daten löschen
-                cutoff = int((datetime.now() - timedelta(days=7)).timestamp())
-                await self.redis.zremrangebyscore(
-                    f"history:{pool_address}",
-                    0,
-                    cutoff
-                )
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for pool_address, members in zip(pools, cold):
+                    if not members:
+                        continue
+                    records = decode_records(members)
+                    days = records['timestamp'] // 86400
+                    for day in np.unique(days):
+                        key = f"archive:{pool_address}:{datetime.fromtimestamp(int(day) * 86400, tz=timezone.utc):%Y%m%d}"
+                        pipe.rpush(key, encode_block(records[days == day]))
+                        pipe.expire(key, int(self.retention.total_seconds()))
+                    pipe.zremrangebyscore(f"history:{pool_address}", 0, cutoff)
+                await pipe.execute()
                 
         except Exception as e:
-            logger.error(f"Cache update error: {e}")
+            logger.error(f"History archive error: {e}")
+            
+    async def get_archived_history(self, pool_address: str, day: datetime) -> np.ndarray:
+        """Lädt die archivierten Records eines Tages (UTC)"""
+        blocks = await self.redis.lrange(f"archive:{pool_address}:{day:%Y%m%d}", 0, -1)
+        if not blocks:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.concatenate([decode_block(block) for block in blocks])
+            
+    async def trim_history(self):
+        """Löscht Historie älter als die Retention für alle bekannten Pools"""
+        if not self.redis or not self._known_pools:
+            return
+        try:
+            cutoff = int((datetime.now() - self.retention).timestamp())
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for pool_address in self._known_pools:
+                    pipe.zremrangebyscore(f"history:{pool_address}", 0, cutoff)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"History cleanup error: {e}")
             
     async def get_cached_data(self, pool_address: str) -> Optional[Dict]:
         """Holt gecachte Daten"""
@@ -152,7 +250,7 @@ class DataProcessor:
             if self.redis:
                 data = await self.redis.hget(f"pool:{pool_address}", "latest")
                 if data:
-                    return self._decompress_data(data)
+                    return decode_record(data)
                     
             return None
             
@@ -160,80 +258,35 @@ class DataProcessor:
             logger.error(f"Cache retrieval error: {e}")
             return None
             
-    async def _get_price_history(self, pool_address: str) -> List[Dict]:
-        """Holt Preishistorie"""
+    async def _get_price_history(self, pool_address: str) -> np.ndarray:
+        """Holt Preishistorie als strukturiertes Array (RECORD_DTYPE)"""
         try:
             if self.redis:
                 # Letzte 24h
                 start = int((datetime.now() - timedelta(hours=24)).timestamp())
                 end = int(datetime.now().timestamp())
                 
-                data = await self.redis.zrangebyscore(
+                # Ein ZRANGE BYSCORE REV LIMIT: die jüngsten history_limit Einträge
+                data = await self.redis.zrange(
                     f"history:{pool_address}",
+                    end,
                     start,
-                    end
+                    desc=True,
+                    byscore=True,
+                    offset=0,
+                    num=self.history_limit
                 )
                 
-                return [self._decompress_data(d) for d in data]
-            return []
+                return decode_records(data[::-1])
             
         except Exception as e:
             logger.error(f"History retrieval error: {e}")
-            return [] 
+        return np.empty(0, dtype=RECORD_DTYPE)
             
-    def _calculate_rsi(self, prices: pd.Series, periods: int = 14) -> pd.Series:
-        """Berechnet RSI Indikator"""
-        delta = prices.diff()
-        
-        # Gewinne und Verluste trennen
-        gains = delta.copy()
-        losses = delta.copy()
-        gains[gains < 0] = 0
-        losses[losses > 0] = 0
-        losses = abs(losses)
-        
-        # Erste Durchschnitte
-        avg_gain = gains.rolling(window=periods).mean()
-        avg_loss = losses.rolling(window=periods).mean()
-        
-        # RSI Berechnung
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+    def _compress_data(self, data: Dict, timestamp: int) -> bytes:
+        """Packt Daten als Binär-Record für Redis"""
+        return encode_record(data, timestamp)
         
-    def _compress_data(self, data: Dict) -> str:
-        """Komprimiert Daten für Redis"""
-        try:
-            # Nur wichtige Felder speichern
-            compressed = {
-                'price': float(data['price']),
-                'volume': float(data.get('volume', 0)),
-                'liquidity': float(data.get('liquidity', 0)),
-                'timestamp': int(datetime.now().timestamp())
-            }
-            
-            if 'indicators' in data:
-                compressed['indicators'] = {
-                    k: float(v) for k, v in data['indicators'].items()
-                }
-                
-            return json.dumps(compressed)
-            
-        except Exception as e:
-            logger.error(f"Compression error: {e}")
-            return "{}"
-            
-    def _decompress_data(self, data_str: str) -> Dict:
-        """Dekomprimiert Redis-Daten"""
-        try:
-            data = json.loads(data_str)
-            data['timestamp'] = datetime.fromtimestamp(data['timestamp'])
-            return data
-        except Exception as e:
-            logger.error(f"Decompression error: {e}")
-            return {}
-            
     async def start_pipeline(self):
         """Startet die Datenpipeline"""
         self.pipeline_running = True
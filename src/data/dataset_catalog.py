@@ -0,0 +1,305 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.data.collector_sink import partition_files
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+TIMEFRAMES = ('1m', '5m', '15m', '1h', '4h', '1d')
+
+# Einzeldateien: pool_<adresse>_<timeframe?>_<...>.parquet (Base58-Adressen enthalten kein '_')
+_LEGACY = re.compile(r'pool_([^_=]+)_(.+)\.parquet$')
+
+
+@dataclass
+class CatalogEntry:
+    """Manifest-Eintrag einer Parquet-Datei"""
+    path: str  # relativ zum Datenverzeichnis
+    pool: str
+    timeframe: str
+    rows: int
+    min_ts: Optional[int]  # ns seit Epoche, None ohne Zeitstempelspalte
+    max_ts: Optional[int]
+    schema: Dict[str, str]
+    mtime_ns: int
+    size: int
+    # [min_ts, max_ts, rows] je Row-Group; None-Grenzen = keine Statistik vorhanden
+    row_groups: List[List[Optional[int]]] = field(default_factory=list)
+
+    def overlaps(self, start: Optional[int], end: Optional[int]) -> bool:
+        if self.min_ts is None:
+            return self.rows > 0 and 'timestamp' in self.schema
+        return (start is None or self.max_ts >= start) and (end is None or self.min_ts <= end)
+
+
+def _to_ns(value) -> Optional[int]:
+    if value is None:
+        return None
+    return int(pd.Timestamp(value).as_unit('ns').value)
+
+
+def _timestamps_ns(column) -> np.ndarray:
+    """Zeitstempelspalte (Arrow-Timestamp oder ISO-String) als int64-ns"""
+    series = pd.Series(column.to_pandas() if hasattr(column, 'to_pandas') else column)
+    return pd.to_datetime(series).astype('datetime64[ns]').to_numpy().view(np.int64)
+
+
+class DatasetCatalog:
+    """Manifest des historischen Parquet-Bestands mit Zeitbereichs-Pruning beim Lesen"""
+
+    # Indiziert die alten Einzeldateien (pool_<adresse>_*.parquet) und die Partitionen
+    # des ParquetCollectorSink (pool=<adresse>/day=<tag>/). Pro Datei und Row-Group werden
+    # Min/Max-Zeitstempel gehalten; query() liest nur Dateien und Row-Groups, die das
+    # angefragte Fenster schneiden. Geänderte Dateien erkennt refresh() an mtime/Größe.
+
+    def __init__(self, data_dir: Path, manifest_name: str = 'catalog.json'):
+        self.data_dir = Path(data_dir)
+        self.manifest_path = self.data_dir / manifest_name
+        self.entries: Dict[str, CatalogEntry] = {}
+        self.files_read = 0
+        self.row_groups_read = 0
+        self._load_manifest()
+
+    # --- Manifest ---
+
+    def _load_manifest(self):
+        if not self.manifest_path.exists():
+            return
+        try:
+            manifest = json.loads(self.manifest_path.read_text())
+            if manifest.get('version') != MANIFEST_VERSION:
+                logger.info(f"Katalog-Version {manifest.get('version')} veraltet, wird neu aufgebaut")
+                return
+            self.entries = {item['path']: CatalogEntry(**item) for item in manifest['files']}
+        except Exception as e:
+            logger.warning(f"Katalog {self.manifest_path} unlesbar, wird neu aufgebaut: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Schreibt das Manifest atomar (tmp + rename)"""
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix('.tmp')
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'files': [asdict(entry) for _, entry in sorted(self.entries.items())],
+        }
+        tmp.write_text(json.dumps(manifest))
+        os.replace(tmp, self.manifest_path)
+
+    # --- Indizierung ---
+
+    def _discover(self, pool: Optional[str] = None) -> Dict[str, Tuple[Path, str, str]]:
+        """Alle gültigen Dateien (optional nur eines Pools) -> (Pfad, Pool, Timeframe)"""
+        found = {}
+        for path in self.data_dir.glob(f"pool_{pool}_*.parquet" if pool else 'pool_*.parquet'):
+            match = _LEGACY.match(path.name)
+            if not match:
+                continue
+            parts = match.group(2).split('_')
+            timeframe = next((part for part in parts if part in TIMEFRAMES), 'tick')
+            found[path.relative_to(self.data_dir).as_posix()] = (path, match.group(1), timeframe)
+
+        for pool_dir in self.data_dir.glob(f"pool={pool}" if pool else 'pool=*'):
+            for day_dir in pool_dir.glob('day=*'):
+                for path in partition_files(day_dir):
+                    found[path.relative_to(self.data_dir).as_posix()] = (path, pool_dir.name[5:], 'tick')
+        return found
+
+    def refresh(self, pool: Optional[str] = None) -> int:
+        """Gleicht das Manifest mit der Platte ab; liefert die Zahl neu indizierter Dateien"""
+        found = self._discover(pool)
+        changed = 0
+
+        for key in [key for key, entry in self.entries.items()
+                    if (pool is None or entry.pool == pool) and key not in found]:
+            del self.entries[key]  # gelöscht oder durch Compaction ersetzt
+            changed += 1
+
+        indexed = 0
+        for key, (path, pool_address, timeframe) in found.items():
+            stat = path.stat()
+            entry = self.entries.get(key)
+            if entry and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                continue
+            try:
+                self.entries[key] = self._index_file(path, key, pool_address, timeframe, stat)
+                indexed += 1
+            except Exception as e:
+                logger.error(f"Fehler beim Indizieren von {path}: {e}")
+                self.entries.pop(key, None)
+
+        if indexed or changed:
+            self.save()
+        return indexed
+
+    def _index_file(self, path: Path, key: str, pool: str, timeframe: str, stat: os.stat_result) -> CatalogEntry:
+        parquet = pq.ParquetFile(path)
+        metadata = parquet.metadata
+        schema = parquet.schema_arrow
+        entry = CatalogEntry(
+            path=key, pool=pool, timeframe=timeframe, rows=metadata.num_rows,
+            min_ts=None, max_ts=None,
+            schema={f.name: str(f.type) for f in schema if not f.name.startswith('__index_level_')},
+            mtime_ns=stat.st_mtime_ns, size=stat.st_size
+        )
+        if 'timestamp' not in entry.schema or not metadata.num_rows:
+            return entry
+
+        column = metadata.schema.names.index('timestamp')
+        for i in range(metadata.num_row_groups):
+            group = metadata.row_group(i)
+            bounds = [None, None]
+            if pa.types.is_timestamp(schema.field('timestamp').type):
+                stats = group.column(column).statistics
+                if stats is not None and stats.has_min_max:
+                    bounds = [_to_ns(stats.min), _to_ns(stats.max)]
+            if bounds[0] is None:
+                # Keine Statistik (z.B. ISO-Strings): Spalte dieser Row-Group einmalig lesen
+                timestamps = _timestamps_ns(parquet.read_row_group(i, columns=['timestamp'])['timestamp'])
+                if len(timestamps):
+                    bounds = [int(timestamps.min()), int(timestamps.max())]
+            entry.row_groups.append(bounds + [group.num_rows])
+
+        known = [bounds for bounds in entry.row_groups if bounds[0] is not None]
+        if known:
+            entry.min_ts = min(bounds[0] for bounds in known)
+            entry.max_ts = max(bounds[1] for bounds in known)
+        return entry
+
+    # --- Abfragen ---
+
+    def files(self,
+        pool: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        timeframe: Optional[str] = None
+    ) -> List[CatalogEntry]:
+        """Dateien eines Pools, die [start, end] schneiden, nach Startzeit sortiert"""
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+        selected = [
+            entry for entry in self.entries.values()
+            if entry.pool == pool
+            and (timeframe is None or entry.timeframe == timeframe)
+            and entry.overlaps(start_ns, end_ns)
+        ]
+        return sorted(selected, key=lambda entry: (entry.min_ts or 0, entry.path))
+
+    def covers(self,
+        pool: str,
+        start: datetime,
+        end: datetime,
+        timeframe: Optional[str] = None,
+        tolerance_seconds: float = 0
+    ) -> bool:
+        """Ob die indizierten Dateien [start, end] lückenlos abdecken (Lücken bis tolerance erlaubt)"""
+        tolerance = int(tolerance_seconds * 1e9)
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+        reached = None
+        for entry in self.files(pool, start, end, timeframe):
+            if entry.min_ts is None:
+                continue
+            if reached is None:
+                if entry.min_ts > start_ns + tolerance:
+                    return False
+            elif entry.min_ts > reached + tolerance:
+                return False
+            reached = max(reached or entry.max_ts, entry.max_ts)
+            if reached + tolerance >= end_ns:
+                return True
+        return False
+
+    def window_file(self, pool: str, kind: str, start: datetime, end: datetime) -> Path:
+        """Einzeldatei für ein abgeschlossenes Fenster (z.B. heruntergeladene Historie), wird wie alle pool_*-Dateien indiziert"""
+        return self.data_dir / f"pool_{pool}_{kind}_{start:%Y%m%dT%H%M%S}_{end:%Y%m%dT%H%M%S}.parquet"
+
+    def fingerprint(self,
+        pool: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        timeframe: Optional[str] = None
+    ) -> str:
+        """Hash über die Dateien, die [start, end] schneiden (Pfad, mtime, Größe); Schlüssel für Caches"""
+        files = [(entry.path, entry.mtime_ns, entry.size) for entry in self.files(pool, start, end, timeframe)]
+        payload = json.dumps([pool, _to_ns(start), _to_ns(end), timeframe, files])
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def query(self,
+        pool: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        timeframe: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        refresh: bool = True
+    ) -> pd.DataFrame:
+        """Liest nur die Row-Groups, die [start, end] schneiden; Zeitstempel als datetime64[ns]"""
+        if refresh:
+            self.refresh(pool)
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+        wanted = None if columns is None else ['timestamp', *[c for c in columns if c != 'timestamp']]
+
+        frames = []
+        for entry in self.files(pool, start, end, timeframe):
+            df = self.read_entry(entry, start_ns, end_ns, wanted)
+            if df is not None:
+                frames.append(df)
+
+        if not frames:
+            return pd.DataFrame(columns=wanted or ['timestamp'])
+        return pd.concat(frames, ignore_index=True).sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+    def read_entry(self,
+        entry: CatalogEntry,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """Liest die passenden Row-Groups einer Datei; None wenn keine passt oder beim Lesefehler"""
+        groups = [
+            i for i, (low, high, _) in enumerate(entry.row_groups)
+            if low is None
+            or ((start_ns is None or high >= start_ns) and (end_ns is None or low <= end_ns))
+        ]
+        if not groups:
+            return None
+        try:
+            parquet = pq.ParquetFile(self.data_dir / entry.path)
+            available = [c for c in columns if c in entry.schema] if columns else None
+            table = parquet.read_row_groups(groups, columns=available)
+        except Exception as e:
+            logger.error(f"Fehler beim Lesen von {entry.path}: {e}")
+            return None
+        self.files_read += 1
+        self.row_groups_read += len(groups)
+
+        df = table.to_pandas()
+        timestamps = _timestamps_ns(df['timestamp'])
+        mask = np.ones(len(df), dtype=bool)
+        if start_ns is not None:
+            mask &= timestamps >= start_ns
+        if end_ns is not None:
+            mask &= timestamps <= end_ns
+        df = df[mask].reset_index(drop=True)
+        df['timestamp'] = timestamps[mask].view('datetime64[ns]')
+        return df
+
+    def stats(self) -> Dict:
+        return {
+            'files': len(self.entries),
+            'rows': sum(entry.rows for entry in self.entries.values()),
+            'pools': len({entry.pool for entry in self.entries.values()}),
+            'files_read': self.files_read,
+            'row_groups_read': self.row_groups_read,
+        }
@@ -0,0 +1,276 @@
+import logging
+import math
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+NaN = float('nan')
+
+# Die Update-Regeln folgen den Cython-Kernels von pandas (rolling/ewm) Operation für
+# Operation, damit die Werte bitgenau der pandas-Referenz entsprechen.
+
+
+class RollingMean:
+    """Gleitender Mittelwert über laufende Summen (Kahan wie pandas roll_mean)"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values: Deque[float] = deque()
+        self._nobs = 0
+        self._neg_ct = 0
+        self._sum = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._same = 0
+        self._prev = NaN
+        self.value = NaN
+
+    def update(self, val: float) -> float:
+        if len(self._values) == self.window:
+            self._remove(self._values.popleft())
+        self._values.append(val)
+        self._add(val)
+        self.value = self._calc()
+        return self.value
+
+    def _add(self, val: float):
+        if val != val:
+            return
+        self._nobs += 1
+        y = val - self._comp_add
+        t = self._sum + y
+        self._comp_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, val) < 0:
+            self._neg_ct += 1
+        self._same = self._same + 1 if val == self._prev else 1
+        self._prev = val
+
+    def _remove(self, val: float):
+        if val != val:
+            return
+        self._nobs -= 1
+        y = -val - self._comp_remove
+        t = self._sum + y
+        self._comp_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, val) < 0:
+            self._neg_ct -= 1
+
+    def _calc(self) -> float:
+        if self._nobs < self.window or self._nobs == 0:
+            return NaN
+        result = self._sum / self._nobs
+        if self._same >= self._nobs:
+            return self._prev
+        if self._neg_ct == 0 and result < 0:
+            return 0.0
+        if self._neg_ct == self._nobs and result > 0:
+            return 0.0
+        return result
+
+
+class RollingStd:
+    """Gleitende Standardabweichung (ddof=1) nach Welford mit Kahan-Korrektur wie pandas roll_var"""
+
+    # Rundungsfehler in konstanten Fenstern können die Quadratsumme negativ machen;
+    # pandas setzt den Zustand dann auf ein konstantes Fenster zurück (Mittel = Wert, Summe = 0)
+
+    def __init__(self, window: int, ddof: int = 1):
+        self.window = window
+        self.ddof = ddof
+        self._values: Deque[float] = deque()
+        self._nobs = 0.0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._prev = NaN
+        self.value = NaN
+
+    def update(self, val: float) -> float:
+        if len(self._values) == self.window:
+            self._remove(self._values.popleft())
+        self._values.append(val)
+        self._add(val)
+        variance = self._calc()
+        self.value = math.sqrt(variance) if variance == variance else NaN
+        return self.value
+
+    def _add(self, val: float):
+        if val != val:
+            return
+        self._nobs += 1
+        self._prev = val
+        prev_mean = self._mean - self._comp_add
+        y = val - self._comp_add
+        t = y - self._mean
+        self._comp_add = t + self._mean - y
+        self._mean = self._mean + t / self._nobs
+        self._ssqdm = self._ssqdm + (val - prev_mean) * (val - self._mean)
+        if self._ssqdm < 0:
+            self._mean, self._ssqdm = val, 0.0
+
+    def _remove(self, val: float):
+        if val != val:
+            return
+        self._nobs -= 1
+        if self._nobs:
+            prev_mean = self._mean - self._comp_remove
+            y = val - self._comp_remove
+            t = y - self._mean
+            self._comp_remove = t + self._mean - y
+            self._mean = self._mean - t / self._nobs
+            self._ssqdm = self._ssqdm - (val - prev_mean) * (val - self._mean)
+            if self._ssqdm < 0:
+                self._mean, self._ssqdm = self._prev, 0.0
+        else:
+            self._mean = 0.0
+            self._ssqdm = 0.0
+
+    def _calc(self) -> float:
+        if self._nobs < self.window or self._nobs <= self.ddof:
+            return NaN
+        return self._ssqdm / (self._nobs - self.ddof)
+
+
+class EWMA:
+    """Exponentiell gewichteter Mittelwert wie Series.ewm(...).mean()"""
+
+    def __init__(self, span: Optional[float] = None, alpha: Optional[float] = None, adjust: bool = True):
+        if (span is None) == (alpha is None):
+            raise ValueError("Genau einer von span oder alpha muss gesetzt sein")
+        # Gleiche Umrechnung wie pandas: erst Center of Mass, dann alpha
+        com = (span - 1) / 2 if span is not None else 1 / alpha - 1
+        self.alpha = 1. / (1. + com)
+        self.adjust = adjust
+        self._old_wt_factor = 1. - self.alpha
+        self._new_wt = 1. if adjust else self.alpha
+        self._old_wt = 1.
+        self.value = NaN
+
+    def update(self, cur: float) -> float:
+        weighted = self.value
+        if weighted == weighted:
+            if cur == cur:
+                self._old_wt *= self._old_wt_factor
+                if weighted != cur:
+                    weighted = self._old_wt * weighted + self._new_wt * cur
+                    weighted /= (self._old_wt + self._new_wt)
+                self._old_wt = self._old_wt + self._new_wt if self.adjust else 1.
+            else:
+                self._old_wt *= self._old_wt_factor
+        elif cur == cur:
+            weighted = cur
+        self.value = weighted
+        return weighted
+
+
+class WilderRSI:
+    """RSI mit Wilder-Glättung (alpha = 1/period)"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._gain = EWMA(alpha=1 / period, adjust=False)
+        self._loss = EWMA(alpha=1 / period, adjust=False)
+        self._prev = NaN
+        self._count = 0
+        self.value = NaN
+
+    def update(self, price: float) -> float:
+        delta = price - self._prev
+        self._prev = price
+        if delta != delta:
+            return self.value
+        self._count += 1
+        avg_gain = self._gain.update(delta if delta > 0 else 0.0)
+        avg_loss = self._loss.update(-delta if delta < 0 else 0.0)
+        if self._count < self.period:
+            self.value = NaN
+        elif avg_loss:
+            self.value = 100 - 100 / (1 + avg_gain / avg_loss)
+        else:
+            # Nur Gewinne: RSI 100; keinerlei Bewegung: undefiniert (wie pandas mit 0/0)
+            self.value = 100.0 if avg_gain else NaN
+        return self.value
+
+
+class MACD:
+    """MACD-Linie, Signal und Histogramm aus zwei EMAs (adjust=False)"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast = EWMA(span=fast, adjust=False)
+        self._slow = EWMA(span=slow, adjust=False)
+        self._signal = EWMA(span=signal, adjust=False)
+        self.macd = self.signal = self.hist = NaN
+
+    def update(self, price: float):
+        self.macd = self._fast.update(price) - self._slow.update(price)
+        self.signal = self._signal.update(self.macd)
+        self.hist = self.macd - self.signal
+
+
+class IndicatorState:
+    """O(1)-Indikatorzustand eines Pools"""
+
+    def __init__(self, sma_window: int = 20, ema_span: int = 50, rsi_period: int = 14,
+                 bb_window: int = 20, bb_width: float = 2.0):
+        self.sma = RollingMean(sma_window)
+        self.ema = EWMA(span=ema_span)
+        self.rsi = WilderRSI(rsi_period)
+        self.std = RollingStd(bb_window)
+        self.bb_mean = self.sma if bb_window == sma_window else RollingMean(bb_window)
+        self.bb_width = bb_width
+        self.macd = MACD()
+        self.count = 0
+
+    def update(self, price: float) -> Dict[str, float]:
+        self.count += 1
+        self.sma.update(price)
+        if self.bb_mean is not self.sma:
+            self.bb_mean.update(price)
+        self.ema.update(price)
+        self.rsi.update(price)
+        self.std.update(price)
+        self.macd.update(price)
+        return self.values()
+
+    def values(self) -> Dict[str, float]:
+        middle, band = self.bb_mean.value, self.bb_width * self.std.value
+        return {
+            'sma_20': self.sma.value,
+            'ema_50': self.ema.value,
+            'rsi': self.rsi.value,
+            'volatility': self.std.value,
+            'macd': self.macd.macd,
+            'macd_signal': self.macd.signal,
+            'macd_hist': self.macd.hist,
+            'bb_upper': middle + band,
+            'bb_middle': middle,
+            'bb_lower': middle - band,
+        }
+
+
+class IndicatorEngine:
+    """Hält den Indikatorzustand aller Pools; einmal aus der Historie gesät, danach O(1) pro Tick"""
+
+    def __init__(self, **state_kwargs):
+        self.state_kwargs = state_kwargs
+        self.pools: Dict[str, IndicatorState] = {}
+
+    def has_pool(self, pool_address: str) -> bool:
+        return pool_address in self.pools
+
+    def seed(self, pool_address: str, prices: Iterable[float]) -> Dict[str, float]:
+        """Baut den Zustand aus historischen Preisen neu auf"""
+        state = self.pools[pool_address] = IndicatorState(**self.state_kwargs)
+        for price in prices:
+            state.update(float(price))
+        return state.values()
+
+    def update(self, pool_address: str, price: float) -> Dict[str, float]:
+        state = self.pools.get(pool_address)
+        if state is None:
+            state = self.pools[pool_address] = IndicatorState(**self.state_kwargs)
+        return state.update(float(price))
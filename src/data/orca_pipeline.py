@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import aiohttp
@@ -10,7 +11,12 @@ from orca_whirlpool.context import WhirlpoolContext
 from orca_whirlpool.constants import ORCA_WHIRLPOOL_PROGRAM_ID
 from orca_whirlpool.utils import PriceMath, DecimalUtil
 from src.models import WhirlpoolData, TradeData
-from src.config.network_config import get_rpc_client
+from src.config.network_config import get_rpc_client, QUICKNODE_RPC_URL, QUICKNODE_WS_URL, DEFAULT_WHIRLPOOLS
+from src.connection.account_poller import PoolSnapshot, WhirlpoolPoller
+from src.connection.ws_feed import WhirlpoolFeed
+from src.data.whirlpool_registry import get_whirlpool_registry
+from src.utils.ttl_cache import AsyncTTLCache
+from src.data.price_history import PriceHistory
 import pandas as pd
 import numpy as np
 
@@ -23,8 +29,15 @@ class OrcaPipeline:
         self.ctx = None
         self.session = None
         self.whirlpools = {}
-        self.historical_data = {}
-        self.price_cache = {}
+        self.historical_data = AsyncTTLCache(maxsize=100, ttl=None, max_bytes=256 * 1024 * 1024,
+                                        name="pipeline_trades")
+        self.price_cache: Dict[str, PriceHistory] = {}
+        self.price_history_capacity = 86_400  # 24h bei 1s-Sampling
+        self.poller = None
+        self.feed = None
+        self.ws = None
+        self._stream_addresses = {}
+        self.last_updates = {}
         self.is_running = False
         
     async def initialize(self):
@@ -36,27 +49,28 @@ class OrcaPipeline:
             None
         )
         self.session = aiohttp.ClientSession()
+        # Gleicher Endpoint wie get_rpc_client()
+        self.poller = WhirlpoolPoller(QUICKNODE_RPC_URL, session=self.session)
         
         try:
             # Hole alle aktiven Whirlpools
-            async with self.session.get("https://api.mainnet.orca.so/v1/whirlpool/list") as resp:
-                if resp.status != 200:
-                    logger.error(f"API Error: {resp.status}")
-                    self.whirlpools = DEFAULT_WHIRLPOOLS
-                    return
-                    
-                data = await resp.json()
-                for pool in data["whirlpools"]:
-                    if pool["whitelisted"]:
-                        symbol = f"{pool['tokenA']['symbol']}/{pool['tokenB']['symbol']}"
-                        self.whirlpools[symbol] = {
-                            "address": pool["address"],
-                            "token_a": pool["tokenA"]["mint"],
-                            "token_b": pool["tokenB"]["mint"],
-                            "decimals_a": pool["tokenA"]["decimals"],
-                            "decimals_b": pool["tokenB"]["decimals"],
-                            "fee_rate": pool["lpFeeRate"]
-                        }
+            pools = await get_whirlpool_registry().get_pools()
+            if not pools:
+                logger.error("Whirlpool-Liste nicht verfügbar")
+                self.whirlpools = DEFAULT_WHIRLPOOLS
+                return
+                
+            for pool in pools:
+                if pool.get("whitelisted"):
+                    symbol = f"{pool['tokenA']['symbol']}/{pool['tokenB']['symbol']}"
+                    self.whirlpools[symbol] = {
+                        "address": pool["address"],
+                        "token_a": pool["tokenA"]["mint"],
+                        "token_b": pool["tokenB"]["mint"],
+                        "decimals_a": pool["tokenA"]["decimals"],
+                        "decimals_b": pool["tokenB"]["decimals"],
+                        "fee_rate": pool["lpFeeRate"]
+                    }
                         
             logger.info(f"✓ {len(self.whirlpools)} Whirlpools geladen")
             
@@ -119,61 +133,96 @@ class OrcaPipeline:
             
     def update_price_cache(self, pool_name: str, data: WhirlpoolData):
         """Aktualisiert den Preis-Cache"""
-        if pool_name not in self.price_cache:
-            self.price_cache[pool_name] = []
-            
-        self.price_cache[pool_name].append({
-            'price': data.price,
-            'timestamp': data.timestamp
-        })
-        
-        # Behalte nur die letzten 24h
-        cutoff = datetime.now() - timedelta(hours=24)
-        self.price_cache[pool_name] = [
-            p for p in self.price_cache[pool_name]
-            if p['timestamp'] > cutoff
-        ]
+        self.last_updates[pool_name] = time.time()
+        history = self.price_cache.get(pool_name)
+        if history is None:
+            history = self.price_cache[pool_name] = PriceHistory(self.price_history_capacity)
+        history.append_datetime(data.timestamp, data.price)
         
     def calculate_metrics(self, pool_name: str) -> Dict:
         """Berechnet wichtige Metriken"""
         if pool_name not in self.price_cache:
             return {}
-            
-        prices = [p['price'] for p in self.price_cache[pool_name]]
-        if len(prices) < 2:
-            return {}
-            
-        prices_array = np.array(prices)
-        returns = np.diff(np.log(prices_array))
+        return self.price_cache[pool_name].metrics(window_seconds=24 * 3600)
         
-        return {
-            'volatility': float(np.std(returns) * np.sqrt(len(returns))),
-            'price_change_1h': (prices[-1] / prices[-60] - 1) if len(prices) >= 60 else 0,
-            'price_change_24h': (prices[-1] / prices[0] - 1),
-            'current_price': prices[-1],
-            'min_price_24h': min(prices),
-            'max_price_24h': max(prices)
-        }
-        
-    async def start_monitoring(self, pool_names: List[str], interval: float = 1.0):
-        """Startet kontinuierliches Monitoring"""
+    async def start_monitoring(self, pool_names: List[str], interval: float = 1.0,
+                               streaming: bool = True):
+        """Startet kontinuierliches Monitoring (Push-Feed, ohne streaming reines Polling)"""
         self.is_running = True
+        if streaming:
+            await self.start_streaming(pool_names)
+            try:
+                while self.is_running:
+                    await asyncio.sleep(interval)
+            finally:
+                await self.feed.close()
+                self.feed = None
+                self.ws = None
+            return
+            
+        addresses = {
+            self.whirlpools[name]["address"]: name
+            for name in pool_names if name in self.whirlpools
+        }
         
         while self.is_running:
-            for pool_name in pool_names:
-                data = await self.fetch_live_data(pool_name)
-                if data:
-                    metrics = self.calculate_metrics(pool_name)
-                    
-                    # Log wichtige Änderungen
-                    if metrics.get('price_change_1h', 0) > 0.01:  # 1% Änderung
-                        logger.info(
-                            f"{pool_name} 1h Änderung: "
-                            f"{metrics['price_change_1h']:.2%}"
-                        )
+            for chunk in await self.poller.poll(list(addresses)):
+                prices = chunk.batch.price
+                for i, address in enumerate(chunk.batch.addresses):
+                    if not chunk.batch.valid[i]:
+                        continue
+                        
+                    self._apply_update(
+                        addresses[address],
+                        float(prices[i]),
+                        chunk.batch.u128('liquidity', i)
+                    )
                         
             await asyncio.sleep(interval)
             
+    def _apply_update(self, pool_name: str, raw_price: float, liquidity: int):
+        """Übernimmt einen dekodierten Pool-Zustand in Cache und Metriken"""
+        pool_config = self.whirlpools[pool_name]
+        data = WhirlpoolData(
+            pool_name=pool_name,
+            price=raw_price * 10 ** (pool_config["decimals_a"] - pool_config["decimals_b"]),
+            liquidity=liquidity,
+            volume_24h=pool_config.get("volume_24h", 0.0),
+            fee_rate=pool_config["fee_rate"],
+            timestamp=datetime.now()
+        )
+        self.update_price_cache(pool_name, data)
+        metrics = self.calculate_metrics(pool_name)
+        
+        # Log wichtige Änderungen
+        if metrics.get('price_change_1h', 0) > 0.01:  # 1% Änderung
+            logger.info(
+                f"{pool_name} 1h Änderung: "
+                f"{metrics['price_change_1h']:.2%}"
+            )
+            
+    async def start_streaming(self, pool_names: List[str], poll_interval: float = 5.0):
+        """Startet Push-Updates via WebSocket, Polling nur als Fallback"""
+        self._stream_addresses = {
+            self.whirlpools[name]["address"]: name
+            for name in pool_names if name in self.whirlpools
+        }
+        self.feed = WhirlpoolFeed(
+            QUICKNODE_WS_URL,
+            self.poller.rpc_url,
+            self._handle_pool_update,
+            session=self.session,
+            poll_interval=poll_interval
+        )
+        self.ws = self.feed.ws
+        await self.feed.start(list(self._stream_addresses))
+        
+    async def _handle_pool_update(self, snapshot: PoolSnapshot):
+        """Verarbeitet ein slot-geordnetes Pool-Update"""
+        pool_name = self._stream_addresses.get(snapshot.address)
+        if pool_name:
+            self._apply_update(pool_name, snapshot.data['price'], snapshot.data['liquidity'])
+            
     async def stop_monitoring(self):
         """Stoppt das Monitoring"""
         self.is_running = False
@@ -231,5 +280,7 @@ class OrcaPipeline:
         
     async def close(self):
         """Schließt die Pipeline"""
+        if self.feed:
+            await self.feed.close()
         if self.session:
             await self.session.close()
\ No newline at end of file
@@ -0,0 +1,86 @@
+import logging
+from datetime import datetime
+from typing import Dict, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NS_PER_SECOND = 1_000_000_000
+
+
+class PriceHistory:
+    """Ringpuffer mit fester Kapazität für Zeitstempel (ns, int64) und Preise (float64)"""
+
+    # Jeder Wert wird an i und i + capacity geschrieben: die letzten n Einträge
+    # liegen so immer zusammenhängend im Array und lassen sich ohne Kopie slicen
+
+    def __init__(self, capacity: int = 86_400):
+        if capacity < 1:
+            raise ValueError("Kapazität muss positiv sein")
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self._prices = np.zeros(2 * capacity, dtype=np.float64)
+        self._next = 0  # nächste Schreibposition in [0, capacity)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp_ns: int, price: float):
+        """O(1): überschreibt bei voller Kapazität den ältesten Eintrag"""
+        i = self._next
+        self._timestamps[i] = self._timestamps[i + self.capacity] = timestamp_ns
+        self._prices[i] = self._prices[i + self.capacity] = price
+        self._next = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def append_datetime(self, timestamp: datetime, price: float):
+        self.append(int(timestamp.timestamp() * NS_PER_SECOND), price)
+
+    def view(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Alle Einträge chronologisch als Views (nicht verändern)"""
+        end = self._next + self.capacity
+        start = end - self._size
+        return self._timestamps[start:end], self._prices[start:end]
+
+    def window(self, seconds: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Einträge der letzten `seconds` relativ zum jüngsten Zeitstempel, als Views"""
+        timestamps, prices = self.view()
+        if not self._size:
+            return timestamps, prices
+        cutoff = timestamps[-1] - int(seconds * NS_PER_SECOND)
+        first = int(np.searchsorted(timestamps, cutoff, side='right'))
+        return timestamps[first:], prices[first:]
+
+    @property
+    def latest(self) -> float:
+        if not self._size:
+            raise IndexError("Preis-Historie ist leer")
+        return float(self._prices[self._next - 1 + self.capacity])
+
+    def metrics(self, window_seconds: float = 86_400, change_seconds: float = 3_600) -> Dict:
+        """Volatilität, 1h/24h-Änderung und Min/Max über das Zeitfenster"""
+        timestamps, prices = self.window(window_seconds)
+        if len(prices) < 2:
+            return {}
+
+        returns = np.diff(np.log(prices))
+        current = float(prices[-1])
+
+        # 1h-Änderung nur, wenn die Historie weit genug zurückreicht
+        change_cutoff = timestamps[-1] - int(change_seconds * NS_PER_SECOND)
+        if timestamps[0] <= change_cutoff:
+            reference = prices[int(np.searchsorted(timestamps, change_cutoff, side='left'))]
+            price_change_1h = current / float(reference) - 1
+        else:
+            price_change_1h = 0
+
+        return {
+            'volatility': float(np.std(returns) * np.sqrt(len(returns))),
+            'price_change_1h': price_change_1h,
+            'price_change_24h': current / float(prices[0]) - 1,
+            'current_price': current,
+            'min_price_24h': float(prices.min()),
+            'max_price_24h': float(prices.max())
+        }
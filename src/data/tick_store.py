@@ -0,0 +1,259 @@
+import logging
+import os
+import struct
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.data.dataset_catalog import DatasetCatalog
+
+logger = logging.getLogger(__name__)
+
+TICK_MAGIC = b'ORCT'
+TICK_VERSION = 1
+HEADER_SIZE = 64
+INDEX_STRIDE = 4096
+
+# 40 Bytes pro Tick, 8-Byte-aligned; Zeitstempel in ns seit Epoche (naiv, wie die Parquet-Daten)
+TICK_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('price', '<f8'),
+    ('liquidity', '<f8'),
+    ('volume', '<f8'),
+    ('sqrt_price', '<f8'),
+])
+_HEADER = struct.Struct('<4sHHI')
+
+
+def _to_ns(value) -> int:
+    return int(pd.Timestamp(value).as_unit('ns').value)
+
+
+class TickFormatError(ValueError):
+    """Unbekannte Version oder beschädigte Tick-Datei"""
+
+
+class TickFile:
+    """Append-only Tick-Datei eines Pools, gelesen über np.memmap"""
+
+    # Layout: 64-Byte-Header (Magic, Version, Recordgröße, Index-Schrittweite), danach
+    # Records in Zeitreihenfolge. Die Anzahl ergibt sich aus der Dateigröße, Appends
+    # schreiben nur ans Ende; ein abgerissener letzter Record wird beim Öffnen abgeschnitten.
+    # Die Sidecar-Datei <name>.idx hält den Zeitstempel jedes INDEX_STRIDE-ten Records,
+    # damit Zeitsuchen nur den kleinen Index und einen Block der Daten anfassen.
+
+    def __init__(self, path: Path, create: bool = False, index_stride: int = INDEX_STRIDE):
+        self.path = Path(path)
+        self.index_path = self.path.with_suffix('.idx')
+        if not self.path.exists():
+            if not create:
+                raise FileNotFoundError(f"Tick-Datei {self.path} existiert nicht")
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            header = _HEADER.pack(TICK_MAGIC, TICK_VERSION, TICK_DTYPE.itemsize, index_stride)
+            self.path.write_bytes(header.ljust(HEADER_SIZE, b'\0'))
+
+        with open(self.path, 'rb') as f:
+            magic, version, record_size, stride = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != TICK_MAGIC or version != TICK_VERSION or record_size != TICK_DTYPE.itemsize:
+            raise TickFormatError(f"{self.path}: unbekanntes Format {magic!r} v{version}")
+        self.stride = stride
+
+        self._count = self._repair()
+        self._map: Optional[np.ndarray] = None
+        self._index = self._load_index()
+
+    def _repair(self) -> int:
+        size = self.path.stat().st_size - HEADER_SIZE
+        torn = size % TICK_DTYPE.itemsize
+        if torn:
+            logger.warning(f"{self.path}: unvollständiger Record ({torn} Bytes) wird abgeschnitten")
+            os.truncate(self.path, self.path.stat().st_size - torn)
+        return size // TICK_DTYPE.itemsize
+
+    def _load_index(self) -> np.ndarray:
+        expected = -(-self._count // self.stride)
+        index = np.fromfile(self.index_path, dtype='<i8') if self.index_path.exists() else np.empty(0, '<i8')
+        if len(index) != expected:
+            # Index fehlt oder passt nicht zur Datenlänge: aus jedem stride-ten Record neu bauen
+            index = np.ascontiguousarray(self.records[::self.stride]['timestamp'])
+            index.tofile(self.index_path)
+        return index
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def records(self) -> np.ndarray:
+        """Alle Records als read-only memmap (zero-copy)"""
+        if self._map is None or len(self._map) != self._count:
+            if not self._count:
+                return np.empty(0, dtype=TICK_DTYPE)
+            self._map = np.memmap(self.path, dtype=TICK_DTYPE, mode='r', offset=HEADER_SIZE, shape=(self._count,))
+        return self._map
+
+    # --- Schreiben ---
+
+    def append(self, records: np.ndarray) -> int:
+        """Hängt zeitlich sortierte Records an; ältere Zeitstempel als der letzte sind ein Fehler"""
+        records = np.ascontiguousarray(records, dtype=TICK_DTYPE)
+        if not len(records):
+            return 0
+        timestamps = records['timestamp']
+        if (np.diff(timestamps) < 0).any():
+            raise ValueError("Records müssen nach Zeitstempel sortiert sein")
+        if self._count and timestamps[0] < self.records[-1]['timestamp']:
+            raise ValueError(f"{self.path.name}: Append vor dem letzten gespeicherten Zeitstempel")
+
+        with open(self.path, 'ab') as f:
+            f.write(records.tobytes())
+        first = self._count
+        self._count += len(records)
+
+        # Neue Indexpunkte: alle Vielfachen von stride im angehängten Bereich
+        offset = -first % self.stride
+        new_index = np.ascontiguousarray(timestamps[offset::self.stride])
+        if len(new_index):
+            with open(self.index_path, 'ab') as f:
+                f.write(new_index.tobytes())
+            self._index = np.concatenate([self._index, new_index])
+        return len(records)
+
+    def append_frame(self, df: pd.DataFrame) -> int:
+        return self.append(frame_to_records(df))
+
+    # --- Lesen ---
+
+    def locate(self, timestamp_ns: int, side: str = 'left') -> int:
+        """Position wie np.searchsorted auf der Zeitstempelspalte, ohne sie ganz zu lesen"""
+        if not self._count:
+            return 0
+        block = max(int(np.searchsorted(self._index, timestamp_ns, side=side)) - 1, 0)
+        lo = block * self.stride
+        hi = min(lo + self.stride, self._count)
+        return lo + int(np.searchsorted(self.records[lo:hi]['timestamp'], timestamp_ns, side=side))
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> np.ndarray:
+        """Records in [start, end] als memmap-View"""
+        lo = self.locate(_to_ns(start)) if start is not None else 0
+        hi = self.locate(_to_ns(end), side='right') if end is not None else self._count
+        return self.records[lo:hi]
+
+    def at(self, timestamp: datetime) -> Optional[np.void]:
+        """Record mit genau diesem Zeitstempel oder None"""
+        ts = _to_ns(timestamp)
+        i = self.locate(ts)
+        if i < self._count and self.records[i]['timestamp'] == ts:
+            return self.records[i]
+        return None
+
+    def iter_chunks(self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        chunk_rows: int = 1 << 20
+    ) -> Iterator[np.ndarray]:
+        """Iteriert in Blöcken über [start, end]; jeder Block ist ein View, nichts wird kopiert"""
+        records = self.between(start, end)
+        for i in range(0, len(records), chunk_rows):
+            yield records[i:i + chunk_rows]
+
+    def time_range(self) -> Optional[Tuple[datetime, datetime]]:
+        if not self._count:
+            return None
+        return (pd.Timestamp(int(self.records[0]['timestamp'])).to_pydatetime(),
+                pd.Timestamp(int(self.records[-1]['timestamp'])).to_pydatetime())
+
+
+class TickStore:
+    """Verzeichnis mit einer TickFile pro Pool"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._files: Dict[str, TickFile] = {}
+
+    def path(self, pool: str) -> Path:
+        return self.directory / f"{pool}.ticks"
+
+    def pools(self) -> Sequence[str]:
+        return sorted(path.stem for path in self.directory.glob('*.ticks'))
+
+    def __contains__(self, pool: str) -> bool:
+        return pool in self._files or self.path(pool).exists()
+
+    def open(self, pool: str, create: bool = False) -> TickFile:
+        tick_file = self._files.get(pool)
+        if tick_file is None:
+            tick_file = self._files[pool] = TickFile(self.path(pool), create=create)
+        return tick_file
+
+    def append(self, pool: str, data: Union[pd.DataFrame, np.ndarray]) -> int:
+        tick_file = self.open(pool, create=True)
+        return tick_file.append_frame(data) if isinstance(data, pd.DataFrame) else tick_file.append(data)
+
+    def read(self, pool: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> np.ndarray:
+        return self.open(pool).between(start, end)
+
+
+def frame_to_records(df: pd.DataFrame) -> np.ndarray:
+    """DataFrame (Parquet-/CSV-Format) in Tick-Records; fehlende Felder werden NaN, 'close' gilt als Preis"""
+    records = np.empty(len(df), dtype=TICK_DTYPE)
+    timestamps = df['timestamp'] if 'timestamp' in df else df.index.to_series()
+    records['timestamp'] = pd.to_datetime(timestamps).astype('datetime64[ns]').to_numpy().view(np.int64)
+    for name in TICK_DTYPE.names[1:]:
+        source = name if name in df else ('close' if name == 'price' and 'close' in df else None)
+        records[name] = df[source].to_numpy(dtype=np.float64) if source else np.nan
+    return records
+
+
+def records_to_frame(records: np.ndarray) -> pd.DataFrame:
+    """Kopiert Records in einen DataFrame (für Code, der pandas erwartet)"""
+    df = pd.DataFrame({name: records[name] for name in TICK_DTYPE.names})
+    df['timestamp'] = df['timestamp'].to_numpy().view('datetime64[ns]')
+    return df
+
+
+def convert_catalog(catalog: DatasetCatalog, store: TickStore,
+                    pools: Optional[Sequence[str]] = None, timeframe: Optional[str] = None) -> Dict[str, int]:
+    """Überträgt den Parquet-Bestand inkrementell in den TickStore, Datei für Datei"""
+    # Pro Pool wird nur angehängt, was nach dem letzten gespeicherten Zeitstempel liegt;
+    # erneutes Konvertieren setzt also dort fort. Überlappende ältere Punkte werden übersprungen.
+    catalog.refresh()
+    converted = {}
+    for pool in pools or sorted({entry.pool for entry in catalog.entries.values()}):
+        tick_file = store.open(pool, create=True)
+        written = 0
+        for entry in catalog.files(pool, timeframe=timeframe):
+            last = int(tick_file.records[-1]['timestamp']) if len(tick_file) else None
+            df = catalog.read_entry(entry, last + 1 if last is not None else None)
+            if df is None or df.empty:
+                continue
+            records = frame_to_records(df)
+            records = records[np.argsort(records['timestamp'], kind='stable')]
+            written += tick_file.append(records)
+        converted[pool] = written
+        logger.info(f"{pool}: {written} Ticks konvertiert ({len(tick_file)} gesamt)")
+    return converted
+
+
+def convert_parquet(paths: Sequence[Path], store: TickStore, pool: str) -> int:
+    """Einzelne Parquet-Dateien (z.B. Exporte außerhalb des Katalogs) in einen Pool konvertieren"""
+    df = pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+    records = frame_to_records(df)
+    records = records[np.argsort(records['timestamp'], kind='stable')]
+    tick_file = store.open(pool, create=True)
+    if len(tick_file):
+        records = records[records['timestamp'] > tick_file.records[-1]['timestamp']]
+    return tick_file.append(records)
+
+
+if __name__ == "__main__":
+    # python -m src.data.tick_store <parquet-verzeichnis> <tick-verzeichnis> [pool ...]
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) < 3:
+        print("Verwendung: python -m src.data.tick_store <parquet-verzeichnis> <tick-verzeichnis> [pool ...]")
+        sys.exit(1)
+    result = convert_catalog(DatasetCatalog(Path(sys.argv[1])), TickStore(Path(sys.argv[2])), sys.argv[3:] or None)
+    print(f"Konvertiert: {sum(result.values())} Ticks aus {len(result)} Pools")
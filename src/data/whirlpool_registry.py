@@ -0,0 +1,185 @@
+import asyncio
+import gzip
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+WHIRLPOOL_LIST_URL = "https://api.orca.so/v1/whirlpool/list"
+SNAPSHOT_PATH = Path("cache/whirlpool_list.json.gz")
+
+
+class WhirlpoolRegistry:
+    """Prozessweite, einmal geladene Whirlpool-Liste mit Indizes und Snapshot"""
+
+    def __init__(self,
+        url: str = WHIRLPOOL_LIST_URL,
+        ttl: float = 60.0,
+        snapshot_path: Optional[Path] = SNAPSHOT_PATH,
+        session: Optional[aiohttp.ClientSession] = None,
+        timeout: float = 30.0
+    ):
+        self.url = url
+        self.ttl = ttl
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session = session
+        self._owns_session = session is None
+        self._lock = asyncio.Lock()
+
+        self.pools: List[Dict] = []
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.fetched_at = 0.0
+        self.version = 0
+        self.downloads = 0
+
+        self._by_address: Dict[str, Dict] = {}
+        self._by_mint: Dict[str, List[Dict]] = {}
+        self._by_pair: Dict[str, List[Dict]] = {}
+        self._snapshot_checked = False
+
+    @property
+    def is_fresh(self) -> bool:
+        return bool(self.pools) and time.time() - self.fetched_at < self.ttl
+
+    async def get_pools(self, force: bool = False) -> List[Dict]:
+        """Liefert alle Pools, lädt nur nach Ablauf der TTL neu"""
+        if force or not self.is_fresh:
+            await self.refresh(force)
+        return self.pools
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Lädt die Liste (bedingt via ETag/Last-Modified), gleichzeitige Aufrufe teilen einen Download"""
+        async with self._lock:
+            if not self._snapshot_checked:
+                self._snapshot_checked = True
+                self.load_snapshot()
+            if not force and self.is_fresh:
+                return True
+
+            headers = {}
+            if self.pools and self.etag:
+                headers['If-None-Match'] = self.etag
+            if self.pools and self.last_modified:
+                headers['If-Modified-Since'] = self.last_modified
+
+            try:
+                session = await self._get_session()
+                async with session.get(self.url, headers=headers) as response:
+                    if response.status == 304:
+                        self.fetched_at = time.time()
+                        return True
+                    if response.status != 200:
+                        logger.error(f"Whirlpool-Liste: HTTP {response.status}")
+                        return False
+
+                    payload = await response.json(content_type=None)
+                    self.downloads += 1
+                    self.etag = response.headers.get('ETag')
+                    self.last_modified = response.headers.get('Last-Modified')
+
+                self._set_pools(self._normalize(payload), time.time())
+                self.save_snapshot()
+                logger.info(f"✓ {len(self.pools)} Whirlpools geladen")
+                return True
+
+            except Exception as e:
+                # Bei Fehlern weiter mit dem letzten Stand (ggf. aus dem Snapshot)
+                logger.error(f"Fehler beim Laden der Whirlpool-Liste: {e}")
+                return False
+
+    def _normalize(self, payload) -> List[Dict]:
+        """Die API liefert je nach Endpoint eine Liste oder {'whirlpools': [...]}"""
+        if isinstance(payload, dict):
+            return payload.get('whirlpools', [])
+        return payload or []
+
+    def _set_pools(self, pools: List[Dict], fetched_at: float):
+        self.pools = pools
+        self.fetched_at = fetched_at
+        self.version += 1
+
+        by_address, by_mint, by_pair = {}, {}, {}
+        for pool in pools:
+            by_address[pool.get('address')] = pool
+            token_a = pool.get('tokenA') or {}
+            token_b = pool.get('tokenB') or {}
+            for mint in (token_a.get('mint'), token_b.get('mint')):
+                if mint:
+                    by_mint.setdefault(mint, []).append(pool)
+            pair = f"{token_a.get('symbol')}/{token_b.get('symbol')}"
+            by_pair.setdefault(pair, []).append(pool)
+
+        self._by_address = by_address
+        self._by_mint = by_mint
+        self._by_pair = by_pair
+
+    def by_address(self, address: str) -> Optional[Dict]:
+        return self._by_address.get(address)
+
+    def by_mint(self, mint: str) -> List[Dict]:
+        return self._by_mint.get(mint, [])
+
+    def by_pair(self, symbol_a: str, symbol_b: str) -> List[Dict]:
+        return self._by_pair.get(f"{symbol_a}/{symbol_b}", [])
+
+    def load_snapshot(self) -> bool:
+        """Warmstart aus dem komprimierten Snapshot"""
+        if not self.snapshot_path or not self.snapshot_path.exists():
+            return False
+        try:
+            with gzip.open(self.snapshot_path, 'rt', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self.etag = snapshot.get('etag')
+            self.last_modified = snapshot.get('last_modified')
+            self._set_pools(snapshot['pools'], snapshot['fetched_at'])
+            logger.info(f"Whirlpool-Snapshot geladen: {len(self.pools)} Pools")
+            return True
+        except Exception as e:
+            logger.warning(f"Whirlpool-Snapshot unlesbar: {e}")
+            return False
+
+    def save_snapshot(self):
+        """Schreibt den aktuellen Stand atomar auf die Platte"""
+        if not self.snapshot_path:
+            return
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix('.tmp')
+            with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+                json.dump({
+                    'etag': self.etag,
+                    'last_modified': self.last_modified,
+                    'fetched_at': self.fetched_at,
+                    'pools': self.pools
+                }, f, separators=(',', ':'))
+            tmp_path.replace(self.snapshot_path)
+        except Exception as e:
+            logger.warning(f"Whirlpool-Snapshot konnte nicht gespeichert werden: {e}")
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+            self._owns_session = True
+        return self._session
+
+    async def close(self):
+        if self._owns_session and self._session and not self._session.closed:
+            await self._session.close()
+
+
+_registry: Optional[WhirlpoolRegistry] = None
+
+
+def get_whirlpool_registry() -> WhirlpoolRegistry:
+    """Prozessweite Registry-Instanz"""
+    global _registry
+    if _registry is None:
+        _registry = WhirlpoolRegistry()
+    return _registry
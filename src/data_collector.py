@@ -4,13 +4,15 @@ import pandas as pd
 from datetime import datetime, timedelta
 import json
 from colorama import init, Fore, Style
+from src.utils.ttl_cache import AsyncTTLCache
 
 init()
 
 class DataCollector:
     def __init__(self):
         self.orca_api = "https://api.mainnet.orca.so"
-        self.cache = {}
+        # Tages-Candles pro Pool; nach Bytes begrenzt, da DataFrames groß werden
+        self.cache = AsyncTTLCache(maxsize=1000, ttl=None, max_bytes=256 * 1024 * 1024, name="candles")
         
     async def get_historical_data(self, date: datetime, pool_ids: list):
         """Fetch historical data for backtesting"""
@@ -7,16 +7,20 @@ from orca_whirlpool.context import WhirlpoolContext
 from orca_whirlpool.constants import ORCA_WHIRLPOOL_PROGRAM_ID
 from orca_whirlpool.utils import PriceMath, DecimalUtil
 from src.token_manager import TokenManager
+from src.connection.account_poller import WhirlpoolPoller
 from rich.console import Console
 
 console = Console()
 logger = logging.getLogger(__name__)
 
 class DataFetcher:
-    def __init__(self, ctx: WhirlpoolContext):
+    def __init__(self, ctx: WhirlpoolContext, rpc_url: Optional[str] = None):
         self.ctx = ctx
         self.token_manager = TokenManager(ctx)
         self.cache = {}
+        self.decimals = {}
+        # Endpoint aus der Connection-Config, HTTP über den geteilten Transport
+        self.poller = WhirlpoolPoller(rpc_url) if rpc_url else WhirlpoolPoller.from_config()
         
     async def update_pool_data(self, pool_name: str) -> Optional[Dict]:
         """Aktualisiert Pool-Daten mit High-Level SDK"""
@@ -62,9 +66,54 @@ class DataFetcher:
             logger.error(f"Fehler beim Update von {pool_name}: {e}")
             return None
             
+    async def _get_decimals(self, mint: str) -> int:
+        """Holt Token Decimals (einmal pro Mint)"""
+        if mint not in self.decimals:
+            token = await self.ctx.fetcher.get_token_mint(Pubkey.from_string(mint))
+            self.decimals[mint] = token.decimals
+        return self.decimals[mint]
+            
     async def start_monitoring(self, pool_names: List[str], interval: float = 1.0):
         """Startet kontinuierliches Monitoring"""
+        addresses = {}
+        for pool_name in pool_names:
+            pool = self.token_manager.WHIRLPOOLS[pool_name]
+            addresses[pool['address'] if isinstance(pool, dict) else pool] = pool_name
+            
         while True:
-            for pool_name in pool_names:
-                await self.update_pool_data(pool_name)
-            await asyncio.sleep(interval) 
\ No newline at end of file
+            for chunk in await self.poller.poll(list(addresses)):
+                for i, address in enumerate(chunk.batch.addresses):
+                    if not chunk.batch.valid[i]:
+                        continue
+                        
+                    try:
+                        pool_name = addresses[address]
+                        decoded = chunk.batch.to_dict(i)
+                        decimals_a = await self._get_decimals(decoded['token_mint_a'])
+                        decimals_b = await self._get_decimals(decoded['token_mint_b'])
+                        price = decoded['price'] * 10 ** (decimals_a - decimals_b)
+                        
+                        last = self.cache.get(pool_name)
+                        self.cache[pool_name] = {
+                            'timestamp': datetime.now(),
+                            'price': price,
+                            'liquidity': decoded['liquidity'],
+                            'pool_name': pool_name,
+                            'address': address,
+                            'slot': chunk.slot
+                        }
+                        
+                        # Log signifikante Änderungen
+                        if last and last['price']:
+                            price_change = (price - last['price']) / last['price']
+                            if abs(price_change) > 0.001:  # 0.1% Änderung
+                                logger.info(f"{pool_name} Preis: ${price:.4f} ({price_change:.2%})")
+                                
+                    except Exception as e:
+                        logger.error(f"Fehler beim Update von {address}: {e}")
+                        
+            await asyncio.sleep(interval)
+            
+    async def close(self):
+        """Beendet das Monitoring (Poller)"""
+        await self.poller.close()
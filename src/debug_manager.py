@@ -47,6 +47,7 @@ class OrcaDebugManager:
 
     async def monitor_pipeline(self, pipeline):
         """Überwacht die Orca Datenpipeline in Echtzeit"""
+        self.pipeline = pipeline
         while True:
             try:
                 # Prüfe WebSocket-Verbindung
@@ -213,21 +214,9 @@ class OrcaDebugManager:
     async def _attempt_reconnect(self):
         """Versucht WebSocket-Reconnect"""
         try:
-            if hasattr(self.pipeline, 'ws'):
-                await self.pipeline.ws.close()
-                await self.pipeline.ws.connect()
-                
-                # Erneuere Subscriptions
-                await self.pipeline.ws.subscribe_to_program(
-                    "whirLbMiicVdio4qvUfM5KAg6Ct8VwpYzGff3uctyCc",
-                    self.pipeline._handle_program_update
-                )
-                
-                for pool in self.pipeline.watchlist_pools.values():
-                    await self.pipeline.ws.subscribe_to_logs(
-                        pool,
-                        self.pipeline._handle_pool_update
-                    )
+            if getattr(self.pipeline, 'ws', None):
+                # Subscriptions werden vom Feed nach dem Reconnect erneuert
+                await self.pipeline.ws.reconnect()
         except Exception as e:
             self.log_error('reconnect', e)
 
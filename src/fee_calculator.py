@@ -3,6 +3,7 @@ from typing import Dict, Optional
 import logging
 from solana.rpc.api import Client
 import aiohttp
+from src.connection.http_transport import get_http_transport
 
 @dataclass
 class TransactionFees:
@@ -12,8 +13,9 @@ class TransactionFees:
     total_fee: float  # Gesamtgebühren
 
 class FeeCalculator:
-    def __init__(self, rpc_client: Client):
+    def __init__(self, rpc_client: Client, cost_model=None):
         self.client = rpc_client
+        self.cost_model = cost_model  # ExecutionCostModel für liquiditätsabhängigen Preiseinfluss
         self.orca_api = "https://api.orca.so"
         
         # Standard Gebühren (werden dynamisch aktualisiert)
@@ -92,11 +94,10 @@ class FeeCalculator:
     async def _get_pool_fee(self, pool_address: str) -> float:
         """Holt aktuelle Pool-Gebühren von Orca"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.orca_api}/v1/pool/{pool_address}") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return float(data['fee_rate'])
+            async with get_http_transport().get(f"{self.orca_api}/v1/pool/{pool_address}") as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return float(data['fee_rate'])
                         
             # Fallback auf Standard-Gebühr
             return self.default_fees['orca_fees']['volatile_pools']
@@ -124,6 +125,10 @@ class FeeCalculator:
     def estimate_price_impact(self, pool_data: Dict, amount: float) -> float:
         """Schätzt den Preiseinfluss eines Trades"""
         try:
+            if self.cost_model is not None:
+                # amount als Gegenwert in Quote-Einheiten, Kauf-Richtung (konservativer)
+                return min(self.cost_model.slippage(pool_data.get('address'), amount, True), 1.0)
+                
             liquidity = float(pool_data['liquidity'])
             if liquidity <= 0:
                 return 1.0  # 100% Preiseinfluss
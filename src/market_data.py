@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import asyncio
 from config import BotConfig
+from src.connection.http_transport import get_http_transport
+from src.utils.ttl_cache import AsyncTTLCache
 import json
 from dataclasses import dataclass
 from enum import Enum
@@ -42,8 +44,8 @@ class SourceStats:
 class MarketDataProvider:
     def __init__(self, config: BotConfig):
         self.config = config
-        self.cache = {}
         self.cache_duration = config.trading_params.cache_duration
+        self.cache = AsyncTTLCache(maxsize=5000, ttl=self.cache_duration, name="market_data")
         
         # API endpoints
         self.endpoints = {
@@ -112,37 +114,33 @@ class MarketDataProvider:
         try:
             # Check cache first
             cached = self.cache.get(token_address)
-            if cached and (datetime.now() - cached['timestamp']).seconds < self.cache_duration:
-                return cached['data']
+            if cached is not None:
+                return cached
             
             # Get data from Orca
             start_time = time.time()
             
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.endpoints[DataSource.ORCA]}/v1/token/{token_address}"
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        token_data = {
-                            'price': float(data['price']),
-                            'volume_24h': float(data['volume24h']),
-                            'liquidity': float(data['tvl']),
-                            'last_update': datetime.now(),
-                            'source': DataSource.ORCA.value,
-                            'timing': {
-                                'latency': (time.time() - start_time) * 1000
-                            }
+            url = f"{self.endpoints[DataSource.ORCA]}/v1/token/{token_address}"
+            async with get_http_transport().get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    
+                    token_data = {
+                        'price': float(data['price']),
+                        'volume_24h': float(data['volume24h']),
+                        'liquidity': float(data['tvl']),
+                        'last_update': datetime.now(),
+                        'source': DataSource.ORCA.value,
+                        'timing': {
+                            'latency': (time.time() - start_time) * 1000
                         }
-                        
-                        # Cache the result
-                        self.cache[token_address] = {
-                            'timestamp': datetime.now(),
-                            'data': token_data
-                        }
-                        
-                        return token_data
-                        
+                    }
+                    
+                    # Cache the result
+                    self.cache[token_address] = token_data
+                    
+                    return token_data
+                    
             return None
             
         except Exception as e:
@@ -3,6 +3,23 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional, List
 
+@dataclass
+class WhirlpoolData:
+    pool_name: str
+    price: float
+    liquidity: int
+    volume_24h: float
+    fee_rate: float
+    timestamp: datetime
+
+@dataclass
+class TradeData:
+    pool_name: str
+    price: float
+    amount: float
+    side: str  # 'buy' oder 'sell'
+    timestamp: datetime
+
 @dataclass
 class Trade:
     timestamp: datetime
@@ -4,6 +4,7 @@ from typing import Dict, List, Optional
 from datetime import datetime
 import asyncio
 from dataclasses import dataclass
+from src.connection.rate_limiter import Priority, get_rate_limiter
 
 @dataclass
 class OrcaPool:
@@ -20,8 +21,8 @@ class OrcaAPI:
         self.base_url = "https://api.orca.so"
         self.version = "v1"
         self.session = None
-        self.rate_limit_delay = 0.1  # 100ms zwischen Anfragen
-        self.last_request_time = 0
+        self.rate_limiter = get_rate_limiter()
+        self.max_attempts = 5  # Versuche pro Anfrage, solange der Provider 429 liefert
         
     async def __aenter__(self):
         self.session = aiohttp.ClientSession()
@@ -34,7 +35,7 @@ class OrcaAPI:
     async def get_pools(self) -> List[OrcaPool]:
         """Holt alle aktiven Pools von Orca"""
         try:
-            data = await self._make_request("/pools/list")
+            data = await self._make_request("/pools/list", priority=Priority.SCANNER)
             
             pools = []
             for pool_data in data:
@@ -90,37 +91,34 @@ class OrcaAPI:
                 'amount': str(amount),
                 'slippage': slippage
             }
-            return await self._make_request("/quote/swap", params=params)
+            return await self._make_request("/quote/swap", params=params, priority=Priority.TRADE)
         except Exception as e:
             logging.error(f"Fehler beim Abrufen des Swap Quotes: {e}")
             return None
             
-    async def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
-        """Führt eine API-Anfrage aus mit Rate Limiting"""
+    async def _make_request(self, endpoint: str, params: Dict = None,
+                            priority: Priority = Priority.NORMAL) -> Dict:
+        """Führt eine API-Anfrage aus mit Rate Limiting (höchstens max_attempts Versuche bei 429)"""
         if not self.session:
             self.session = aiohttp.ClientSession()
             
-        # Rate Limiting
-        now = datetime.now().timestamp()
-        time_since_last = now - self.last_request_time
-        if time_since_last < self.rate_limit_delay:
-            await asyncio.sleep(self.rate_limit_delay - time_since_last)
-            
         url = f"{self.base_url}/{self.version}{endpoint}"
         
         try:
-            async with self.session.get(url, params=params) as response:
-                self.last_request_time = datetime.now().timestamp()
-                
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 429:  # Rate limit
-                    retry_after = int(response.headers.get('Retry-After', '1'))
-                    logging.warning(f"Rate limit erreicht. Warte {retry_after}s")
-                    await asyncio.sleep(retry_after)
-                    return await self._make_request(endpoint, params)
-                else:
-                    raise Exception(f"API Error: {response.status} - {await response.text()}")
+            for attempt in range(1, self.max_attempts + 1):
+                async with self.rate_limiter.limit(url, priority=priority, subsystem="orca_api"):
+                    async with self.session.get(url, params=params) as response:
+                        if response.status == 200:
+                            return await response.json()
+                        elif response.status == 429:  # Rate limit
+                            retry_after = int(response.headers.get('Retry-After', '1'))
+                            logging.warning(f"Rate limit erreicht ({attempt}/{self.max_attempts}). Warte {retry_after}s")
+                            # Der Limiter pausiert den ganzen Provider, nicht nur diesen Aufruf
+                            self.rate_limiter.penalize(url, retry_after)
+                        else:
+                            raise Exception(f"API Error: {response.status} - {await response.text()}")
+                            
+            raise Exception(f"Rate limit: {url} nach {self.max_attempts} Versuchen aufgegeben")
                     
         except Exception as e:
             logging.error(f"Request Fehler: {e}")
@@ -6,6 +6,11 @@ from typing import Dict, List, Optional, Tuple
 import json
 from dataclasses import dataclass
 from decimal import Decimal
+from urllib.parse import urlencode
+from src.connection.http_transport import get_http_transport
+from src.connection.rate_limiter import Priority, get_rate_limiter
+from src.utils.single_flight import SingleFlight, request_key
+from src.utils.ttl_cache import AsyncTTLCache
 
 # Configure logging
 logging.basicConfig(
@@ -40,12 +45,12 @@ class OrcaWhirlpoolClient:
         self.network = network
         self.base_url = "https://api.orca.so"
         
-        # Cache settings
+        # Cache settings (begrenzt, Ablauf lazy beim Zugriff statt periodischem Cleanup)
         self.cache_duration = timedelta(seconds=30)
-        self._pools_cache = {}
-        self._price_cache = {}
-        self._orderbook_cache = {}
-        self._last_cache_update = None
+        ttl = self.cache_duration.total_seconds()
+        self._pools_cache = AsyncTTLCache(maxsize=2000, ttl=ttl, stale_ttl=ttl, name="orca_pool_stats")
+        # Preise gehen in Trade-Entscheidungen ein: kurze TTL, keine veralteten Werte
+        self._price_cache = AsyncTTLCache(maxsize=2000, ttl=1.0, name="orca_prices")
         
         # Health monitoring
         self.health_check_interval = 60  # seconds
@@ -54,10 +59,12 @@ class OrcaWhirlpoolClient:
         self.max_failures = 3
         self.is_healthy = True
         
-        # Rate limiting
-        self.request_semaphore = asyncio.Semaphore(5)
-        self.last_request_time = {}
-        self.min_request_interval = 0.2
+        # Geteilte HTTP-Session (Keep-Alive statt neuer Verbindung pro Request)
+        self.transport = get_http_transport()
+        
+        # Rate limiting (zentral, Trade-Pfad vor Scanner-Traffic)
+        self.rate_limiter = get_rate_limiter()
+        self.flight = SingleFlight()
         
         # Event callbacks
         self.on_health_change = None
@@ -65,7 +72,7 @@ class OrcaWhirlpoolClient:
         # Market depth tracking
         self.depth_levels = 10
         self.min_depth_update_interval = 1.0  # seconds
-        self._depth_cache = {}
+        self._orderbook_cache = AsyncTTLCache(maxsize=500, ttl=self.min_depth_update_interval, name="orca_orderbook")
         
         # Active pools tracking
         self.whirlpools: Dict[str, WhirlpoolData] = {}
@@ -80,7 +87,6 @@ class OrcaWhirlpoolClient:
     async def start(self):
         """Start the client with health monitoring"""
         asyncio.create_task(self._health_monitor())
-        asyncio.create_task(self._cache_cleanup())
         await self._initial_load()
         
     async def _initial_load(self):
@@ -105,7 +111,9 @@ class OrcaWhirlpoolClient:
         """Monitor API health"""
         while True:
             try:
-                response = await self._fetch_with_retry(f"{self.base_url}/v1/health", retries=1)
+                response = await self._fetch_with_retry(
+                    f"{self.base_url}/v1/health", retries=1, priority=Priority.SCANNER
+                )
                 is_healthy = response is not None and response.get('status') == 'healthy'
                 
                 if is_healthy:
@@ -125,80 +133,51 @@ class OrcaWhirlpoolClient:
                 
             await asyncio.sleep(self.health_check_interval)
             
-    async def _cache_cleanup(self):
-        """Clean up stale cache entries"""
-        while True:
-            try:
-                current_time = datetime.now()
-                
-                # Clean pool cache
-                self._pools_cache = {
-                    k: v for k, v in self._pools_cache.items()
-                    if current_time - v['timestamp'] < self.cache_duration
-                }
-                
-                # Clean price cache
-                self._price_cache = {
-                    k: v for k, v in self._price_cache.items()
-                    if current_time - v['timestamp'] < self.cache_duration
-                }
-                
-                # Clean orderbook cache
-                self._orderbook_cache = {
-                    k: v for k, v in self._orderbook_cache.items()
-                    if current_time - v['timestamp'] < self.cache_duration
-                }
-                
-            except Exception as e:
-                logging.error(f"Cache cleanup error: {e}")
-                
-            await asyncio.sleep(30)  # Run cleanup every 30 seconds
-        
-    async def _fetch_with_retry(self, session: aiohttp.ClientSession, url: str, retries: int = 3) -> Optional[Dict]:
+    async def _fetch_with_retry(self, url: str, retries: int = 3,
+                                priority: Priority = Priority.NORMAL) -> Optional[Dict]:
         """Fetch data with retry logic and rate limiting"""
-        endpoint = url.split("/v1/")[1].split("?")[0]
+        # Tracking-Loop und Strategie-Aufrufe auf dieselbe URL teilen sich einen Request
+        return await self.flight.do(
+            request_key("GET", url),
+            lambda: self._fetch_uncached(url, retries, priority)
+        )
         
-        async with self.request_semaphore:
-            if endpoint in self.last_request_time:
-                time_since_last = datetime.now() - self.last_request_time[endpoint]
-                if time_since_last.total_seconds() < self.min_request_interval:
-                    await asyncio.sleep(self.min_request_interval - time_since_last.total_seconds())
-            
-            for attempt in range(retries):
-                try:
-                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                        self.last_request_time[endpoint] = datetime.now()
-                        
+    async def _fetch_uncached(self, url: str, retries: int, priority: Priority) -> Optional[Dict]:
+        for attempt in range(retries):
+            try:
+                async with self.rate_limiter.limit(url, priority=priority, subsystem="whirlpool_client"):
+                    async with self.transport.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
                         if response.status == 200:
                             return await response.json()
                         elif response.status == 429:  # Rate limit
+                            # Pausiert den Provider im Limiter, der nächste Versuch wartet dort
                             wait_time = float(response.headers.get('Retry-After', 1 * (attempt + 1)))
-                            await asyncio.sleep(wait_time)
+                            self.rate_limiter.penalize(url, wait_time)
+                            continue
                         elif response.status == 404:
                             logging.warning(f"Resource not found: {url}")
                             return None
                         else:
                             logging.warning(f"Failed request to {url}. Status: {response.status}")
-                            if attempt < retries - 1:
-                                await asyncio.sleep(1 * (attempt + 1))
-                except asyncio.TimeoutError:
-                    logging.warning(f"Request timeout ({attempt+1}/{retries})")
-                    if attempt < retries - 1:
-                        await asyncio.sleep(1)
-                except Exception as e:
-                    logging.error(f"Request error ({attempt+1}/{retries}): {str(e)}")
-                    if attempt < retries - 1:
-                        await asyncio.sleep(1)
-            return None
+                if attempt < retries - 1:
+                    await asyncio.sleep(1 * (attempt + 1))
+            except asyncio.TimeoutError:
+                logging.warning(f"Request timeout ({attempt+1}/{retries})")
+                if attempt < retries - 1:
+                    await asyncio.sleep(1)
+            except Exception as e:
+                logging.error(f"Request error ({attempt+1}/{retries}): {str(e)}")
+                if attempt < retries - 1:
+                    await asyncio.sleep(1)
+        return None
         
     async def get_pool_price(self, pool_address: str) -> Optional[float]:
         """Get current pool price with validation"""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/v1/whirlpool/{pool_address}/price"
-                data = await self._fetch_with_retry(session, url)
-                if data and 'price' in data:
-                    return float(data['price'])
+            url = f"{self.base_url}/v1/whirlpool/{pool_address}/price"
+            data = await self._price_cache.get_or_load(pool_address, lambda: self._fetch_with_retry(url))
+            if data and 'price' in data:
+                return float(data['price'])
         except Exception as e:
             logging.error(f"Error fetching pool price: {str(e)}")
         return None
@@ -206,35 +185,36 @@ class OrcaWhirlpoolClient:
     async def get_historical_prices(self, pool_address: str, interval: str = "1h", limit: int = 24) -> List[Dict]:
         """Get historical price data"""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/v1/whirlpool/{pool_address}/candles"
-                params = {
-                    'interval': interval,
-                    'limit': limit
-                }
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('candles', [])
+            url = f"{self.base_url}/v1/whirlpool/{pool_address}/candles"
+            params = {
+                'interval': interval,
+                'limit': limit
+            }
+            async with self.transport.get(url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return data.get('candles', [])
         except Exception as e:
             logging.error(f"Error fetching historical prices: {str(e)}")
         return []
         
-    async def get_pool_stats(self, pool_address: str) -> Optional[Dict]:
+    async def get_pool_stats(self, pool_address: str,
+                             priority: Priority = Priority.NORMAL) -> Optional[Dict]:
         """Get comprehensive pool statistics"""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/v1/whirlpool/{pool_address}/stats"
-                data = await self._fetch_with_retry(session, url)
-                if data:
-                    return {
-                        'price': float(data.get('price', 0)),
-                        'price_change': float(data.get('priceChange24h', 0)),
-                        'volume_24h': float(data.get('volume24h', 0)),
-                        'tvl': float(data.get('tvl', 0)),
-                        'fees_24h': float(data.get('fees24h', 0)),
-                        'trades_24h': int(data.get('numberOfTrades24h', 0))
-                    }
+            url = f"{self.base_url}/v1/whirlpool/{pool_address}/stats"
+            data = await self._pools_cache.get_or_load(
+                pool_address, lambda: self._fetch_with_retry(url, priority=priority)
+            )
+            if data:
+                return {
+                    'price': float(data.get('price', 0)),
+                    'price_change': float(data.get('priceChange24h', 0)),
+                    'volume_24h': float(data.get('volume24h', 0)),
+                    'tvl': float(data.get('tvl', 0)),
+                    'fees_24h': float(data.get('fees24h', 0)),
+                    'trades_24h': int(data.get('numberOfTrades24h', 0))
+                }
         except Exception as e:
             logging.error(f"Error fetching pool stats: {str(e)}")
         return None
@@ -242,23 +222,22 @@ class OrcaWhirlpoolClient:
     async def get_quote(self, input_token: str, output_token: str, amount: float, slippage: float = 0.5) -> Optional[Dict]:
         """Get swap quote from Orca"""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/v1/quote"
-                params = {
-                    'inputToken': input_token,
-                    'outputToken': output_token,
-                    'amount': str(amount),
-                    'slippage': slippage
+            params = {
+                'inputToken': input_token,
+                'outputToken': output_token,
+                'amount': str(amount),
+                'slippage': slippage
+            }
+            url = f"{self.base_url}/v1/quote?{urlencode(params)}"
+            data = await self._fetch_with_retry(url, priority=Priority.TRADE)
+            if data:
+                return {
+                    'input_amount': float(data['inAmount']),
+                    'output_amount': float(data['outAmount']),
+                    'price_impact': float(data['priceImpact']),
+                    'fee_amount': float(data['fee']),
+                    'route': data.get('route', [])
                 }
-                data = await self._fetch_with_retry(session, url)
-                if data:
-                    return {
-                        'input_amount': float(data['inAmount']),
-                        'output_amount': float(data['outAmount']),
-                        'price_impact': float(data['priceImpact']),
-                        'fee_amount': float(data['fee']),
-                        'route': data.get('route', [])
-                    }
         except Exception as e:
             logging.error(f"Error getting swap quote: {str(e)}")
         return None
@@ -266,41 +245,40 @@ class OrcaWhirlpoolClient:
     async def get_top_pools(self, metric: str = 'volume', limit: int = 10) -> List[WhirlpoolData]:
         """Get top pools by specified metric (volume, tvl, etc)"""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/v1/whirlpool/list"
-                pools = await self._fetch_with_retry(session, url)
-                
-                if not pools:
-                    return []
-                    
-                # Fetch stats for each pool
-                pool_data = []
-                for pool in pools:
-                    if pool['tokenA']['symbol'] in self.tokens or pool['tokenB']['symbol'] in self.tokens:
-                        stats = await self.get_pool_stats(pool['address'])
-                        if stats:
-                            price = stats['price']
-                            pool_data.append(WhirlpoolData(
-                                address=pool['address'],
-                                token_a=pool['tokenA']['symbol'],
-                                token_b=pool['tokenB']['symbol'],
-                                price=price,
-                                liquidity=stats['tvl'],
-                                volume_24h=stats['volume_24h'],
-                                trades_24h=stats['trades_24h'],
-                                price_change=stats['price_change'],
-                                best_bid=price * 0.995,  # Estimated
-                                best_ask=price * 1.005,  # Estimated
-                                last_update=datetime.now()
-                            ))
-                
-                # Sort by specified metric
-                if metric == 'volume':
-                    pool_data.sort(key=lambda x: x.volume_24h, reverse=True)
-                elif metric == 'tvl':
-                    pool_data.sort(key=lambda x: x.liquidity, reverse=True)
+            url = f"{self.base_url}/v1/whirlpool/list"
+            pools = await self._fetch_with_retry(url, priority=Priority.SCANNER)
+            
+            if not pools:
+                return []
                 
-                return pool_data[:limit]
+            # Fetch stats for each pool
+            pool_data = []
+            for pool in pools:
+                if pool['tokenA']['symbol'] in self.tokens or pool['tokenB']['symbol'] in self.tokens:
+                    stats = await self.get_pool_stats(pool['address'], priority=Priority.SCANNER)
+                    if stats:
+                        price = stats['price']
+                        pool_data.append(WhirlpoolData(
+                            address=pool['address'],
+                            token_a=pool['tokenA']['symbol'],
+                            token_b=pool['tokenB']['symbol'],
+                            price=price,
+                            liquidity=stats['tvl'],
+                            volume_24h=stats['volume_24h'],
+                            trades_24h=stats['trades_24h'],
+                            price_change=stats['price_change'],
+                            best_bid=price * 0.995,  # Estimated
+                            best_ask=price * 1.005,  # Estimated
+                            last_update=datetime.now()
+                        ))
+            
+            # Sort by specified metric
+            if metric == 'volume':
+                pool_data.sort(key=lambda x: x.volume_24h, reverse=True)
+            elif metric == 'tvl':
+                pool_data.sort(key=lambda x: x.liquidity, reverse=True)
+            
+            return pool_data[:limit]
                 
         except Exception as e:
             logging.error(f"Error fetching top pools: {str(e)}")
@@ -327,6 +305,10 @@ class OrcaWhirlpoolClient:
                 
             await asyncio.sleep(self.update_interval)
             
+    def cache_stats(self) -> List[Dict]:
+        """Hit/Miss/Eviction-Zähler der Client-Caches"""
+        return [cache.stats() for cache in (self._pools_cache, self._price_cache, self._orderbook_cache)]
+        
     def get_tracked_pools(self, limit: Optional[int] = None) -> List[WhirlpoolData]:
         """Get currently tracked pools"""
         pools = sorted(
@@ -18,6 +18,7 @@ from base58 import b58encode, b58decode
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from aiohttp import ClientTimeout
 from asyncio import TimeoutError
+from src.data.whirlpool_registry import get_whirlpool_registry
 from collections import defaultdict
 from dataclasses import dataclass
 
@@ -163,37 +164,32 @@ class OrcaDataProvider:
     async def update_pools(self):
         """Aktualisiert alle Whirlpools"""
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
+            pools_data = await get_whirlpool_registry().get_pools()
+            if not pools_data:
+                logging.error("Pool update failed: Whirlpool-Liste nicht verfügbar")
+                return
                 
-            async with self.session.get(f"{self.base_url}/v1/whirlpools") as response:
-                if response.status == 200:
-                    pools_data = await response.json()
-                    
-                    # Pools verarbeiten
-                    for pool_data in pools_data:
-                        if self._is_valid_pool(pool_data):
-                            pool = OrcaPool(
-                                address=pool_data['address'],
-                                token_a=pool_data['tokenA']['mint'],
-                                token_b=pool_data['tokenB']['mint'],
-                                token_a_symbol=pool_data['tokenA'].get('symbol', 'Unknown'),
-                                token_b_symbol=pool_data['tokenB'].get('symbol', 'Unknown'),
-                                liquidity=float(pool_data.get('tvl', 0)),
-                                volume_24h=float(pool_data.get('volume', {}).get('day', 0)),
-                                price=float(pool_data.get('price', 0)),
-                                fee=float(pool_data.get('fee', 0)) / 10000,
-                                price_change_24h=float(pool_data.get('priceChange', {}).get('day', 0)),
-                                created_at=datetime.fromtimestamp(pool_data.get('createdAt', 0))
-                            )
-                            self.pools[pool.address] = pool
-                            
-                    self.last_update = datetime.now()
-                    logging.info(f"Updated {len(self.pools)} pools")
-                    
-                else:
-                    logging.error(f"Pool update failed: {response.status}")
+            # Pools verarbeiten
+            for pool_data in pools_data:
+                if self._is_valid_pool(pool_data):
+                    pool = OrcaPool(
+                        address=pool_data['address'],
+                        token_a=pool_data['tokenA']['mint'],
+                        token_b=pool_data['tokenB']['mint'],
+                        token_a_symbol=pool_data['tokenA'].get('symbol', 'Unknown'),
+                        token_b_symbol=pool_data['tokenB'].get('symbol', 'Unknown'),
+                        liquidity=float(pool_data.get('tvl', 0)),
+                        volume_24h=float(pool_data.get('volume', {}).get('day', 0)),
+                        price=float(pool_data.get('price', 0)),
+                        fee=float(pool_data.get('fee', 0)) / 10000,
+                        price_change_24h=float(pool_data.get('priceChange', {}).get('day', 0)),
+                        created_at=datetime.fromtimestamp(pool_data.get('createdAt', 0))
+                    )
+                    self.pools[pool.address] = pool
                     
+            self.last_update = datetime.now()
+            logging.info(f"Updated {len(self.pools)} pools")
+            
         except Exception as e:
             logging.error(f"Error updating pools: {e}")
             
@@ -16,6 +16,10 @@ import struct
 import asyncio
 from datetime import datetime, timedelta
 import aiohttp
+from src.whirlpool.account_decoder import decode_whirlpool
+from src.connection.account_poller import WhirlpoolPoller
+from src.data.whirlpool_registry import get_whirlpool_registry
+from src.connection.http_transport import get_http_transport
 
 class OrcaDEX:
     def __init__(self, provider: Provider):
@@ -40,10 +44,10 @@ class OrcaDEX:
     async def load_pools(self):
         """Lädt alle aktiven Pools von Orca"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get('https://api.orca.so/v1/whirlpool/list') as response:
-                    pools = await response.json()
-                    
+            pools = await get_whirlpool_registry().get_pools()
+            if not pools:
+                raise RuntimeError("Whirlpool-Liste nicht verfügbar")
+                
             for pool in pools:
                 pool_address = pool['address']
                 self.pools[pool_address] = {
@@ -62,18 +66,24 @@ class OrcaDEX:
 
     async def monitor_pools(self):
         """Überwacht Pools auf Änderungen"""
-        while True:
-            try:
-                for pool_address in list(self.pools.keys()):
-                    pool_data = await self.get_pool_data(pool_address)
-                    if pool_data:
-                        self.pools[pool_address].update(pool_data)
-                        
-                await asyncio.sleep(1)  # 1 Sekunde Pause zwischen Updates
-                
-            except Exception as e:
-                logging.error(f"Fehler beim Pool-Monitoring: {e}")
-                await asyncio.sleep(5)  # Längere Pause bei Fehler
+        poller = WhirlpoolPoller.from_config()
+        try:
+            while True:
+                try:
+                    for chunk in await poller.poll(list(self.pools.keys())):
+                        for i, pool_address in enumerate(chunk.batch.addresses):
+                            if chunk.batch.valid[i]:
+                                pool_data = self._pool_data_from_decoded(chunk.batch.to_dict(i))
+                                pool_data['slot'] = chunk.slot
+                                self.pools[pool_address].update(pool_data)
+                            
+                    await asyncio.sleep(1)  # 1 Sekunde Pause zwischen Updates
+                    
+                except Exception as e:
+                    logging.error(f"Fehler beim Pool-Monitoring: {e}")
+                    await asyncio.sleep(5)  # Längere Pause bei Fehler
+        finally:
+            await poller.close()
 
     async def get_pool_data(self, pool_address: str) -> Optional[Dict]:
         """Holt aktuelle Pool-Daten"""
@@ -92,10 +102,9 @@ class OrcaDEX:
             pool_data = self._parse_whirlpool_data(data)
             
             # Zusätzliche Marktdaten abrufen
-            async with aiohttp.ClientSession() as session:
-                url = f"https://api.orca.so/v1/whirlpool/{pool_address}/stats"
-                async with session.get(url) as response:
-                    market_stats = await response.json()
+            url = f"https://api.orca.so/v1/whirlpool/{pool_address}/stats"
+            async with get_http_transport().get(url) as response:
+                market_stats = await response.json()
                     
             pool_data.update(market_stats)
             return pool_data
@@ -106,62 +115,26 @@ class OrcaDEX:
 
     def _parse_whirlpool_data(self, data: bytes) -> Dict:
         """Parst Whirlpool-Daten"""
-        try:
-            # Whirlpool Layout:
-            # - Token A Mint (32)
-            # - Token B Mint (32)
-            # - Token A Vault (32)
-            # - Token B Vault (32)
-            # - Fee Rate (8)
-            # - Tick Spacing (2)
-            # - Tick Current Index (2)
-            # - Sqrt Price (16)
-            # - Liquidity (16)
-            # ...
-            
-            offset = 0
-            token_a_mint = Pubkey(data[offset:offset+32])
-            offset += 32
-            token_b_mint = Pubkey(data[offset:offset+32])
-            offset += 32
-            token_a_vault = Pubkey(data[offset:offset+32])
-            offset += 32
-            token_b_vault = Pubkey(data[offset:offset+32])
-            offset += 32
-            
-            fee_rate = int.from_bytes(data[offset:offset+8], 'little')
-            offset += 8
-            
-            tick_spacing = int.from_bytes(data[offset:offset+2], 'little')
-            offset += 2
-            
-            tick_current = int.from_bytes(data[offset:offset+2], 'little')
-            offset += 2
-            
-            sqrt_price = int.from_bytes(data[offset:offset+16], 'little')
-            offset += 16
-            
-            liquidity = int.from_bytes(data[offset:offset+16], 'little')
-            
-            # Preis berechnen
-            price = (sqrt_price / 2**64) ** 2
-            
-            return {
-                'token_a_mint': str(token_a_mint),
-                'token_b_mint': str(token_b_mint),
-                'token_a_vault': str(token_a_vault),
-                'token_b_vault': str(token_b_vault),
-                'fee_rate': fee_rate / 1_000_000,  # Convert to percentage
-                'tick_spacing': tick_spacing,
-                'tick_current': tick_current,
-                'price': price,
-                'liquidity': liquidity,
-                'last_update': datetime.now()
-            }
-            
-        except Exception as e:
-            logging.error(f"Fehler beim Parsen der Whirlpool-Daten: {e}")
-            raise
+        decoded = decode_whirlpool(data)
+        if decoded is None:
+            logging.error("Fehler beim Parsen der Whirlpool-Daten: ungültiger Account")
+            raise ValueError("Ungültige Whirlpool-Account-Daten")
+        return self._pool_data_from_decoded(decoded)
+
+    def _pool_data_from_decoded(self, decoded: Dict) -> Dict:
+        """Bringt dekodierte Account-Daten ins Pool-Format"""
+        return {
+            'token_a_mint': decoded['token_mint_a'],
+            'token_b_mint': decoded['token_mint_b'],
+            'token_a_vault': decoded['token_vault_a'],
+            'token_b_vault': decoded['token_vault_b'],
+            'fee_rate': decoded['fee_rate'] / 1_000_000,  # Convert to percentage
+            'tick_spacing': decoded['tick_spacing'],
+            'tick_current': decoded['tick_current_index'],
+            'price': decoded['price'],
+            'liquidity': decoded['liquidity'],
+            'last_update': datetime.now()
+        }
 
     async def get_token_price(self, token_address: str) -> Optional[float]:
         """Ermittelt den Preis eines Tokens in USDC"""
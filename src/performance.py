@@ -1,7 +1,7 @@
-import pandas as pd
 from typing import Dict, Optional
 from dataclasses import dataclass
 import logging
+from trading.metrics import OnlineMetrics
 
 @dataclass
 class PerformanceMetrics:
@@ -11,27 +11,43 @@ class PerformanceMetrics:
     profitable_trades: int = 0
     max_drawdown: float = 0.0
     sharpe_ratio: float = 0.0
+    best_trade: float = 0.0
 
 class PerformanceAnalyzer:
-    def __init__(self):
+    def __init__(self, initial_capital: float = 1000.0):
         self.trades = []
         self.metrics = PerformanceMetrics()
-        
+        self.initial_capital = initial_capital
+        # Kapitalkurve = Startkapital + kumulierte Profits, ein Punkt pro Trade
+        self.online = OnlineMetrics(initial_capital)
+
     def add_trade(self, trade: Dict):
         """Fügt einen Trade hinzu und aktualisiert Metriken"""
         self.trades.append(trade)
-        self._update_metrics()
-        
-    def _update_metrics(self):
-        """Aktualisiert Performance-Metriken"""
-        if not self.trades:
-            return
-            
-        df = pd.DataFrame(self.trades)
-        
-        self.metrics.total_profit = df['profit'].sum()
-        self.metrics.trades_count = len(df)
-        self.metrics.profitable_trades = len(df[df['profit'] > 0])
-        self.metrics.win_rate = (self.metrics.profitable_trades / self.metrics.trades_count * 100)
-        
-        # Drawdown und Sharpe später implementieren 
\ No newline at end of file
+        self._update_metrics(float(trade.get('profit', 0.0)))
+
+    def _update_metrics(self, profit: float):
+        """Aktualisiert Performance-Metriken in O(1) pro Trade"""
+        self.online.add_trade(profit)
+        self.online.update(self.online.equity + profit)
+
+        self.metrics.total_profit += profit
+        self.metrics.trades_count = self.online.trades
+        self.metrics.profitable_trades = self.online.wins
+        self.metrics.win_rate = self.online.win_rate * 100
+        self.metrics.max_drawdown = self.online.max_drawdown * 100
+        self.metrics.sharpe_ratio = self.online.sharpe_ratio
+        self.metrics.best_trade = self.online.best_trade
+
+    def get_statistics(self) -> Dict:
+        """Kennzahlen für das Live-Monitoring (Prozentwerte wie in PerformanceMetrics)"""
+        return {
+            'total_profit': self.metrics.total_profit,
+            'win_rate': self.metrics.win_rate,
+            'total_trades': self.metrics.trades_count,
+            'profitable_trades': self.metrics.profitable_trades,
+            'max_drawdown': self.metrics.max_drawdown,
+            'sharpe_ratio': self.metrics.sharpe_ratio,
+            'sortino_ratio': self.online.sortino_ratio,
+            'profit_factor': self.online.profit_factor,
+        }
@@ -9,6 +9,7 @@ from dataclasses import dataclass
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
+from src.data.whirlpool_registry import get_whirlpool_registry
 
 @dataclass
 class MemePool:
@@ -32,6 +33,7 @@ class OrcaMemeScanner:
         self.pools: Dict[str, MemePool] = {}
         self.hot_pools: List[str] = []
         self.last_update = None
+        self._registry_version = None
         
         # Schwellenwerte
         self.MIN_LIQUIDITY = 10000  # $10k
@@ -57,16 +59,17 @@ class OrcaMemeScanner:
     async def _scan_pools(self):
         """Scannt alle Orca Pools"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.orca_api}/v1/whirlpool/list") as response:
-                    if response.status == 200:
-                        pools = await response.json()
+            registry = get_whirlpool_registry()
+            pools = await registry.get_pools()
+            
+            # Nur neu verarbeiten, wenn sich die Liste geändert hat
+            if registry.version != self._registry_version:
+                self._registry_version = registry.version
+                for pool in pools:
+                    # Nur USDC Pairs
+                    if pool['tokenB']['symbol'] == 'USDC':
+                        await self._process_pool(pool)
                         
-                        for pool in pools:
-                            # Nur USDC Pairs
-                            if pool['tokenB']['symbol'] == 'USDC':
-                                await self._process_pool(pool)
-                                
             self.last_update = datetime.now()
             
         except Exception as e:
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+# Fügen Sie das src Verzeichnis zum Python Path hinzu
+src_path = str(Path(__file__).parent.parent)
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+import asyncio
+import logging
+from typing import Dict, List
+
+import click
+from rich.console import Console
+
+from src.whirlpool.impact_recorder import ImpactCurveRecorder
+
+console = Console()
+
+
+def parse_pools(specs: List[str]) -> Dict[str, int]:
+    """adresse:decimals -> {adresse: Decimals des Quote-Tokens}"""
+    pools = {}
+    for spec in specs:
+        address, sep, decimals = spec.partition(':')
+        if not sep or not decimals.isdigit():
+            raise click.BadParameter(f"'{spec}' hat nicht die Form adresse:decimals", param_hint='--pool')
+        pools[address] = int(decimals)
+    return pools
+
+
+@click.command()
+@click.option('--pool', '-p', 'pools', multiple=True, required=True,
+              help='Pool-Adresse und Decimals des Quote-Tokens, z.B. HJPj...:6')
+@click.option('--output', '-o', default='data/impact_curves.npz',
+              help="NPZ für 'impact_curves' in der Backtest-Konfiguration (wird fortgesetzt)")
+@click.option('--rounds', '-n', type=int, default=1, help='Anzahl Snapshot-Runden')
+@click.option('--interval', type=float, default=60.0, help='Sekunden zwischen den Runden')
+@click.option('--radius', type=int, default=2, help='Tick-Arrays links und rechts vom aktuellen')
+def main(pools, output, rounds, interval, radius):
+    """Zeichnet Impact-Kurven aus Whirlpool-Tick-Arrays für liquiditätsabhängige Backtest-Slippage auf"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    from src.whirlpool_fetcher import WhirlpoolFetcher
+
+    recorder = ImpactCurveRecorder(WhirlpoolFetcher(), parse_pools(list(pools)), Path(output), radius=radius)
+    book = asyncio.run(recorder.record(rounds, interval))
+    for pool in book.pools():
+        console.print(f"  {pool}: {book.snapshots(pool)} Snapshots, Tiefe Kauf {book.depth(pool, True):,.0f}")
+    console.print(f"[green]Impact-Kurven gespeichert: {output}[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ class RiskManager:
         self.max_position_size = Decimal("1000")  # Max Position in USD
         self.max_daily_loss = Decimal("100")      # Max Tagesverlust in USD
         self.max_drawdown = Decimal("0.1")        # 10% max Drawdown
+        self.stop_loss = Decimal("5")             # Stop-Loss in % unter Einstieg
         
         self.positions = {}
         self.daily_pnl = Decimal("0")
@@ -49,6 +50,21 @@ class RiskManager:
             logger.error(f"Fehler in der Risikoprüfung: {e}")
             return False
             
+    def check_trade(self, signal: Dict, price: Optional[float] = None) -> bool:
+        """Prüft ein Signal-Dict (pool_id, size, price) mit denselben Limits wie can_open_position"""
+        try:
+            trade = TradeData(
+                pool_name=signal['pool_id'],
+                price=price if price is not None else signal['price'],
+                amount=signal['size'],
+                side='sell' if signal.get('type') in ('exit', 'sell') else 'buy',
+                timestamp=signal.get('timestamp') or datetime.now()
+            )
+        except (KeyError, TypeError) as e:
+            logger.error(f"Ungültiges Signal: {e}")
+            return False
+        return self.can_open_position(trade)
+
     def update_position(self, trade: TradeData):
         """Aktualisiert Position und P&L"""
         try:
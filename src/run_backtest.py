@@ -1,8 +1,11 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
+from pathlib import Path
+import yaml
 from rich.console import Console
 from backtest_engine import BacktestEngine
+from trading.execution_cost import cost_model_from_config
 from data_collector import DataCollector
 from trading_manager import TradingManager
 from risk_manager import RiskManager
@@ -10,7 +13,16 @@ from risk_manager import RiskManager
 console = Console()
 logger = logging.getLogger(__name__)
 
-async def run_24h_backtest():
+def load_cost_model(config_path: str = "config.yaml"):
+    """Slippage model from the backtest section (slippage_model: curves + impact_curves)"""
+    path = Path(config_path)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        config = yaml.safe_load(f) or {}
+    return cost_model_from_config(config.get('backtest', {}))
+
+async def run_24h_backtest(config_path: str = "config.yaml"):
     console.print("\n[bold cyan]Starting 24h Backtest[/bold cyan]")
     
     # Initialize components
@@ -20,7 +32,8 @@ async def run_24h_backtest():
     backtest = BacktestEngine(
         start_date=start_date,
         end_date=end_date,
-        initial_capital=1000  # USDC
+        initial_capital=1000,  # USDC
+        cost_model=load_cost_model(config_path)
     )
     
     # Run backtest
@@ -0,0 +1,135 @@
+import sys
+from pathlib import Path
+
+# Fügen Sie das src Verzeichnis zum Python Path hinzu
+src_path = str(Path(__file__).parent.parent)
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+import logging
+from typing import Any, Dict, List
+
+import click
+import yaml
+from rich.console import Console
+from rich.table import Table
+
+from src.backtest.sweep import (
+    STRATEGIES, SweepStore, grid_search, load_market, random_search, rank_results, run_sweep, write_results
+)
+
+console = Console()
+logger = logging.getLogger(__name__)
+
+
+def _parse_value(text: str) -> Any:
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_space(specs: List[str]) -> Dict[str, Any]:
+    """name=v1,v2,v3 -> Liste; name=low:high -> Bereich (nur für --random)"""
+    space = {}
+    for spec in specs:
+        name, sep, values = spec.partition('=')
+        if not sep or not values:
+            raise click.BadParameter(f"'{spec}' hat nicht die Form name=werte", param_hint='--param')
+        if ':' in values:
+            low, high = values.split(':', 1)
+            space[name] = (_parse_value(low), _parse_value(high))
+        else:
+            space[name] = [_parse_value(v) for v in values.split(',')]
+    return space
+
+
+def _config_defaults(config_path: str, strategy: str):
+    """Basiswerte aus der YAML-Konfiguration: backtest-Abschnitt für die Engine, meme_strategy für MemeSniper"""
+    if not config_path:
+        return {}, {}
+    with open(config_path) as f:
+        config = yaml.safe_load(f) or {}
+    backtest = config.get('backtest', {})
+    engine = {
+        name: backtest[key]
+        for name, key in (('initial_capital', 'start_balance'), ('fee_rate', 'fee_rate'), ('slippage', 'fixed_slippage'))
+        if key in backtest
+    }
+    # slippage_model 'curves' (oder nur impact_curves gesetzt): Kurven statt fester Slippage
+    if backtest.get('impact_curves') and backtest.get('slippage_model', 'curves') == 'curves':
+        engine['impact_curves'] = backtest['impact_curves']
+    base = dict(config.get('meme_strategy', {})) if strategy == 'meme_sniper' else {}
+    return engine, base
+
+
+@click.command()
+@click.option('--strategy', '-s', type=click.Choice(list(STRATEGIES)), default='backtest_strategy')
+@click.option('--data-dir', default='data/historical', help='Parquet-Bestand (über den Katalog gelesen)')
+@click.option('--tick-dir', default=None, help='TickStore-Verzeichnis statt Parquet')
+@click.option('--pool', '-p', 'pools', multiple=True, help='Pool-Adressen (Standard: alle im Bestand)')
+@click.option('--start', type=click.DateTime(), default=None)
+@click.option('--end', type=click.DateTime(), default=None)
+@click.option('--param', '-P', 'params', multiple=True, help='name=v1,v2 (Werte) oder name=low:high (Bereich)')
+@click.option('--random', 'samples', type=int, default=0, help='Zufallssuche mit N Stichproben statt Grid')
+@click.option('--seed', type=int, default=None)
+@click.option('--config', 'config_path', type=click.Path(exists=True), default=None,
+              help='YAML-Konfiguration als Basis (backtest, meme_strategy)')
+@click.option('--impact-curves', type=click.Path(exists=True), default=None,
+              help='Impact-Kurven (NPZ aus record_impact_curves.py) statt fester Slippage')
+@click.option('--workers', '-w', type=int, default=None, help='Prozesse (Standard: CPU-Anzahl, 0 = seriell)')
+@click.option('--results', default='results/sweep.jsonl', help='Ergebnisdatei, bereits gerechnete Läufe werden übersprungen')
+@click.option('--output', '-o', default='results/sweep_ranked.json', help='Rangliste als .json oder .parquet')
+@click.option('--metric', '-m', default='total_return', help='Sortier-Metrik')
+@click.option('--top', default=10, help='Anzahl angezeigter Ergebnisse')
+def main(strategy, data_dir, tick_dir, pools, start, end, params, samples, seed, config_path,
+         impact_curves, workers, results, output, metric, top):
+    """Parameter-Sweep über Backtests, parallel und fortsetzbar"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    space = parse_space(list(params))
+    if not space:
+        raise click.UsageError("Mindestens ein --param angeben")
+    if not samples and any(isinstance(values, tuple) for values in space.values()):
+        raise click.UsageError("Bereiche (low:high) nur mit --random")
+
+    engine_defaults, base = _config_defaults(config_path, strategy)
+    if impact_curves:
+        engine_defaults['impact_curves'] = impact_curves
+    sampled = random_search(space, samples, seed) if samples else grid_search(space)
+    param_sets = [{**base, **p} for p in sampled]
+
+    market = load_market(Path(data_dir), Path(tick_dir) if tick_dir else None, pools, start, end)
+    if not len(market):
+        raise click.ClickException("Keine Marktdaten im gewählten Zeitraum")
+    console.print(f"[cyan]{len(market)} Events aus {len(market.pools)} Pools, {len(param_sets)} Kombinationen[/cyan]")
+
+    ranked = rank_results(run_sweep(
+        market, strategy, param_sets,
+        store=SweepStore(Path(results)),
+        workers=workers,
+        engine_defaults=engine_defaults,
+        start=start,
+        end=end,
+        progress=lambda r: console.print(f"  {r['key']}: {r.get('metrics', {}).get(metric, r.get('error'))}")
+    ), metric)
+    write_results(ranked, Path(output))
+
+    table = Table(title=f"Top {top} nach {metric}")
+    table.add_column("Rang", justify="right")
+    table.add_column("Parameter")
+    table.add_column(metric, justify="right")
+    table.add_column("Trades", justify="right")
+    for result in ranked[:top]:
+        metrics = result.get('metrics', {})
+        shown = {k: v for k, v in result['params'].items() if k in space}
+        table.add_row(str(result['rank']), str(shown), f"{metrics.get(metric, float('nan')):.4f}",
+                      str(metrics.get('trades', '-')))
+    console.print(table)
+    console.print(f"[green]Rangliste gespeichert: {output}[/green]")
+
+
+if __name__ == "__main__":
+    main()
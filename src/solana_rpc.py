@@ -1,28 +1,26 @@
-from solana.rpc.api import Client
-from solana.rpc.commitment import Confirmed
 from typing import Optional, Dict, List
 import logging
 import asyncio
+import time
 from datetime import datetime
 import base58
+from src.config.connections import RPCEndpoint, SOLANA_RPC_ENDPOINTS
+from src.connection.hedged_rpc import HedgedRPCClient
 
 class SolanaRPC:
-    def __init__(self, network: str = "mainnet"):
-        # RPC Endpoints
+    def __init__(self, network: str = "mainnet", transport=None):
+        # RPC Endpoints: Gewichte und Health-Status aus der Connection-Config
         self.endpoints = {
-            "mainnet": [
-                "https://api.mainnet-beta.solana.com",
-                "https://solana-api.projectserum.com",
-                "https://rpc.ankr.com/solana"
-            ],
+            "mainnet": SOLANA_RPC_ENDPOINTS["mainnet"],
             "devnet": [
-                "https://api.devnet.solana.com"
+                RPCEndpoint(url="https://api.devnet.solana.com", weight=1)
             ]
         }
         
         self.network = network
-        self.current_endpoint = 0
-        self.client = Client(self.endpoints[network][0])
+        # Reads gehen gehedged über alle Endpoints (Reihenfolge nach Health und Gewicht): ein
+        # langsamer Endpoint wird nach seiner p95-Latenz abgesichert statt erst nach einem Fehler gewechselt
+        self.rpc = HedgedRPCClient(self.endpoints[network], transport=transport)
         self.last_request_time = {}
         self.request_interval = 0.1  # 100ms zwischen Anfragen
         
@@ -33,19 +31,20 @@ class SolanaRPC:
     async def get_token_accounts(self, wallet_address: str) -> List[Dict]:
         """Holt alle Token Accounts einer Wallet"""
         try:
-            response = await self.client.get_token_accounts_by_owner(
+            response = await self._request("getTokenAccountsByOwner", [
                 wallet_address,
-                {'programId': 'TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA'}
-            )
+                {'programId': 'TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA'},
+                {'encoding': 'jsonParsed'}
+            ])
             
-            if response['result']['value']:
+            if response['value']:
                 return [
                     {
                         'mint': acc['account']['data']['parsed']['info']['mint'],
                         'amount': float(acc['account']['data']['parsed']['info']['tokenAmount']['uiAmount']),
                         'address': acc['pubkey']
                     }
-                    for acc in response['result']['value']
+                    for acc in response['value']
                 ]
             return []
             
@@ -56,9 +55,9 @@ class SolanaRPC:
     async def get_token_balance(self, token_account: str) -> float:
         """Holt den Balance eines Token Accounts"""
         try:
-            response = await self.client.get_token_account_balance(token_account)
-            if response['result']['value']:
-                return float(response['result']['value']['uiAmount'])
+            response = await self._request("getTokenAccountBalance", [token_account])
+            if response['value']:
+                return float(response['value']['uiAmount'])
             return 0.0
         except Exception as e:
             await self._handle_error("get_token_balance", e)
@@ -67,9 +66,9 @@ class SolanaRPC:
     async def get_sol_balance(self, wallet_address: str) -> float:
         """Holt den SOL Balance einer Wallet"""
         try:
-            response = await self.client.get_balance(wallet_address)
-            if response['result']['value']:
-                return response['result']['value'] / 1e9  # Lamports zu SOL
+            response = await self._request("getBalance", [wallet_address])
+            if response['value']:
+                return response['value'] / 1e9  # Lamports zu SOL
             return 0.0
         except Exception as e:
             await self._handle_error("get_sol_balance", e)
@@ -78,9 +77,9 @@ class SolanaRPC:
     async def get_token_info(self, token_mint: str) -> Optional[Dict]:
         """Holt Token Metadaten"""
         try:
-            response = await self.client.get_account_info(token_mint)
-            if response['result']['value']:
-                data = base58.b58decode(response['result']['value']['data'][0])
+            response = await self._request("getAccountInfo", [token_mint, {'encoding': 'base58'}])
+            if response['value']:
+                data = base58.b58decode(response['value']['data'][0])
                 return {
                     'mint': token_mint,
                     'decimals': data[4],
@@ -119,20 +118,18 @@ class SolanaRPC:
             await asyncio.sleep(1)
             return
             
-        if "502" in str(error) or "503" in str(error):  # Server Fehler
-            await self._switch_endpoint()
-            return
-            
+        # Server-Fehler einzelner Endpoints fängt der Hedged-Client ab (Ranking nach Fehlerquote);
+        # hier landet nur, was auf keinem Endpoint geklappt hat
         logging.error(f"RPC Fehler in {method}: {str(error)}")
         
-    async def _switch_endpoint(self):
-        """Wechselt zu einem anderen RPC Endpoint"""
-        self.current_endpoint = (self.current_endpoint + 1) % len(self.endpoints[self.network])
-        new_endpoint = self.endpoints[self.network][self.current_endpoint]
-        
-        self.client = Client(new_endpoint)
-        logging.warning(f"Gewechselt zu RPC Endpoint: {new_endpoint}")
-        
+    async def _request(self, method: str, params: List) -> Dict:
+        """JSON-RPC über den Hedged-Client; liefert das result-Feld"""
+        start_time = time.time()
+        try:
+            return await self.rpc.request(method, params)
+        finally:
+            await self._measure_performance(method, start_time)
+            
     async def _measure_performance(self, method: str, start_time: float):
         """Misst die Performance eines RPC Calls"""
         duration = time.time() - start_time
@@ -149,14 +146,13 @@ class SolanaRPC:
     async def get_pool_info(self, pool_address: str) -> Optional[Dict]:
         """Holt detaillierte Pool-Informationen"""
         try:
-            response = await self.client.get_account_info(
+            response = await self._request("getAccountInfo", [
                 pool_address,
-                encoding="jsonParsed",
-                commitment=Confirmed
-            )
+                {'encoding': 'jsonParsed', 'commitment': 'confirmed'}
+            ])
             
-            if response['result']['value']:
-                data = response['result']['value']['data']
+            if response['value']:
+                data = response['value']['data']
                 return {
                     'address': pool_address,
                     'liquidity': float(data['parsed']['info']['liquidity']),
@@ -194,8 +190,8 @@ class SolanaRPC:
     async def _get_recent_blockhash(self) -> str:
         """Holt den aktuellen Blockhash"""
         try:
-            response = await self.client.get_recent_blockhash()
-            return response['result']['value']['blockhash']
+            response = await self._request("getLatestBlockhash", [])
+            return response['value']['blockhash']
         except Exception as e:
             await self._handle_error("get_recent_blockhash", e)
             return None
@@ -0,0 +1,60 @@
+import base64
+import numpy as np
+from src.whirlpool.account_decoder import (
+    WHIRLPOOL_ACCOUNT_SIZE,
+    decode_whirlpool,
+    decode_whirlpools,
+    encode_whirlpool
+)
+
+SQRT_PRICE = 7_456_729_101_634_128_012  # ~0.163 B/A
+LIQUIDITY = (1 << 70) + 12345
+
+
+def _account(i: int = 0) -> bytes:
+    return encode_whirlpool(
+        sqrt_price=SQRT_PRICE + i,
+        tick_current_index=-18_000 + i,
+        liquidity=LIQUIDITY + i,
+        fee_rate=3000,
+        tick_spacing=64,
+        fee_growth_global_a=(1 << 100) + i,
+        fee_growth_global_b=i,
+        token_mint_a=bytes([1]) * 32,
+        token_mint_b=bytes([2]) * 32
+    )
+
+
+def test_decode_single_account():
+    data = decode_whirlpool(_account())
+
+    assert data['sqrt_price'] == SQRT_PRICE
+    assert data['tick_current_index'] == -18_000
+    assert data['liquidity'] == LIQUIDITY
+    assert data['fee_rate'] == 3000
+    assert data['tick_spacing'] == 64
+    assert data['fee_growth_global_a'] == 1 << 100
+    assert data['price'] == (SQRT_PRICE / 2 ** 64) ** 2
+    assert data['token_mint_a'] == "4vJ9JU1bJJE96FWSJKvHsmmFADCg4gpZQff4P3bkLKi"
+
+
+def test_decode_batch_columns():
+    accounts = [_account(i) for i in range(100)]
+    batch = decode_whirlpools(accounts)
+
+    assert len(batch) == 100
+    assert batch.valid.all()
+    assert np.array_equal(batch.tick_current_index, np.arange(100) - 18_000)
+    assert np.allclose(batch.liquidity, float(LIQUIDITY) + np.arange(100))
+    assert batch.u128('liquidity', 42) == LIQUIDITY + 42
+    assert bytes(batch.token_mint_b[7]) == bytes([2]) * 32
+
+
+def test_decode_rpc_formats_and_invalid():
+    encoded = base64.b64encode(_account()).decode()
+    batch = decode_whirlpools([[encoded, "base64"], b"\x00" * 10, None, _account(1)])
+
+    assert list(batch.valid) == [True, False, False, True]
+    assert batch.to_dicts()[1] is None
+    assert batch.to_dict(3)['tick_current_index'] == -17_999
+    assert decode_whirlpool(bytes(WHIRLPOOL_ACCOUNT_SIZE)) is None
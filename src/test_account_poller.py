@@ -0,0 +1,66 @@
+import asyncio
+from src.connection.account_poller import WhirlpoolPoller
+from src.connection.http_transport import HttpTransport
+from testing.mock_rpc import MockRPCServer
+from src.whirlpool.account_decoder import encode_whirlpool
+
+
+def _accounts(n: int):
+    return {
+        f"Pool{i:04d}": encode_whirlpool(
+            sqrt_price=(1 << 64) + i,
+            tick_current_index=i,
+            liquidity=1_000_000 + i
+        )
+        for i in range(n)
+    }
+
+
+def test_poller_chunks_and_tags_slot():
+    async def run():
+        accounts = _accounts(250)
+        async with MockRPCServer(accounts) as server, HttpTransport() as transport:
+            poller = WhirlpoolPoller(server.url, max_concurrency=2, transport=transport)
+            try:
+                chunks = await poller.poll(list(accounts) + ["Missing"])
+                snapshots = await poller.snapshots(list(accounts))
+            finally:
+                await poller.close()
+        return server, chunks, snapshots, transport
+
+    server, chunks, snapshots, transport = asyncio.run(run())
+
+    # 251 Adressen -> 3 Chunks, danach nochmal 3 für snapshots()
+    assert server.method_counts["getMultipleAccounts"] == 6
+    assert [len(chunk.batch) for chunk in chunks] == [100, 100, 51]
+    assert not chunks[-1].batch.valid[-1]
+    assert all(chunk.slot > 1_000_000 for chunk in chunks)
+    assert len(snapshots) == 250
+    assert snapshots["Pool0123"].data["liquidity"] == 1_000_123
+    assert snapshots["Pool0123"].data["tick_current_index"] == 123
+    # Kein eigener Session-Pool: alle Aufrufe laufen über den geteilten Transport
+    assert transport.requests == 6
+
+
+def test_poller_skips_failed_chunks():
+    async def run():
+        async with HttpTransport() as transport:
+            poller = WhirlpoolPoller("http://127.0.0.1:9", timeout=1, transport=transport)
+            try:
+                return await poller.poll(["Pool0000"])
+            finally:
+                await poller.close()
+
+    assert asyncio.run(run()) == []
+
+
+def test_poller_endpoint_comes_from_config():
+    from src.config.connections import SOLANA_RPC_ENDPOINTS, primary_rpc_url
+
+    configured = sorted((ep for ep in SOLANA_RPC_ENDPOINTS['mainnet'] if ep.url), key=lambda ep: ep.weight)
+    assert WhirlpoolPoller.from_config().rpc_url == primary_rpc_url() == configured[0].url
+    configured[0].healthy = False
+    try:
+        assert primary_rpc_url() == configured[1].url
+    finally:
+        configured[0].healthy = True
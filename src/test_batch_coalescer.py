@@ -0,0 +1,88 @@
+import asyncio
+from src.connection.batch_coalescer import RPCBatchCoalescer, RPCBatchError, _coalescers, get_batch_coalescer, with_commitment
+from src.connection.http_transport import HttpTransport
+from testing.mock_rpc import MockRPCServer
+
+
+def test_concurrent_reads_share_one_batch():
+    async def run():
+        async with MockRPCServer() as server:
+            for i in range(30):
+                server.balances[f"Wallet{i}"] = i
+            async with HttpTransport() as transport:
+                coalescer = RPCBatchCoalescer(server.url, transport=transport,
+                                              flush_interval=0.02, max_batch_size=25)
+                results = await asyncio.gather(
+                    *(coalescer.call("getBalance", [f"Wallet{i}"]) for i in range(30)),
+                    coalescer.call("getTokenAccountBalance", ["Wallet7"]),
+                    coalescer.call("getUnknown", []),
+                    return_exceptions=True
+                )
+        return server, coalescer, results
+
+    server, coalescer, results = asyncio.run(run())
+
+    # 32 Aufrufe, Obergrenze 25 -> zwei HTTP-Requests
+    assert server.http_requests == 2
+    assert coalescer.stats()["largest_batch"] == 25
+    assert [result["value"] for result in results[:30]] == list(range(30))
+    assert results[30]["value"]["amount"] == "7"
+    assert isinstance(results[31], RPCBatchError)
+
+
+def test_batch_failure_reaches_every_caller():
+    async def run():
+        async with HttpTransport() as transport:
+            coalescer = RPCBatchCoalescer("http://127.0.0.1:9", transport=transport, timeout=1)
+            return await asyncio.gather(
+                *(coalescer.call("getBalance", [f"Wallet{i}"]) for i in range(3)),
+                return_exceptions=True
+            )
+
+    results = asyncio.run(run())
+
+    assert len(results) == 3
+    assert all(isinstance(result, Exception) for result in results)
+
+
+def test_shared_coalescer_is_keyed_on_settings():
+    url = "http://rpc.test/settings"
+    try:
+        fast = get_batch_coalescer(url, flush_interval=0.01, max_batch_size=100)
+        slow = get_batch_coalescer(url, max_batch_size=20, flush_interval=0.1)
+        shared = get_batch_coalescer(url, max_batch_size=100, flush_interval=0.01)
+    finally:
+        for key in [key for key in _coalescers if key[0] == url]:
+            _coalescers.pop(key)
+
+    # Abweichende Einstellungen stellen die geteilte Instanz nicht um
+    assert fast is shared and fast is not slow
+    assert (fast.flush_interval, fast.max_batch_size) == (0.01, 100)
+    assert (slow.flush_interval, slow.max_batch_size) == (0.1, 20)
+
+
+def test_commitment_is_forwarded_in_batched_params():
+    assert with_commitment(["Wallet1"], "confirmed") == ["Wallet1", {"commitment": "confirmed"}]
+    assert with_commitment(["Pool", {"encoding": "base64"}], "confirmed") == [
+        "Pool", {"commitment": "confirmed", "encoding": "base64"}
+    ]
+    assert with_commitment(["Pool", {"commitment": "finalized"}], "confirmed") == [
+        "Pool", {"commitment": "finalized"}
+    ]
+    assert with_commitment(None, None) == []
+
+    async def run():
+        async with MockRPCServer() as server:
+            server.balances["Wallet1"] = 5
+            async with HttpTransport() as transport:
+                coalescer = RPCBatchCoalescer(server.url, transport=transport)
+                return await asyncio.gather(
+                    coalescer.call("getBalance", ["Wallet1"], commitment="confirmed"),
+                    coalescer.call("getBalance", ["Wallet1"]),
+                ), coalescer
+
+    (confirmed, default), coalescer = asyncio.run(run())
+
+    # Unterschiedliche Commitments werden nicht zu einem Eintrag zusammengelegt
+    assert confirmed["value"] == default["value"] == 5
+    assert coalescer.stats()["largest_batch"] == 2
@@ -0,0 +1,72 @@
+import numpy as np
+from benchmarks.cases import CASES, select
+from benchmarks.run import compare, main, measure
+from benchmarks.synthetic import MarketSpec, generate_frames, generate_prices, generate_swaps
+
+
+def test_generator_is_deterministic_and_independent_of_pool_count():
+    small, large = MarketSpec(pools=3, steps=500), MarketSpec(pools=50, steps=500)
+    assert np.array_equal(generate_prices(small), generate_prices(small))
+    assert np.array_equal(generate_prices(small), generate_prices(large)[:3])
+    assert not np.array_equal(generate_prices(small), generate_prices(small.scaled(seed=8)))
+
+    frames = generate_frames(small)
+    assert list(frames) == small.pool_names
+    assert (frames['pool00000']['price'] > 0).all()
+
+
+def test_jumps_fatten_the_tails():
+    calm = np.diff(np.log(generate_prices(MarketSpec(pools=20, steps=5000, jump_intensity=0))), axis=1)
+    jumpy = np.diff(np.log(generate_prices(MarketSpec(pools=20, steps=5000, jump_intensity=50))), axis=1)
+    kurtosis = lambda r: ((r - r.mean()) ** 4).mean() / r.var() ** 2
+    assert kurtosis(calm) < 3.5 < kurtosis(jumpy)
+
+
+def test_swaps_are_time_ordered_and_follow_the_price_path():
+    spec = MarketSpec(pools=5, steps=200, swaps_per_step=3)
+    swaps = generate_swaps(spec)
+    assert np.all(np.diff(swaps['timestamp']) >= 0)
+    assert abs(len(swaps) - 5 * 200 * 3) < 300
+    prices = generate_prices(spec)
+    step = (swaps['timestamp'] - spec.timestamps()[0]) // (60 * 10 ** 9)
+    assert np.array_equal(swaps['price'], prices[swaps['pool'], step])
+
+
+def test_measure_and_compare(tmp_path):
+    assert [c.name for c in select(['decode'])] == ['decode_whirlpools']
+    entry = measure(CASES['decode_whirlpools'], pools=10, repeat=2, seed=1)
+    assert entry['status'] == 'ok' and entry['min'] <= entry['median']
+
+    def results(**medians):
+        return {'results': {key: {'status': 'ok', 'median': value} for key, value in medians.items()}}
+
+    baseline = results(a=1.0, b=1.0, c=1.0, d=0.001)
+    current = results(a=1.1, b=1.5, c=0.5, d=0.0015, e=2.0)
+    rows = {row['key']: row['status'] for row in compare(current, baseline, threshold=0.2)}
+    # d ist zwar 50 % langsamer, liegt aber unter dem Rauschen; e fehlt in der Baseline
+    assert rows == {'a': 'ok', 'b': 'regression', 'c': 'faster', 'd': 'ok'}
+
+    # In der Baseline gemessen, jetzt übersprungen oder fehlerhaft: Fehlschlag statt Stille
+    current['results']['a'] = {'status': 'skipped', 'reason': 'ImportError'}
+    current['results']['b'] = {'status': 'error', 'reason': 'ValueError: x'}
+    rows = {row['key']: row['status'] for row in compare(current, baseline, threshold=0.2)}
+    assert rows['a'] == rows['b'] == 'failed'
+
+
+def test_risk_and_engine_cases_run(tmp_path):
+    # Beide Fälle wurden früher wegen des fehlenden TradeData-Exports übersprungen
+    assert measure(CASES['risk_checks'], pools=2, repeat=1, seed=1)['status'] == 'ok'
+    report = CASES['backtest_engine'].setup(MarketSpec(pools=2, steps=300, seed=1), tmp_path)()
+    assert report['total_return'] == report['total_return']  # nicht NaN, Schleife lief durch
+
+
+def test_main_fails_when_a_baseline_case_is_skipped(tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.json"
+    args = ['--filter', 'decode', '--quick', '--repeat', '1', '--baseline', str(baseline),
+            '--output', str(tmp_path / "out.json")]
+    assert main(args + ['--save-baseline']) == 0
+
+    def broken(spec, workdir):
+        raise ImportError("kaputt")
+    monkeypatch.setattr(CASES['decode_whirlpools'], 'setup', broken)
+    assert main(args) == 1
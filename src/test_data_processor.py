@@ -0,0 +1,77 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from src.data.data_processor import DataProcessor
+from src.data.record_codec import decode_record, encode_record
+
+
+def test_writes_are_batched_and_history_is_trimmed():
+    async def run():
+        client = fakeredis.FakeAsyncRedis()
+        processor = DataProcessor({'redis_url': 'redis://localhost', 'history_limit': 3})
+        processor.redis = client
+
+        for pool in ("PoolA", "PoolB"):
+            await processor._update_cache(pool, {'price': 1.5, 'volume': 10})
+        assert await client.exists("pool:PoolA") == 0  # noch nicht geschrieben
+
+        assert await processor.flush_writes() == 2
+        latest = decode_record(await client.hget("pool:PoolB", "latest"))
+
+        now = int(time.time())
+        await client.zadd("history:PoolA", {encode_record({'price': float(i)}, now - 10 + i): now - 10 + i
+                                            for i in range(5)})
+        old = now - 3 * 86400
+        await client.zadd("history:PoolA", {encode_record({'price': 0.1}, old): old})
+        history = await processor._get_price_history("PoolA")
+
+        await processor.archive_cold_history()
+        await processor.trim_history()
+        remaining = await client.zcard("history:PoolA")
+        archived = await processor.get_archived_history("PoolA", datetime.fromtimestamp(old, tz=timezone.utc))
+        await client.aclose()
+        return latest, history, remaining, archived
+
+    latest, history, remaining, archived = asyncio.run(run())
+
+    assert latest['price'] == 1.5
+    # Jüngste Einträge, chronologisch sortiert, auf history_limit begrenzt
+    assert history['price'].tolist() == [3.0, 4.0, 1.5]
+    # Kalter Eintrag liegt komprimiert im Tagesarchiv
+    assert remaining == 6
+    assert archived['price'].tolist() == [0.1]
+
+
+class _BrokenRedis:
+    def pipeline(self, transaction=True):
+        raise ConnectionError("redis down")
+
+
+def test_failed_flush_keeps_updates_for_next_flush():
+    async def run():
+        client = fakeredis.FakeAsyncRedis()
+        processor = DataProcessor({'redis_url': 'redis://localhost'})
+        processor.redis = client
+        await processor._update_cache("PoolA", {'price': 1.0})
+
+        processor.redis = _BrokenRedis()
+        failed = await processor.flush_writes()
+        await processor._update_cache("PoolA", {'price': 2.0})
+
+        processor.redis = client
+        written = await processor.flush_writes()
+        latest = decode_record(await client.hget("pool:PoolA", "latest"))
+        history = await client.zcard("history:PoolA")
+        await client.aclose()
+        return failed, written, latest, history
+
+    failed, written, latest, history = asyncio.run(run())
+
+    assert failed == 0
+    assert written == 2
+    assert latest['price'] == 2.0
+    assert history >= 1
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+import pandas as pd
+from src.data.collector_sink import ParquetCollectorSink
+from src.data.dataset_catalog import DatasetCatalog
+
+
+def _legacy_file(data_dir, pool, start, count, name):
+    # Altes Format: ein DataFrame pro Datei, Zeitstempel als ISO-String
+    df = pd.DataFrame({
+        'timestamp': [(start + timedelta(minutes=i)).isoformat() for i in range(count)],
+        'price': [float(i) for i in range(count)],
+        'liquidity': 1e9,
+    })
+    df.to_parquet(data_dir / f"pool_{pool}_{name}.parquet")
+
+
+def test_query_prunes_files_and_row_groups(tmp_path):
+    start = datetime(2024, 1, 1)
+    sink = ParquetCollectorSink(tmp_path, flush_rows=60)
+    for i in range(3 * 24 * 60):  # drei Tage, eine Row-Group pro Stunde
+        sink.append("PoolA", start + timedelta(minutes=i), price=float(i), liquidity=1e9)
+    sink.append("PoolB", start, price=1.0)
+    sink.close()
+    _legacy_file(tmp_path, "PoolA", start - timedelta(days=1), 30, "1m_20231231")
+
+    catalog = DatasetCatalog(tmp_path)
+    assert catalog.refresh() == 5
+    entries = catalog.files("PoolA")
+    assert [entry.timeframe for entry in entries] == ["1m", "tick", "tick", "tick"]
+    assert entries[1].rows == 24 * 60 and len(entries[1].row_groups) == 24
+    assert entries[0].min_ts == pd.Timestamp(start - timedelta(days=1)).value
+
+    window_start = start + timedelta(days=1, hours=5, minutes=30)
+    df = catalog.query("PoolA", window_start, window_start + timedelta(minutes=59))
+    assert len(df) == 60
+    assert df["timestamp"].iloc[0] == window_start
+    assert df["price"].iloc[0] == 24 * 60 + 5 * 60 + 30
+    # Eine Datei, zwei Row-Groups statt drei Tage Vollscan
+    assert catalog.files_read == 1 and catalog.row_groups_read == 2
+
+    legacy = catalog.query("PoolA", start - timedelta(days=1), start - timedelta(days=1, minutes=-9))
+    assert len(legacy) == 10 and str(legacy["timestamp"].dtype) == "datetime64[ns]"
+
+
+def test_manifest_is_persisted_and_follows_compaction(tmp_path):
+    start = datetime(2024, 1, 1)
+    sink = ParquetCollectorSink(tmp_path, flush_rows=10)
+    for i in range(25):
+        sink.append("PoolA", start + timedelta(minutes=i), price=float(i))
+    sink.flush()
+
+    catalog = DatasetCatalog(tmp_path)
+    catalog.refresh("PoolA")
+    assert len(catalog.files("PoolA")) == 3
+
+    sink.close()  # Parts werden zu einer Compact-Datei zusammengefasst
+    reopened = DatasetCatalog(tmp_path)
+    assert len(reopened.entries) == 3
+    assert reopened.refresh("PoolA") == 1
+    assert [entry.path.rsplit('/', 1)[-1] for entry in reopened.files("PoolA")] == ["compact-000003.parquet"]
+    assert len(reopened.query("PoolA")) == 25
+    assert reopened.refresh() == 0
+
+
+def test_covers_detects_gaps(tmp_path):
+    start = datetime(2024, 1, 1)
+    _legacy_file(tmp_path, "PoolA", start, 60, "1m_a")
+    _legacy_file(tmp_path, "PoolA", start + timedelta(hours=2), 60, "1m_b")
+    catalog = DatasetCatalog(tmp_path)
+    catalog.refresh()
+
+    assert catalog.covers("PoolA", start, start + timedelta(minutes=59), "1m", tolerance_seconds=60)
+    assert not catalog.covers("PoolA", start, start + timedelta(hours=2, minutes=30), "1m", tolerance_seconds=60)
+    assert not catalog.covers("PoolA", start - timedelta(hours=1), start + timedelta(minutes=30), "1m", 60)
+
+
+def test_window_file_is_indexed_and_fingerprinted(tmp_path):
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 2)
+    catalog = DatasetCatalog(tmp_path)
+    path = catalog.window_file("SOL-USDC", "trades", start, end)
+    pd.DataFrame({'timestamp': [start + timedelta(hours=1)], 'price': [1.0], 'side': ['buy']}).to_parquet(path)
+    catalog.refresh()
+    assert [entry.path for entry in catalog.files("SOL-USDC", start, end)] == [path.name]
+    before = catalog.fingerprint("SOL-USDC", start, end)
+
+    pd.DataFrame({'timestamp': [start + timedelta(hours=2)], 'price': [2.0], 'side': ['sell']}).to_parquet(path)
+    catalog.refresh()
+    assert catalog.fingerprint("SOL-USDC", start, end) != before
@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from src.backtest.event_engine import (
+    AlignedMarket, EventBacktester, Order, RowStrategyAdapter, SignalFrameAdapter, EventStrategy
+)
+from src.backtest.strategy_manager import BacktestStrategy
+from src.strategies.meme_strategy import MemeStrategy
+from src.data.tick_store import TickStore
+
+
+def _frame(start, minutes, prices):
+    return pd.DataFrame({
+        'timestamp': [start + timedelta(minutes=m) for m in minutes],
+        'price': prices,
+        'volume': 1e6,
+    })
+
+
+def test_events_are_merged_and_batched_by_timestamp():
+    start = datetime(2024, 1, 1)
+    market = AlignedMarket.from_frames({
+        'A': _frame(start, [0, 2, 4], [1.0, 2.0, 3.0]),
+        'B': _frame(start, [1, 2, 3], [10.0, 20.0, 30.0]).iloc[::-1],  # unsortiert geliefert
+        'C': _frame(start, [2], [100.0]),
+    })
+    assert list(market.events())[:4] == [
+        (pd.Timestamp(start).value + m * 60_000_000_000, pool, row)
+        for m, pool, row in [(0, 0, 0), (1, 1, 0), (2, 0, 1), (2, 1, 1)]
+    ]
+    batches = list(market.batches())
+    assert [len(b) for b in batches] == [1, 1, 3, 1, 1]
+    assert batches[2].values['price'].tolist() == [2.0, 20.0, 100.0]
+    assert batches[2].datetime == start + timedelta(minutes=2)
+    assert [b.timestamp for b in market.batches(start + timedelta(minutes=1), start + timedelta(minutes=3))] == \
+        [b.timestamp for b in batches[1:4]]
+
+
+class _CrossoverStrategy(BacktestStrategy):
+    # Die Standardregel (MA-Crossover + RSI < 30) feuert auf Zufallsdaten praktisch nie
+    def generate_signals(self, df):
+        signals = pd.Series(index=df.index, data='HOLD')
+        signals[df['MA5'] > df['MA20']] = 'BUY'
+        signals[df['MA5'] < df['MA20']] = 'SELL'
+        return signals
+
+
+def test_signal_frame_adapter_matches_strategy_signals():
+    rng = np.random.default_rng(3)
+    start = datetime(2024, 1, 1)
+    frames = {
+        pool: _frame(start, range(2000), 100 * np.exp(np.cumsum(rng.normal(0, 0.003, 2000))))
+        for pool in ('A', 'B')
+    }
+    strategy = _CrossoverStrategy()
+    market = AlignedMarket.from_frames(frames)
+    result = asyncio.run(EventBacktester(market, SignalFrameAdapter(strategy), fee_rate=0, slippage=0).run())
+
+    # Referenz: gleiche Signale, Pool für Pool mit der bisherigen DataFrame-Logik
+    for pool, df in frames.items():
+        signals = strategy.generate_signals(strategy.calculate_indicators(df))
+        expected, holding = [], False
+        for ts, signal in zip(df['timestamp'], signals):
+            if signal == 'BUY' and not holding:
+                expected.append((ts, 'buy'))
+                holding = True
+            elif signal == 'SELL' and holding:
+                expected.append((ts, 'sell'))
+                holding = False
+        got = [(t['timestamp'], t['type']) for t in result.trades if t['pool_address'] == pool]
+        assert got == expected and expected
+
+    assert len(result.equity) == 2000
+    assert result.final_capital == result.equity[-1]
+    assert 0 <= result.max_drawdown < 1
+
+
+def test_row_adapter_runs_async_candle_strategy():
+    start = datetime(2024, 1, 1)
+    prices = [1.0, 1.1, 1.1, 1.0, 1.0]  # +10% -> buy, -9% -> sell
+    market = AlignedMarket.from_frames({'A': _frame(start, range(5), prices)})
+    result = asyncio.run(EventBacktester(market, RowStrategyAdapter(MemeStrategy()), slippage=0, fee_rate=0).run())
+    assert [(t['type'], t['price']) for t in result.trades] == [('buy', 1.1), ('sell', 1.0)]
+    assert result.final_capital < result.initial_capital
+
+
+class _BuyOnce(EventStrategy):
+    def on_batch(self, batch, engine):
+        if not engine.position('A'):
+            return [Order('A', 'buy', value=100.0)]
+
+
+def test_tick_files_feed_the_engine(tmp_path):
+    start = datetime(2024, 1, 1)
+    store = TickStore(tmp_path)
+    store.append('A', _frame(start, range(100), np.linspace(1, 2, 100)))
+    market = AlignedMarket.from_tick_files({'A': store.open('A')}, start + timedelta(minutes=10))
+    assert len(market) == 90
+
+    result = asyncio.run(EventBacktester(market, _BuyOnce(), initial_capital=100.0, fee_rate=0, slippage=0).run())
+    assert len(result.trades) == 1 and result.trades[0]['timestamp'] == start + timedelta(minutes=10)
+    assert np.isclose(result.final_capital, 100.0 * 2 / market.series[0]['price'][0])
@@ -0,0 +1,103 @@
+import asyncio
+import time
+from src.connection.hedged_rpc import HedgedRPCClient, RPCError
+from src.connection.http_transport import HttpTransport
+from testing.mock_rpc import MockRPCServer
+
+
+def test_slow_primary_is_hedged_to_backup():
+    async def run():
+        async with MockRPCServer(latency=0.5) as slow, MockRPCServer(latency=0.0) as fast:
+            fast.balances["Wallet"] = 42
+            async with HttpTransport() as transport:
+                client = HedgedRPCClient([slow.url, fast.url], transport=transport, initial_hedge_delay=0.05)
+                start = time.perf_counter()
+                result = await client.request("getBalance", ["Wallet"])
+                elapsed = time.perf_counter() - start
+        return client, result, elapsed, slow
+
+    client, result, elapsed, slow = asyncio.run(run())
+
+    assert result["value"] == 42
+    assert elapsed < 0.4
+    assert client.hedges == 1
+    assert client.metrics()["endpoints"][slow.url]["wins"] == 0
+
+
+def test_stale_slot_response_is_rejected():
+    async def run():
+        async with MockRPCServer(slot=500) as lagging, MockRPCServer(slot=1_000_000) as current:
+            async with HttpTransport() as transport:
+                client = HedgedRPCClient([lagging.url, current.url], transport=transport)
+                result = await client.request("getAccountInfo", ["Missing"], min_slot=900_000)
+                # Der verworfene Endpoint rutscht im Ranking nach hinten
+                later = await client.request("getAccountInfo", ["Missing"])
+        return client, result, later, lagging
+
+    client, result, later, lagging = asyncio.run(run())
+
+    assert result["context"]["slot"] > 1_000_000
+    assert later["context"]["slot"] > result["context"]["slot"]
+    assert client.stale_responses == 1
+    assert client.metrics()["endpoints"][lagging.url]["requests"] == 1
+
+
+def test_solana_rpc_reads_go_through_hedged_client():
+    from src.solana_rpc import SolanaRPC
+
+    async def run():
+        async with MockRPCServer(latency=0.5) as slow, MockRPCServer(latency=0.0) as fast:
+            fast.balances["Wallet"] = 3_000_000_000
+            async with HttpTransport() as transport:
+                rpc = SolanaRPC(transport=transport)
+                rpc.rpc = HedgedRPCClient([slow.url, fast.url], transport=transport, initial_hedge_delay=0.05)
+                balance = await rpc.get_sol_balance("Wallet")
+        return rpc, balance
+
+    rpc, balance = asyncio.run(run())
+
+    assert balance == 3.0
+    assert rpc.rpc.hedges == 1
+    assert len(rpc.response_times) == 1
+
+
+def test_slot_floor_is_tracked_per_commitment():
+    async def run():
+        async with MockRPCServer(slot=1_000_000) as server:
+            async with HttpTransport() as transport:
+                client = HedgedRPCClient([server.url], transport=transport, max_hedges=0)
+                await client.request("getAccountInfo", ["Pool", {"commitment": "confirmed"}])
+                # finalized läuft ~32 Slots hinter confirmed und wird nur am eigenen Stand gemessen
+                server.slot -= 40
+                finalized = await client.request("getBalance", ["Wallet"])
+                same_scope = await client.request("getAccountInfo", ["Pool", {"commitment": "finalized"}])
+                try:
+                    await client.request("getAccountInfo", ["Pool", {"commitment": "confirmed"}])
+                except RPCError:
+                    stale = True
+                else:
+                    stale = False
+        return client, finalized, same_scope, stale
+
+    client, finalized, same_scope, stale = asyncio.run(run())
+
+    assert finalized["context"]["slot"] < client.highest_slots[("getAccountInfo", "confirmed")]
+    assert same_scope["value"] is None
+    assert stale and client.stale_responses == 1
+
+
+def test_endpoint_order_follows_config_weights_and_health():
+    from src.config.connections import RPCEndpoint
+    from src.solana_rpc import SolanaRPC
+
+    primary = RPCEndpoint(url="http://primary", weight=1)
+    backup = RPCEndpoint(url="http://backup", weight=2)
+    client = HedgedRPCClient([backup, RPCEndpoint(url=None, weight=0), primary])
+    assert [ep.url for ep in client.ranked_endpoints()] == ["http://primary", "http://backup"]
+    primary.healthy = False  # vom RPCManager-Healthcheck gesetzt
+    assert [ep.url for ep in client.ranked_endpoints()] == ["http://backup", "http://primary"]
+
+    rpc = SolanaRPC()
+    configured = [ep for ep in rpc.endpoints["mainnet"] if ep.url]
+    ranked = rpc.rpc.ranked_endpoints()
+    assert [ep.url for ep in ranked] == [ep.url for ep in sorted(configured, key=lambda ep: ep.weight)]
@@ -0,0 +1,43 @@
+import asyncio
+from aiohttp import web
+from src.connection.http_transport import HttpTransport
+
+
+async def _start_server(stats):
+    async def handle(request):
+        stats["connections"].add(request.transport.get_extra_info("peername"))
+        stats["active"] += 1
+        stats["peak"] = max(stats["peak"], stats["active"])
+        await asyncio.sleep(0.02)
+        stats["active"] -= 1
+        return web.json_response({"price": "1.5"})
+
+    app = web.Application()
+    app.router.add_get("/price", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/price"
+
+
+def test_transport_reuses_connections_and_limits_host():
+    async def run():
+        stats = {"connections": set(), "active": 0, "peak": 0}
+        runner, url = await _start_server(stats)
+        try:
+            async with HttpTransport(host_limits={"127.0.0.1": 3}) as transport:
+                results = await asyncio.gather(*(transport.get_json(url) for _ in range(30)))
+                requests = transport.requests
+        finally:
+            await runner.cleanup()
+        return stats, results, requests
+
+    stats, results, requests = asyncio.run(run())
+
+    assert all(result == {"price": "1.5"} for result in results)
+    assert requests == 30
+    # Höchstens 3 gleichzeitige Requests, Verbindungen werden wiederverwendet
+    assert stats["peak"] <= 3
+    assert len(stats["connections"]) <= 3
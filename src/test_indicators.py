@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from src.data.indicators import IndicatorEngine
+
+
+def _prices():
+    rng = np.random.default_rng(0)
+    prices = pd.Series(100 + rng.normal(0, 0.5, 3000).cumsum())
+    prices[500:540] = prices[499]  # Seitwärtsphase (konstante Fenster)
+    return prices
+
+
+def _pandas_reference(prices: pd.Series) -> pd.DataFrame:
+    delta = prices.diff()
+    avg_gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    avg_loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    macd = prices.ewm(span=12, adjust=False).mean() - prices.ewm(span=26, adjust=False).mean()
+    signal = macd.ewm(span=9, adjust=False).mean()
+    sma = prices.rolling(window=20).mean()
+    std = prices.rolling(window=20).std()
+    return pd.DataFrame({
+        'sma_20': sma,
+        'ema_50': prices.ewm(span=50).mean(),
+        'rsi': 100 - 100 / (1 + avg_gain / avg_loss),
+        'volatility': std,
+        'macd': macd,
+        'macd_signal': signal,
+        'macd_hist': macd - signal,
+        'bb_upper': sma + 2.0 * std,
+        'bb_middle': sma,
+        'bb_lower': sma - 2.0 * std,
+    })
+
+
+def test_incremental_indicators_match_pandas_bitwise():
+    prices = _prices()
+    engine = IndicatorEngine()
+    result = pd.DataFrame([engine.update("pool", price) for price in prices])
+    reference = _pandas_reference(prices)
+
+    for column in reference:
+        np.testing.assert_array_equal(result[column].to_numpy(), reference[column].to_numpy(), err_msg=column)
+
+
+def test_seed_then_update_equals_full_replay():
+    prices = _prices()
+    seeded = IndicatorEngine()
+    seeded.seed("pool", prices[:2000])
+    tail = [seeded.update("pool", price) for price in prices[2000:]]
+
+    reference = _pandas_reference(prices).iloc[2000:]
+    for column in reference:
+        np.testing.assert_array_equal([row[column] for row in tail], reference[column].to_numpy(), err_msg=column)
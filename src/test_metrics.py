@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+from src.trading import metrics
+from src.trading.metrics import OnlineMetrics
+
+
+def _equity(n=1000, seed=3):
+    rng = np.random.default_rng(seed)
+    return 1000 * np.cumprod(1 + rng.normal(0.0003, 0.01, n))
+
+
+def test_batch_metrics_match_reference_definitions():
+    equity = _equity()
+    r = pd.Series(equity).pct_change().dropna()
+    assert np.isclose(metrics.sharpe_ratio(r), r.mean() / r.std() * np.sqrt(252))
+    downside = np.sqrt((r.clip(upper=0) ** 2).mean())
+    assert np.isclose(metrics.sortino_ratio(r), r.mean() / downside * np.sqrt(252))
+
+    # Loop-Referenz (bisherige BacktestEngine._calculate_max_drawdown)
+    peak, worst = equity[0], 0.0
+    for value in equity:
+        peak = max(peak, value)
+        worst = max(worst, (peak - value) / peak)
+    assert np.isclose(metrics.max_drawdown(equity), worst)
+    assert metrics.max_drawdown_duration([100, 120, 90, 110, 125, 100]) == 2
+    assert metrics.max_drawdown_duration([100, 90, 80]) == 2
+
+    pnls = [10, -5, 0, 20, -15]
+    assert metrics.win_rate(pnls) == 0.4
+    assert metrics.profit_factor(pnls) == 1.5
+    assert metrics.profit_factor([1, 2]) == np.inf and metrics.profit_factor([]) == 0.0
+    assert metrics.exposure([0, 1.5, 0, 2]) == 0.5
+    assert metrics.sharpe_ratio([0.01] * 10) == np.inf and metrics.sharpe_ratio([0.01]) == 0.0
+
+
+def test_paths_windows_and_expanding_agree_with_single_series():
+    paths = np.stack([_equity(seed=s) for s in range(4)])
+    assert np.allclose(metrics.max_drawdown(paths), [metrics.max_drawdown(p) for p in paths])
+    assert np.allclose(metrics.calmar_ratio(paths), [metrics.calmar_ratio(p) for p in paths])
+
+    r = metrics.returns(paths[0])
+    rolling = metrics.rolling_sharpe(r, 50)
+    assert np.isnan(rolling[:49]).all()
+    assert np.isclose(rolling[200], metrics.sharpe_ratio(r[151:201]))
+    assert np.isclose(metrics.rolling_max_drawdown(paths[0], 100)[500], metrics.max_drawdown(paths[0][401:501]))
+
+    expanding = metrics.expanding_sharpe(r)
+    assert np.allclose(expanding[[10, 500, -1]], [metrics.sharpe_ratio(r[:k + 1]) for k in (10, 500, len(r) - 1)])
+    assert np.isclose(metrics.expanding_sortino(r)[-1], metrics.sortino_ratio(r))
+    assert np.isclose(metrics.expanding_max_drawdown(paths[0])[-1], metrics.max_drawdown(paths[0]))
+
+
+def test_online_metrics_match_batch_summary():
+    rng = np.random.default_rng(5)
+    equity = _equity(500)
+    pnls = rng.normal(1, 10, 40)
+    positions = rng.random(500) < 0.3
+
+    online = OnlineMetrics()
+    for value, in_market in zip(equity, positions):
+        online.update(value, in_market)
+    for pnl in pnls:
+        online.add_trade(pnl)
+
+    batch = metrics.summary(equity, pnls, positions)
+    for name, value in online.values().items():
+        assert np.isclose(value, batch[name]), name
+    assert online.best_trade == pnls.max()
+
+
+def test_event_result_metrics_use_the_shared_definitions():
+    from src.backtest.event_engine import EventBacktestResult
+    timestamps = pd.date_range('2024-01-01', periods=5, freq='1h').as_unit('ns').asi8
+    result = EventBacktestResult(1000.0, 950.0, timestamps, np.array([1010.0, 900.0, 1050.0, 1000.0, 950.0]),
+                                 trades=[{'pnl': None}, {'pnl': 50.0}, {'pnl': -100.0}],
+                                 in_market=np.array([True, True, False, False, False]))
+    summary = result.metrics()
+    assert np.isclose(result.max_drawdown, 1 - 900 / 1010)
+    assert summary['max_drawdown'] == result.max_drawdown
+    assert summary['win_rate'] == 0.5 and summary['profit_factor'] == 0.5
+    assert summary['exposure'] == 2 / 6
+    assert summary['max_drawdown_duration'] == 7200.0  # Hoch 1050 bis Ende
@@ -0,0 +1,73 @@
+import asyncio
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from src.backtest.event_engine import AlignedMarket, EventBacktester, Order, EventStrategy
+from src.backtest.monte_carlo import ScenarioConfig, round_trips, simulate
+
+
+class _Alternating(EventStrategy):
+    # Kauft und verkauft jeden Pool abwechselnd alle `every` Batches
+    def __init__(self, every=10):
+        self.every = every
+        self.count = 0
+
+    def on_batch(self, batch, engine):
+        self.count += 1
+        if self.count % self.every:
+            return []
+        pool = engine.market.pools[batch.pools[0]]
+        side = 'sell' if engine.position(pool) else 'buy'
+        return [Order(pool, side)]
+
+
+def _run(seed=0, minutes=600):
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1)
+    frames = {
+        pool: pd.DataFrame({
+            'timestamp': [start + timedelta(minutes=m) for m in range(minutes)],
+            'price': 100 * np.exp(np.cumsum(rng.normal(0, 0.002, minutes))),
+        })
+        for pool in ('A', 'B')
+    }
+    market = AlignedMarket.from_frames(frames)
+    result = asyncio.run(EventBacktester(market, _Alternating(), fee_rate=0.003, slippage=0.001).run())
+    return market, result
+
+
+def test_deterministic_scenario_reproduces_backtest_pnl():
+    market, result = _run()
+    trips = round_trips(result.trades)
+    closed = [t['pnl'] for t in result.trades if t['pnl'] is not None]
+    assert len(trips) == len(closed) > 0
+
+    config = ScenarioConfig(paths=3, slippage=0.001, slippage_noise=0, size_impact=0, fee_rate=0.003, seed=1)
+    mc = result.monte_carlo(market, config)
+    assert np.allclose(mc.pnl, sum(closed))
+    assert np.allclose(mc.win_rate, np.mean(np.array(closed) > 0))
+
+
+def test_percentiles_are_ordered_and_seed_is_worker_independent():
+    market, result = _run()
+    config = ScenarioConfig(paths=5000, slippage_noise=0.5, fee_spread=0.001, latency_mean=90, seed=42)
+    mc = simulate(result.trades, market, config, chunk_paths=1000)
+    assert len(mc.pnl) == 5000 and mc.equity_bands.shape == (5, mc.trips)
+    summary = mc.summary()
+    for metric in ('pnl', 'max_drawdown', 'win_rate'):
+        values = [summary[metric][f"p{p}"] for p in mc.percentiles]
+        assert values == sorted(values)
+    assert np.all(np.diff(mc.equity_bands, axis=0) >= 0)
+    assert mc.pnl.std() > 0
+
+    parallel = simulate(result.trades, market, config, chunk_paths=1000, workers=2)
+    assert np.array_equal(parallel.pnl, mc.pnl)
+    assert not np.array_equal(simulate(result.trades, market, ScenarioConfig(paths=5000, seed=7)).pnl, mc.pnl)
+
+
+def test_higher_costs_shift_distribution_down():
+    _, result = _run()
+    cheap = simulate(result.trades, config=ScenarioConfig(paths=2000, slippage=0.0005, seed=3))
+    expensive = simulate(result.trades, config=ScenarioConfig(paths=2000, slippage=0.005, seed=3))
+    assert expensive.bands('pnl')[50] < cheap.bands('pnl')[50]
+    assert simulate([], config=ScenarioConfig(paths=10, seed=0)).pnl.tolist() == [0.0] * 10
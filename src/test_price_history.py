@@ -0,0 +1,45 @@
+import numpy as np
+from datetime import datetime, timedelta
+from src.data.price_history import PriceHistory
+
+
+def _reference_metrics(prices):
+    returns = np.diff(np.log(prices))
+    return {
+        'volatility': float(np.std(returns) * np.sqrt(len(returns))),
+        'price_change_24h': prices[-1] / prices[0] - 1,
+        'min_price_24h': min(prices),
+        'max_price_24h': max(prices),
+    }
+
+
+def test_ring_buffer_wraps_and_views_share_memory():
+    history = PriceHistory(capacity=5)
+    for i in range(12):
+        history.append(i, float(i))
+
+    timestamps, prices = history.view()
+    assert len(history) == 5
+    assert timestamps.tolist() == [7, 8, 9, 10, 11]
+    assert prices.tolist() == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert np.shares_memory(prices, history._prices)
+    assert history.latest == 11.0
+
+
+def test_metrics_match_list_implementation():
+    start = datetime(2024, 1, 1)
+    prices = 100 + np.random.default_rng(0).normal(0, 0.5, 3 * 3600).cumsum()
+    history = PriceHistory(capacity=2 * 3600)
+    for i, price in enumerate(prices):
+        history.append_datetime(start + timedelta(seconds=i), float(price))
+
+    # Kapazität begrenzt die Historie auf die letzten 2h
+    kept = prices[-2 * 3600:]
+    metrics = history.metrics()
+    for key, expected in _reference_metrics(kept).items():
+        assert np.isclose(metrics[key], expected)
+    assert np.isclose(metrics['price_change_1h'], prices[-1] / prices[-3601] - 1)
+
+    window = history.metrics(window_seconds=600)
+    assert np.isclose(window['price_change_24h'], prices[-1] / prices[-600] - 1)  # wie bisher: timestamp > cutoff
+    assert window['price_change_1h'] == 0  # Fenster reicht keine Stunde zurück
@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from src.connection.rate_limiter import Priority, ProviderLimiter, RateLimiter
+from src.orca_api import OrcaAPI
+
+
+async def _request(limiter, order, name, priority=Priority.NORMAL, subsystem="default", hold=0.0):
+    await limiter.acquire("default", priority, subsystem)
+    order.append(name)
+    await asyncio.sleep(hold)
+    limiter.release()
+
+
+def test_trade_requests_preempt_scanner_queue():
+    async def run():
+        limiter = ProviderLimiter("test", requests_per_second=50, requests_per_minute=6000,
+                                  concurrent_requests=10)
+        # Bucket leeren, damit sich eine Queue bildet
+        limiter.second.tokens = 0
+        order = []
+        tasks = [asyncio.create_task(_request(limiter, order, f"scan{i}", Priority.SCANNER, "scanner"))
+                 for i in range(5)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(_request(limiter, order, "trade", Priority.TRADE, "trader")))
+        await asyncio.gather(*tasks)
+        return order, limiter.metrics()
+
+    order, metrics = asyncio.run(run())
+
+    assert order[0] == "trade"
+    assert metrics["wait"]["trade"]["count"] == 1
+    assert metrics["wait"]["scanner"]["count"] == 5
+    assert metrics["wait"]["scanner"]["max_wait"] >= metrics["wait"]["trade"]["max_wait"]
+
+
+def test_fair_queuing_and_reserved_trade_slot():
+    async def run():
+        limiter = ProviderLimiter("test", requests_per_second=1000, requests_per_minute=60000,
+                                  concurrent_requests=1, reserved_for_trade=0)
+        order = []
+        # Ein Slot: der erste hält ihn, danach müssen sich beide Subsysteme abwechseln
+        tasks = [asyncio.create_task(_request(limiter, order, f"a{i}", subsystem="a", hold=0.001))
+                 for i in range(4)]
+        tasks += [asyncio.create_task(_request(limiter, order, f"b{i}", subsystem="b", hold=0.001))
+                  for i in range(2)]
+        await asyncio.gather(*tasks)
+
+        # Reservierter Slot: Scanner-Traffic darf ihn nicht belegen
+        reserved = ProviderLimiter("test", requests_per_second=1000, requests_per_minute=60000,
+                                   concurrent_requests=2, reserved_for_trade=1)
+        await reserved.acquire("default", Priority.SCANNER, "scanner")
+        blocked = asyncio.create_task(reserved.acquire("default", Priority.SCANNER, "scanner"))
+        await asyncio.sleep(0.01)
+        scanner_waiting = not blocked.done()
+        await asyncio.wait_for(reserved.acquire("default", Priority.TRADE, "trader"), 1)
+        blocked.cancel()
+        return order, scanner_waiting
+
+    order, scanner_waiting = asyncio.run(run())
+
+    assert order[:4] == ["a0", "b0", "a1", "b1"]
+    assert scanner_waiting
+
+
+def test_rate_limiter_maps_hosts_and_enforces_rate():
+    async def run():
+        limiter = RateLimiter(
+            limits={"orca": {"requests_per_second": 20, "requests_per_minute": 6000, "concurrent_requests": 5}},
+            providers={"api.orca.so": "orca", None: "quicknode"}
+        )
+        start = asyncio.get_running_loop().time()
+        for _ in range(30):
+            async with limiter.limit("https://api.orca.so/v1/whirlpool/list"):
+                pass
+        elapsed = asyncio.get_running_loop().time() - start
+
+        async with limiter.limit("http://127.0.0.1:8899") as wait:
+            unknown_wait = wait
+        return limiter, elapsed, unknown_wait
+
+    limiter, elapsed, unknown_wait = asyncio.run(run())
+
+    # 20 Tokens sofort, die restlichen 10 mit 20/s
+    assert elapsed >= 0.45
+    assert limiter.provider_for("https://api.orca.so/v1/quote") == "orca"
+    assert limiter.provider_for("http://127.0.0.1:8899") is None
+    assert unknown_wait == 0.0
+    assert limiter.metrics()["orca"]["wait"]["normal"]["count"] == 30
+
+
+class _Always429:
+    status = 429
+    headers = {'Retry-After': '0'}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Session:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, params=None):
+        self.calls += 1
+        return _Always429()
+
+
+def test_orca_api_gives_up_after_bounded_429_retries():
+    api = OrcaAPI()
+    api.rate_limiter = RateLimiter()
+    api.session = _Session()
+    with pytest.raises(Exception, match="Versuchen"):
+        asyncio.run(api._make_request("/pools/list"))
+    assert api.session.calls == api.max_attempts
@@ -0,0 +1,39 @@
+import json
+import math
+import numpy as np
+from src.data.record_codec import (
+    RECORD_DTYPE, decode_block, decode_record, decode_records, encode_block, encode_record
+)
+
+
+def test_records_roundtrip_and_decode_vectorized():
+    members = [
+        encode_record({'price': 100.0 + i, 'volume': 5.0, 'liquidity': 1e9,
+                       'indicators': {'rsi': 55.5, 'sma_20': 101.25}}, 1_700_000_000 + i)
+        for i in range(50)
+    ]
+    legacy = json.dumps({'price': 99.5, 'volume': 1.0, 'liquidity': 2.0, 'timestamp': 1_699_999_999,
+                         'indicators': {'rsi': 40.0}}).encode()
+
+    records = decode_records([legacy] + members)
+
+    assert all(len(member) == RECORD_DTYPE.itemsize == 73 for member in members)
+    assert records['price'].tolist() == [99.5] + [100.0 + i for i in range(50)]
+    assert records['timestamp'][-1] == 1_700_000_049
+    assert records['rsi'][1] == np.float32(55.5)
+    assert math.isnan(records['macd'][1])
+
+    latest = decode_record(members[-1])
+    assert latest['price'] == 149.0
+    assert latest['indicators']['sma_20'] == 101.25
+
+
+def test_cold_blocks_compress_and_roundtrip():
+    records = decode_records([
+        encode_record({'price': 100.0 + i * 0.01, 'volume': 5.0, 'liquidity': 1e9}, 1_700_000_000 + i)
+        for i in range(1000)
+    ])
+    block = encode_block(records)
+
+    assert len(block) < records.nbytes / 3
+    assert decode_block(block).tobytes() == records.tobytes()
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from src.utils.single_flight import SingleFlight, request_key
+
+
+def test_concurrent_identical_calls_share_one_fetch():
+    async def run():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"liquidity": 42}
+
+        key = request_key("getWhirlpool", "pool", "confirmed")
+        results = await asyncio.gather(*(flight.do(key, fetch) for _ in range(10)))
+        other = await flight.do(request_key("getWhirlpool", "other", "confirmed"), fetch)
+        return flight, calls, results, other
+
+    flight, calls, results, other = asyncio.run(run())
+
+    assert len(calls) == 2
+    assert all(result is results[0] for result in results)
+    assert other == {"liquidity": 42}
+    assert flight.stats() == {'calls': 11, 'shared': 9, 'reused': 0, 'inflight': 0}
+
+
+def test_reuse_window_and_forget():
+    async def run():
+        flight = SingleFlight(reuse_window=60)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return len(calls)
+
+        first = await flight.do("key", fetch)
+        second = await flight.do("key", fetch)
+        flight.forget("key")
+        third = await flight.do("key", fetch)
+        return flight, first, second, third
+
+    flight, first, second, third = asyncio.run(run())
+
+    assert (first, second, third) == (1, 1, 2)
+    assert flight.reused == 1
+
+
+def test_errors_are_shared_but_not_cached():
+    async def run():
+        flight = SingleFlight(reuse_window=60)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            if len(calls) == 1:
+                raise ConnectionError("RPC down")
+            return "ok"
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(3)), return_exceptions=True)
+        retry = await flight.do("key", fetch)
+        return calls, results, retry
+
+    calls, results, retry = asyncio.run(run())
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert retry == "ok"
+    assert len(calls) == 2
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    async def run():
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "pool"
+
+        first = asyncio.create_task(flight.do("key", fetch))
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "pool"
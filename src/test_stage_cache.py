@@ -0,0 +1,136 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from src.backtest.orca_backtester import OrcaBacktester
+from src.backtest.stage_cache import StageCache, strategy_params
+from src.backtest.strategy_manager import BacktestStrategy
+from src.data.dataset_catalog import DatasetCatalog
+from src.data.tick_store import TickStore
+
+
+def test_stages_are_content_addressed_and_survive_restart(tmp_path):
+    cache = StageCache(tmp_path)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return pd.DataFrame({'price': [1.0, 2.0]}, index=pd.date_range('2024-01-01', periods=2, name='timestamp'))
+
+    key = cache.key('history', 'PoolA', datetime(2024, 1, 1), datetime(2024, 1, 2))
+    assert key == cache.key('history', 'PoolA', datetime(2024, 1, 1), datetime(2024, 1, 2))
+    assert key != cache.key('history', 'PoolB', datetime(2024, 1, 1), datetime(2024, 1, 2))
+    cache.cached('history', key, compute)
+
+    reopened = StageCache(tmp_path)
+    df = reopened.cached('history', key, compute)
+    assert len(calls) == 1 and reopened.hits == 1
+    assert df.index.name == 'timestamp' and df['price'].tolist() == [1.0, 2.0]
+
+    arrays = {'a': np.arange(5), 'names': np.array(['x', 'y'])}
+    loaded = asyncio.run(reopened.cached_async('market', 'm', _async(arrays)))
+    assert loaded is arrays
+    assert reopened.get('m')['names'].tolist() == ['x', 'y']
+
+    # Leere Ergebnisse werden nicht gespeichert
+    reopened.cached('history', 'empty', pd.DataFrame)
+    assert 'empty' not in reopened
+
+
+def _async(value):
+    async def compute():
+        return value
+    return compute
+
+
+def test_eviction_purge_and_corrupt_entries(tmp_path):
+    cache = StageCache(tmp_path, max_bytes=10_000)
+    for i in range(4):
+        cache.put('signals', f"k{i}", {'signal': np.zeros(400)})  # je ~3.4 KB
+        time.sleep(0.01)
+    assert 'k0' not in cache and 'k3' in cache
+    assert sum(info['bytes'] for info in cache.stats().values()) <= 10_000
+    assert not (tmp_path / 'signals' / 'k0.npz').exists()
+
+    (tmp_path / cache.entries['k3'].path).write_bytes(b'kaputt')
+    assert cache.get('k3') is None and 'k3' not in cache
+
+    cache.put('market', 'm', {'x': np.ones(3)})
+    assert cache.purge('signals') == 1
+    assert list(StageCache(tmp_path).stats()) == ['market']
+    assert cache.purge(older_than=3600) == 0
+
+
+def test_reads_touch_lru_in_memory_until_close(tmp_path):
+    cache = StageCache(tmp_path)
+    cache.put('market', 'm', {'x': np.ones(3)})
+    written = cache.index_path.stat().st_mtime_ns
+    stored = StageCache(tmp_path).entries['m'].last_access
+
+    time.sleep(0.01)
+    for _ in range(3):
+        assert cache.get('m') is not None
+    assert cache.index_path.stat().st_mtime_ns == written
+    assert StageCache(tmp_path).entries['m'].last_access == stored
+
+    cache.close()
+    assert StageCache(tmp_path).entries['m'].last_access > stored
+
+
+def test_strategy_params_change_with_exit_rule():
+    fast = strategy_params(BacktestStrategy(rsi_sell=70))
+    assert fast['class'].endswith('BacktestStrategy') and fast['rsi_sell'] == 70
+    assert fast != strategy_params(BacktestStrategy(rsi_sell=80))
+
+
+def test_strategy_params_change_with_code():
+    class Patched(BacktestStrategy):
+        pass
+
+    # Gleiche Parameter, anderer Quelltext (hier: zusätzliches Modul in der MRO)
+    base, patched = strategy_params(BacktestStrategy()), strategy_params(Patched())
+    assert base['code'] != patched['code']
+    assert {k: v for k, v in base.items() if k not in ('class', 'code')} == \
+        {k: v for k, v in patched.items() if k not in ('class', 'code')}
+
+
+def test_catalog_fingerprint_follows_files(tmp_path):
+    start = datetime(2024, 1, 1)
+    pd.DataFrame({'timestamp': [start], 'price': [1.0]}).to_parquet(tmp_path / "pool_A_1m_a.parquet")
+    catalog = DatasetCatalog(tmp_path)
+    catalog.refresh()
+    before = catalog.fingerprint('A')
+    assert before == catalog.fingerprint('A') and before != catalog.fingerprint('A', start)
+
+    pd.DataFrame({'timestamp': [start + timedelta(days=1)], 'price': [2.0]}).to_parquet(tmp_path / "pool_A_1m_b.parquet")
+    catalog.refresh()
+    assert catalog.fingerprint('A') != before
+
+
+def test_orca_backtester_reuses_aligned_market(tmp_path):
+    start = datetime(2024, 1, 1)
+    store = TickStore(tmp_path / 'ticks')
+    for pool in ('A', 'B'):
+        store.append(pool, pd.DataFrame({
+            'timestamp': [start + timedelta(minutes=m) for m in range(50)],
+            'price': np.linspace(1, 2, 50),
+        }))
+    config = {'tick_store': str(tmp_path / 'ticks'), 'cache_dir': str(tmp_path / 'cache')}
+    end = start + timedelta(hours=1)
+
+    backtester = OrcaBacktester(config)
+    data = asyncio.run(backtester._load_historical_data(start, end))
+    fresh = backtester._build_market(data, start, end)
+    assert backtester.cache.misses == 1
+
+    again = OrcaBacktester(config)
+    market = again._build_market(asyncio.run(again._load_historical_data(start, end)), start, end)
+    assert again.cache.hits == 1
+    assert market.pools == fresh.pools and np.array_equal(market.event_ts, fresh.event_ts)
+    assert [len(b) for b in market.batches()] == [len(b) for b in fresh.batches()]
+
+    store.append('A', pd.DataFrame({'timestamp': [start + timedelta(minutes=55)], 'price': [3.0]}))
+    newer = OrcaBacktester(config)
+    newer._build_market(asyncio.run(newer._load_historical_data(start, end)), start, end)
+    assert newer.cache.hits == 0
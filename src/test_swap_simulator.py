@@ -0,0 +1,170 @@
+import math
+import random
+from src.whirlpool.account_decoder import decode_tick_array, encode_tick_array
+from src.whirlpool.swap_math import (
+    MAX_TICK_INDEX,
+    MIN_TICK_INDEX,
+    sqrt_price_from_tick_index,
+    tick_index_from_sqrt_price
+)
+from src.whirlpool.swap_simulator import WhirlpoolSwapSimulator, tick_array_start_index
+
+TICK_SPACING = 64
+LIQUIDITY = 10 ** 12
+FEE_RATE = 3000
+
+
+def _simulator(tick_current: int = 100):
+    # Zwei Positionen: breite Basis-Liquidität und eine enge um den aktuellen Preis
+    nets = {
+        -5632: LIQUIDITY, 5568: -LIQUIDITY,
+        -128: 4 * LIQUIDITY, 320: -4 * LIQUIDITY,
+    }
+    arrays = []
+    for start in (-11264, -5632, 0, 5632):
+        raw = encode_tick_array(start, TICK_SPACING, {
+            tick: net for tick, net in nets.items() if start <= tick < start + 5632
+        })
+        arrays.append(decode_tick_array(raw, TICK_SPACING))
+    return WhirlpoolSwapSimulator(
+        sqrt_price=sqrt_price_from_tick_index(tick_current) + 12345,
+        tick_current_index=tick_current,
+        liquidity=5 * LIQUIDITY,
+        fee_rate=FEE_RATE,
+        tick_spacing=TICK_SPACING,
+        tick_arrays=arrays
+    )
+
+
+def test_tick_math_roundtrip():
+    assert sqrt_price_from_tick_index(0) == 1 << 64
+    assert sqrt_price_from_tick_index(MAX_TICK_INDEX) == 79226673515401279992447579055
+    assert sqrt_price_from_tick_index(MIN_TICK_INDEX) == 4295048016
+
+    rng = random.Random(7)
+    for tick in [rng.randint(MIN_TICK_INDEX, MAX_TICK_INDEX - 1) for _ in range(200)]:
+        sqrt_price = sqrt_price_from_tick_index(tick)
+        assert math.isclose((sqrt_price / 2 ** 64) ** 2, 1.0001 ** tick, rel_tol=1e-9)
+        assert tick_index_from_sqrt_price(sqrt_price) == tick
+        assert tick_index_from_sqrt_price(sqrt_price_from_tick_index(tick + 1) - 1) == tick
+
+
+def test_tick_array_roundtrip():
+    raw = encode_tick_array(-5632, TICK_SPACING, {-5632: 10, -128: -(1 << 80)})
+    array = decode_tick_array(raw, TICK_SPACING)
+    assert array.start_tick_index == -5632
+    assert array.ticks == {-5632: 10, -128: -(1 << 80)}
+    assert tick_array_start_index(-1, TICK_SPACING) == -5632
+    assert tick_array_start_index(5631, TICK_SPACING) == 0
+
+
+def test_single_range_matches_constant_product():
+    sqrt_price = 1 << 64
+    simulator = WhirlpoolSwapSimulator(sqrt_price, 0, LIQUIDITY, FEE_RATE, TICK_SPACING)
+    amount = 10 ** 9
+
+    quote = simulator.quote(amount, a_to_b=True)
+    net_in = amount * (10 ** 6 - FEE_RATE) // 10 ** 6
+    expected_sqrt = LIQUIDITY * sqrt_price / (LIQUIDITY + net_in * sqrt_price / 2 ** 64)
+    expected_out = LIQUIDITY * (sqrt_price - expected_sqrt) / 2 ** 64
+
+    assert quote.amount_in == amount
+    assert abs(quote.amount_out - expected_out) <= 1
+    assert quote.fee_amount == amount - net_in
+    assert quote.ticks_crossed == 0
+    assert 0 < quote.price_impact < 0.01
+
+
+def test_crossing_ticks_changes_liquidity():
+    simulator = _simulator()
+    small = simulator.quote(10 ** 6, a_to_b=True)
+    large = simulator.quote(10 ** 11, a_to_b=True)
+
+    assert small.ticks_crossed == 0
+    assert large.ticks_crossed >= 1
+    assert large.end_tick_index < -128
+    assert large.price_impact > small.price_impact
+
+    # Exact-Output liefert mindestens die angefragte Menge zum passenden Input
+    exact_out = simulator.quote(large.amount_out, a_to_b=True, amount_specified_is_input=False)
+    assert exact_out.amount_out == large.amount_out
+    assert abs(exact_out.amount_in - large.amount_in) <= 2
+
+
+def test_exhausted_tick_arrays():
+    simulator = _simulator()
+    quote = simulator.quote(10 ** 20, a_to_b=False)
+    assert quote.exhausted
+    assert quote.amount_in < 10 ** 20
+    assert quote.end_tick_index == 5632 + 87 * TICK_SPACING
+
+
+def test_batch_matches_single_quotes():
+    simulator = _simulator()
+    amounts = [0, 1, 999, 10 ** 6, 10 ** 9, 10 ** 10, 10 ** 11, 3 * 10 ** 11, 10 ** 13, 10 ** 20]
+    for a_to_b in (True, False):
+        batch = simulator.quote_batch(amounts, a_to_b)
+        for amount, quote in zip(amounts, batch):
+            assert quote == simulator.quote(amount, a_to_b), (amount, a_to_b)
+
+
+class _TypedClient:
+    """solana-py AsyncClient-Stand-in mit typisierten Antworten (.value[i].data)"""
+
+    def __init__(self, pool: bytes, arrays: dict):
+        self.pool = pool
+        self.arrays = arrays  # PDA -> TickArray-Bytes
+        self.multiple_calls = 0
+
+    async def get_account_info(self, address, **kwargs):
+        from types import SimpleNamespace
+        return SimpleNamespace(value=SimpleNamespace(data=self.pool))
+
+    async def get_multiple_accounts(self, addresses, **kwargs):
+        from types import SimpleNamespace
+        self.multiple_calls += 1
+        return SimpleNamespace(value=[
+            SimpleNamespace(data=self.arrays[address]) if address in self.arrays else None
+            for address in addresses
+        ])
+
+
+def test_fetcher_quotes_only_over_tick_arrays_covering_the_current_tick():
+    import asyncio
+    import pytest
+    pytest.importorskip("solders")
+    pytest.importorskip("solana")
+    from solders.pubkey import Pubkey
+    from src.whirlpool.account_decoder import encode_whirlpool
+    from src.whirlpool_fetcher import WhirlpoolFetcher
+
+    pool_address = "HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ"
+    fetcher = WhirlpoolFetcher.__new__(WhirlpoolFetcher)
+    fetcher.whirlpool_program = "whirLbMiicVdio4qvUfM5KAg6Ct8VwpYzGff3uctyCc"
+    fetcher.tick_arrays = {}
+
+    def pda(start):
+        return Pubkey.find_program_address(
+            [b"tick_array", bytes(Pubkey.from_string(pool_address)), str(start).encode()],
+            Pubkey.from_string(fetcher.whirlpool_program)
+        )[0]
+
+    def pool_at(tick):
+        return encode_whirlpool(sqrt_price_from_tick_index(tick), tick, 5 * LIQUIDITY, tick_spacing=TICK_SPACING)
+
+    arrays = {pda(start): encode_tick_array(start, TICK_SPACING, {start: LIQUIDITY})
+              for start in (-11264, -5632, 0, 5632)}
+    fetcher.client = _TypedClient(pool_at(100), arrays)
+
+    quote = asyncio.run(fetcher.calculate_swap_quote(pool_address, 10 ** 6, True))
+    assert quote and quote['amount_out'] > 0
+    asyncio.run(fetcher.calculate_swap_quote(pool_address, 10 ** 6, False))
+    assert fetcher.client.multiple_calls == 1
+
+    # Preis hat den gecachten Bereich verlassen: neu laden, ohne Arrays kein Quote
+    fetcher.client.pool = pool_at(12000)
+    assert asyncio.run(fetcher.calculate_swap_quote(pool_address, 10 ** 6, True)) is None
+    assert fetcher.client.multiple_calls == 2
+
+    arrays[pda(11264)] = encode_tick_array(11264, TICK_SPACING, {11264: LIQUIDITY})
+    assert asyncio.run(fetcher.calculate_swap_quote(pool_address, 10 ** 6, True))['amount_out'] > 0
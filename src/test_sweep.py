@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from src.backtest.event_engine import AlignedMarket, EventBacktester
+from src.backtest.sweep import (
+    SharedMarket, SweepStore, backtest_strategy, grid_search, param_key, random_search, rank_results, run_sweep,
+    summarize, write_results
+)
+
+
+def _market():
+    rng = np.random.default_rng(11)
+    index = pd.date_range(datetime(2024, 1, 1), periods=1500, freq='1min')
+    return AlignedMarket.from_frames({
+        pool: pd.DataFrame({'price': 100 * np.exp(np.cumsum(rng.normal(0, 0.004, len(index)))), 'volume': 1e6},
+                           index=index)
+        for pool in ('A', 'B', 'C')
+    })
+
+
+def test_parameter_spaces():
+    grid = list(grid_search({'fast_window': [3, 5], 'rsi_buy': [30, 40, 50]}))
+    assert len(grid) == 6 and grid[0] == {'fast_window': 3, 'rsi_buy': 30}
+
+    samples = list(random_search({'slow_window': (10, 30), 'rsi_sell': (60.0, 80.0), 'mode': ['a', 'b']}, 50, seed=1))
+    assert samples == list(random_search({'slow_window': (10, 30), 'rsi_sell': (60.0, 80.0), 'mode': ['a', 'b']}, 50, seed=1))
+    assert all(isinstance(s['slow_window'], int) and 10 <= s['slow_window'] <= 30 for s in samples)
+    assert all(60.0 <= s['rsi_sell'] <= 80.0 for s in samples)
+    assert param_key({'a': 1, 'b': 2}) == param_key({'b': 2, 'a': 1})
+
+
+def test_shared_market_roundtrip():
+    market = _market()
+    shared = SharedMarket(market)
+    try:
+        attached, shm = SharedMarket.attach(shared.spec)
+        assert attached.pools == market.pools
+        assert np.array_equal(attached.event_ts, market.event_ts)
+        assert np.array_equal(attached.series[2]['price'], market.series[2]['price'])
+        assert [b.timestamp for b in attached.batches()][:3] == [b.timestamp for b in market.batches()][:3]
+        del attached
+        shm.close()
+    finally:
+        shared.close()
+
+
+def test_parallel_sweep_matches_serial_and_resumes(tmp_path):
+    market = _market()
+    space = {'rsi_buy': [50, 70], 'rsi_sell': [60, 80], 'slippage': [0.0, 0.002]}
+
+    serial = {r['key']: r['metrics'] for r in run_sweep(market, 'backtest_strategy', grid_search(space), workers=0)}
+    store = SweepStore(tmp_path / "sweep.jsonl")
+    partial = list(grid_search(space))[:3]
+    run_sweep(market, 'backtest_strategy', partial, store=store, workers=0)
+
+    # Resume: nur die fünf fehlenden Kombinationen laufen, parallel über Shared Memory
+    done = []
+    results = run_sweep(market, 'backtest_strategy', grid_search(space), store=SweepStore(tmp_path / "sweep.jsonl"),
+                        workers=2, progress=done.append)
+    assert len(done) == 5 and len(results) == 8
+    assert {r['key']: r['metrics'] for r in results} == serial
+    assert any(m['trades'] for m in serial.values())
+
+    ranked = rank_results(results, 'total_return')
+    assert [r['rank'] for r in ranked] == list(range(1, 9))
+    assert ranked[0]['metrics']['total_return'] == max(m['total_return'] for m in serial.values())
+    write_results(ranked, tmp_path / "ranked.parquet")
+    write_results(ranked, tmp_path / "ranked.json")
+    table = pd.read_parquet(tmp_path / "ranked.parquet")
+    assert list(table['rank']) == list(range(1, 9)) and 'param_rsi_buy' in table
+
+
+def test_stored_results_are_keyed_on_strategy_market_and_window(tmp_path):
+    market = _market()
+    params = [{'rsi_buy': 50}]
+    store = SweepStore(tmp_path / "sweep.jsonl")
+    run_sweep(market, 'backtest_strategy', params, store=store, workers=0)
+
+    done = []
+    run_sweep(market, 'backtest_strategy', params, store=store, workers=0, progress=done.append)
+    assert done == []
+
+    # Anderes Fenster oder anderer Markt: dieselben Parameter werden neu gerechnet
+    run_sweep(market, 'backtest_strategy', params, store=store, workers=0, progress=done.append,
+              start=datetime(2024, 1, 1, 6))
+    other = AlignedMarket.from_frames({'A': pd.DataFrame({'price': np.linspace(1, 2, 100), 'volume': 1e6},
+                                                         index=pd.date_range('2024-01-01', periods=100, freq='1min'))})
+    run_sweep(other, 'backtest_strategy', params, store=store, workers=0, progress=done.append)
+    assert len(done) == 2 and len({r['key'] for r in store.results.values()}) == 3
+
+    # Rückgabe: nur die angefragten Kombinationen, auch wenn der Store mehr enthält
+    results = run_sweep(market, 'backtest_strategy', params + [{'rsi_buy': 60}], store=store, workers=0)
+    assert [r['params'] for r in results] == [{'rsi_buy': 50}, {'rsi_buy': 60}]
+
+
+def _pump_market():
+    # Ruhiger Tag, Pump mit steigendem Volumen, Abverkauf, ruhiger Tag (stündlich)
+    index = pd.date_range(datetime(2024, 1, 1), periods=96, freq='1h')
+    price = np.concatenate([np.full(24, 1.0), np.linspace(1.0, 2.0, 24), np.linspace(2.0, 0.8, 24), np.full(24, 0.8)])
+    volume = np.concatenate([np.full(24, 1e5), np.linspace(1e5, 5e5, 24), np.full(24, 2e5), np.full(24, 1e5)])
+    return AlignedMarket.from_frames({'A': pd.DataFrame({'price': price, 'volume': volume, 'liquidity': 1e6},
+                                                        index=index)})
+
+
+def test_meme_sniper_sweep_trades_and_enforces_stops():
+    space = {'entry_momentum_threshold': [50, 70], 'stop_loss_percentage': [0.02, 0.2]}
+    results = run_sweep(_pump_market(), 'meme_sniper', grid_search(space), workers=0,
+                        engine_defaults={'slippage': 0.0, 'fee_rate': 0.0})
+    assert all('error' not in r and r['metrics']['trades'] > 0 for r in results)
+    by_params = {(r['params']['entry_momentum_threshold'], r['params']['stop_loss_percentage']): r['metrics']
+                 for r in results}
+    # Der Stop-Loss greift im Abverkauf: eng und weit ergeben verschiedene Läufe
+    assert by_params[(50, 0.02)] != by_params[(50, 0.2)]
+
+
+def test_sweep_runs_only_the_requested_window():
+    market = _market()
+    start, end = datetime(2024, 1, 1, 6), datetime(2024, 1, 1, 12)
+    full, = run_sweep(market, 'backtest_strategy', [{'rsi_buy': 50}], workers=0)
+    windowed, = run_sweep(market, 'backtest_strategy', [{'rsi_buy': 50}], workers=0, start=start, end=end)
+    assert windowed['metrics'] != full['metrics']
+
+    engine = EventBacktester(market, backtest_strategy({'rsi_buy': 50}))
+    expected = summarize(asyncio.run(engine.run(start, end)))
+    assert windowed['metrics'] == expected
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from src.data.collector_sink import ParquetCollectorSink
+from src.data.dataset_catalog import DatasetCatalog
+from src.data.tick_store import TICK_DTYPE, TickFile, TickStore, convert_catalog, records_to_frame
+
+
+def _records(start, count, offset=0):
+    records = np.zeros(count, dtype=TICK_DTYPE)
+    records['timestamp'] = pd.Timestamp(start).value + (np.arange(count) + offset) * 1_000_000_000
+    records['price'] = np.arange(count) + offset
+    return records
+
+
+def test_append_locate_and_reopen(tmp_path):
+    start = datetime(2024, 1, 1)
+    tick_file = TickFile(tmp_path / "PoolA.ticks", create=True, index_stride=16)
+    tick_file.append(_records(start, 100))
+    tick_file.append(_records(start, 50, offset=100))
+    assert len(tick_file) == 150 and len(tick_file._index) == 10
+
+    window = tick_file.between(start + timedelta(seconds=37), start + timedelta(seconds=64))
+    assert isinstance(window, np.memmap)
+    assert window['price'][0] == 37 and window['price'][-1] == 64 and len(window) == 28
+    assert tick_file.at(start + timedelta(seconds=149))['price'] == 149
+    assert tick_file.at(start + timedelta(seconds=150, milliseconds=1)) is None
+    assert sum(len(chunk) for chunk in tick_file.iter_chunks(chunk_rows=32)) == 150
+
+    try:
+        tick_file.append(_records(start, 1))
+        assert False, "Append in die Vergangenheit muss fehlschlagen"
+    except ValueError:
+        pass
+
+    # Abgerissener Append: halber Record am Ende, Index fehlt
+    with open(tick_file.path, 'ab') as f:
+        f.write(b'\x01' * 13)
+    tick_file.index_path.unlink()
+    reopened = TickFile(tmp_path / "PoolA.ticks")
+    assert len(reopened) == 150 and reopened.stride == 16
+    assert np.array_equal(reopened._index, tick_file._index)
+    assert reopened.time_range() == (start, start + timedelta(seconds=149))
+
+
+def test_convert_catalog_is_incremental(tmp_path):
+    start = datetime(2024, 1, 1, 23, 0)
+    sink = ParquetCollectorSink(tmp_path / "parquet", flush_rows=25)
+    for i in range(120):  # über Mitternacht: zwei Tagespartitionen
+        sink.append("PoolA", start + timedelta(minutes=i), price=float(i), liquidity=5.0)
+    sink.close()
+
+    catalog = DatasetCatalog(tmp_path / "parquet")
+    store = TickStore(tmp_path / "ticks")
+    assert convert_catalog(catalog, store) == {"PoolA": 120}
+
+    sink = ParquetCollectorSink(tmp_path / "parquet", flush_rows=25)
+    for i in range(120, 130):
+        sink.append("PoolA", start + timedelta(minutes=i), price=float(i), liquidity=5.0)
+    sink.close()
+    assert convert_catalog(catalog, store) == {"PoolA": 10}
+
+    df = records_to_frame(TickStore(tmp_path / "ticks").read("PoolA"))
+    assert store.pools() == ["PoolA"]
+    assert df["price"].tolist() == [float(i) for i in range(130)]
+    assert df["timestamp"].iloc[-1] == start + timedelta(minutes=129)
+    assert np.isnan(df["volume"]).all() and (df["liquidity"] == 5.0).all()
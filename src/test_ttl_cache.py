@@ -0,0 +1,67 @@
+import asyncio
+import numpy as np
+from src.utils.ttl_cache import AsyncTTLCache
+
+
+def test_lru_eviction_by_size_and_bytes():
+    cache = AsyncTTLCache(maxsize=3, ttl=None)
+    for key in "abc":
+        cache[key] = key.upper()
+    assert cache.get("a") == "A"  # a wird zuletzt benutzt
+    cache["d"] = "D"
+
+    assert "b" not in cache
+    assert [key for key in cache] == ["c", "a", "d"]
+    assert cache.evictions == 1
+
+    arrays = AsyncTTLCache(maxsize=100, ttl=None, max_bytes=3000)
+    for i in range(5):
+        arrays[i] = np.zeros(100)  # 800 Bytes
+    assert len(arrays) == 3
+    assert arrays.bytes == 2400
+    assert 0 not in arrays and 4 in arrays
+
+    arrays["huge"] = np.zeros(1000)
+    assert "huge" not in arrays
+    assert len(arrays) == 3
+
+
+def test_lazy_expiry_and_counters():
+    cache = AsyncTTLCache(maxsize=10, ttl=0.02)
+    cache.set("pool", {"price": 1.0})
+    cache.set("forever", 1, ttl=None)
+    assert cache.get("pool") == {"price": 1.0}
+
+    asyncio.run(asyncio.sleep(0.03))
+
+    assert cache.get("pool") is None
+    assert cache.get("forever") == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["size"]) == (2, 1, 1, 1)
+
+
+def test_stale_while_revalidate():
+    async def run():
+        cache = AsyncTTLCache(maxsize=10, ttl=0.02, stale_ttl=10)
+        loads = []
+
+        async def loader():
+            loads.append(1)
+            await asyncio.sleep(0.01)
+            return len(loads)
+
+        first = await asyncio.gather(*(cache.get_or_load("pool", loader) for _ in range(5)))
+        await asyncio.sleep(0.03)
+        stale = await cache.get_or_load("pool", loader)
+        again = await cache.get_or_load("pool", loader)
+        await asyncio.sleep(0.02)
+        fresh = await cache.get_or_load("pool", loader)
+        return cache, loads, first, stale, again, fresh
+
+    cache, loads, first, stale, again, fresh = asyncio.run(run())
+
+    assert first == [1] * 5
+    # Veralteter Wert sofort, genau ein Hintergrund-Refresh
+    assert (stale, again, fresh) == (1, 1, 2)
+    assert len(loads) == 2
+    assert cache.stale_hits == 2
@@ -0,0 +1,87 @@
+import asyncio
+from aiohttp import web
+from src.data.whirlpool_registry import WhirlpoolRegistry
+
+POOLS = [
+    {
+        "address": "PoolSolUsdc",
+        "tokenA": {"mint": "So11111111111111111111111111111111111111112", "symbol": "SOL", "decimals": 9},
+        "tokenB": {"mint": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v", "symbol": "USDC", "decimals": 6},
+        "whitelisted": True
+    },
+    {
+        "address": "PoolBonkSol",
+        "tokenA": {"mint": "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263", "symbol": "BONK", "decimals": 5},
+        "tokenB": {"mint": "So11111111111111111111111111111111111111112", "symbol": "SOL", "decimals": 9},
+        "whitelisted": False
+    }
+]
+
+
+async def _start_server(stats):
+    async def handle(request):
+        stats["requests"] += 1
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        stats["downloads"] += 1
+        await asyncio.sleep(0.05)
+        return web.json_response({"whirlpools": POOLS}, headers={"ETag": '"v1"'})
+
+    app = web.Application()
+    app.router.add_get("/list", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/list"
+
+
+def test_registry_single_download_and_indexes(tmp_path):
+    async def run():
+        stats = {"requests": 0, "downloads": 0}
+        runner, url = await _start_server(stats)
+        registry = WhirlpoolRegistry(url=url, snapshot_path=tmp_path / "list.json.gz")
+        try:
+            results = await asyncio.gather(*(registry.get_pools() for _ in range(10)))
+            # Nach Ablauf der TTL: bedingter Request, 304 ohne neuen Download
+            registry.ttl = 0
+            await registry.get_pools()
+        finally:
+            await registry.close()
+            await runner.cleanup()
+        return stats, registry, results
+
+    stats, registry, results = asyncio.run(run())
+
+    assert stats == {"requests": 2, "downloads": 1}
+    assert registry.version == 1
+    assert all(len(pools) == 2 for pools in results)
+    assert registry.by_address("PoolBonkSol")["tokenA"]["symbol"] == "BONK"
+    assert len(registry.by_mint("So11111111111111111111111111111111111111112")) == 2
+    assert registry.by_pair("SOL", "USDC")[0]["address"] == "PoolSolUsdc"
+
+
+def test_registry_warm_start_from_snapshot(tmp_path):
+    async def run():
+        stats = {"requests": 0, "downloads": 0}
+        runner, url = await _start_server(stats)
+        snapshot = tmp_path / "list.json.gz"
+        first = WhirlpoolRegistry(url=url, snapshot_path=snapshot)
+        await first.get_pools()
+        await first.close()
+        await runner.cleanup()
+
+        # Server offline: der Snapshot reicht für den Start
+        second = WhirlpoolRegistry(url=url, snapshot_path=snapshot)
+        try:
+            pools = await second.get_pools()
+        finally:
+            await second.close()
+        return stats, second, pools
+
+    stats, registry, pools = asyncio.run(run())
+
+    assert stats["downloads"] == 1
+    assert [pool["address"] for pool in pools] == ["PoolSolUsdc", "PoolBonkSol"]
+    assert registry.etag == '"v1"'
@@ -0,0 +1,133 @@
+import asyncio
+from testing.mock_rpc import MockRPCServer
+from src.connection.ws_feed import SolanaWebsocketFeed, WhirlpoolFeed, WHIRLPOOL_PROGRAM_ID
+from src.whirlpool.account_decoder import encode_whirlpool
+
+
+def _pool(tick: int) -> bytes:
+    return encode_whirlpool(sqrt_price=1 << 64, tick_current_index=tick, liquidity=10 ** 9)
+
+
+async def _wait_for(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise TimeoutError
+        await asyncio.sleep(0.01)
+
+
+def test_multiplexed_subscriptions_and_resubscribe():
+    async def run():
+        async with MockRPCServer() as server:
+            feed = SolanaWebsocketFeed(server.ws_url, reconnect_delay=0.01)
+            account_updates, program_updates = [], []
+
+            async def on_account(slot, value):
+                account_updates.append(slot)
+
+            async def on_program(slot, value):
+                program_updates.append(value["pubkey"])
+
+            await feed.account_subscribe("PoolA", on_account)
+            await feed.program_subscribe(WHIRLPOOL_PROGRAM_ID, on_program)
+            assert await feed.connect()
+            assert server.ws_subscription_count == 2
+
+            await server.notify_account("PoolA", _pool(1))
+            await server.notify_account("PoolB", _pool(2))
+            await _wait_for(lambda: len(program_updates) == 2)
+
+            # Verbindungsabbruch -> automatischer Reconnect mit allen Subscriptions
+            await server.drop_connections()
+            await _wait_for(lambda: feed.connected and server.ws_subscription_count == 2)
+            await server.notify_account("PoolA", _pool(3))
+            await _wait_for(lambda: len(account_updates) == 2)
+
+            reconnects = feed.reconnects
+            await feed.close()
+        return account_updates, program_updates, reconnects
+
+    account_updates, program_updates, reconnects = asyncio.run(run())
+    assert account_updates[0] < account_updates[1]
+    assert program_updates == ["PoolA", "PoolB", "PoolA"]
+    assert reconnects >= 1
+
+
+def test_whirlpool_feed_slot_order_and_polling_fallback():
+    async def run():
+        async with MockRPCServer({"PoolA": _pool(0)}, slot=100) as server:
+            snapshots = []
+
+            async def handler(snapshot):
+                snapshots.append((snapshot.slot, snapshot.data["tick_current_index"]))
+
+            feed = WhirlpoolFeed(server.ws_url, server.url, handler, poll_interval=0.05)
+            await feed.start(["PoolA"])
+            await feed.ws.connect()
+
+            await server.notify_account("PoolA", _pool(1), slot=200)
+            await server.notify_account("PoolA", _pool(-1), slot=150)  # veraltet
+            await _wait_for(lambda: len(snapshots) == 1)
+
+            # Ohne WebSocket übernimmt das Polling
+            await feed.ws.close()
+            server.accounts["PoolA"] = _pool(2)
+            server.slot = 300
+            await _wait_for(lambda: len(snapshots) == 2)
+            await feed.close()
+        return snapshots
+
+    snapshots = asyncio.run(run())
+    assert snapshots[0] == (200, 1)
+    assert snapshots[1][0] > 300 and snapshots[1][1] == 2
+
+
+def test_subscription_added_during_resubscribe_is_sent():
+    async def run():
+        async with MockRPCServer() as server:
+            feed = SolanaWebsocketFeed(server.ws_url, reconnect_delay=0.01)
+            updates = []
+
+            async def on_account(slot, value):
+                updates.append(slot)
+
+            await feed.account_subscribe("PoolA", on_account)
+            await feed.start()
+            # Verbindung steht, Resubscribe läuft noch
+            while feed._ws is None:
+                await asyncio.sleep(0)
+            assert not feed.connected
+            await feed.account_subscribe("PoolB", on_account)
+
+            assert await feed.connect()
+            await _wait_for(lambda: server.ws_subscription_count == 2)
+            await server.notify_account("PoolB", _pool(1))
+            await _wait_for(lambda: len(updates) == 1)
+            await feed.close()
+
+    asyncio.run(run())
+
+
+def test_callback_can_issue_requests_on_the_same_socket():
+    async def run():
+        async with MockRPCServer() as server:
+            feed = SolanaWebsocketFeed(server.ws_url, reconnect_delay=0.01, request_timeout=1.0)
+            account_updates = []
+
+            async def on_account(slot, value):
+                account_updates.append(slot)
+
+            async def on_program(slot, value):
+                # Request aus dem Callback heraus, Antwort kommt über denselben Reader
+                await feed.account_subscribe(value["pubkey"], on_account)
+
+            await feed.program_subscribe(WHIRLPOOL_PROGRAM_ID, on_program)
+            assert await feed.connect()
+
+            await server.notify_account("PoolA", _pool(1))
+            await _wait_for(lambda: server.ws_subscription_count == 2)
+            await server.notify_account("PoolA", _pool(2))
+            await _wait_for(lambda: len(account_updates) == 1)
+            await feed.close()
+
+    asyncio.run(run())
@@ -4,6 +4,7 @@ import logging
 from datetime import datetime
 import json
 from pathlib import Path
+from src.data.whirlpool_registry import get_whirlpool_registry
 
 class TokenFetcher:
     def __init__(self):
@@ -14,60 +15,57 @@ class TokenFetcher:
     async def get_top_tokens(self) -> Dict:
         """Holt die Top Token von Orca"""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Orca Whirlpools API für alle Pools
-                async with session.get(f"{self.base_url}/v1/whirlpool/list") as response:
-                    if response.status == 200:
-                        pools = await response.json()
-                        
-                        # Token-Daten sammeln
-                        tokens = {}
-                        for pool in pools:
-                            # Token A
-                            token_a = pool.get('tokenA', {})
-                            if token_a and token_a.get('mint'):
-                                address = token_a['mint']
-                                if address not in tokens:
-                                    tokens[address] = {
-                                        'symbol': token_a.get('symbol', 'Unknown'),
-                                        'name': token_a.get('name', 'Unknown'),
-                                        'price_usd': float(pool.get('tokenPrice', {}).get('tokenA', 0)),
-                                        'volume_24h': float(pool.get('volume', {}).get('day', 0)),
-                                        'liquidity': float(pool.get('tvl', 0)),
-                                        'price_change_24h': float(pool.get('priceChange', {}).get('day', 0)),
-                                        'pools': [pool['address']]
-                                    }
-                                else:
-                                    tokens[address]['volume_24h'] += float(pool.get('volume', {}).get('day', 0))
-                                    tokens[address]['pools'].append(pool['address'])
-                            
-                            # Token B
-                            token_b = pool.get('tokenB', {})
-                            if token_b and token_b.get('mint'):
-                                address = token_b['mint']
-                                if address not in tokens:
-                                    tokens[address] = {
-                                        'symbol': token_b.get('symbol', 'Unknown'),
-                                        'name': token_b.get('name', 'Unknown'),
-                                        'price_usd': float(pool.get('tokenPrice', {}).get('tokenB', 0)),
-                                        'volume_24h': float(pool.get('volume', {}).get('day', 0)),
-                                        'liquidity': float(pool.get('tvl', 0)),
-                                        'price_change_24h': float(pool.get('priceChange', {}).get('day', 0)),
-                                        'pools': [pool['address']]
-                                    }
-                                else:
-                                    tokens[address]['volume_24h'] += float(pool.get('volume', {}).get('day', 0))
-                                    tokens[address]['pools'].append(pool['address'])
-                        
-                        # Nach Volumen sortieren
-                        sorted_tokens = dict(sorted(
-                            tokens.items(),
-                            key=lambda x: x[1]['volume_24h'],
-                            reverse=True
-                        ))
-                        
-                        return sorted_tokens
-                        
+            # Orca Whirlpools aus der gemeinsamen Registry
+            pools = await get_whirlpool_registry().get_pools()
+            if pools:
+                # Token-Daten sammeln
+                tokens = {}
+                for pool in pools:
+                    # Token A
+                    token_a = pool.get('tokenA', {})
+                    if token_a and token_a.get('mint'):
+                        address = token_a['mint']
+                        if address not in tokens:
+                            tokens[address] = {
+                                'symbol': token_a.get('symbol', 'Unknown'),
+                                'name': token_a.get('name', 'Unknown'),
+                                'price_usd': float(pool.get('tokenPrice', {}).get('tokenA', 0)),
+                                'volume_24h': float(pool.get('volume', {}).get('day', 0)),
+                                'liquidity': float(pool.get('tvl', 0)),
+                                'price_change_24h': float(pool.get('priceChange', {}).get('day', 0)),
+                                'pools': [pool['address']]
+                            }
+                        else:
+                            tokens[address]['volume_24h'] += float(pool.get('volume', {}).get('day', 0))
+                            tokens[address]['pools'].append(pool['address'])
+                    
+                    # Token B
+                    token_b = pool.get('tokenB', {})
+                    if token_b and token_b.get('mint'):
+                        address = token_b['mint']
+                        if address not in tokens:
+                            tokens[address] = {
+                                'symbol': token_b.get('symbol', 'Unknown'),
+                                'name': token_b.get('name', 'Unknown'),
+                                'price_usd': float(pool.get('tokenPrice', {}).get('tokenB', 0)),
+                                'volume_24h': float(pool.get('volume', {}).get('day', 0)),
+                                'liquidity': float(pool.get('tvl', 0)),
+                                'price_change_24h': float(pool.get('priceChange', {}).get('day', 0)),
+                                'pools': [pool['address']]
+                            }
+                        else:
+                            tokens[address]['volume_24h'] += float(pool.get('volume', {}).get('day', 0))
+                            tokens[address]['pools'].append(pool['address'])
+                
+                # Nach Volumen sortieren
+                sorted_tokens = dict(sorted(
+                    tokens.items(),
+                    key=lambda x: x[1]['volume_24h'],
+                    reverse=True
+                ))
+                
+                return sorted_tokens
+                
             return {}
             
         except Exception as e:
@@ -0,0 +1,76 @@
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from src.whirlpool.impact_curve import ImpactCurveBook
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionCostModel:
+    """Schnittstelle für Slippage-Modelle in Backtests und Paper-Trading"""
+
+    # slippage() liefert den Anteil, um den der Ausführungspreis ungünstiger als der
+    # Marktpreis ist (Kauf teurer, Verkauf billiger); value ist der Gegenwert in Quote-Einheiten.
+
+    def slippage(self, pool: Optional[str], value: float, is_buy: bool, timestamp=None) -> float:
+        raise NotImplementedError
+
+    def fill_price(self, pool: Optional[str], price: float, value: float, is_buy: bool, timestamp=None) -> float:
+        slippage = self.slippage(pool, value, is_buy, timestamp)
+        return price * (1 + slippage) if is_buy else price * (1 - slippage)
+
+
+class FixedSlippage(ExecutionCostModel):
+    """Konstante Slippage, optional mit Aufschlag pro Quote-Einheit (wie bisher size/10000)"""
+
+    def __init__(self, rate: float = 0.001, size_factor: float = 0.0):
+        self.rate = rate
+        self.size_factor = size_factor
+
+    def slippage(self, pool: Optional[str], value: float, is_buy: bool, timestamp=None) -> float:
+        return self.rate * (1 + value * self.size_factor)
+
+
+class CurveSlippage(ExecutionCostModel):
+    """Slippage aus vorberechneten Impact-Kurven; Pools ohne Kurve gehen an das Fallback-Modell"""
+
+    def __init__(self, book: ImpactCurveBook, fallback: Optional[ExecutionCostModel] = None,
+                 max_slippage: Optional[float] = None):
+        self.book = book
+        self.fallback = fallback or FixedSlippage()
+        self.max_slippage = max_slippage
+
+    @classmethod
+    def load(cls, path: Union[str, Path], **kwargs) -> 'CurveSlippage':
+        return cls(ImpactCurveBook.load(path), **kwargs)
+
+    def slippage(self, pool: Optional[str], value: float, is_buy: bool, timestamp=None) -> float:
+        if pool not in self.book:
+            return self.fallback.slippage(pool, value, is_buy, timestamp)
+        slippage = float(self.book.slippage(pool, value, is_buy, timestamp)[0])
+        return min(slippage, self.max_slippage) if self.max_slippage is not None else slippage
+
+    def slippage_batch(self, pool: str, values: np.ndarray, is_buy: bool, timestamps=None) -> np.ndarray:
+        """Vektorisiert für viele Orders eines Pools (z.B. Monte-Carlo-Pfade)"""
+        if pool not in self.book:
+            return np.array([self.fallback.slippage(pool, v, is_buy) for v in np.atleast_1d(values)])
+        return self.book.slippage(pool, values, is_buy, timestamps)
+
+
+def cost_model_from_config(config: Dict) -> Optional[ExecutionCostModel]:
+    """Kostenmodell aus dem backtest-Abschnitt: slippage_model 'curves' lädt impact_curves (NPZ)
+
+    'fixed' (Standard ohne impact_curves) liefert None; der Backtester bleibt bei seiner eigenen Slippage.
+    """
+    model = config.get('slippage_model') or ('curves' if config.get('impact_curves') else 'fixed')
+    if model == 'fixed':
+        return None
+    if model != 'curves':
+        raise ValueError(f"Unbekanntes slippage_model '{model}' (fixed oder curves)")
+    if not config.get('impact_curves'):
+        raise ValueError("slippage_model 'curves' braucht impact_curves (NPZ aus record_impact_curves.py)")
+    fallback = FixedSlippage(config.get('fixed_slippage', config.get('slippage', 0.001)))
+    return CurveSlippage.load(config['impact_curves'], fallback=fallback, max_slippage=config.get('max_slippage'))
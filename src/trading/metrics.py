@@ -0,0 +1,347 @@
+import logging
+import math
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+# Gemeinsame Kennzahlen für alle Backtest-Engines und das Live-Monitoring.
+# Konventionen: Renditen sind einfache Periodenrenditen, Drawdowns und Quoten Anteile
+# (0.1 = 10 %), Standardabweichung mit ddof=1. Alle Batch-Funktionen rechnen entlang der
+# letzten Achse; 2D-Eingaben (Monte-Carlo-Pfade, rollende Fenster) liefern ein Array.
+
+PERIODS_PER_YEAR = 252
+YEAR_NS = 365 * 86400 * 10 ** 9
+
+
+def _result(value):
+    return float(value) if np.ndim(value) == 0 else value
+
+
+def _ratio(numerator, denominator):
+    # Nenner im Rundungsrauschen des Zählers gilt als 0: positiver Zähler -> inf, sonst 0
+    numerator, denominator = np.asarray(numerator, float), np.asarray(denominator, float)
+    valid = denominator > np.finfo(float).eps * np.abs(numerator)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(valid, numerator / np.where(valid, denominator, 1.0), np.where(numerator > 0, np.inf, 0.0))
+    return _result(ratio)
+
+
+def periods_per_year(timestamps) -> float:
+    """Annualisierungsfaktor aus dem Median-Abstand von ns-Zeitstempeln"""
+    timestamps = np.asarray(timestamps).astype('datetime64[ns]').view(np.int64)
+    if len(timestamps) < 2:
+        return PERIODS_PER_YEAR
+    step = float(np.median(np.diff(timestamps)))
+    return YEAR_NS / step if step > 0 else PERIODS_PER_YEAR
+
+
+def returns(equity) -> np.ndarray:
+    equity = np.asarray(equity, dtype=np.float64)
+    return equity[..., 1:] / equity[..., :-1] - 1
+
+
+# --- Batch-Kennzahlen ---
+
+def sharpe_ratio(returns, periods_per_year: float = PERIODS_PER_YEAR, risk_free: float = 0.0):
+    r = np.asarray(returns, dtype=np.float64) - risk_free / periods_per_year
+    if r.shape[-1] < 2:
+        return _result(np.zeros(r.shape[:-1]))
+    return _ratio(r.mean(axis=-1) * math.sqrt(periods_per_year), r.std(axis=-1, ddof=1))
+
+
+def sortino_ratio(returns, periods_per_year: float = PERIODS_PER_YEAR, target: float = 0.0):
+    """Wie Sharpe, aber nur Abweichungen unter dem Ziel (pro Jahr) zählen als Risiko"""
+    r = np.asarray(returns, dtype=np.float64) - target / periods_per_year
+    if r.shape[-1] < 1:
+        return _result(np.zeros(r.shape[:-1]))
+    downside = np.sqrt(np.mean(np.minimum(r, 0.0) ** 2, axis=-1))
+    return _ratio(r.mean(axis=-1) * math.sqrt(periods_per_year), downside)
+
+
+def drawdowns(equity, initial: Optional[float] = None) -> np.ndarray:
+    """Abstand zum bisherigen Hoch je Punkt; initial zählt als Hoch vor dem ersten Punkt"""
+    equity = np.asarray(equity, dtype=np.float64)
+    peaks = np.maximum.accumulate(equity, axis=-1)
+    if initial is not None:
+        peaks = np.maximum(peaks, initial)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(peaks > 0, 1 - equity / peaks, 0.0)
+
+
+def max_drawdown(equity, initial: Optional[float] = None):
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.shape[-1] == 0:
+        return _result(np.zeros(equity.shape[:-1]))
+    return _result(drawdowns(equity, initial).max(axis=-1))
+
+
+def max_drawdown_duration(equity, timestamps=None):
+    """Längste Zeit unter dem letzten Hoch; in Perioden oder, mit Zeitstempeln, in deren Einheit"""
+    equity = np.asarray(equity, dtype=np.float64)
+    n = equity.shape[-1]
+    if n == 0:
+        return 0 if equity.ndim == 1 else np.zeros(equity.shape[:-1], dtype=np.int64)
+    index = np.broadcast_to(np.arange(n), equity.shape)
+    at_peak = equity >= np.maximum.accumulate(equity, axis=-1)
+    peak_index = np.maximum.accumulate(np.where(at_peak, index, 0), axis=-1)
+    if timestamps is None:
+        durations = index - peak_index
+    else:
+        timestamps = np.asarray(timestamps)
+        durations = timestamps - timestamps[peak_index]
+    longest = durations.max(axis=-1)
+    return longest if np.ndim(longest) or timestamps is not None else int(longest)
+
+
+def annualized_return(equity, periods_per_year: float = PERIODS_PER_YEAR):
+    equity = np.asarray(equity, dtype=np.float64)
+    periods = equity.shape[-1] - 1
+    if periods < 1:
+        return _result(np.zeros(equity.shape[:-1]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = equity[..., -1] / equity[..., 0]
+        return _result(np.where(growth > 0, growth ** (periods_per_year / periods) - 1, -1.0))
+
+
+def calmar_ratio(equity, periods_per_year: float = PERIODS_PER_YEAR):
+    return _ratio(annualized_return(equity, periods_per_year), max_drawdown(equity))
+
+
+def win_rate(pnls):
+    pnls = np.asarray(pnls, dtype=np.float64)
+    if pnls.shape[-1] == 0:
+        return _result(np.zeros(pnls.shape[:-1]))
+    return _result((pnls > 0).mean(axis=-1))
+
+
+def profit_factor(pnls):
+    """Bruttogewinn / Bruttoverlust; ohne Verluste inf (oder 0 ohne Gewinne)"""
+    pnls = np.asarray(pnls, dtype=np.float64)
+    gains = np.where(pnls > 0, pnls, 0.0).sum(axis=-1)
+    losses = -np.where(pnls < 0, pnls, 0.0).sum(axis=-1)
+    return _ratio(gains, losses)
+
+
+def exposure(positions):
+    """Anteil der Perioden mit offener Position (Positionswert/-menge oder bool je Periode)"""
+    positions = np.asarray(positions)
+    if positions.shape[-1] == 0:
+        return _result(np.zeros(positions.shape[:-1]))
+    return _result((positions != 0).mean(axis=-1))
+
+
+def summary(equity,
+    pnls: Sequence[float] = (),
+    positions=None,
+    periods_per_year: float = PERIODS_PER_YEAR,
+    timestamps=None,
+    initial: Optional[float] = None
+) -> Dict[str, float]:
+    """Alle Kennzahlen einer Equity-Kurve (plus geschlossene Trade-PnLs und Positionen)"""
+    equity = np.asarray(equity, dtype=np.float64)
+    if timestamps is not None:
+        timestamps = np.asarray(timestamps).astype('datetime64[ns]')
+    if initial is not None:
+        equity = np.concatenate([[initial], equity])
+        if timestamps is not None:
+            timestamps = np.concatenate([timestamps[:1], timestamps])
+    r = returns(equity)
+    # Dauer in Perioden, mit Zeitstempeln in Sekunden
+    duration = max_drawdown_duration(equity, timestamps)
+    if timestamps is not None:
+        duration = float(duration / np.timedelta64(1, 's')) if len(equity) else 0.0
+    result = {
+        'total_return': float(equity[-1] / equity[0] - 1) if len(equity) > 1 else 0.0,
+        'sharpe_ratio': sharpe_ratio(r, periods_per_year),
+        'sortino_ratio': sortino_ratio(r, periods_per_year),
+        'max_drawdown': max_drawdown(equity),
+        'max_drawdown_duration': duration,
+        'calmar_ratio': calmar_ratio(equity, periods_per_year),
+        'win_rate': win_rate(pnls),
+        'profit_factor': profit_factor(pnls),
+        'trades': len(pnls),
+    }
+    if positions is not None:
+        result['exposure'] = exposure(positions)
+    return result
+
+
+# --- Rollende und expandierende Fenster ---
+
+def rolling(metric: Callable, values, window: int, **kwargs) -> np.ndarray:
+    """metric über jedes Fenster einer 1D-Serie (ohne Kopie über sliding_window_view); NaN bis zum ersten vollen Fenster"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = metric(sliding_window_view(values, window), **kwargs)
+    return out
+
+
+def rolling_sharpe(returns, window: int, periods_per_year: float = PERIODS_PER_YEAR) -> np.ndarray:
+    return rolling(sharpe_ratio, returns, window, periods_per_year=periods_per_year)
+
+
+def rolling_sortino(returns, window: int, periods_per_year: float = PERIODS_PER_YEAR) -> np.ndarray:
+    return rolling(sortino_ratio, returns, window, periods_per_year=periods_per_year)
+
+
+def rolling_max_drawdown(equity, window: int) -> np.ndarray:
+    return rolling(max_drawdown, equity, window)
+
+
+def _expanding_moments(r: np.ndarray):
+    # Verschiebung um den ersten Wert ändert die Varianz nicht, verringert aber die Auslöschung
+    n = np.arange(1, len(r) + 1, dtype=np.float64)
+    shifted = r - (r[0] if len(r) else 0.0)
+    s1, s2 = np.cumsum(shifted), np.cumsum(shifted ** 2)
+    mean = s1 / n + (r[0] if len(r) else 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        var = np.maximum(s2 - s1 ** 2 / n, 0.0) / (n - 1)
+    return n, mean, var
+
+
+def expanding_sharpe(returns, periods_per_year: float = PERIODS_PER_YEAR) -> np.ndarray:
+    r = np.asarray(returns, dtype=np.float64)
+    n, mean, var = _expanding_moments(r)
+    ratio = np.asarray(_ratio(mean * math.sqrt(periods_per_year), np.sqrt(var)), dtype=np.float64)
+    return np.where(n >= 2, ratio, 0.0)
+
+
+def expanding_sortino(returns, periods_per_year: float = PERIODS_PER_YEAR) -> np.ndarray:
+    r = np.asarray(returns, dtype=np.float64)
+    n = np.arange(1, len(r) + 1, dtype=np.float64)
+    mean = np.cumsum(r) / n
+    downside = np.sqrt(np.cumsum(np.minimum(r, 0.0) ** 2) / n)
+    return np.asarray(_ratio(mean * math.sqrt(periods_per_year), downside), dtype=np.float64)
+
+
+def expanding_max_drawdown(equity) -> np.ndarray:
+    equity = np.asarray(equity, dtype=np.float64)
+    return np.maximum.accumulate(drawdowns(equity)) if len(equity) else np.empty(0)
+
+
+# --- Inkrementell für den Live-Betrieb ---
+
+class OnlineMetrics:
+    """Laufende Kennzahlen: O(1) pro Equity-Punkt (update) und pro geschlossenem Trade (add_trade)"""
+
+    # Liefert dieselben Werte wie summary() über die gleiche Folge von Punkten und Trades
+    # (Welford für Mittel und Varianz der Renditen).
+
+    def __init__(self,
+        initial_capital: Optional[float] = None,
+        periods_per_year: float = PERIODS_PER_YEAR,
+        risk_free: float = 0.0
+    ):
+        self.periods_per_year = periods_per_year
+        self.risk_free = risk_free
+        self.start = math.nan
+        self.equity = math.nan
+        self.peak = math.nan
+        self.periods = 0
+        self.max_drawdown = 0.0
+        self.max_drawdown_duration = 0
+        self._peak_period = 0
+        self._in_market = 0
+        # Renditen
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._downside = 0.0
+        # Trades
+        self.trades = 0
+        self.wins = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.best_trade = math.nan
+        self.worst_trade = math.nan
+        if initial_capital is not None:
+            self.update(initial_capital)
+
+    def update(self, equity: float, in_market: bool = False) -> float:
+        """Neuer Equity-Punkt; gibt den aktuellen Drawdown zurück"""
+        equity = float(equity)
+        if self.periods:
+            r = equity / self.equity - 1 - self.risk_free / self.periods_per_year
+            self._n += 1
+            delta = r - self._mean
+            self._mean += delta / self._n
+            self._m2 += delta * (r - self._mean)
+            self._downside += min(r, 0.0) ** 2
+        else:
+            self.start = equity
+        self.periods += 1
+        self._in_market += bool(in_market)
+        self.equity = equity
+
+        if not equity < self.peak:
+            self.peak = equity
+            self._peak_period = self.periods - 1
+        drawdown = 1 - equity / self.peak if self.peak > 0 else 0.0
+        self.max_drawdown = max(self.max_drawdown, drawdown)
+        self.max_drawdown_duration = max(self.max_drawdown_duration, self.periods - 1 - self._peak_period)
+        return drawdown
+
+    def add_trade(self, pnl: float):
+        pnl = float(pnl)
+        self.trades += 1
+        if pnl > 0:
+            self.wins += 1
+            self.gross_profit += pnl
+        elif pnl < 0:
+            self.gross_loss -= pnl
+        self.best_trade = pnl if not pnl <= self.best_trade else self.best_trade
+        self.worst_trade = pnl if not pnl >= self.worst_trade else self.worst_trade
+
+    @property
+    def total_return(self) -> float:
+        return self.equity / self.start - 1 if self.periods > 1 else 0.0
+
+    @property
+    def sharpe_ratio(self) -> float:
+        if self._n < 2:
+            return 0.0
+        return _ratio(self._mean * math.sqrt(self.periods_per_year), math.sqrt(self._m2 / (self._n - 1)))
+
+    @property
+    def sortino_ratio(self) -> float:
+        if not self._n:
+            return 0.0
+        return _ratio(self._mean * math.sqrt(self.periods_per_year), math.sqrt(self._downside / self._n))
+
+    @property
+    def calmar_ratio(self) -> float:
+        if self.periods < 2:
+            return 0.0
+        growth = self.equity / self.start
+        annualized = growth ** (self.periods_per_year / (self.periods - 1)) - 1 if growth > 0 else -1.0
+        return _ratio(annualized, self.max_drawdown)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.trades if self.trades else 0.0
+
+    @property
+    def profit_factor(self) -> float:
+        return _ratio(self.gross_profit, self.gross_loss)
+
+    @property
+    def exposure(self) -> float:
+        return self._in_market / self.periods if self.periods else 0.0
+
+    def values(self) -> Dict[str, float]:
+        return {
+            'total_return': self.total_return,
+            'sharpe_ratio': self.sharpe_ratio,
+            'sortino_ratio': self.sortino_ratio,
+            'max_drawdown': self.max_drawdown,
+            'max_drawdown_duration': self.max_drawdown_duration,
+            'calmar_ratio': self.calmar_ratio,
+            'win_rate': self.win_rate,
+            'profit_factor': self.profit_factor,
+            'trades': self.trades,
+            'exposure': self.exposure,
+        }
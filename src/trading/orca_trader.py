@@ -8,6 +8,7 @@ from orca_whirlpool.constants import ORCA_WHIRLPOOL_PROGRAM_ID
 from orca_whirlpool.utils import PriceMath, DecimalUtil, SwapUtil, PoolUtil
 from orca_whirlpool.types import Percentage, SwapQuote
 from .whirlpool_errors import WhirlpoolError
+from src.utils.single_flight import SLOT_TIME, SingleFlight, request_key
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +18,20 @@ class OrcaTrader:
         self.ctx = WhirlpoolContext(ORCA_WHIRLPOOL_PROGRAM_ID, self.connection, wallet_keypair)
         self.slippage = Percentage.from_fraction(1, 100)  # 1% Slippage
         self.max_price_impact = Percentage.from_fraction(5, 100)  # 5% max Impact
+        # Health-Check, Simulation und Ausführung lesen denselben Pool nur einmal pro Slot
+        self.flight = SingleFlight(reuse_window=SLOT_TIME)
+        
+    async def _get_whirlpool(self, pool_address: str):
+        """Holt den Whirlpool-Account (dedupliziert)"""
+        return await self.flight.do(
+            request_key("getWhirlpool", pool_address, "confirmed"),
+            lambda: self.ctx.fetcher.get_whirlpool(Pubkey.from_string(pool_address))
+        )
         
     async def check_pool_health(self, pool_address: str) -> Tuple[bool, str]:
         """Prüft die Gesundheit eines Pools"""
         try:
-            whirlpool = await self.ctx.fetcher.get_whirlpool(
-                Pubkey.from_string(pool_address)
-            )
+            whirlpool = await self._get_whirlpool(pool_address)
             
             if whirlpool.liquidity == 0:
                 return False, "Keine Liquidität"
@@ -48,9 +56,7 @@ class OrcaTrader:
             if not is_healthy:
                 raise ValueError(message)
             
-            whirlpool = await self.ctx.fetcher.get_whirlpool(
-                Pubkey.from_string(pool_address)
-            )
+            whirlpool = await self._get_whirlpool(pool_address)
             
             # Prüfe Token-Balancen
             if is_a_to_b:
@@ -112,9 +118,7 @@ class OrcaTrader:
                 }
             
             # Baue und sende Transaktion
-            whirlpool = await self.ctx.fetcher.get_whirlpool(
-                Pubkey.from_string(pool_address)
-            )
+            whirlpool = await self._get_whirlpool(pool_address)
             
             tx = await SwapUtil.get_swap_transaction(
                 self.ctx,
@@ -125,6 +129,8 @@ class OrcaTrader:
             
             signature = await self.ctx.send_transaction(tx)
             await self.connection.confirm_transaction(signature)
+            # Eigener Swap hat den Pool verändert
+            self.flight.forget(request_key("getWhirlpool", pool_address, "confirmed"))
             
             return {
                 'success': True,
@@ -142,9 +148,7 @@ class OrcaTrader:
             
     async def get_pool_info(self, pool_address: str) -> Dict:
         """Holt detaillierte Pool-Informationen"""
-        whirlpool = await self.ctx.fetcher.get_whirlpool(
-            Pubkey.from_string(pool_address)
-        )
+        whirlpool = await self._get_whirlpool(pool_address)
         
         decimals_a = (await self.ctx.fetcher.get_token_mint(whirlpool.token_mint_a)).decimals
         decimals_b = (await self.ctx.fetcher.get_token_mint(whirlpool.token_mint_b)).decimals
@@ -28,13 +28,14 @@ class Trade:
     pnl: Optional[float] = None
 
 class OrcaTradeSimulator:
-    def __init__(self, initial_capital: float = 10.0):
+    def __init__(self, initial_capital: float = 10.0, cost_model=None):
         self.initial_capital = initial_capital  # In SOL
         self.current_capital = initial_capital
         self.positions: Dict[str, Position] = {}  # token -> Position
         self.trades: List[Trade] = []
         self.max_position_size = 0.2  # 20% des Kapitals
         self.max_slippage = 0.01  # 1% max slippage
+        self.cost_model = cost_model  # ExecutionCostModel (Impact-Kurven), sonst Näherung
         
     def simulate_trade(self, pool_data: Dict, amount: float, is_buy: bool) -> Optional[Trade]:
         """Simuliert einen Trade mit Slippage und Fees"""
@@ -56,7 +57,7 @@ class OrcaTradeSimulator:
                 return None
                 
             # 3. Slippage Simulation
-            impact = self._calculate_price_impact(amount, liquidity)
+            impact = self._calculate_price_impact(amount, liquidity, pool_data.get('address'), price, is_buy)
             actual_price = price * (1 + impact if is_buy else 1 - impact)
             
             if abs(actual_price - price) / price > self.max_slippage:
@@ -111,8 +112,11 @@ class OrcaTradeSimulator:
             logger.error(f"Trade simulation failed: {e}")
             return None
             
-    def _calculate_price_impact(self, amount: float, liquidity: float) -> float:
+    def _calculate_price_impact(self, amount: float, liquidity: float, pool_address: Optional[str] = None,
+                                price: float = 1.0, is_buy: bool = True) -> float:
         """Berechnet simulierten Price Impact"""
+        if self.cost_model is not None:
+            return self.cost_model.slippage(pool_address, amount * price, is_buy)
         return (amount / liquidity) ** 0.5 * 0.01  # Vereinfachte Formel
         
     def check_positions(self, current_prices: Dict[str, float]):
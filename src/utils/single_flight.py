@@ -0,0 +1,84 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Ein Solana-Slot dauert ~400ms; innerhalb davon liefert ein erneuter Read praktisch dasselbe
+SLOT_TIME = 0.4
+
+
+def request_key(method: str, params: Any = None, commitment: Optional[str] = None) -> str:
+    """Stabiler Schlüssel aus Methode, Parametern und Commitment"""
+    return json.dumps([method, params, commitment], sort_keys=True, default=str)
+
+
+class SingleFlight:
+    """Gleichzeitige identische Requests teilen sich einen laufenden Aufruf"""
+
+    # Alle Aufrufer bekommen dasselbe Ergebnis-Objekt, es darf nicht verändert werden
+
+    def __init__(self, reuse_window: float = 0.0, max_results: int = 10_000):
+        self.reuse_window = reuse_window
+        self.max_results = max_results
+        self.calls = 0
+        self.shared = 0
+        self.reused = 0
+
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Führt fn höchstens einmal pro Schlüssel gleichzeitig aus"""
+        self.calls += 1
+
+        if self.reuse_window > 0:
+            cached = self._results.get(key)
+            if cached is not None:
+                if time.monotonic() - cached[0] <= self.reuse_window:
+                    self.reused += 1
+                    return cached[1]
+                del self._results[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._on_done(key, t))
+        else:
+            self.shared += 1
+
+        # shield: bricht ein Aufrufer ab, laufen die anderen weiter
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if self.reuse_window > 0:
+            if len(self._results) >= self.max_results:
+                self._evict_expired()
+            self._results[key] = (time.monotonic(), task.result())
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for key in [k for k, (at, _) in self._results.items() if now - at > self.reuse_window]:
+            del self._results[key]
+        # Immer noch voll: ältesten Eintrag verwerfen
+        while len(self._results) >= self.max_results:
+            del self._results[next(iter(self._results))]
+
+    def forget(self, key: Hashable):
+        """Verwirft ein wiederverwendbares Ergebnis (z.B. nach einem eigenen Swap)"""
+        self._results.pop(key, None)
+
+    def stats(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'shared': self.shared,
+            'reused': self.reused,
+            'inflight': len(self._inflight),
+        }
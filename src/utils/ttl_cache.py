@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+from src.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """Grobe Speichergröße eines Cache-Werts in Bytes"""
+    if hasattr(value, 'memory_usage'):  # pandas DataFrame/Series
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, 'sum') else usage)
+    if hasattr(value, 'nbytes'):  # numpy Arrays
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires: float
+    stale_until: float
+    size: int
+
+
+class AsyncTTLCache:
+    """Begrenzter LRU-Cache mit TTL pro Eintrag und Stale-While-Revalidate"""
+
+    def __init__(self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = 60.0,
+        max_bytes: Optional[int] = None,
+        stale_ttl: float = 0.0,
+        sizeof: Callable[[Any], int] = estimate_size,
+        name: str = 'cache'
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl  # None = kein Ablauf, nur LRU
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self.sizeof = sizeof
+        self.name = name
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.bytes = 0
+
+        self._data: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self._flight = SingleFlight()
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+
+    # --- Lesen / Schreiben ---
+
+    def _lookup(self, key: Hashable, now: float) -> Tuple[Optional[_Entry], bool]:
+        """Eintrag und ob er noch frisch ist; abgelaufene Einträge werden hier (lazy) entfernt"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None, False
+        if now < entry.expires:
+            return entry, True
+        if now < entry.stale_until:
+            return entry, False
+        self._remove(key)
+        self.expirations += 1
+        return None, False
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Liefert einen frischen Wert oder default"""
+        entry, fresh = self._lookup(key, time.monotonic())
+        if not fresh:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = _MISSING):
+        """Speichert einen Wert, verdrängt bei Bedarf die am längsten ungenutzten Einträge"""
+        ttl = self.ttl if ttl is _MISSING else ttl
+        now = time.monotonic()
+        expires = now + ttl if ttl is not None else float('inf')
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+
+        if key in self._data:
+            self._remove(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Einzelner Wert größer als das ganze Budget: nicht cachen statt alles zu verdrängen
+            logger.debug(f"{self.name}: Wert für {key} überschreitet max_bytes")
+            return
+        self._data[key] = _Entry(value, expires, expires + self.stale_ttl, size)
+        self.bytes += size
+        self._enforce_bounds()
+
+    def _remove(self, key: Hashable) -> _Entry:
+        entry = self._data.pop(key)
+        self.bytes -= entry.size
+        return entry
+
+    def _enforce_bounds(self):
+        while len(self._data) > self.maxsize or (self.max_bytes is not None and self.bytes > self.max_bytes):
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self._data:
+            return default
+        return self._remove(key).value
+
+    def clear(self):
+        self._data.clear()
+        self.bytes = 0
+
+    # --- Async Laden ---
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]],
+                          ttl: Optional[float] = _MISSING) -> Any:
+        """Frischer Wert aus dem Cache, sonst laden; abgelaufene Werte im Stale-Fenster
+        werden sofort geliefert und im Hintergrund erneuert"""
+        entry, fresh = self._lookup(key, time.monotonic())
+        if entry is not None:
+            self._data.move_to_end(key)
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._revalidate(key, loader, ttl)
+            return entry.value
+
+        self.misses += 1
+        return await self._flight.do(key, lambda: self._load(key, loader, ttl))
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]) -> Any:
+        value = await loader()
+        # None-Ergebnisse (Fehler) werden nicht gecacht
+        if value is not None:
+            self.set(key, value, ttl)
+        return value
+
+    def _revalidate(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]):
+        task = self._refreshing.get(key)
+        if task is not None and not task.done():
+            return
+
+        async def refresh():
+            try:
+                await self._flight.do(key, lambda: self._load(key, loader, ttl))
+            except Exception as e:
+                logger.warning(f"{self.name}: Hintergrund-Refresh für {key} fehlgeschlagen: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.ensure_future(refresh())
+
+    # --- Mapping-Zugriff ---
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry, fresh = self._lookup(key, time.monotonic())
+        return fresh
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self.set(key, value)
+
+    def __delitem__(self, key: Hashable):
+        if key not in self._data:
+            raise KeyError(key)
+        self._remove(key)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        now = time.monotonic()
+        return iter([key for key, entry in self._data.items() if now < entry.expires])
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            'name': self.name,
+            'size': len(self._data),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+        }
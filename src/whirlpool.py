@@ -13,13 +13,14 @@ from decimal import Decimal
 init()
 
 class WhirlpoolClient:
-    def __init__(self, env: str = 'mainnet'):
+    def __init__(self, env: str = 'mainnet', cost_model=None):
         self.config = ENVIRONMENTS[env]
         self.endpoints = self.config['endpoints']
         self.headers = API_HEADERS
         self.logger = logging.getLogger(__name__)
         self.configs = WHIRLPOOL_CONFIGS
         self.decimals = TOKEN_DECIMALS
+        self.cost_model = cost_model  # ExecutionCostModel from recorded tick arrays
         
     async def get_active_whirlpools(self) -> list:
         """Holt aktive Whirlpools von Orca"""
@@ -213,6 +214,9 @@ class WhirlpoolClient:
     def calculate_slippage(self, pool_data: dict, amount: float) -> float:
         """Calculate expected slippage for a trade"""
         try:
+            if self.cost_model is not None:
+                return min(self.cost_model.slippage(pool_data.get('address'), amount, True), 0.05)
+                
             price_impact = self.calculate_price_impact(pool_data, amount)
             
             # Base slippage calculation
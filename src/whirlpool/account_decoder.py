@@ -0,0 +1,296 @@
+import base64
+import logging
+import struct
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import base58
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Whirlpool Account Layout (Anchor, 653 Bytes)
+# https://github.com/orca-so/whirlpools/blob/main/programs/whirlpool/src/state/whirlpool.rs
+WHIRLPOOL_ACCOUNT_SIZE = 653
+WHIRLPOOL_DISCRIMINATOR = bytes([63, 149, 209, 12, 225, 128, 99, 9])
+
+Q64 = float(2 ** 64)
+
+# u128-Felder werden als (lo, hi) u64-Paare abgebildet, da NumPy kein u128 kennt
+WHIRLPOOL_DTYPE = np.dtype({
+    'names': [
+        'discriminator',
+        'whirlpools_config',
+        'tick_spacing',
+        'fee_rate',
+        'protocol_fee_rate',
+        'liquidity_lo',
+        'liquidity_hi',
+        'sqrt_price_lo',
+        'sqrt_price_hi',
+        'tick_current_index',
+        'protocol_fee_owed_a',
+        'protocol_fee_owed_b',
+        'token_mint_a',
+        'token_vault_a',
+        'fee_growth_global_a_lo',
+        'fee_growth_global_a_hi',
+        'token_mint_b',
+        'token_vault_b',
+        'fee_growth_global_b_lo',
+        'fee_growth_global_b_hi',
+        'reward_last_updated_timestamp',
+    ],
+    'formats': [
+        'S8', ('u1', 32), '<u2', '<u2', '<u2',
+        '<u8', '<u8', '<u8', '<u8', '<i4', '<u8', '<u8',
+        ('u1', 32), ('u1', 32), '<u8', '<u8',
+        ('u1', 32), ('u1', 32), '<u8', '<u8', '<u8',
+    ],
+    'offsets': [
+        0, 8, 41, 45, 47,
+        49, 57, 65, 73, 81, 85, 93,
+        101, 133, 165, 173,
+        181, 213, 245, 253, 261,
+    ],
+    'itemsize': WHIRLPOOL_ACCOUNT_SIZE,
+})
+
+# TickArray Account Layout: 8 Discriminator, i32 start_tick_index, 88 Ticks à 113 Bytes, Pubkey
+TICK_ARRAY_SIZE = 88
+TICK_ARRAY_ACCOUNT_SIZE = 9988
+TICK_ARRAY_DISCRIMINATOR = bytes([69, 97, 189, 190, 110, 7, 66, 187])
+
+TICK_DTYPE = np.dtype({
+    'names': ['initialized', 'liquidity_net_lo', 'liquidity_net_hi', 'liquidity_gross_lo', 'liquidity_gross_hi'],
+    'formats': ['u1', '<u8', '<i8', '<u8', '<u8'],
+    'offsets': [0, 1, 9, 17, 25],
+    'itemsize': 113,
+})
+
+RawAccount = Union[bytes, bytearray, memoryview, str, Sequence]
+
+
+def _to_bytes(raw: RawAccount) -> bytes:
+    """Normalisiert Account-Daten (Bytes, Base64 oder RPC-Format [data, encoding])"""
+    if raw is None:
+        return b''
+    if isinstance(raw, (list, tuple)):
+        raw = raw[0] if raw else b''
+    if isinstance(raw, str):
+        return base64.b64decode(raw)
+    return bytes(raw)
+
+
+def _u128(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Kombiniert u64-Paare zu float64 (verlustbehaftet für sehr große Werte)"""
+    return lo.astype(np.float64) + hi.astype(np.float64) * Q64
+
+
+class WhirlpoolBatch:
+    """Struct-of-Arrays Sicht auf N dekodierte Whirlpool-Accounts"""
+
+    def __init__(self, records: np.ndarray, valid: np.ndarray,
+                 addresses: Optional[Sequence[str]] = None):
+        self.records = records
+        self.valid = valid
+        self.addresses = list(addresses) if addresses is not None else None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def sqrt_price(self) -> np.ndarray:
+        return _u128(self.records['sqrt_price_lo'], self.records['sqrt_price_hi'])
+
+    @property
+    def price(self) -> np.ndarray:
+        """Roher Preis B/A ohne Decimal-Korrektur"""
+        return (self.sqrt_price / Q64) ** 2
+
+    @property
+    def liquidity(self) -> np.ndarray:
+        return _u128(self.records['liquidity_lo'], self.records['liquidity_hi'])
+
+    @property
+    def tick_current_index(self) -> np.ndarray:
+        return self.records['tick_current_index']
+
+    @property
+    def tick_spacing(self) -> np.ndarray:
+        return self.records['tick_spacing']
+
+    @property
+    def fee_rate(self) -> np.ndarray:
+        return self.records['fee_rate']
+
+    @property
+    def protocol_fee_rate(self) -> np.ndarray:
+        return self.records['protocol_fee_rate']
+
+    @property
+    def fee_growth_global_a(self) -> np.ndarray:
+        return _u128(self.records['fee_growth_global_a_lo'], self.records['fee_growth_global_a_hi'])
+
+    @property
+    def fee_growth_global_b(self) -> np.ndarray:
+        return _u128(self.records['fee_growth_global_b_lo'], self.records['fee_growth_global_b_hi'])
+
+    @property
+    def token_mint_a(self) -> np.ndarray:
+        return self.records['token_mint_a']
+
+    @property
+    def token_mint_b(self) -> np.ndarray:
+        return self.records['token_mint_b']
+
+    @property
+    def token_vault_a(self) -> np.ndarray:
+        return self.records['token_vault_a']
+
+    @property
+    def token_vault_b(self) -> np.ndarray:
+        return self.records['token_vault_b']
+
+    def u128(self, field: str, index: int) -> int:
+        """Exakter u128-Wert eines Feldes als Python-Int"""
+        record = self.records[index]
+        return int(record[f'{field}_lo']) | (int(record[f'{field}_hi']) << 64)
+
+    def pubkey(self, field: str, index: int) -> str:
+        """Base58-Adresse eines Pubkey-Feldes"""
+        return base58.b58encode(self.records[field][index].tobytes()).decode()
+
+    def to_dict(self, index: int) -> Dict:
+        """Einzelner Pool als Dict (Kompatibilität zu den alten Decodern)"""
+        record = self.records[index]
+        sqrt_price = self.u128('sqrt_price', index)
+        return {
+            'sqrt_price': sqrt_price,
+            'tick_current_index': int(record['tick_current_index']),
+            'tick_spacing': int(record['tick_spacing']),
+            'fee_rate': int(record['fee_rate']),
+            'protocol_fee_rate': int(record['protocol_fee_rate']),
+            'liquidity': self.u128('liquidity', index),
+            'fee_growth_global_a': self.u128('fee_growth_global_a', index),
+            'fee_growth_global_b': self.u128('fee_growth_global_b', index),
+            'token_mint_a': self.pubkey('token_mint_a', index),
+            'token_mint_b': self.pubkey('token_mint_b', index),
+            'token_vault_a': self.pubkey('token_vault_a', index),
+            'token_vault_b': self.pubkey('token_vault_b', index),
+            'price': (sqrt_price / Q64) ** 2,
+        }
+
+    def to_dicts(self) -> List[Optional[Dict]]:
+        """Alle Pools als Dicts, ungültige Accounts als None"""
+        return [self.to_dict(i) if self.valid[i] else None for i in range(len(self))]
+
+
+def decode_whirlpools(raw_accounts: Sequence[RawAccount],
+                      addresses: Optional[Sequence[str]] = None) -> WhirlpoolBatch:
+    """Dekodiert N Whirlpool-Accounts in einem Durchgang"""
+    buffers = [_to_bytes(raw) for raw in raw_accounts]
+    valid = np.fromiter(
+        (
+            len(buf) >= WHIRLPOOL_ACCOUNT_SIZE and buf[:8] == WHIRLPOOL_DISCRIMINATOR
+            for buf in buffers
+        ),
+        dtype=bool,
+        count=len(buffers)
+    )
+
+    if valid.all():
+        # Schneller Pfad: ein Join, ein frombuffer, keine Kopie pro Feld
+        blob = b''.join(
+            buf if len(buf) == WHIRLPOOL_ACCOUNT_SIZE else buf[:WHIRLPOOL_ACCOUNT_SIZE]
+            for buf in buffers
+        )
+    else:
+        empty = bytes(WHIRLPOOL_ACCOUNT_SIZE)
+        blob = b''.join(
+            buf[:WHIRLPOOL_ACCOUNT_SIZE] if ok else empty
+            for buf, ok in zip(buffers, valid)
+        )
+
+    records = np.frombuffer(blob, dtype=WHIRLPOOL_DTYPE, count=len(buffers))
+    return WhirlpoolBatch(records, valid, addresses)
+
+
+def decode_whirlpool(raw_account: RawAccount) -> Optional[Dict]:
+    """Dekodiert einen einzelnen Whirlpool-Account"""
+    batch = decode_whirlpools([raw_account])
+    if not batch.valid[0]:
+        logger.debug("Ungültige Whirlpool-Account-Daten")
+        return None
+    return batch.to_dict(0)
+
+
+def encode_whirlpool(
+    sqrt_price: int,
+    tick_current_index: int,
+    liquidity: int,
+    fee_rate: int = 3000,
+    protocol_fee_rate: int = 300,
+    tick_spacing: int = 64,
+    fee_growth_global_a: int = 0,
+    fee_growth_global_b: int = 0,
+    token_mint_a: bytes = bytes(32),
+    token_mint_b: bytes = bytes(32),
+    token_vault_a: bytes = bytes(32),
+    token_vault_b: bytes = bytes(32),
+) -> bytes:
+    """Erzeugt Whirlpool-Account-Bytes (für Tests, Mock-RPCs und Benchmarks)"""
+    data = bytearray(WHIRLPOOL_ACCOUNT_SIZE)
+    data[0:8] = WHIRLPOOL_DISCRIMINATOR
+    struct.pack_into('<H', data, 41, tick_spacing)
+    struct.pack_into('<HH', data, 45, fee_rate, protocol_fee_rate)
+    data[49:65] = liquidity.to_bytes(16, 'little')
+    data[65:81] = sqrt_price.to_bytes(16, 'little')
+    struct.pack_into('<i', data, 81, tick_current_index)
+    data[101:133] = token_mint_a
+    data[133:165] = token_vault_a
+    data[165:181] = fee_growth_global_a.to_bytes(16, 'little')
+    data[181:213] = token_mint_b
+    data[213:245] = token_vault_b
+    data[245:261] = fee_growth_global_b.to_bytes(16, 'little')
+    return bytes(data)
+
+
+@dataclass
+class TickArray:
+    """Initialisierte Ticks eines TickArray-Accounts"""
+    start_tick_index: int
+    ticks: Dict[int, int]  # tick_index -> liquidity_net
+
+
+def decode_tick_array(raw_account: RawAccount, tick_spacing: int) -> Optional[TickArray]:
+    """Dekodiert einen TickArray-Account (nur initialisierte Ticks)"""
+    data = _to_bytes(raw_account)
+    if len(data) < TICK_ARRAY_ACCOUNT_SIZE or data[:8] != TICK_ARRAY_DISCRIMINATOR:
+        return None
+
+    start_tick_index = struct.unpack_from('<i', data, 8)[0]
+    ticks = np.frombuffer(data, dtype=TICK_DTYPE, count=TICK_ARRAY_SIZE, offset=12)
+    initialized = np.flatnonzero(ticks['initialized'])
+    return TickArray(
+        start_tick_index=start_tick_index,
+        ticks={
+            start_tick_index + int(i) * tick_spacing:
+                int(ticks['liquidity_net_lo'][i]) + (int(ticks['liquidity_net_hi'][i]) << 64)
+            for i in initialized
+        }
+    )
+
+
+def encode_tick_array(start_tick_index: int, tick_spacing: int,
+                      liquidity_net: Dict[int, int]) -> bytes:
+    """Erzeugt TickArray-Account-Bytes (für Tests, Mock-RPCs und Benchmarks)"""
+    data = bytearray(TICK_ARRAY_ACCOUNT_SIZE)
+    data[0:8] = TICK_ARRAY_DISCRIMINATOR
+    struct.pack_into('<i', data, 8, start_tick_index)
+    for tick_index, net in liquidity_net.items():
+        offset = 12 + ((tick_index - start_tick_index) // tick_spacing) * 113
+        data[offset] = 1
+        data[offset + 1:offset + 17] = net.to_bytes(16, 'little', signed=True)
+        data[offset + 17:offset + 33] = abs(net).to_bytes(16, 'little')
+    return bytes(data)
@@ -0,0 +1,133 @@
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.whirlpool.account_decoder import TickArray
+from src.whirlpool.swap_simulator import Q64, WhirlpoolSwapSimulator
+
+logger = logging.getLogger(__name__)
+
+# Ordergrößen-Raster in Quote-Einheiten (Token B, UI): 0 plus geometrisch bis max_value
+DEFAULT_POINTS = 96
+UNFILLABLE = 1.0  # Slippage für Größen jenseits der bekannten Tick-Arrays
+
+
+def value_grid(min_value: float, max_value: float, points: int = DEFAULT_POINTS) -> np.ndarray:
+    return np.concatenate([[0.0], np.geomspace(min_value, max_value, points - 1)])
+
+
+def _slippage_curve(simulator: WhirlpoolSwapSimulator, grid: np.ndarray, is_buy: bool,
+                    quote_decimals: int) -> Tuple[np.ndarray, float]:
+    """Exakte Quotes für alle Rastergrößen (ein Tick-Durchlauf) -> Slippage ohne Fee, Markttiefe"""
+    # Kauf = B rein, A raus (b_to_a); Verkauf = A rein, B raus. Die Menge ist immer der
+    # Gegenwert in B, beim Verkauf über den Spot-Preis in A umgerechnet.
+    spot = (simulator.sqrt_price / Q64) ** 2  # B roh pro A roh
+    raw_b = grid * 10 ** quote_decimals
+    amounts = raw_b if is_buy else raw_b / spot
+    quotes = simulator.quote_batch([int(a) for a in amounts], a_to_b=not is_buy)
+
+    impact = np.array([q.price_impact for q in quotes])
+    # Kauf: effektiver Preis = Spot / (1 - Impact); Verkauf: Spot * (1 - Impact)
+    slippage = 1 / np.maximum(1 - impact, 1e-12) - 1 if is_buy else impact
+    # Tiefe = tatsächlich gefüllter Input der ersten erschöpften Quote, als Gegenwert in B
+    exhausted = next((q for q in quotes if q.exhausted), None)
+    if exhausted is None:
+        return slippage, np.inf
+    filled = exhausted.amount_in if is_buy else exhausted.amount_in * spot
+    return slippage, filled / 10 ** quote_decimals
+
+
+class ImpactCurveBook:
+    """Vorberechnete Slippage-Kurven je Pool und Tick-Array-Snapshot"""
+
+    # Pro Snapshot (Whirlpool-Zustand + Tick-Arrays zu einem Zeitpunkt) wird für Kauf und
+    # Verkauf einmal exakt über das Größenraster gequotet. Eine Abfrage sucht den letzten
+    # Snapshot vor dem Zeitpunkt und die Rasterstelle per Binärsuche und interpoliert linear;
+    # beides O(log n), auch vektorisiert über viele Trades.
+
+    def __init__(self, grid: Optional[np.ndarray] = None):
+        self.grid = value_grid(1e-3, 1e7) if grid is None else np.asarray(grid, dtype=np.float64)
+        # pool -> (timestamps ns, buy (k, P), sell (k, P), depth (k, 2))
+        self._pools: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def __contains__(self, pool: str) -> bool:
+        return pool in self._pools
+
+    def pools(self) -> Sequence[str]:
+        return sorted(self._pools)
+
+    def snapshots(self, pool: str) -> int:
+        return len(self._pools[pool][0]) if pool in self._pools else 0
+
+    def add_snapshot(self,
+        pool: str,
+        timestamp,
+        pool_data: Dict,
+        tick_arrays: Optional[Sequence[TickArray]],
+        quote_decimals: int
+    ):
+        """Quotet einen Snapshot (dekodierter Whirlpool + Tick-Arrays) über das Raster"""
+        simulator = WhirlpoolSwapSimulator.from_pool(pool_data, tick_arrays)
+        buy, buy_depth = _slippage_curve(simulator, self.grid, True, quote_decimals)
+        sell, sell_depth = _slippage_curve(simulator, self.grid, False, quote_decimals)
+        ts = int(pd.Timestamp(timestamp).as_unit('ns').value)
+
+        timestamps, buys, sells, depths = self._pools.get(pool, (
+            np.empty(0, np.int64), np.empty((0, len(self.grid))), np.empty((0, len(self.grid))), np.empty((0, 2))
+        ))
+        i = int(np.searchsorted(timestamps, ts, side='right'))
+        self._pools[pool] = (
+            np.insert(timestamps, i, ts),
+            np.insert(buys, i, buy, axis=0),
+            np.insert(sells, i, sell, axis=0),
+            np.insert(depths, i, [buy_depth, sell_depth], axis=0),
+        )
+
+    def _rows(self, pool: str, timestamps) -> np.ndarray:
+        snapshot_ts = self._pools[pool][0]
+        if timestamps is None:
+            return np.full(1, len(snapshot_ts) - 1)
+        query = pd.to_datetime(np.atleast_1d(timestamps)).astype('datetime64[ns]').to_numpy().view(np.int64)
+        # Letzter Snapshot vor dem Zeitpunkt; davor gilt der erste
+        return np.clip(np.searchsorted(snapshot_ts, query, side='right') - 1, 0, len(snapshot_ts) - 1)
+
+    def slippage(self, pool: str, values, is_buy: bool, timestamps=None) -> np.ndarray:
+        """Slippage (Anteil des Spot-Preises, ohne Fee) für Ordergrößen in Quote-Einheiten"""
+        _, buys, sells, depths = self._pools[pool]
+        curves = buys if is_buy else sells
+        values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+        rows = np.broadcast_to(self._rows(pool, timestamps), values.shape)
+
+        grid = self.grid
+        j = np.clip(np.searchsorted(grid, values, side='right'), 1, len(grid) - 1)
+        lo, hi = grid[j - 1], grid[j]
+        weight = np.clip((values - lo) / (hi - lo), 0.0, 1.0)
+        result = curves[rows, j - 1] * (1 - weight) + curves[rows, j] * weight
+        # Jenseits der Tiefe nicht ausführbar; über dem Raster gilt der letzte Punkt
+        return np.where(values >= depths[rows, 0 if is_buy else 1], UNFILLABLE, result)
+
+    def depth(self, pool: str, is_buy: bool, timestamp=None) -> float:
+        """Größte Ordergröße, die die bekannten Tick-Arrays noch füllen (inf = unbegrenzt)"""
+        return float(self._pools[pool][3][self._rows(pool, timestamp)[0], 0 if is_buy else 1])
+
+    # --- Persistenz ---
+
+    def save(self, path: Union[str, Path]):
+        arrays = {'grid': self.grid}
+        pools = self.pools()
+        arrays['pools'] = np.array(pools)
+        for i, pool in enumerate(pools):
+            timestamps, buys, sells, depths = self._pools[pool]
+            arrays.update({f"{i}_ts": timestamps, f"{i}_buy": buys, f"{i}_sell": sells, f"{i}_depth": depths})
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'ImpactCurveBook':
+        with np.load(path, allow_pickle=False) as data:
+            book = cls(data['grid'])
+            for i, pool in enumerate(data['pools'].tolist()):
+                book._pools[pool] = (data[f"{i}_ts"], data[f"{i}_buy"], data[f"{i}_sell"], data[f"{i}_depth"])
+        return book
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Mapping, Optional, Union
+
+import numpy as np
+
+from src.whirlpool.impact_curve import ImpactCurveBook
+
+logger = logging.getLogger(__name__)
+
+
+class ImpactCurveRecorder:
+    """Nimmt periodisch Whirlpool-Zustand und Tick-Arrays auf und quotet sie in ein ImpactCurveBook"""
+
+    # Der Fetcher liefert den dekodierten Whirlpool (get_whirlpool_data) und die Tick-Arrays
+    # um den aktuellen Tick (load_tick_arrays), z.B. WhirlpoolFetcher. Nach jeder Runde wird
+    # das Buch atomar als NPZ geschrieben; eine vorhandene Datei wird fortgesetzt, ein Abbruch
+    # kostet also höchstens die laufende Runde. Die Datei ist direkt als 'impact_curves' in
+    # der Backtest-Konfiguration nutzbar.
+
+    def __init__(self,
+        fetcher,
+        pools: Mapping[str, int],
+        path: Union[str, Path],
+        grid: Optional[np.ndarray] = None,
+        radius: int = 2
+    ):
+        self.fetcher = fetcher
+        self.pools = dict(pools)  # Pool-Adresse -> Decimals des Quote-Tokens (B)
+        self.path = Path(path)
+        self.radius = radius
+        self.book = ImpactCurveBook.load(self.path) if self.path.exists() else ImpactCurveBook(grid)
+        self.snapshots = 0
+        self.failures = 0
+
+    async def snapshot(self, pool: str, timestamp: Optional[datetime] = None) -> bool:
+        """Ein Snapshot eines Pools; False, wenn Pool-Daten oder Tick-Arrays fehlen oder nicht quotebar sind"""
+        try:
+            pool_data = await self.fetcher.get_whirlpool_data(pool)
+            if not pool_data:
+                self.failures += 1
+                return False
+            tick_arrays = await self.fetcher.load_tick_arrays(pool, pool_data, self.radius)
+            if not tick_arrays:
+                # Ohne Tick-Arrays wäre die Kurve konstante Liquidität mit unendlicher Tiefe
+                logger.warning(f"Keine Tick-Arrays für {pool}, Snapshot verworfen")
+                self.failures += 1
+                return False
+            self.book.add_snapshot(pool, timestamp or datetime.now(), pool_data, tick_arrays, self.pools[pool])
+        except Exception as e:
+            logger.error(f"Impact-Snapshot für {pool} fehlgeschlagen: {e}")
+            self.failures += 1
+            return False
+        self.snapshots += 1
+        return True
+
+    async def record(self, rounds: int = 1, interval: float = 60.0) -> ImpactCurveBook:
+        """rounds Runden über alle Pools im Abstand interval (Sekunden), nach jeder Runde speichern"""
+        for i in range(rounds):
+            started = time.monotonic()
+            timestamp = datetime.now()
+            await asyncio.gather(*(self.snapshot(pool, timestamp) for pool in self.pools))
+            self.save()
+            logger.info(f"Runde {i + 1}/{rounds}: {self.snapshots} Snapshots, {self.failures} Fehler")
+            if i < rounds - 1:
+                await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+        return self.book
+
+    def save(self):
+        """Schreibt das Buch atomar (tmp + rename)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.stem}.tmp.npz")
+        self.book.save(tmp)
+        os.replace(tmp, self.path)
@@ -0,0 +1,207 @@
+# Whirlpool Sqrt-Price- und Swap-Mathematik (Port von tick_math.rs / swap_math.rs)
+# Alle Sqrt-Preise sind Python-Ints im Q64.64-Format, Rundung wie on-chain.
+from dataclasses import dataclass
+
+MIN_TICK_INDEX = -443636
+MAX_TICK_INDEX = 443636
+MIN_SQRT_PRICE = 4295048016
+MAX_SQRT_PRICE = 79226673515401279992447579055
+
+TICK_ARRAY_SIZE = 88
+FEE_RATE_MUL_VALUE = 1_000_000
+PROTOCOL_FEE_RATE_MUL_VALUE = 10_000
+
+U64_MAX = (1 << 64) - 1
+
+# floor(sqrt(1.0001)^(2^k) * 2^96) für positive Ticks
+_POSITIVE_RATIOS = (
+    79232123823359799118286999567,
+    79236085330515764027303304731,
+    79244008939048815603706035061,
+    79259858533276714757314932305,
+    79291567232598584799939703904,
+    79355022692464371645785046466,
+    79482085999252804386437311141,
+    79736823300114093921829183326,
+    80248749790819932309965073892,
+    81282483887344747381513967011,
+    83390072131320151908154831281,
+    87770609709833776024991924138,
+    97234110755111693312479820773,
+    119332217159966728226237229890,
+    179736315981702064433883588727,
+    407748233172238350107850275304,
+    2098478828474011932436660412517,
+    55581415166113811149459800483533,
+    38992368544603139932233054999993551,
+)
+
+# floor(2^64 / sqrt(1.0001)^(2^k)) für negative Ticks
+_NEGATIVE_RATIOS = (
+    18445821805675392311,
+    18444899583751176498,
+    18443055278223354162,
+    18439367220385604838,
+    18431993317065449817,
+    18417254355718160513,
+    18387811781193591352,
+    18329067761203520168,
+    18212142134806087854,
+    17980523815641551639,
+    17526086738831147013,
+    16651378430235024244,
+    15030750278693429944,
+    12247334978882834399,
+    8131365268884726200,
+    3584323654723342297,
+    696457651847595233,
+    26294789957452057,
+    37481735321082,
+)
+
+
+def sqrt_price_from_tick_index(tick: int) -> int:
+    """Q64.64 Sqrt-Preis eines Ticks (bitgenau wie on-chain)"""
+    if not MIN_TICK_INDEX <= tick <= MAX_TICK_INDEX:
+        raise ValueError(f"Tick {tick} außerhalb des gültigen Bereichs")
+
+    if tick >= 0:
+        ratio = _POSITIVE_RATIOS[0] if tick & 1 else 1 << 96
+        for bit in range(1, 19):
+            if tick & (1 << bit):
+                ratio = (ratio * _POSITIVE_RATIOS[bit]) >> 96
+        return ratio >> 32
+
+    abs_tick = -tick
+    ratio = _NEGATIVE_RATIOS[0] if abs_tick & 1 else 1 << 64
+    for bit in range(1, 19):
+        if abs_tick & (1 << bit):
+            ratio = (ratio * _NEGATIVE_RATIOS[bit]) >> 64
+    return ratio
+
+
+def tick_index_from_sqrt_price(sqrt_price: int) -> int:
+    """Größter Tick mit sqrt_price_from_tick_index(tick) <= sqrt_price"""
+    if not MIN_SQRT_PRICE <= sqrt_price <= MAX_SQRT_PRICE:
+        raise ValueError(f"Sqrt-Preis {sqrt_price} außerhalb des gültigen Bereichs")
+
+    low, high = MIN_TICK_INDEX, MAX_TICK_INDEX
+    while low < high:
+        mid = (low + high + 1) >> 1
+        if sqrt_price_from_tick_index(mid) <= sqrt_price:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _div_round_up(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(numerator, denominator)
+    return quotient + 1 if remainder else quotient
+
+
+def get_amount_delta_a(sqrt_price_0: int, sqrt_price_1: int, liquidity: int, round_up: bool) -> int:
+    """Token-A-Menge zwischen zwei Sqrt-Preisen"""
+    lower, upper = sorted((sqrt_price_0, sqrt_price_1))
+    numerator = (liquidity * (upper - lower)) << 64
+    denominator = upper * lower
+    return _div_round_up(numerator, denominator) if round_up else numerator // denominator
+
+
+def get_amount_delta_b(sqrt_price_0: int, sqrt_price_1: int, liquidity: int, round_up: bool) -> int:
+    """Token-B-Menge zwischen zwei Sqrt-Preisen"""
+    product = liquidity * abs(sqrt_price_1 - sqrt_price_0)
+    result = product >> 64
+    if round_up and product & U64_MAX:
+        result += 1
+    return result
+
+
+def get_next_sqrt_price_from_a_round_up(sqrt_price: int, liquidity: int, amount: int, add: bool) -> int:
+    if amount == 0:
+        return sqrt_price
+    product = sqrt_price * amount
+    numerator = (liquidity * sqrt_price) << 64
+    liquidity_shifted = liquidity << 64
+    denominator = liquidity_shifted + product if add else liquidity_shifted - product
+    if denominator <= 0:
+        raise ValueError("Sqrt-Preis außerhalb des gültigen Bereichs")
+    return _div_round_up(numerator, denominator)
+
+
+def get_next_sqrt_price_from_b_round_down(sqrt_price: int, liquidity: int, amount: int, add: bool) -> int:
+    amount_x64 = amount << 64
+    delta = amount_x64 // liquidity if add else _div_round_up(amount_x64, liquidity)
+    return sqrt_price + delta if add else sqrt_price - delta
+
+
+def get_next_sqrt_price(sqrt_price: int, liquidity: int, amount: int,
+                        amount_specified_is_input: bool, a_to_b: bool) -> int:
+    if amount_specified_is_input == a_to_b:
+        return get_next_sqrt_price_from_a_round_up(sqrt_price, liquidity, amount, amount_specified_is_input)
+    return get_next_sqrt_price_from_b_round_down(sqrt_price, liquidity, amount, amount_specified_is_input)
+
+
+def get_amount_fixed_delta(sqrt_price_current: int, sqrt_price_target: int, liquidity: int,
+                           amount_specified_is_input: bool, a_to_b: bool) -> int:
+    if a_to_b == amount_specified_is_input:
+        return get_amount_delta_a(sqrt_price_current, sqrt_price_target, liquidity, amount_specified_is_input)
+    return get_amount_delta_b(sqrt_price_current, sqrt_price_target, liquidity, amount_specified_is_input)
+
+
+def get_amount_unfixed_delta(sqrt_price_current: int, sqrt_price_target: int, liquidity: int,
+                             amount_specified_is_input: bool, a_to_b: bool) -> int:
+    if a_to_b == amount_specified_is_input:
+        return get_amount_delta_b(sqrt_price_current, sqrt_price_target, liquidity, not amount_specified_is_input)
+    return get_amount_delta_a(sqrt_price_current, sqrt_price_target, liquidity, not amount_specified_is_input)
+
+
+@dataclass
+class SwapStep:
+    amount_in: int
+    amount_out: int
+    next_sqrt_price: int
+    fee_amount: int
+
+
+def compute_swap_step(amount_remaining: int, fee_rate: int, liquidity: int,
+                      sqrt_price_current: int, sqrt_price_target: int,
+                      amount_specified_is_input: bool, a_to_b: bool) -> SwapStep:
+    """Ein Swap-Schritt bis zum Ziel-Sqrt-Preis oder bis die Menge aufgebraucht ist"""
+    initial_fixed_delta = get_amount_fixed_delta(
+        sqrt_price_current, sqrt_price_target, liquidity, amount_specified_is_input, a_to_b
+    )
+
+    amount_calc = amount_remaining
+    if amount_specified_is_input:
+        amount_calc = amount_remaining * (FEE_RATE_MUL_VALUE - fee_rate) // FEE_RATE_MUL_VALUE
+
+    if initial_fixed_delta <= amount_calc:
+        next_sqrt_price = sqrt_price_target
+    else:
+        next_sqrt_price = get_next_sqrt_price(
+            sqrt_price_current, liquidity, amount_calc, amount_specified_is_input, a_to_b
+        )
+
+    is_max_swap = next_sqrt_price == sqrt_price_target
+    amount_unfixed_delta = get_amount_unfixed_delta(
+        sqrt_price_current, next_sqrt_price, liquidity, amount_specified_is_input, a_to_b
+    )
+    if is_max_swap:
+        amount_fixed_delta = initial_fixed_delta
+    else:
+        amount_fixed_delta = get_amount_fixed_delta(
+            sqrt_price_current, next_sqrt_price, liquidity, amount_specified_is_input, a_to_b
+        )
+
+    if amount_specified_is_input:
+        amount_in, amount_out = amount_fixed_delta, amount_unfixed_delta
+    else:
+        amount_in, amount_out = amount_unfixed_delta, min(amount_fixed_delta, amount_remaining)
+
+    if amount_specified_is_input and not is_max_swap:
+        fee_amount = amount_remaining - amount_in
+    else:
+        fee_amount = _div_round_up(amount_in * fee_rate, FEE_RATE_MUL_VALUE - fee_rate)
+
+    return SwapStep(amount_in, amount_out, next_sqrt_price, fee_amount)
@@ -0,0 +1,275 @@
+import logging
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.whirlpool.account_decoder import TICK_ARRAY_SIZE, TickArray
+from src.whirlpool.swap_math import (
+    FEE_RATE_MUL_VALUE,
+    MAX_SQRT_PRICE,
+    MIN_SQRT_PRICE,
+    compute_swap_step,
+    get_amount_delta_a,
+    get_amount_delta_b,
+    sqrt_price_from_tick_index,
+    tick_index_from_sqrt_price
+)
+
+logger = logging.getLogger(__name__)
+
+Q64 = 2 ** 64
+
+
+@dataclass
+class SwapQuote:
+    amount_in: int  # inkl. Fee
+    amount_out: int
+    fee_amount: int
+    start_sqrt_price: int
+    end_sqrt_price: int
+    end_tick_index: int
+    ticks_crossed: int
+    price_impact: float
+    exhausted: bool = False  # Gecachte Tick-Arrays reichen nicht für die volle Menge
+
+
+@dataclass
+class _SwapState:
+    sqrt_price: int
+    tick: int
+    liquidity: int
+    consumed: int = 0
+    calculated: int = 0
+    fee_amount: int = 0
+    ticks_crossed: int = 0
+
+
+def tick_array_start_index(tick_index: int, tick_spacing: int) -> int:
+    """Start-Tick des TickArrays, das den Tick enthält"""
+    ticks_in_array = TICK_ARRAY_SIZE * tick_spacing
+    return (tick_index // ticks_in_array) * ticks_in_array
+
+
+class WhirlpoolSwapSimulator:
+    """Exakter CLMM-Swap über gecachte Tick-Arrays, ohne RPC-Roundtrip"""
+
+    def __init__(self,
+        sqrt_price: int,
+        tick_current_index: int,
+        liquidity: int,
+        fee_rate: int,
+        tick_spacing: int,
+        tick_arrays: Optional[Sequence[TickArray]] = None
+    ):
+        self.sqrt_price = sqrt_price
+        self.tick_current_index = tick_current_index
+        self.liquidity = liquidity
+        self.fee_rate = fee_rate
+        self.tick_spacing = tick_spacing
+
+        # Ohne Tick-Arrays: konstante Liquidität bis zum Preislimit
+        self.bounded = tick_arrays is not None
+        self.liquidity_net: Dict[int, int] = {}
+        self._stops_a_to_b = np.empty(0, dtype=np.int64)
+        self._stops_b_to_a = np.empty(0, dtype=np.int64)
+        if self.bounded:
+            self._index_tick_arrays(tick_arrays)
+
+    @classmethod
+    def from_pool(cls, pool_data: Dict,
+                  tick_arrays: Optional[Sequence[TickArray]] = None) -> "WhirlpoolSwapSimulator":
+        """Erstellt einen Simulator aus dekodierten Whirlpool-Daten"""
+        return cls(
+            sqrt_price=pool_data['sqrt_price'],
+            tick_current_index=pool_data['tick_current_index'],
+            liquidity=pool_data['liquidity'],
+            fee_rate=pool_data['fee_rate'],
+            tick_spacing=pool_data['tick_spacing'],
+            tick_arrays=tick_arrays
+        )
+
+    def _index_tick_arrays(self, tick_arrays: Sequence[TickArray]):
+        """Baut sortierte Stop-Ticks (initialisierte Ticks + Array-Grenzen) wie on-chain"""
+        by_start = {array.start_tick_index: array for array in tick_arrays}
+        ticks_in_array = TICK_ARRAY_SIZE * self.tick_spacing
+        current_start = tick_array_start_index(self.tick_current_index, self.tick_spacing)
+        if current_start not in by_start:
+            raise ValueError("Tick-Arrays decken den aktuellen Tick nicht ab")
+
+        # Nur lückenlos zusammenhängende Arrays um den aktuellen Tick verwenden
+        starts = [current_start]
+        while starts[0] - ticks_in_array in by_start:
+            starts.insert(0, starts[0] - ticks_in_array)
+        while starts[-1] + ticks_in_array in by_start:
+            starts.append(starts[-1] + ticks_in_array)
+
+        for start in starts:
+            self.liquidity_net.update(by_start[start].ticks)
+
+        initialized = list(self.liquidity_net)
+        last_offset = (TICK_ARRAY_SIZE - 1) * self.tick_spacing
+        self._stops_a_to_b = np.unique(np.array(initialized + starts, dtype=np.int64))
+        self._stops_b_to_a = np.unique(np.array(
+            initialized + [start + last_offset for start in starts], dtype=np.int64
+        ))
+
+    def _next_tick(self, tick: int, a_to_b: bool) -> Optional[int]:
+        if a_to_b:
+            i = int(np.searchsorted(self._stops_a_to_b, tick, side='right')) - 1
+            return int(self._stops_a_to_b[i]) if i >= 0 else None
+        i = int(np.searchsorted(self._stops_b_to_a, tick, side='right'))
+        return int(self._stops_b_to_a[i]) if i < len(self._stops_b_to_a) else None
+
+    def _target(self, state: _SwapState, a_to_b: bool, sqrt_price_limit: int):
+        """Nächster Ziel-Sqrt-Preis; None wenn die Tick-Arrays erschöpft sind"""
+        next_tick = self._next_tick(state.tick, a_to_b) if self.bounded else None
+        if next_tick is None:
+            if self.bounded:
+                return None, None
+            return None, sqrt_price_limit
+        next_sqrt_price = sqrt_price_from_tick_index(next_tick)
+        if a_to_b:
+            return next_tick, max(next_sqrt_price, sqrt_price_limit)
+        return next_tick, min(next_sqrt_price, sqrt_price_limit)
+
+    def _advance(self, state: _SwapState, next_tick: Optional[int], next_sqrt_price: int, a_to_b: bool):
+        """Übernimmt den neuen Sqrt-Preis, kreuzt ggf. den Tick"""
+        if next_tick is not None and next_sqrt_price == sqrt_price_from_tick_index(next_tick):
+            net = self.liquidity_net.get(next_tick)
+            if net is not None:
+                state.liquidity = state.liquidity - net if a_to_b else state.liquidity + net
+                state.ticks_crossed += 1
+            state.tick = next_tick - 1 if a_to_b else next_tick
+        elif next_sqrt_price != state.sqrt_price:
+            state.tick = tick_index_from_sqrt_price(next_sqrt_price)
+        state.sqrt_price = next_sqrt_price
+
+    def _default_limit(self, a_to_b: bool) -> int:
+        return MIN_SQRT_PRICE if a_to_b else MAX_SQRT_PRICE
+
+    def quote(self,
+        amount: int,
+        a_to_b: bool,
+        amount_specified_is_input: bool = True,
+        sqrt_price_limit: Optional[int] = None
+    ) -> SwapQuote:
+        """Exaktes Swap-Quote für eine Menge"""
+        limit = sqrt_price_limit or self._default_limit(a_to_b)
+        state = _SwapState(self.sqrt_price, self.tick_current_index, self.liquidity)
+        remaining = amount
+        exhausted = False
+
+        while remaining > 0 and state.sqrt_price != limit:
+            next_tick, target = self._target(state, a_to_b, limit)
+            if target is None:
+                exhausted = True
+                break
+
+            step = compute_swap_step(
+                remaining, self.fee_rate, state.liquidity, state.sqrt_price, target,
+                amount_specified_is_input, a_to_b
+            )
+            if amount_specified_is_input:
+                remaining -= step.amount_in + step.fee_amount
+                state.calculated += step.amount_out
+            else:
+                remaining -= step.amount_out
+                state.calculated += step.amount_in + step.fee_amount
+            state.fee_amount += step.fee_amount
+            self._advance(state, next_tick, step.next_sqrt_price, a_to_b)
+
+        if amount_specified_is_input:
+            amount_in, amount_out = amount - remaining, state.calculated
+        else:
+            amount_in, amount_out = state.calculated, amount - remaining
+        return self._build_quote(state, amount_in, amount_out, a_to_b, exhausted)
+
+    def quote_batch(self, amounts: Sequence[int], a_to_b: bool) -> List[SwapQuote]:
+        """Exakte Quotes (Exact-Input) für viele Mengen mit einem Tick-Durchlauf"""
+        if not len(amounts):
+            return []
+        max_amount = int(max(amounts))
+        limit = self._default_limit(a_to_b)
+
+        # Ein Durchlauf über volle Schritte; thresholds[j] = Menge, ab der Schritt j voll ist
+        states = [_SwapState(self.sqrt_price, self.tick_current_index, self.liquidity)]
+        thresholds: List[int] = []
+        targets = []
+        path_end_exhausted = False
+        while True:
+            state = states[-1]
+            if state.sqrt_price == limit:
+                break
+            next_tick, target = self._target(state, a_to_b, limit)
+            if target is None:
+                path_end_exhausted = True
+                break
+            targets.append((next_tick, target))
+
+            amount_in = get_amount_delta_a(state.sqrt_price, target, state.liquidity, True) if a_to_b \
+                else get_amount_delta_b(state.sqrt_price, target, state.liquidity, True)
+            amount_out = get_amount_delta_b(state.sqrt_price, target, state.liquidity, False) if a_to_b \
+                else get_amount_delta_a(state.sqrt_price, target, state.liquidity, False)
+            fee = -(-amount_in * self.fee_rate // (FEE_RATE_MUL_VALUE - self.fee_rate))
+            thresholds.append(state.consumed + amount_in + fee)
+            if thresholds[-1] > max_amount:
+                break
+
+            next_state = _SwapState(
+                state.sqrt_price, state.tick, state.liquidity,
+                consumed=thresholds[-1],
+                calculated=state.calculated + amount_out,
+                fee_amount=state.fee_amount + fee,
+                ticks_crossed=state.ticks_crossed
+            )
+            self._advance(next_state, next_tick, target, a_to_b)
+            states.append(next_state)
+
+        full_thresholds = thresholds[:len(states) - 1]
+        quotes = []
+        for amount in amounts:
+            amount = int(amount)
+            # Volle Schritte: alle mit threshold < amount, plus einer bei Gleichheit
+            k = bisect_left(full_thresholds, amount)
+            if k < len(full_thresholds) and full_thresholds[k] == amount:
+                k += 1
+
+            state = states[k]
+            remaining = amount - state.consumed
+            if remaining > 0 and k < len(targets):
+                next_tick, target = targets[k]
+                step = compute_swap_step(
+                    remaining, self.fee_rate, state.liquidity, state.sqrt_price, target, True, a_to_b
+                )
+                state = _SwapState(
+                    state.sqrt_price, state.tick, state.liquidity,
+                    consumed=amount,
+                    calculated=state.calculated + step.amount_out,
+                    fee_amount=state.fee_amount + step.fee_amount,
+                    ticks_crossed=state.ticks_crossed
+                )
+                self._advance(state, next_tick, step.next_sqrt_price, a_to_b)
+
+            exhausted = path_end_exhausted and state.consumed < amount
+            quotes.append(self._build_quote(state, state.consumed, state.calculated, a_to_b, exhausted))
+        return quotes
+
+    def _build_quote(self, state: _SwapState, amount_in: int, amount_out: int,
+                     a_to_b: bool, exhausted: bool) -> SwapQuote:
+        net_in = amount_in - state.fee_amount
+        spot_price = (self.sqrt_price / Q64) ** 2  # B pro A
+        ideal_out = net_in * spot_price if a_to_b else net_in / spot_price
+        price_impact = 1 - amount_out / ideal_out if ideal_out > 0 else 0.0
+        return SwapQuote(
+            amount_in=amount_in,
+            amount_out=amount_out,
+            fee_amount=state.fee_amount,
+            start_sqrt_price=self.sqrt_price,
+            end_sqrt_price=state.sqrt_price,
+            end_tick_index=state.tick,
+            ticks_crossed=state.ticks_crossed,
+            price_impact=max(price_impact, 0.0),
+            exhausted=exhausted
+        )
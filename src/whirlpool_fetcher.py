@@ -4,16 +4,20 @@ from typing import Dict, Optional, List
 import aiohttp
 from solana.rpc.async_api import AsyncClient
 from solders.pubkey import Pubkey
-import base64
-import struct
 from src.database import DatabaseManager
+from src.whirlpool.account_decoder import TICK_ARRAY_SIZE, TickArray, decode_tick_array, decode_whirlpool
+from src.whirlpool.swap_simulator import SwapQuote, WhirlpoolSwapSimulator, tick_array_start_index
+from src.connection.account_poller import WhirlpoolPoller
+from src.data.whirlpool_registry import get_whirlpool_registry
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 class WhirlpoolFetcher:
     def __init__(self):
-        self.client = AsyncClient("https://api.mainnet-beta.solana.com")
+        self.rpc_url = "https://api.mainnet-beta.solana.com"
+        self.client = AsyncClient(self.rpc_url)
+        self.poller = WhirlpoolPoller(self.rpc_url)
         self.orca_api_url = "https://api.orca.so"
         self.whirlpool_program = "whirLbMiicVdio4qvUfM5KAg6Ct8VwpYzGff3uctyCc"
         
@@ -35,6 +39,7 @@ class WhirlpoolFetcher:
         self.PROTOCOL_FEE_RATE = 300  # 0.3%
         self.FEE_RATE = 3000  # 0.3%
         self.db = DatabaseManager()
+        self.tick_arrays: Dict[str, List[TickArray]] = {}
         
     async def initialize(self):
         """Initialisiert Fetcher und Datenbank"""
@@ -55,16 +60,16 @@ class WhirlpoolFetcher:
         """Holt Rohdaten eines Whirlpools"""
         try:
             response = await self.client.get_account_info(
-                Pubkey(pool_address),
+                Pubkey.from_string(pool_address),
                 commitment="confirmed",
                 encoding="base64"
             )
             
-            if not response["result"]["value"]:
+            # solana-py liefert typisierte Antworten (GetAccountInfoResp), data ist bereits dekodiert
+            if response.value is None:
                 return None
                 
-            raw_data = base64.b64decode(response["result"]["value"]["data"][0])
-            return self._decode_whirlpool_data(raw_data)
+            return self._decode_whirlpool_data(bytes(response.value.data))
             
         except Exception as e:
             logger.error(f"Fehler beim Abrufen von Whirlpool {pool_address}: {e}")
@@ -72,45 +77,17 @@ class WhirlpoolFetcher:
 
     def _decode_whirlpool_data(self, data: bytes) -> Dict:
         """Dekodiert Whirlpool-Daten nach Orca-Spezifikation"""
-        try:
-            # Whirlpool Layout Dekodierung
-            # https://orca-so.github.io/whirlpools/classes/WhirlpoolData.html
-            (
-                sqrt_price,
-                tick_current_index,
-                protocol_fee_rate,
-                liquidity,
-                fee_growth_global_a,
-                fee_growth_global_b,
-                *rest
-            ) = struct.unpack("<QqHQQQ", data[:42])
-            
-            # Berechne aktuellen Preis
-            price = (sqrt_price / (2 ** 64)) ** 2
-            
-            return {
-                "sqrt_price": sqrt_price,
-                "tick_current_index": tick_current_index,
-                "protocol_fee_rate": protocol_fee_rate,
-                "liquidity": liquidity,
-                "fee_growth_global_a": fee_growth_global_a,
-                "fee_growth_global_b": fee_growth_global_b,
-                "price": price
-            }
-            
-        except Exception as e:
-            logger.error(f"Fehler bei der Whirlpool-Dekodierung: {e}")
+        pool_data = decode_whirlpool(data)
+        if pool_data is None:
+            logger.error("Fehler bei der Whirlpool-Dekodierung: ungültige Account-Daten")
             return {}
+        return pool_data
 
     async def get_all_whirlpools(self) -> List[Dict]:
         """Holt alle aktiven Whirlpools von Orca"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.orca_api_url}/v1/whirlpool/list") as response:
-                    if response.status == 200:
-                        pools = await response.json()
-                        return self._filter_active_pools(pools)
-                    return []
+            pools = await get_whirlpool_registry().get_pools()
+            return self._filter_active_pools(pools)
         except Exception as e:
             logger.error(f"Fehler beim Abrufen der Whirlpools: {e}")
             return []
@@ -129,18 +106,18 @@ class WhirlpoolFetcher:
     async def monitor_pools(self, pool_addresses: List[str], interval: int = 5):
         """Überwacht ausgewählte Pools kontinuierlich"""
         while True:
-            for address in pool_addresses:
-                pool_data = await self.get_whirlpool_data(address)
-                if pool_data:
-                    logger.info(f"Pool {address}: Preis=${pool_data['price']:.4f}, "
-                              f"Liquidität={pool_data['liquidity']}")
+            snapshots = await self.poller.snapshots(pool_addresses)
+            for address, snapshot in snapshots.items():
+                logger.info(f"Pool {address} @ Slot {snapshot.slot}: "
+                          f"Preis=${snapshot.data['price']:.4f}, "
+                          f"Liquidität={snapshot.data['liquidity']}")
             await asyncio.sleep(interval)
 
     async def get_pool_ticks(self, pool_address: str) -> Dict:
         """Holt Tick-Daten für einen Pool"""
         try:
             response = await self.client.get_program_accounts(
-                Pubkey(self.whirlpool_program),
+                Pubkey.from_string(self.whirlpool_program),
                 commitment="confirmed",
                 encoding="base64",
                 filters=[
@@ -155,6 +132,40 @@ class WhirlpoolFetcher:
             logger.error(f"Fehler beim Abrufen der Ticks: {e}")
             return {}
             
+    async def load_tick_arrays(self, pool_address: str, pool_data: Dict, radius: int = 2) -> List[TickArray]:
+        """Lädt die Tick-Arrays um den aktuellen Tick in den Cache"""
+        tick_spacing = pool_data['tick_spacing']
+        current_start = tick_array_start_index(pool_data['tick_current_index'], tick_spacing)
+        starts = [
+            current_start + offset * TICK_ARRAY_SIZE * tick_spacing
+            for offset in range(-radius, radius + 1)
+        ]
+        
+        program_id = Pubkey.from_string(self.whirlpool_program)
+        whirlpool = bytes(Pubkey.from_string(pool_address))
+        addresses = [
+            Pubkey.find_program_address([b"tick_array", whirlpool, str(start).encode()], program_id)[0]
+            for start in starts
+        ]
+        
+        try:
+            response = await self.client.get_multiple_accounts(
+                addresses,
+                commitment="confirmed",
+                encoding="base64"
+            )
+            # GetMultipleAccountsResp: value ist eine Liste von Account | None (fehlende Arrays)
+            tick_arrays = [
+                decode_tick_array(bytes(account.data), tick_spacing)
+                for account in response.value if account is not None
+            ]
+            self.tick_arrays[pool_address] = [array for array in tick_arrays if array]
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der Tick-Arrays für {pool_address}: {e}")
+            self.tick_arrays[pool_address] = []
+            
+        return self.tick_arrays[pool_address]
+            
     async def calculate_swap_quote(self, 
         pool_address: str,
         amount_in: int,
@@ -166,17 +177,18 @@ class WhirlpoolFetcher:
         if not pool_data:
             return None
             
-        sqrt_price = pool_data['sqrt_price']
-        liquidity = pool_data['liquidity']
-        
+        # Neu laden, sobald der Preis den gecachten Bereich verlassen hat
+        if not self.covers_current_tick(pool_address, pool_data):
+            await self.load_tick_arrays(pool_address, pool_data)
+        if not self.covers_current_tick(pool_address, pool_data):
+            logger.error(f"Kein Quote für {pool_address}: Tick-Arrays um Tick "
+                         f"{pool_data['tick_current_index']} nicht verfügbar")
+            return None
+            
         # Berechne Quote
         try:
-            amount_out = self._calculate_out_amount(
-                sqrt_price,
-                liquidity,
-                amount_in,
-                is_a_to_b
-            )
+            quote = self._simulate_swap(pool_address, pool_data, amount_in, is_a_to_b)
+            amount_out = self._calculate_out_amount(quote)
             
             min_amount_out = int(amount_out * (1 - slippage))
             
@@ -184,16 +196,35 @@ class WhirlpoolFetcher:
                 'amount_in': amount_in,
                 'amount_out': amount_out,
                 'min_amount_out': min_amount_out,
-                'price_impact': self._calculate_price_impact(
-                    sqrt_price,
-                    liquidity,
-                    amount_in,
-                    is_a_to_b
-                )
+                'fee_amount': quote.fee_amount,
+                'end_tick_index': quote.end_tick_index,
+                'price_impact': self._calculate_price_impact(quote)
             }
         except Exception as e:
             logger.error(f"Fehler bei Quote-Berechnung: {e}")
             return None
+            
+    def covers_current_tick(self, pool_address: str, pool_data: Dict) -> bool:
+        """True, wenn der Cache das Tick-Array des aktuellen Ticks enthält"""
+        current_start = tick_array_start_index(pool_data['tick_current_index'], pool_data['tick_spacing'])
+        return any(array.start_tick_index == current_start for array in self.tick_arrays.get(pool_address, []))
+            
+    def _simulate_swap(self, pool_address: str, pool_data: Dict, amount_in: int, is_a_to_b: bool) -> SwapQuote:
+        """Simuliert den Swap exakt über die gecachten Tick-Arrays (ValueError ohne passende Arrays)"""
+        tick_arrays = self.tick_arrays.get(pool_address)
+        if not tick_arrays:
+            raise ValueError(f"Keine Tick-Arrays für {pool_address} geladen")
+        return WhirlpoolSwapSimulator.from_pool(pool_data, tick_arrays).quote(amount_in, is_a_to_b)
+        
+    def _calculate_out_amount(self, quote: SwapQuote) -> int:
+        """Output-Menge eines Quotes, nur bei ausreichender Liquidität"""
+        if quote.exhausted:
+            raise ValueError("Nicht genug Liquidität in den geladenen Tick-Arrays")
+        return quote.amount_out
+        
+    def _calculate_price_impact(self, quote: SwapQuote) -> float:
+        """Price Impact in Prozent"""
+        return quote.price_impact * 100
 
 async def main():
     fetcher = WhirlpoolFetcher()
@@ -220,6 +251,7 @@ async def main():
         print(f"TVL: ${float(pool['liquidity']):,.2f}")
     
     await fetcher.client.close()
+    await fetcher.poller.close()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
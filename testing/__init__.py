@@ -0,0 +1 @@
+"""Test-Infrastruktur (Mock-Server) für Tests und Benchmarks, nicht Teil des Bots"""
@@ -0,0 +1,180 @@
+import asyncio
+import base64
+import json
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+
+class MockRPCServer:
+    """Lokaler Solana JSON-RPC Stand-in für Tests und Benchmarks"""
+
+    def __init__(self, accounts: Optional[Dict[str, bytes]] = None,
+                 latency: float = 0.0, slot: int = 1_000_000,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.accounts = accounts or {}
+        self.balances: Dict[str, int] = {}
+        self.latency = latency
+        self.slot = slot
+        self.host = host
+        self.port = port
+        self.http_requests = 0
+        self.method_counts = Counter()
+        self._runner: Optional[web.AppRunner] = None
+        # WebSocket-Verbindungen mit ihren Subscriptions {sub_id: (method, key)}
+        self._ws_clients: Dict[web.WebSocketResponse, Dict[int, Tuple[str, str]]] = {}
+        self._next_sub_id = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}/ws"
+
+    @property
+    def ws_subscription_count(self) -> int:
+        return sum(len(subs) for subs in self._ws_clients.values())
+
+    async def start(self) -> str:
+        """Startet den Server und gibt die URL zurück"""
+        app = web.Application()
+        app.router.add_post("/", self._handle)
+        app.router.add_get("/ws", self._handle_ws)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.url
+
+    async def stop(self):
+        """Stoppt den Server"""
+        await self.drop_connections()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.http_requests += 1
+        payload = await request.json()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.slot += 1
+
+        if isinstance(payload, list):
+            return web.json_response([self._dispatch(item) for item in payload])
+        return web.json_response(self._dispatch(payload))
+
+    def _account_value(self, address: str) -> Optional[Dict]:
+        data = self.accounts.get(address)
+        if data is None:
+            return None
+        return {
+            "data": [base64.b64encode(data).decode(), "base64"],
+            "executable": False,
+            "lamports": 2_039_280,
+            "owner": "whirLbMiicVdio4qvUfM5KAg6Ct8VwpYzGff3uctyCc",
+            "rentEpoch": 0
+        }
+
+    def _dispatch(self, request: Dict) -> Dict:
+        method = request.get("method")
+        params: List = request.get("params", [])
+        self.method_counts[method] += 1
+        context = {"slot": self.slot}
+
+        if method == "getMultipleAccounts":
+            value = [self._account_value(address) for address in params[0]]
+            result = {"context": context, "value": value}
+        elif method == "getAccountInfo":
+            result = {"context": context, "value": self._account_value(params[0])}
+        elif method == "getBalance":
+            result = {"context": context, "value": self.balances.get(params[0], 0)}
+        elif method == "getTokenAccountBalance":
+            amount = self.balances.get(params[0], 0)
+            result = {"context": context, "value": {
+                "amount": str(amount), "decimals": 6, "uiAmount": amount / 1e6
+            }}
+        elif method == "getSlot":
+            result = self.slot
+        elif method == "getHealth":
+            result = "ok"
+        else:
+            return {"jsonrpc": "2.0", "id": request.get("id"),
+                    "error": {"code": -32601, "message": "Method not found"}}
+
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    async def _handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        subscriptions = self._ws_clients.setdefault(ws, {})
+
+        try:
+            async for msg in ws:
+                if msg.type != web.WSMsgType.TEXT:
+                    continue
+                message = json.loads(msg.data)
+                method = message.get("method")
+                params = message.get("params", [])
+                self.method_counts[method] += 1
+
+                if method in ("accountSubscribe", "programSubscribe"):
+                    self._next_sub_id += 1
+                    subscriptions[self._next_sub_id] = (method, params[0])
+                    result = self._next_sub_id
+                elif method in ("accountUnsubscribe", "programUnsubscribe"):
+                    result = subscriptions.pop(params[0], None) is not None
+                else:
+                    await ws.send_json({"jsonrpc": "2.0", "id": message.get("id"),
+                                        "error": {"code": -32601, "message": "Method not found"}})
+                    continue
+
+                await ws.send_json({"jsonrpc": "2.0", "id": message.get("id"), "result": result})
+        finally:
+            self._ws_clients.pop(ws, None)
+        return ws
+
+    async def notify_account(self, address: str, data: bytes, slot: Optional[int] = None):
+        """Aktualisiert einen Account und pusht Notifications an alle Subscriber"""
+        self.accounts[address] = data
+        if slot is None:
+            self.slot += 1
+            slot = self.slot
+        value = self._account_value(address)
+
+        for ws, subscriptions in list(self._ws_clients.items()):
+            for sub_id, (method, key) in list(subscriptions.items()):
+                if method == "accountSubscribe" and key == address:
+                    notification, result = "accountNotification", value
+                elif method == "programSubscribe" and key == value["owner"]:
+                    notification, result = "programNotification", {"pubkey": address, "account": value}
+                else:
+                    continue
+                await ws.send_json({
+                    "jsonrpc": "2.0",
+                    "method": notification,
+                    "params": {
+                        "subscription": sub_id,
+                        "result": {"context": {"slot": slot}, "value": result}
+                    }
+                })
+
+    async def drop_connections(self):
+        """Trennt alle WebSocket-Clients (simuliert Verbindungsabbruch)"""
+        for ws in list(self._ws_clients):
+            await ws.close()
+        self._ws_clients.clear()